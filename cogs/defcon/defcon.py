@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, NamedTuple
 
 import discord
 from core import Cog, Context, Parrot
 from discord.ext import commands
+from utilities.overwrites import BulkChannelEditor, ChannelChange
 
 from .settings import ACTION_SETTINGS, DEFCON_SETTINGS
 
@@ -15,11 +17,23 @@ if TYPE_CHECKING:
 log = logging.getLogger("cogs.defcon")
 
 
+class RunningEditor(NamedTuple):
+    """The editor of a defcon set/reset of a guild, running or cancelled."""
+
+    editor: BulkChannelEditor
+    level: int
+    resetting: bool
+    task: asyncio.Task[None]
+
+
 class DefensiveCondition(Cog):
     """Powerful Raid Protection."""
 
     def __init__(self, bot: Parrot) -> None:
         self.bot = bot
+        self.editors: dict[int, RunningEditor] = {}
+        # editors of a set stopped by a reset, their set must not record anything more
+        self.aborted: set[BulkChannelEditor] = set()
 
         """
         {
@@ -91,87 +105,117 @@ class DefensiveCondition(Cog):
 
         return embed
 
-    async def defcon_set(self, ctx: Context, level: int) -> None:
+    def _progress_reporter(self, message: discord.Message | None, action: str):
+        async def report(editor: BulkChannelEditor) -> None:
+            if message is None:
+                return
+            content = f"{action}... `{editor.done}/{editor.total}` channel changes applied"
+            if editor.failed:
+                content += f" (`{len(editor.failed)}` failed)"
+            if editor.cancelled:
+                content += ". **Cancelled**, use `defcon resume` to continue"
+            await message.edit(content=content)
+
+        return report
+
+    async def _execute_editor(
+        self,
+        ctx: Context,
+        editor: BulkChannelEditor,
+        *,
+        level: int,
+        resetting: bool,
+    ) -> BulkChannelEditor:
+        # a task of its own, for a reset to wait until a cancelled set recorded what it applied
+        task = asyncio.create_task(self.__run_editor(ctx, editor, resetting=resetting))
+        self.editors[ctx.guild.id] = RunningEditor(editor, level, resetting, task)
+        await task
+        return editor
+
+    async def __run_editor(self, ctx: Context, editor: BulkChannelEditor, *, resetting: bool) -> None:
+        already_applied = len(editor.applied)
+
+        await self.bot.wait_until_ready()
+        await editor.execute()
+
+        if resetting:
+            # whatever could not be reverted stays recorded, so the next reset retries it
+            remaining = [*editor.pending.values(), *(change for change, _ in editor.failed)]
+            update = {"$set": {"default_defcon.rollback": [change.reverse().to_dict() for change in remaining]}}
+        else:
+            # the previous state of every applied change, to be able to reset exactly
+            applied = editor.applied[already_applied:]
+            update = {"$push": {"default_defcon.rollback": {"$each": [change.to_dict() for change in applied]}}}
+        await self.bot.guild_configurations.update_one({"_id": ctx.guild.id}, update, upsert=True)
+
+        if not editor.pending and (running := self.editors.get(ctx.guild.id)) and running.editor is editor:
+            del self.editors[ctx.guild.id]
+
+    async def defcon_set(self, ctx: Context, level: int, *, message: discord.Message | None = None) -> bool:
         # sourcery skip: use-named-expression
-        """Set the level of defcon."""
-        channel_hidded = []
+        """Set the level of defcon. ``False`` when a reset stopped it."""
         settings = DEFCON_SETTINGS[level]["SETTINGS"]
+        default_role = ctx.guild.default_role
+
+        editor = BulkChannelEditor(
+            ctx.guild,
+            reason=f"Setting DEFCON {level}. Invoked by {ctx.author}",
+            on_progress=self._progress_reporter(message, "Setting defcon"),
+        )
+
+        channel_hidded = []
         if settings.get("HIDE_CHANNELS"):
             for channel in ctx.guild.channels:
-                if channel.permissions_for(ctx.guild.default_role).read_messages:
-                    try:
-                        overwrite = channel.overwrites_for(ctx.guild.default_role)
-                        overwrite.update(read_messages=False)
-                        await self.bot.wait_until_ready()
-                        await channel.set_permissions(
-                            ctx.guild.default_role,
-                            overwrite=overwrite,
-                            reason=f"Setting DEFON {level}. Invoked by {ctx.author}",
-                        )
-                        channel_hidded.append(channel.id)
-                    except discord.Forbidden:
-                        log.warning("failed to hide channel %s in guild %s", channel.id, ctx.guild.id)
-
-        if channel_hidded:
-            await self.bot.guild_configurations.update_one(
-                {"_id": ctx.guild.id},
-                {"$set": {"default_defcon.hidden_channels": channel_hidded}},
-                upsert=True,
-            )
+                if channel.permissions_for(default_role).read_messages and editor.plan_overwrite(
+                    channel,
+                    default_role,
+                    read_messages=False,
+                ):
+                    channel_hidded.append(channel.id)
 
         channel_locked = []
         if settings.get("LOCK_VOICE_CHANNELS"):
             for channel in ctx.guild.voice_channels:
-                if channel.permissions_for(ctx.guild.default_role).connect:
-                    try:
-                        overwrite = channel.overwrites_for(ctx.guild.default_role)
-                        overwrite.update(connect=False)
-                        await self.bot.wait_until_ready()
-                        await channel.set_permissions(
-                            ctx.guild.default_role,
-                            overwrite=overwrite,
-                            reason=f"Setting DEFCON {level}. Invoked by {ctx.author}",
-                        )
-                        channel_locked.append(channel.id)
-                    except discord.Forbidden:
-                        log.warning("failed to lock channel %s in guild %s", channel.id, ctx.guild.id)
+                if channel.permissions_for(default_role).connect and editor.plan_overwrite(
+                    channel,
+                    default_role,
+                    connect=False,
+                ):
+                    channel_locked.append(channel.id)
 
         if settings.get("LOCK_TEXT_CHANNELS"):
             for channel in ctx.guild.text_channels:
-                if channel.permissions_for(ctx.guild.default_role).send_messages:
-                    try:
-                        overwrite = channel.overwrites_for(ctx.guild.default_role)
-                        overwrite.update(send_messages=False)
-                        await self.bot.wait_until_ready()
-                        await channel.set_permissions(
-                            ctx.guild.default_role,
-                            overwrite=overwrite,
-                            reason=f"Setting DEFCON {level}. Invoked by {ctx.author}",
-                        )
-                        channel_locked.append(channel.id)
-                    except discord.Forbidden:
-                        log.warning("failed to lock channel %s in guild %s", channel.id, ctx.guild.id)
-
-        if channel_locked:
-            await self.bot.guild_configurations.update_one(
-                {"_id": ctx.guild.id},
-                {"$set": {"default_defcon.locked_channels": channel_locked}},
-                upsert=True,
-            )
+                if channel.permissions_for(default_role).send_messages and editor.plan_overwrite(
+                    channel,
+                    default_role,
+                    send_messages=False,
+                ):
+                    channel_locked.append(channel.id)
 
         count = 0
         if settings.get("SLOWMODE") and settings.get("SLOWMODE_TIME"):
             for channel in ctx.guild.text_channels:
-                if channel.id not in channel_locked:
+                if channel.id in channel_locked:
                     continue
-                try:
-                    await channel.edit(
-                        slowmode_delay=DEFCON_SETTINGS[level]["SLOWMODE_TIME"],
-                        reason=f"Setting DEFCON {level}. Invoked by {ctx.author}",
-                    )
+                if editor.plan_slowmode(channel, settings["SLOWMODE_TIME"]):
                     count += 1
-                except discord.Forbidden:
-                    log.warning("failed to set slowmode in channel %s in guild %s", channel.id, ctx.guild.id)
+
+        await self._execute_editor(ctx, editor, level=level, resetting=False)
+        if editor in self.aborted:
+            # the reset reverted what was applied, and is writing the configuration
+            self.aborted.discard(editor)
+            return False
+
+        await self.bot.guild_configurations.update_one(
+            {"_id": ctx.guild.id},
+            {
+                "$set": {
+                    "default_defcon.hidden_channels": channel_hidded,
+                    "default_defcon.locked_channels": channel_locked,
+                },
+            },
+            upsert=True,
+        )
 
         cog: DefconListeners = self.bot.get_cog("DefconListeners")  # type: ignore
         if cog:
@@ -184,67 +228,66 @@ class DefensiveCondition(Cog):
                 f"`Total Channels Locked  `: **{len(channel_locked)}**\n"
                 f"`Total Channels Hidden  `: **{len(channel_hidded)}**\n"
                 f"`Total Channels Affected`: **{len(channel_locked) + len(channel_hidded)}**\n"
-                f"`Channels With Slowmode `: **{count}**\n\n"
+                f"`Channels With Slowmode `: **{count}**\n"
+                f"`Failed Changes         `: **{len(editor.failed)}**\n\n"
                 f"> **Use `defcon reset` to reset the defcon level.**"
             )
             await cog.defcon_broadcast(embed, guild=ctx.guild, level=level)
+        return True
+
+    async def defcon_reset(
+        self,
+        ctx: Context,
+        level: int,
+        *,
+        message: discord.Message | None = None,
+    ) -> BulkChannelEditor | None:
+        """Reset the level of defcon. The editor which reverted the channels, ``None`` when defcon is not set."""
+        if (running := self.editors.pop(ctx.guild.id, None)) and not running.task.done():
+            if not running.resetting:
+                self.aborted.add(running.editor)
+            running.editor.cancel()
+            # the changes it applied are in the rollback once it is done
+            await asyncio.wait([running.task])
 
-    async def defcon_reset(self, ctx: Context, level: int) -> None:
-        """Reset the level of defcon."""
         guild_config = await self.bot.guild_configurations.find_one({"_id": ctx.guild.id})
         if not guild_config or not guild_config.get("default_defcon"):
             await ctx.reply("Defcon is not set.")
-            return
+            return None
+
+        default_defcon = guild_config["default_defcon"]
+        default_role = ctx.guild.default_role
+        editor = BulkChannelEditor(
+            ctx.guild,
+            reason=f"Resetting DEFCON {level}. Invoked by {ctx.author}",
+            on_progress=self._progress_reporter(message, "Resetting defcon"),
+        )
 
-        settings = DEFCON_SETTINGS[level]["SETTINGS"]
-        if settings.get("HIDE_CHANNELS"):
-            for channel_id in guild_config["default_defcon"].get("hidden_channels", []):
+        if rollback := default_defcon.get("rollback"):
+            editor.extend(ChannelChange.from_dict(change).reverse() for change in reversed(rollback))
+        else:
+            # defcon was set before the previous state was being recorded
+            settings = DEFCON_SETTINGS[level]["SETTINGS"]
+            for channel_id in default_defcon.get("hidden_channels", []) if settings.get("HIDE_CHANNELS") else []:
                 if channel := ctx.guild.get_channel(channel_id):
-                    try:
-                        overwrite = channel.overwrites_for(ctx.guild.default_role)
-                        overwrite.update(read_messages=None)
-                        await self.bot.wait_until_ready()
-                        await channel.set_permissions(
-                            ctx.guild.default_role,
-                            overwrite=overwrite,
-                            reason=f"Resetting DEFCON {level}. Invoked by {ctx.author}",
-                        )
-
-                    except discord.Forbidden:
-                        log.warning("failed to reset channel %s in guild %s", channel.id, ctx.guild.id)
+                    editor.plan_overwrite(channel, default_role, read_messages=None)
 
-        count = 0
-        if settings.get("LOCK_VOICE_CHANNELS"):
-            for channel_id in guild_config["default_defcon"].get("locked_channels", []):
-                if channel := ctx.guild.get_channel(channel_id):
-                    try:
-                        overwrite = channel.overwrites_for(ctx.guild.default_role)
-                        overwrite.update(connect=None)
-                        await self.bot.wait_until_ready()
-                        await channel.set_permissions(
-                            ctx.guild.default_role,
-                            overwrite=overwrite,
-                            reason=f"Resetting DEFCON {level}. Invoked by {ctx.author}",
-                        )
-                        count += 1
-                    except discord.Forbidden:
-                        log.warning("failed to reset channel %s in guild %s", channel.id, ctx.guild.id)
+            for channel_id in default_defcon.get("locked_channels", []):
+                channel = ctx.guild.get_channel(channel_id)
+                if isinstance(channel, discord.VoiceChannel) and settings.get("LOCK_VOICE_CHANNELS"):
+                    editor.plan_overwrite(channel, default_role, connect=None)
+                elif isinstance(channel, discord.TextChannel) and settings.get("LOCK_TEXT_CHANNELS"):
+                    editor.plan_overwrite(channel, default_role, send_messages=None)
 
-        if settings.get("LOCK_TEXT_CHANNELS"):
-            for channel_id in guild_config["default_defcon"].get("locked_channels", []):
-                if channel := ctx.guild.get_channel(channel_id):
-                    try:
-                        overwrite = channel.overwrites_for(ctx.guild.default_role)
-                        overwrite.update(send_messages=None)
-                        await self.bot.wait_until_ready()
-                        await channel.set_permissions(
-                            ctx.guild.default_role,
-                            overwrite=overwrite,
-                            reason=f"Resetting DEFCON {level}. Invoked by {ctx.author}",
-                        )
-                        count += 1
-                    except discord.Forbidden:
-                        log.warning("failed to reset channel %s in guild %s", channel.id, ctx.guild.id)
+            if settings.get("SLOWMODE") and settings.get("SLOWMODE_TIME"):
+                for channel in ctx.guild.text_channels:
+                    if channel.id not in default_defcon.get("locked_channels", []):
+                        editor.plan_slowmode(channel, 0)
+
+        count = sum(change.kind == "overwrite" for change in editor.pending.values())
+        slow_mode_count = sum(change.kind == "slowmode" for change in editor.pending.values())
+
+        await self._execute_editor(ctx, editor, level=level, resetting=True)
 
         await self.bot.guild_configurations.update_one(
             {"_id": ctx.guild.id},
@@ -257,20 +300,6 @@ class DefensiveCondition(Cog):
             upsert=True,
         )
 
-        slow_mode_count = 0
-        if settings.get("SLOWMODE") and settings.get("SLOWMODE_TIME"):
-            for channel in ctx.guild.text_channels:
-                if channel.id in guild_config["default_defcon"]["locked_channels"]:
-                    continue
-                try:
-                    await channel.edit(
-                        slowmode_delay=0,
-                        reason=f"Resetting DEFCON {level}. Invoked by {ctx.author}",
-                    )
-                    slow_mode_count += 1
-                except discord.Forbidden:
-                    log.warning("failed to reset slowmode in channel %s in guild %s", channel.id, ctx.guild.id)
-
         if cog := self.bot.get_cog("DefconListeners"):
             embed = discord.Embed(title=f"DEFCON {level}", color=self.bot.color).set_footer(
                 text=f"Invoked by {ctx.author}",
@@ -279,11 +308,14 @@ class DefensiveCondition(Cog):
             embed.description = (
                 f"**{ctx.author}** has reset the defcon level to {level}.\n\n"
                 f"`Total Channels Unlocked`: **{count}**\n"
-                f"`Channels With Slowmode `: **{slow_mode_count}**\n\n"
+                f"`Channels With Slowmode `: **{slow_mode_count}**\n"
+                f"`Failed Changes         `: **{len(editor.failed)}**\n\n"
                 f"> **Use `defcon set` to set the defcon level.**"
             )
             await cog.defcon_broadcast(embed, guild=ctx.guild, level=level)  # type: ignore
 
+        return editor
+
     @defcon.command(name="set")
     @commands.has_permissions(manage_guild=True)
     async def _defcon_set(self, ctx: Context, *, level: Literal[1, 2, 3, 4, 5] = 1) -> None:
@@ -299,7 +331,11 @@ class DefensiveCondition(Cog):
             return
 
         msg = await ctx.reply("Setting defcon...")
-        await self.defcon_set(ctx, level)
+        if not await self.defcon_set(ctx, level, message=msg):
+            if msg:
+                await msg.edit(content="Setting defcon was stopped by a reset.")
+            return
+
         await self.bot.guild_configurations.update_one(
             {"_id": ctx.guild.id},
             {"$set": {"default_defcon.level": level}},
@@ -314,6 +350,9 @@ class DefensiveCondition(Cog):
         """Reset the defcon level."""
         default_defcon = self.bot.guild_configurations_cache[ctx.guild.id].get("default_defcon", {})
         level = default_defcon.get("level", -1)
+        if level == -1 and (running := self.editors.get(ctx.guild.id)):
+            # a set still running has not stored its level
+            level = running.level
         if level == -1:
             await ctx.reply("Defcon is not set.")
             return
@@ -324,14 +363,62 @@ class DefensiveCondition(Cog):
             return
 
         msg = await ctx.reply("Resetting defcon...")
-        await self.defcon_reset(ctx, level)
+        editor = await self.defcon_reset(ctx, level, message=msg)
+        if editor is None:
+            return
+
+        if remaining := await self._finish_reset(ctx, editor):
+            if msg:
+                await msg.edit(
+                    content=f"Defcon partially reset, {remaining} changes could not be reverted. "
+                    "Use `defcon reset` again to retry them.",
+                )
+            return
+
+        if msg:
+            await msg.edit(content="Defcon reset.", delete_after=5)
+
+    async def _finish_reset(self, ctx: Context, editor: BulkChannelEditor) -> int:
+        """Unset defcon once every change is reverted. The number of changes left."""
+        if remaining := len(editor.pending) + len(editor.failed):
+            # defcon stays set with the changes left in its rollback, the next reset retries them
+            return remaining
+
         await self.bot.guild_configurations.update_one(
             {"_id": ctx.guild.id},
             {"$unset": {"default_defcon": ""}},
             upsert=True,
         )
-        if msg:
-            await msg.edit(content="Defcon reset.", delete_after=5)
+        return 0
+
+    @defcon.command(name="cancel")
+    @commands.has_permissions(manage_guild=True)
+    async def defcon_cancel(self, ctx: Context) -> None:
+        """Cancel the running defcon set/reset. The remaining channels can be done with `defcon resume`."""
+        running = self.editors.get(ctx.guild.id)
+        if running is None or not running.editor.running:
+            await ctx.reply("Nothing to cancel.")
+            return
+
+        running.editor.cancel()
+        await ctx.reply("Cancelled.")
+
+    @defcon.command(name="resume")
+    @commands.has_permissions(manage_guild=True)
+    async def defcon_resume(self, ctx: Context) -> None:
+        """Resume the cancelled defcon set/reset."""
+        running = self.editors.get(ctx.guild.id)
+        if running is None or running.editor.running or not running.editor.pending:
+            await ctx.reply("Nothing to resume.")
+            return
+
+        editor, resetting = running.editor, running.resetting
+        msg = await ctx.reply("Resuming defcon...")
+        editor.on_progress = self._progress_reporter(msg, "Resuming defcon")
+        await self._execute_editor(ctx, editor, level=running.level, resetting=resetting)
+        if resetting:
+            await self._finish_reset(ctx, editor)
+        await ctx.reply(f"Resumed. `{len(editor.applied)}` channel changes applied, `{len(editor.failed)}` failed.")
 
     @defcon.command(name="settings")
     @commands.has_permissions(manage_guild=True)
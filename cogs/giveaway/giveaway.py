@@ -1,31 +1,72 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 from typing import Annotated
 
+from pymongo.errors import PyMongoError
+
 import cogs.giveaway.method as mt
 import discord
 from core import Cog, Context, Parrot
-from discord.ext import commands
+from discord.ext import commands, tasks
 from utilities.time import ShortTime
 
+log = logging.getLogger("cogs.giveaway.giveaway")
+
 
 class Giveaways(Cog):
     """Giveaway commands. Let's start a giveaway!."""
 
     def __init__(self, bot: Parrot) -> None:
         self.bot = bot
+        self.registry = mt.GiveawayRegistry()
+        self._flush_lock = asyncio.Lock()
 
     @property
     def display_emoji(self) -> discord.PartialEmoji:
         return discord.PartialEmoji(name="\N{PARTY POPPER}")
 
+    async def cog_load(self) -> None:
+        log.info("Getting all the ongoing giveaways")
+        async for data in self.bot.giveaways.find({"status": "ONGOING"}, {"message_id": 1, "reactors": 1}):
+            self.registry.register(data["message_id"], data.get("reactors") or [])
+
+        self.flush_entrants_loop.start()
+
+    async def cog_unload(self) -> None:
+        log.info("Stopping giveaway entrants flush loop")
+        self.flush_entrants_loop.cancel()
+        async with self._flush_lock:
+            try:
+                await mt.flush_entrants(self.bot, self.registry)
+            except PyMongoError as e:
+                log.warning("Failed to write the giveaway entrants", exc_info=e)
+
+    async def close_entries(self, message_id: int) -> None:
+        """Write the pending entrants of the giveaway and stop tracking it.
+
+        Must be called before the giveaway status is changed from ``ONGOING``.
+        """
+        async with self._flush_lock:
+            await mt.flush_entrants(self.bot, self.registry, message_ids=[message_id])
+        self.registry.unregister(message_id)
+
+    @tasks.loop(seconds=15)
+    async def flush_entrants_loop(self) -> None:
+        async with self._flush_lock:
+            try:
+                await mt.flush_entrants(self.bot, self.registry)
+            except PyMongoError as e:
+                log.warning("Failed to write the giveaway entrants", exc_info=e)
+
     @Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
-        await mt.add_reactor(self.bot, payload)
+        mt.add_reactor(self.registry, payload)
 
     @Cog.listener()
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
-        await mt.remove_reactor(self.bot, payload)
+        mt.remove_reactor(self.registry, payload)
 
     @commands.group(name="giveaway", aliases=["gw"], invoke_without_command=True)
     @commands.has_permissions(manage_guild=True)
@@ -33,6 +74,7 @@ class Giveaways(Cog):
         """To create giveaway."""
         if not ctx.invoked_subcommand:
             post = await mt._make_giveaway(ctx)
+            self.registry.register(post["extra"]["main"]["message_id"])
             await self.bot.create_timer(_event_name="giveaway", **post)
 
     @giveaway.command(name="drop")
@@ -49,12 +91,14 @@ class Giveaways(Cog):
         if not prize:
             return await ctx.send(f"{ctx.author.mention} you didn't give the prize argument")
         post = await mt._make_giveaway_drop(ctx, duration=duration, winners=winners, prize=prize)
+        self.registry.register(post["extra"]["main"]["message_id"])
         await self.bot.create_timer(_event_name="giveaway", **post)
 
     @giveaway.command(name="end")
     @commands.has_permissions(manage_guild=True)
     async def giveaway_end(self, ctx: Context, message_id: int):
         """To end the giveaway."""
+        await self.close_entries(message_id)
         if data := await self.bot.giveaways.find_one_and_update(
             {"message_id": message_id, "status": "ONGOING"},
             {"$set": {"status": "END"}},
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import random
-from typing import Any, Dict, List, Optional
+from collections.abc import Iterable
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pymongo import UpdateOne
 
 import discord
 from core import Context, Parrot
@@ -10,6 +13,8 @@ from discord.ext import commands
 from utilities.exceptions import ParrotCheckFailure, ParrotTimeoutError
 from utilities.time import ShortTime
 
+WINNER_BATCH_SIZE = 100
+
 
 async def _create_giveaway_post(
     *,
@@ -61,85 +66,97 @@ async def end_giveaway(bot: Parrot, **kw: Any) -> List[int]:
                 break
             reactors = []
 
-    __item__remove(reactors, bot.user.id)
-
-    if not reactors:
+    entrants = list(set(reactors) - {bot.user.id})
+    if not entrants:
         return []
 
-    win_count = kw.get("winners", 1)
+    real_winners = await __select_winners(bot, entrants, **kw)
+    if real_winners:
+        # winners are removed from the pool, so that reroll picks someone else
+        await __remove_giveaway_reactors(bot=bot, reactors=real_winners, message_id=kw["message_id"])
 
-    real_winners: List[int] = []
-
-    while True:
-        if win_count > len(reactors):
-            # more winner than the reactions
-            return real_winners
-
-        winners = random.choices(reactors, k=win_count)
-        kw["winners"] = winners
-        real_winners = await __check_requirements(bot, **kw)
+    return real_winners
 
-        _ = [__item__remove(reactors, i) for i in real_winners]  # flake8: noqa
 
-        await __update_giveaway_reactors(bot=bot, reactors=reactors, message_id=kw.get("message_id"))  # type: ignore
+async def __select_winners(
+    bot: Parrot,
+    entrants: List[int],
+    *,
+    guild_id: int,
+    winners: Optional[int] = 1,
+    required_role: Optional[int] = None,
+    required_guild: Optional[int] = None,
+    required_level: Optional[int] = None,
+    **kw: Any,
+) -> List[int]:
+    """Pick up to `winners` distinct eligible entrants.
+
+    Entrants are shuffled once and consumed as a stream in batches, every batch
+    is resolved in bulk, so the whole selection is a single pass over the pool.
+    """
+    current_guild: Optional[discord.Guild] = bot.get_guild(guild_id)
+    if current_guild is None:
+        return []
 
-        if not real_winners and not reactors:
-            # requirement do not statisfied and we are out of reactors
-            return real_winners
+    win_count = winners or 1
+    other_guild: Optional[discord.Guild] = bot.get_guild(required_guild) if required_guild else None
 
-        if real_winners:
-            return real_winners
-        win_count = win_count - len(real_winners)
-        await asyncio.sleep(0)
+    levels: Dict[int, int] = {}
+    if required_level:
+        levels = await __fetch_levels(bot, current_guild.id, entrants)
 
+    # sampling without replacement, every entrant is considered at most once
+    candidates = random.sample(entrants, len(entrants))
+    real_winners: List[int] = []
 
-async def __check_requirements(bot: Parrot, **kw: Any) -> List[int]:
-    # vars
-    real_winners: List[int] = kw.get("winners", [])
+    for index in range(0, len(candidates), WINNER_BATCH_SIZE):
+        batch = candidates[index : index + WINNER_BATCH_SIZE]
+        if required_level:
+            batch = [member_id for member_id in batch if levels.get(member_id, 0) >= required_level]
+        if not batch:
+            continue
 
-    current_guild: discord.Guild = bot.get_guild(kw.get("guild_id"))  # type: ignore
-    required_guild: Optional[discord.Guild] = bot.get_guild(kw.get("required_guild", 0))
-    required_role: int = kw.get("required_role", 0)
-    required_level: int = kw.get("required_level", 0)
+        members = [member async for member in bot.resolve_member_ids(current_guild, batch)]
+        if required_role:
+            members = [member for member in members if member._roles.has(required_role)]
 
-    for member in kw.get("winners", []):
-        member = await bot.get_or_fetch_member(current_guild, member)
-        assert isinstance(member, discord.Member)
-        if required_guild:
-            is_member_none = await bot.get_or_fetch_member(required_guild, member.id)
-            if is_member_none is None:
-                __item__remove(real_winners, member)
+        eligible: Set[int] = {member.id for member in members}
+        if other_guild is not None and eligible:
+            eligible = {member.id async for member in bot.resolve_member_ids(other_guild, eligible)}
 
-        if required_role and not member._roles.has(required_role):
-            __item__remove(real_winners, member)
+        # keep the shuffled order, `resolve_member_ids` does not preserve it
+        for member_id in batch:
+            if member_id in eligible:
+                real_winners.append(member_id)
+                if len(real_winners) >= win_count:
+                    return real_winners
 
-        if required_level:
-            level = await bot.guild_level_db[f"{current_guild.id}"].find_one({"_id": member.id})
-            if level < required_level:
-                __item__remove(real_winners, member)
+        await asyncio.sleep(0)
 
     return real_winners
 
 
-async def __update_giveaway_reactors(*, bot: Parrot, reactors: List[int], message_id: int) -> None:
-    collection = bot.giveaways
-    await collection.update_one({"message_id": message_id}, {"$set": {"reactors": reactors}})
+async def __fetch_levels(bot: Parrot, guild_id: int, member_ids: List[int]) -> Dict[int, int]:
+    collection = bot.guild_level_collection(guild_id)
+    return {
+        data["_id"]: int((data.get("xp", 0) // 42) ** 0.55)
+        async for data in collection.find({"_id": {"$in": member_ids}}, {"xp": 1})
+    }
 
 
-def __item__remove(ls: List[Any], item: Any) -> Optional[List[Any]]:
-    try:
-        ls.remove(item)
-    except (ValueError, KeyError):
-        return ls
-    return ls
+async def __remove_giveaway_reactors(*, bot: Parrot, reactors: List[int], message_id: int) -> None:
+    collection = bot.giveaways
+    await collection.update_one({"message_id": message_id}, {"$pull": {"reactors": {"$in": reactors}}})
 
 
 async def __wait_for__message(ctx: Context) -> str:
-    def check(m: discord.Message) -> bool:
-        return m.channel.id == ctx.channel.id and m.author.id == ctx.author.id
-
     try:
-        msg: discord.Message = await ctx.wait_for("message", check=check, timeout=60)
+        msg: discord.Message = await ctx.wait_for(
+            "message",
+            timeout=60,
+            channel_id=ctx.channel.id,
+            user_id=ctx.author.id,
+        )
     except asyncio.TimeoutError:
         raise ParrotTimeoutError()
     else:
@@ -263,21 +280,121 @@ def __is_int(st: str, error: str) -> Optional[int]:
         return main
 
 
-async def add_reactor(bot: Parrot, payload: discord.RawReactionActionEvent):
-    if str(payload.emoji) != "\N{PARTY POPPER}":
+class GiveawayRegistry:
+    """In-memory view of the ongoing giveaways and their entrants.
+
+    Reactions on messages that are not ongoing giveaways are filtered out with a
+    single dict lookup. Entrant changes are kept as pending additions/removals and
+    written to the database in batches by :func:`flush_entrants`.
+    """
+
+    def __init__(self) -> None:
+        self.entrants: Dict[int, Set[int]] = {}
+        self._added: Dict[int, Set[int]] = {}
+        self._removed: Dict[int, Set[int]] = {}
+
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self.entrants
+
+    def __len__(self) -> int:
+        return len(self.entrants)
+
+    def register(self, message_id: int, reactors: Iterable[int] = ()) -> None:
+        self.entrants[message_id] = set(reactors)
+
+    def unregister(self, message_id: int) -> Optional[Set[int]]:
+        self._added.pop(message_id, None)
+        self._removed.pop(message_id, None)
+        return self.entrants.pop(message_id, None)
+
+    def add(self, message_id: int, user_id: int) -> bool:
+        try:
+            entrants = self.entrants[message_id]
+        except KeyError:
+            return False
+
+        entrants.add(user_id)
+        self._removed.get(message_id, set()).discard(user_id)
+        self._added.setdefault(message_id, set()).add(user_id)
+        return True
+
+    def remove(self, message_id: int, user_id: int) -> bool:
+        try:
+            entrants = self.entrants[message_id]
+        except KeyError:
+            return False
+
+        entrants.discard(user_id)
+        self._added.get(message_id, set()).discard(user_id)
+        self._removed.setdefault(message_id, set()).add(user_id)
+        return True
+
+    def drain(self, message_ids: Optional[Iterable[int]] = None) -> Dict[int, Tuple[Set[int], Set[int]]]:
+        """Take the pending entrant changes, message ID -> (added, removed).
+
+        Additions and removals of the same user cancel out in memory, so the two
+        sets are always disjoint and the order of their writes does not matter.
+        """
+        ids = set(self._added) | set(self._removed) if message_ids is None else set(message_ids)
+
+        changes: Dict[int, Tuple[Set[int], Set[int]]] = {}
+        for message_id in ids:
+            added = self._added.pop(message_id, set())
+            removed = self._removed.pop(message_id, set())
+            if added or removed:
+                changes[message_id] = (added, removed)
+        return changes
+
+    def requeue(self, changes: Dict[int, Tuple[Set[int], Set[int]]]) -> None:
+        """Put back changes which failed to be written, behind the ones made since."""
+        for message_id, (added, removed) in changes.items():
+            if message_id not in self.entrants:
+                continue
+
+            added_since = self._added.get(message_id, set())
+            removed_since = self._removed.get(message_id, set())
+            if added := added - removed_since:
+                self._added.setdefault(message_id, set()).update(added)
+            if removed := removed - added_since:
+                self._removed.setdefault(message_id, set()).update(removed)
+
+
+def entrant_operations(changes: Dict[int, Tuple[Set[int], Set[int]]]) -> List[UpdateOne]:
+    operations: List[UpdateOne] = []
+    for message_id, (added, removed) in changes.items():
+        query = {"message_id": message_id, "status": "ONGOING"}
+        if added:
+            operations.append(UpdateOne(query, {"$addToSet": {"reactors": {"$each": list(added)}}}))
+        if removed:
+            operations.append(UpdateOne(query, {"$pull": {"reactors": {"$in": list(removed)}}}))
+    return operations
+
+
+async def flush_entrants(
+    bot: Parrot,
+    registry: GiveawayRegistry,
+    *,
+    message_ids: Optional[Iterable[int]] = None,
+) -> None:
+    if not (changes := registry.drain(message_ids)):
         return
 
-    await bot.giveaways.update_one(
-        {"message_id": payload.message_id, "status": "ONGOING"},
-        {"$addToSet": {"reactors": payload.user_id}},
-    )
+    try:
+        await bot.giveaways.bulk_write(entrant_operations(changes), ordered=False)
+    except Exception:
+        registry.requeue(changes)
+        raise
 
 
-async def remove_reactor(bot: Parrot, payload: discord.RawReactionActionEvent):
-    if str(payload.emoji) != "\N{PARTY POPPER}":
-        return
+def add_reactor(registry: GiveawayRegistry, payload: discord.RawReactionActionEvent) -> bool:
+    if payload.message_id not in registry or str(payload.emoji) != "\N{PARTY POPPER}":
+        return False
 
-    await bot.giveaways.update_one(
-        {"message_id": payload.message_id, "status": "ONGOING"},
-        {"$pull": {"reactors": payload.user_id}},
-    )
+    return registry.add(payload.message_id, payload.user_id)
+
+
+def remove_reactor(registry: GiveawayRegistry, payload: discord.RawReactionActionEvent) -> bool:
+    if payload.message_id not in registry or str(payload.emoji) != "\N{PARTY POPPER}":
+        return False
+
+    return registry.remove(payload.message_id, payload.user_id)
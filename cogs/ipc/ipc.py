@@ -13,12 +13,30 @@ import discord
 from api import cricket_api
 from core import Cog, Parrot
 
+# Seconds the routes wait for the other clusters.
+IPC_GATHER_TIMEOUT = 10
+
 
 class IPCRoutes(Cog):
+    """Routes of the IPC server, run by the primary cluster.
+
+    Routes about guilds, users and messages gather them from every cluster, each
+    only caching the ones of its shards.
+    """
+
     def __init__(self, bot: Parrot) -> None:
         self.bot = bot
         self.ON_TESTING = False
 
+    async def cog_load(self) -> None:
+        self.bot.cluster.add_handler("ipc_guilds", self._guilds)
+        self.bot.cluster.add_handler("ipc_users", self._users)
+        self.bot.cluster.add_handler("ipc_message", self._message)
+
+    async def cog_unload(self) -> None:
+        for event in ("ipc_guilds", "ipc_users", "ipc_message"):
+            self.bot.cluster.remove_handler(event)
+
     def _overwrite_to_json(
         self,
         overwrites: dict[discord.User | discord.Role, discord.PermissionOverwrite],
@@ -53,6 +71,11 @@ class IPCRoutes(Cog):
 
         return await self.bot.mongo[db][collection].update_one(query, update, upsert=upsert)
 
+    @Server.route()
+    async def metrics(self, data: ClientPayload) -> str:
+        """Profiler stats in the Prometheus text exposition format."""
+        return self.bot.profiler.prometheus()
+
     @Server.route()
     async def commands(self, data: ClientPayload) -> list[dict[str, Any]]:
         if name := getattr(data, "name", None):
@@ -76,9 +99,14 @@ class IPCRoutes(Cog):
 
     @Server.route()
     async def guilds(self, data: ClientPayload) -> list[dict[str, Any]]:
-        if _id := getattr(data, "id", None):
+        query = {"id": getattr(data, "id", None), "name": getattr(data, "name", None)}
+        results = await self.bot.cluster.gather("ipc_guilds", query, timeout=IPC_GATHER_TIMEOUT)
+        return [guild for guilds in results.values() if guilds for guild in guilds]
+
+    async def _guilds(self, query: dict[str, Any]) -> list[dict[str, Any]]:
+        if _id := query["id"]:
             guilds = [self.bot.get_guild(_id)]
-        elif name := getattr(data, "name", None):
+        elif name := query["name"]:
             guilds = [discord.utils.get(self.bot.guilds, name=name)]
         else:
             guilds = self.bot.guilds
@@ -166,9 +194,16 @@ class IPCRoutes(Cog):
 
     @Server.route()
     async def users(self, data: ClientPayload) -> list[dict[str, Any]]:
-        if _id := getattr(data, "id", None):
+        query = {"id": getattr(data, "id", None), "name": getattr(data, "name", None)}
+        results = await self.bot.cluster.gather("ipc_users", query, timeout=IPC_GATHER_TIMEOUT)
+        # clusters sharing a user both have it
+        users = {user["id"]: user for users in results.values() if users for user in users}
+        return list(users.values())
+
+    async def _users(self, query: dict[str, Any]) -> list[dict[str, Any]]:
+        if _id := query["id"]:
             users = [self.bot.get_user(_id)]
-        elif name := getattr(data, "name", None):
+        elif name := query["name"]:
             users = [discord.utils.get(self.bot.users, name=name)]
         else:
             users = self.bot.users
@@ -188,10 +223,18 @@ class IPCRoutes(Cog):
 
     @Server.route()
     async def get_message(self, data: ClientPayload) -> dict[str, Any]:
-        channel = self.bot.get_channel(data.channel_id)
+        query = {"channel_id": data.channel_id, "message_id": data.message_id}
+        results = await self.bot.cluster.gather("ipc_message", query, timeout=IPC_GATHER_TIMEOUT)
+        # only the cluster of the channel finds the message
+        return next((message for message in results.values() if message), {})
+
+    async def _message(self, query: dict[str, Any]) -> dict[str, Any]:
+        channel = self.bot.get_channel(query["channel_id"])
+        if channel is None:
+            return {}
         message = await self.bot.get_or_fetch_message(
             channel,
-            data.message_id,
+            query["message_id"],
             partial=False,
         )
         return (
@@ -213,9 +256,10 @@ class IPCRoutes(Cog):
 
     @Server.route()
     async def announce_global(self, data: ClientPayload) -> list[dict[str, str]]:
+        # webhooks are sent to from any cluster, the configurations of every guild are in the database
         MESSAGES = []
-        async for data in self.bot.guild_configurations.find({}):
-            webhook = data["global_chat"]
+        async for config in self.bot.guild_configurations.find({}):
+            webhook = config["global_chat"]
             if (hook := webhook["webhook"]) and webhook["enable"]:
                 try:
                     webhook = discord.Webhook.from_url(f"{hook}", session=self.bot.http_session)
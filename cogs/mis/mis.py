@@ -15,7 +15,6 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Annotated, Any, BinaryIO
 
 import qrcode
-import sympy
 from PIL import Image
 from qrcode.image.styledpil import StyledPilImage
 from qrcode.image.styles.colormasks import (
@@ -39,12 +38,9 @@ from core import Cog, Context, Parrot
 from discord import Embed
 from discord.ext import commands
 from utilities.converters import convert_bool
-from utilities.imaging.graphing import boxplot, plotfn
-from utilities.imaging.image import do_command
 from utilities.paginator import PaginationView
 from utilities.regex import INVITE_RE, LINKS_RE
 from utilities.robopages import SimplePages
-from utilities.ttg import Truths
 from utilities.youtube_search import YoutubeSearch
 
 from .__embed_view import EmbedBuilder, EmbedCancel, EmbedSend
@@ -624,6 +620,9 @@ class Misc(Cog):
         **Example:**
         - `[p]truthtable --var p, q --con p and q`
         """
+        # numpy and pandas, imported on first use
+        from utilities.ttg import Truths
+
         table = Truths(
             flags.var.replace(" ", "").split(","),
             flags.con.split(","),
@@ -1039,6 +1038,10 @@ class Misc(Cog):
         showing Min, Max, Mean, Q1, Median and Q3.
         Numbers should be seperated by spaces per data point.
         """
+        # matplotlib, numpy, OpenCV and Wand, imported on first use
+        from utilities.imaging.graphing import boxplot
+        from utilities.imaging.image import do_command
+
         return await do_command(ctx, numbers, func=boxplot)
 
     @commands.command(name="plot", aliases=("line-graph", "graph"))
@@ -1047,6 +1050,11 @@ class Misc(Cog):
         """Plots the provided equation out.
         Ex: `$plot 2x+1`.
         """
+        import sympy
+
+        from utilities.imaging.graphing import plotfn
+        from utilities.imaging.image import do_command
+
         try:
             return await do_command(ctx, equation, func=plotfn)
         except TypeError:
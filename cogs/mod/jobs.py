@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Any, Literal
+
+from bson import ObjectId
+
+import discord
+
+if TYPE_CHECKING:
+    from core import Parrot
+
+log = logging.getLogger("cogs.mod.jobs")
+
+JobAction = Literal["add_role", "remove_role", "ban", "softban", "kick", "block"]
+JobStatus = Literal["QUEUED", "RUNNING", "DONE", "CANCELLED"]
+
+# Member, role, ban and kick routes are all bucketed on the guild, so the budget is per guild.
+ACTIONS_PER_SECOND = 4
+WORKERS_PER_JOB = 3
+# Seconds between two status message edits (and progress saves).
+STATUS_INTERVAL = 5
+
+ACTION_NAMES: dict[str, str] = {
+    "add_role": "Adding role",
+    "remove_role": "Removing role",
+    "ban": "Banning",
+    "softban": "Soft banning",
+    "kick": "Kicking",
+    "block": "Blocking",
+}
+ACTION_DONE_NAMES: dict[str, str] = {
+    "add_role": "Added the role to",
+    "remove_role": "Removed the role from",
+    "ban": "Banned",
+    "softban": "Soft banned",
+    "kick": "Kicked",
+    "block": "Blocked",
+}
+
+
+class RateBudget:
+    """Spread calls evenly, so that at most `rate` calls start every second."""
+
+    __slots__ = ("interval", "_next", "_lock")
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class MemberJob:
+    """A mass action on members of a guild, as stored in the `modJobs` collection."""
+
+    __slots__ = (
+        "id",
+        "guild_id",
+        "channel_id",
+        "message_id",
+        "author_id",
+        "action",
+        "targets",
+        "cursor",
+        "options",
+        "status",
+        "failures",
+        "done",
+    )
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.id: ObjectId = data["_id"]
+        self.guild_id: int = data["guild_id"]
+        self.channel_id: int = data["channel_id"]
+        self.message_id: int | None = data.get("message_id")
+        self.author_id: int = data["author_id"]
+        self.action: JobAction = data["action"]
+        self.targets: list[int] = data["targets"]
+        self.cursor: int = data.get("cursor", 0)
+        self.options: dict[str, Any] = data.get("options", {})
+        self.status: JobStatus = data.get("status", "QUEUED")
+        self.failures: Counter[str] = Counter(data.get("failures", {}))
+        self.done: int = self.cursor
+
+    @property
+    def short_id(self) -> str:
+        return str(self.id)[-6:]
+
+    @property
+    def total(self) -> int:
+        return len(self.targets)
+
+    def to_document(self) -> dict[str, Any]:
+        return {
+            "_id": self.id,
+            "guild_id": self.guild_id,
+            "channel_id": self.channel_id,
+            "message_id": self.message_id,
+            "author_id": self.author_id,
+            "action": self.action,
+            "targets": self.targets,
+            "cursor": self.cursor,
+            "options": self.options,
+            "status": self.status,
+            "failures": dict(self.failures),
+            "created_at": discord.utils.utcnow().timestamp(),
+        }
+
+    def status_message(self) -> str:
+        name = ACTION_NAMES.get(self.action, self.action)
+        failed = sum(self.failures.values())
+        content = f"**{name}** (job `{self.short_id}`) - `{self.status}`\n`{self.done}/{self.total}` processed, `{failed}` failed"
+        if self.status in ("DONE", "CANCELLED") and self.failures:
+            content += "\n\n**Failures**\n" + "\n".join(
+                f"- {reason}: **{count}**" for reason, count in self.failures.most_common(10)
+            )
+        return content
+
+
+class MemberJobQueue:
+    """Persistent queue of mass member actions.
+
+    Jobs are recorded in Mongo and executed in the background, one job at a time per
+    guild, with the API calls of a guild spread by a :class:`RateBudget`. Progress is
+    reported in a single status message which is edited in place, and saved along
+    with the job so that unfinished jobs are resumed after a restart. An action on a
+    single member is not worth a job, :meth:`apply_now` runs it right away. Silent
+    jobs have no status message.
+    """
+
+    def __init__(self, bot: Parrot) -> None:
+        self.bot = bot
+        self.collection = bot.mod_jobs
+
+        self._guild_locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._budgets: dict[int, RateBudget] = {}
+        self._tasks: dict[ObjectId, asyncio.Task[None]] = {}
+        self._jobs: dict[ObjectId, MemberJob] = {}
+
+    def jobs_in(self, guild_id: int) -> list[MemberJob]:
+        return [job for job in self._jobs.values() if job.guild_id == guild_id]
+
+    async def submit(
+        self,
+        *,
+        guild: discord.Guild,
+        author: discord.abc.User,
+        destination: discord.abc.Messageable,
+        action: JobAction,
+        targets: list[int],
+        silent: bool = False,
+        **options: Any,
+    ) -> MemberJob:
+        job = MemberJob(
+            {
+                "_id": ObjectId(),
+                "guild_id": guild.id,
+                "channel_id": getattr(destination, "id", 0),
+                "author_id": author.id,
+                "action": action,
+                "targets": targets,
+                "options": options,
+            },
+        )
+        if not silent:
+            message = await destination.send(job.status_message())
+            job.message_id = message.id
+            job.channel_id = message.channel.id
+
+        await self.collection.insert_one(job.to_document())
+        self._schedule(job)
+        return job
+
+    async def apply_now(self, guild: discord.Guild, *, action: JobAction, target_id: int, **options: Any) -> str | None:
+        """Run the action on one member, within the budget of the guild. The reason it failed, if it did."""
+        await self._budgets.setdefault(guild.id, RateBudget(ACTIONS_PER_SECOND)).acquire()
+        try:
+            await self._apply(guild, action, options, target_id)
+        except (discord.HTTPException, LookupError) as e:
+            return self._failure_reason(e)
+        return None
+
+    async def resume(self) -> None:
+        async for data in self.collection.find({"status": {"$in": ["QUEUED", "RUNNING"]}}):
+            # the cluster of the guild runs its jobs
+            if not self.bot.cluster.info.owns(data["guild_id"]):
+                continue
+            log.info("Resuming mod job %s", data["_id"])
+            self._schedule(MemberJob(data))
+
+    def cancel(self, guild_id: int, short_id: str) -> MemberJob | None:
+        for job in self.jobs_in(guild_id):
+            if job.short_id == short_id:
+                job.status = "CANCELLED"
+                return job
+        return None
+
+    def close(self) -> None:
+        # jobs stay RUNNING in the database, and are picked up again on the next load
+        for task in self._tasks.values():
+            task.cancel()
+
+    def _schedule(self, job: MemberJob) -> None:
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job.id] = task
+
+        def done(_: asyncio.Task[None]) -> None:
+            self._tasks.pop(job.id, None)
+            self._jobs.pop(job.id, None)
+
+        task.add_done_callback(done)
+
+    async def _run(self, job: MemberJob) -> None:
+        await self.bot.wait_until_ready()
+
+        async with self._guild_locks[job.guild_id]:
+            if job.status == "CANCELLED":
+                await self._save(job)
+                return
+
+            guild = self.bot.get_guild(job.guild_id)
+            if guild is None:
+                # unavailable, or not cached by this process; the job is left for the next resume
+                log.warning("Guild %s of mod job %s is not available", job.guild_id, job.id)
+                return
+
+            job.status = "RUNNING"
+            budget = self._budgets.setdefault(guild.id, RateBudget(ACTIONS_PER_SECOND))
+
+            next_index = job.cursor
+            in_flight: set[int] = set()
+
+            async def worker() -> None:
+                nonlocal next_index
+                while next_index < job.total and job.status == "RUNNING":
+                    index = next_index
+                    next_index += 1
+                    in_flight.add(index)
+
+                    await budget.acquire()
+                    try:
+                        await self._apply(guild, job.action, job.options, job.targets[index])
+                    except (discord.HTTPException, LookupError) as e:
+                        job.failures[self._failure_reason(e)] += 1
+                    finally:
+                        in_flight.discard(index)
+                        job.done += 1
+                        # everything before the oldest in-flight target is complete
+                        job.cursor = min(in_flight, default=next_index)
+
+            reporter = asyncio.create_task(self._report(job))
+            try:
+                await asyncio.gather(*(worker() for _ in range(WORKERS_PER_JOB)))
+            finally:
+                reporter.cancel()
+
+            if job.status == "RUNNING":
+                job.status = "DONE"
+            await self._save(job)
+            await self._edit_status(job)
+
+    async def _report(self, job: MemberJob) -> None:
+        while True:
+            await asyncio.sleep(STATUS_INTERVAL)
+            await self._save(job)
+            await self._edit_status(job)
+
+    async def _save(self, job: MemberJob) -> None:
+        await self.collection.update_one(
+            {"_id": job.id},
+            {"$set": {"cursor": job.cursor, "status": job.status, "failures": dict(job.failures)}},
+        )
+
+    async def _edit_status(self, job: MemberJob) -> None:
+        channel = self.bot.get_channel(job.channel_id)
+        if channel is None or job.message_id is None:
+            return
+
+        try:
+            await channel.get_partial_message(job.message_id).edit(content=job.status_message())  # type: ignore
+        except discord.HTTPException:
+            pass
+
+    async def _apply(self, guild: discord.Guild, action: JobAction, options: dict[str, Any], target_id: int) -> None:
+        reason: str | None = options.get("reason")
+        target = discord.Object(id=target_id)
+
+        if action == "ban":
+            await guild.ban(target, reason=reason, delete_message_days=options.get("days", 0))
+            return
+
+        if action == "softban":
+            await guild.ban(target, reason=reason)
+            await guild.unban(target, reason=reason)
+            return
+
+        if action == "kick":
+            await guild.kick(target, reason=reason)
+            return
+
+        member = guild.get_member(target_id)
+        if member is None:
+            msg = "Member not found"
+            raise LookupError(msg)
+
+        if action == "add_role":
+            await member.add_roles(discord.Object(id=options["role_id"]), reason=reason)
+        elif action == "remove_role":
+            await member.remove_roles(discord.Object(id=options["role_id"]), reason=reason)
+        elif action == "block":
+            channel = guild.get_channel(options["channel_id"])
+            if channel is None:
+                msg = "Channel not found"
+                raise LookupError(msg)
+            overwrite = channel.overwrites_for(member)
+            overwrite.update(send_messages=False, view_channel=False)
+            await channel.set_permissions(member, overwrite=overwrite, reason=reason)
+
+    @staticmethod
+    def _failure_reason(error: Exception) -> str:
+        if isinstance(error, discord.HTTPException):
+            return error.text or f"{error.status} {error.__class__.__name__}"
+        return str(error) or error.__class__.__name__
@@ -1,17 +1,102 @@
 from __future__ import annotations
 
-import asyncio
 import datetime
 import io
 from collections import Counter
 from collections.abc import Callable
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 import discord
+from cogs.mod.jobs import ACTION_DONE_NAMES, ACTION_NAMES, JobAction, MemberJob
 from core import Context, Parrot
 from discord.ext import commands
+from utilities.overwrites import BulkChannelEditor
 from utilities.time import FutureTime, ShortTime
 
+if TYPE_CHECKING:
+    from cogs.mod.mod import Moderator
+
+
+async def _submit_job(
+    *,
+    ctx: Context,
+    guild: discord.Guild,
+    destination: discord.abc.Messageable,
+    action: JobAction,
+    targets: list[int],
+    silent: bool = False,
+    **options: Any,
+) -> MemberJob | None:
+    if not targets:
+        if not silent:
+            await destination.send(f"{ctx.author.mention} nothing to do")
+        return None
+
+    cog: Moderator = ctx.bot.get_cog("Moderator")  # type: ignore
+    if len(targets) == 1:
+        (target_id,) = targets
+        failure = await cog.jobs.apply_now(guild, action=action, target_id=target_id, **options)
+        if not silent:
+            target = guild.get_member(target_id) or target_id
+            if failure is None:
+                await destination.send(f"{ctx.author.mention} {ACTION_DONE_NAMES[action]} **{target}**")
+            else:
+                await destination.send(f"{ctx.author.mention} {ACTION_NAMES[action]} **{target}** failed: **{failure}**")
+        return None
+
+    return await cog.jobs.submit(
+        guild=guild,
+        author=ctx.author,
+        destination=destination,
+        action=action,
+        targets=targets,
+        silent=silent,
+        **options,
+    )
+
+
+async def _check_role(ctx: Context, *, destination: discord.abc.Messageable, role: discord.Role) -> bool:
+    if ctx.author.top_role.position < role.position:
+        await destination.send(f"{ctx.author.mention} can not assign/remove/edit the role which is above you")
+        return False
+    if role.permissions.administrator:
+        await destination.send(f"{ctx.author.mention} can not assign/remove/edit admin role.")
+        return False
+    is_mod = await ctx.modrole()
+    if is_mod and (is_mod.id == role.id):
+        await destination.send(f"{ctx.author.mention} can not assign/remove/edit mod role")
+        return False
+    return True
+
+
+async def _role_members_job(
+    *,
+    guild: discord.Guild,
+    ctx: Context,
+    destination: discord.abc.Messageable,
+    operator: str,
+    role: discord.Role,
+    reason: str | None,
+    bots: bool,
+) -> None:
+    if not await _check_role(ctx, destination=destination, role=role):
+        return
+
+    add = operator.lower() in ["+", "add", "give"]
+    # members who already have (or already lack) the role are skipped up front
+    targets = [
+        member.id for member in guild.members if member.bot is bots and member._roles.has(role.id) is not add
+    ]
+    await _submit_job(
+        ctx=ctx,
+        guild=guild,
+        destination=destination,
+        action="add_role" if add else "remove_role",
+        targets=targets,
+        role_id=role.id,
+        reason=reason,
+    )
+
 
 async def _add_roles_bot(
     *,
@@ -24,23 +109,15 @@ async def _add_roles_bot(
     reason: str | None,
     **kwargs: Any,
 ):
-    if ctx.author.top_role.position < role.position:
-        return await destination.send(f"{ctx.author.mention} can not assign/remove/edit the role which is above you")
-    if role.permissions.administrator:
-        return await destination.send(f"{ctx.author.mention} can not assign/remove/edit admin role.")
-    is_mod = await ctx.modrole()
-
-    if is_mod and (is_mod.id == role.id):
-        return await destination.send(f"{ctx.author.mention} can not assign/remove/edit mod role")
-    for member in guild.members:
-        try:
-            if member.bot:
-                if operator.lower() in ["+", "add", "give"]:
-                    await member.add_roles(role, reason=reason)
-                elif operator.lower() in ["-", "remove", "take"]:
-                    await member.remove_roles(role, reason=reason)
-        except Exception as e:
-            await destination.send(f"Can not able to {command_name} **{member}**. Error raised: **{e}**")
+    await _role_members_job(
+        guild=guild,
+        ctx=ctx,
+        destination=destination,
+        operator=operator,
+        role=role,
+        reason=reason,
+        bots=True,
+    )
 
 
 async def _add_roles_humans(
@@ -54,22 +131,36 @@ async def _add_roles_humans(
     reason: str | None,
     **kwargs: Any,
 ):
-    if ctx.author.top_role.position < role.position:
-        return await destination.send(f"{ctx.author.mention} can not assign/remove/edit the role which is above you")
-    if role.permissions.administrator:
-        return await destination.send(f"{ctx.author.mention} can not assign/remove/edit admin role.")
-    is_mod = await ctx.modrole()
-    if is_mod and (is_mod.id == role.id):
-        return await destination.send(f"{ctx.author.mention} can not assign/remove/edit mod role")
-    for member in guild.members:
-        try:
-            if not member.bot:
-                if operator.lower() in ["+", "add", "give"]:
-                    await member.add_roles(role, reason=reason)
-                elif operator.lower() in ["-", "remove", "take"]:
-                    await member.remove_roles(role, reason=reason)
-        except Exception as e:
-            await destination.send(f"Can not able to {command_name} **{member}**. Error raised: **{e}**")
+    await _role_members_job(
+        guild=guild,
+        ctx=ctx,
+        destination=destination,
+        operator=operator,
+        role=role,
+        reason=reason,
+        bots=False,
+    )
+
+
+def _member_targets(
+    ctx: Context,
+    *,
+    guild: discord.Guild,
+    command_name: str,
+    members: list[discord.Member],
+) -> list[int] | None:
+    targets: list[int] = []
+    for member in members:
+        # massban converts IDs into users, who have no roles in the guild
+        top_role: discord.Role | None = getattr(member, "top_role", None)
+        if top_role is not None and ctx.author.top_role.position < top_role.position:
+            msg = f"{ctx.author.mention} can not {command_name} the {member}, as the their's role is above you"
+            raise commands.BadArgument(msg)
+        if member.id in (ctx.author.id, guild.me.id):
+            return None
+        if member.id not in targets:
+            targets.append(member.id)
+    return targets
 
 
 async def _add_roles(
@@ -255,25 +346,20 @@ async def _mass_ban(
     **kwargs: Any,
 ):
     members = members if isinstance(members, list) else [members]
-    for member in members:
-        if ctx.author.top_role.position < member.top_role.position:
-            msg = f"{ctx.author.mention} can not {command_name} the {member}, as the their's role is above you"
-            raise commands.BadArgument(
-                msg,
-            )
-        try:
-            if member.id in (ctx.author.id, guild.me.id):
-                await destination.send(f"{ctx.author.mention} don't do that, Bot is only trying to help")
-                return
-            await guild.ban(
-                member,
-                reason=reason,
-                delete_message_days=days,
-            )
-        except Exception as e:
-            await destination.send(f"Can not able to {command_name} **{member}**. Error raised: **{e}**")
+    targets = _member_targets(ctx, guild=guild, command_name=command_name, members=members)
+    if targets is None:
+        await destination.send(f"{ctx.author.mention} don't do that, Bot is only trying to help")
+        return
 
-    await destination.send(f"{ctx.author.mention} **{', '.join([str(member) for member in members])}** are banned!")
+    await _submit_job(
+        ctx=ctx,
+        guild=guild,
+        destination=destination,
+        action="ban",
+        targets=targets,
+        days=days,
+        reason=reason,
+    )
 
 
 async def _softban(
@@ -287,22 +373,19 @@ async def _softban(
     **kwargs: Any,
 ):
     members = members if isinstance(members, list) else [members]
-    for member in members:
-        if ctx.author.top_role.position < member.top_role.position:
-            msg = f"{ctx.author.mention} can not {command_name} the {member}, as the their's role is above you"
-            raise commands.BadArgument(
-                msg,
-            )
-        try:
-            if member.id in (ctx.author.id, guild.me.id):
-                await destination.send(f"{ctx.author.mention} don't do that, Bot is only trying to help")
-                return
-            await member.ban(reason=reason)
-            await guild.unban(member, reason=reason)
+    targets = _member_targets(ctx, guild=guild, command_name=command_name, members=members)
+    if targets is None:
+        await destination.send(f"{ctx.author.mention} don't do that, Bot is only trying to help")
+        return
 
-            await destination.send(f"{ctx.author.mention} **{member}** is soft banned!")
-        except Exception as e:
-            await destination.send(f"Can not able to {command_name} **{member}**. Error raised: **{e}**")
+    await _submit_job(
+        ctx=ctx,
+        guild=guild,
+        destination=destination,
+        action="softban",
+        targets=targets,
+        reason=reason,
+    )
 
 
 async def _temp_ban(
@@ -479,34 +562,33 @@ async def _mute(
                 send_messages_in_threads=False,
             ),
         )
-        passed, fails = 0, 0
+        editor = BulkChannelEditor(guild, reason="Setting up mute role")
         for channel in guild.channels:
-            try:
-                if isinstance(channel, discord.TextChannel):
-                    await channel.set_permissions(
-                        muted,
-                        add_reactions=False,
-                        use_application_commands=False,
-                        create_private_threads=False,
-                        create_public_threads=False,
-                        send_messages_in_threads=False,
-                    )
-                if isinstance(channel, discord.CategoryChannel):
-                    await channel.set_permissions(
-                        muted,
-                        add_reactions=False,
-                        use_application_commands=False,
-                        create_private_threads=False,
-                        create_public_threads=False,
-                        send_messages_in_threads=False,
-                        connect=False,
-                        speak=False,
-                    )
-                if isinstance(channel, discord.VoiceChannel | discord.StageChannel):
-                    await channel.set_permissions(muted, connect=False)
-                passed += 1
-            except discord.HTTPException:
-                fails += 1
+            if isinstance(channel, discord.TextChannel):
+                editor.plan_overwrite(
+                    channel,
+                    muted,
+                    add_reactions=False,
+                    use_application_commands=False,
+                    create_private_threads=False,
+                    create_public_threads=False,
+                    send_messages_in_threads=False,
+                )
+            if isinstance(channel, discord.CategoryChannel):
+                editor.plan_overwrite(
+                    channel,
+                    muted,
+                    add_reactions=False,
+                    use_application_commands=False,
+                    create_private_threads=False,
+                    create_public_threads=False,
+                    send_messages_in_threads=False,
+                    connect=False,
+                    speak=False,
+                )
+            if isinstance(channel, discord.VoiceChannel | discord.StageChannel):
+                editor.plan_overwrite(channel, muted, connect=False)
+        await editor.execute()
 
     try:
         await member.add_roles(
@@ -597,23 +679,18 @@ async def _mass_kick(
     **kwargs: Any,
 ):
     members = members if isinstance(members, list) else [members]
-    for member in members:
-        if ctx.author.top_role.position < member.top_role.position:
-            msg = f"{ctx.author.mention} can not {command_name} the {member}, as the their's role is above you"
-            raise commands.BadArgument(
-                msg,
-            )
-        try:
-            if member.id in (ctx.author.id, guild.me.id):
-                await destination.send(f"{ctx.author.mention} don't do that, Bot is only trying to help")
-                return
-            await member.kick(reason=reason)
-        except Exception as e:
-            await destination.send(f"Can not able to {command_name} **{member}**. Error raised: **{e}**")
+    targets = _member_targets(ctx, guild=guild, command_name=command_name, members=members)
+    if targets is None:
+        await destination.send(f"{ctx.author.mention} don't do that, Bot is only trying to help")
+        return
 
-        await asyncio.sleep(0.25)
-    await destination.send(
-        f"{ctx.author.mention} **{', '.join([str(member) for member in members])}** are kicked from the server!",
+    await _submit_job(
+        ctx=ctx,
+        guild=guild,
+        destination=destination,
+        action="kick",
+        targets=targets,
+        reason=reason,
     )
 
 
@@ -626,34 +703,36 @@ async def _block(
     command_name: str,
     ctx: Context,
     destination: discord.abc.Messageable,
-    channel: discord.TextChannel,
+    channel: discord.TextChannel | None = None,
     members: list[discord.Member] | discord.Member,
     reason: str | None,
     silent: bool = False,
     **kwargs: Any,
 ):
+    channel = channel or ctx.channel  # type: ignore
     members = members if isinstance(members, list) else [members]
-    for member in members:
-        if ctx.author.top_role.position < member.top_role.position and not silent:
-            msg = f"{ctx.author.mention} can not {command_name} the {member}, as the their's role is above you"
-            raise commands.BadArgument(msg)
-        try:
-            if member.id in (ctx.author.id, guild.me.id) and not silent:
-                await destination.send(f"{ctx.author.mention} don't do that, Bot is only trying to help")
-                return
-            overwrite = channel.overwrites
-            try:
-                overwrite[member].update(send_messages=False, view_channel=False)
-            except KeyError:
-                overwrite[member] = discord.PermissionOverwrite(send_messages=False, view_channel=False)
-            await channel.edit(overwrites=overwrite, reason=reason)
-            if not silent:
-                await destination.send(
-                    f"{ctx.author.mention} overwrite permission(s) for **{member}** has been created! **View Channel, and Send Messages** is denied!",
-                )
-        except Exception as e:
-            if not silent:
-                await destination.send(f"Can not able to {command_name} **{member}**. Error raised: **{e}**")
+    if silent:
+        members = [
+            member
+            for member in members
+            if member.id not in (ctx.author.id, guild.me.id)
+            and ctx.author.top_role.position >= member.top_role.position
+        ]
+    targets = _member_targets(ctx, guild=guild, command_name=command_name, members=members)
+    if targets is None:
+        await destination.send(f"{ctx.author.mention} don't do that, Bot is only trying to help")
+        return
+
+    await _submit_job(
+        ctx=ctx,
+        guild=guild,
+        destination=destination,
+        action="block",
+        targets=targets,
+        silent=silent,
+        channel_id=channel.id,
+        reason=reason,
+    )
 
 
 async def _unblock(
@@ -11,6 +11,7 @@ import wavelink
 import discord
 from cogs.mod import method as mod_method
 from cogs.mod.embeds import MEMBER_EMBED, ROLE_EMBED, TEXT_CHANNEL_EMBED, VOICE_CHANNEL_EMBED
+from cogs.mod.jobs import MemberJobQueue
 from core import Cog, Context, Parrot
 from discord.ext import commands
 from utilities.checks import in_temp_channel, is_mod
@@ -29,11 +30,53 @@ class Moderator(Cog):
     def __init__(self, bot: Parrot) -> None:
         self.bot = bot
         self.ON_TESTING = False
+        self.jobs = MemberJobQueue(bot)
 
     @property
     def display_emoji(self) -> discord.PartialEmoji:
         return discord.PartialEmoji(name="moderator", id=892424227007918121)
 
+    async def cog_load(self) -> None:
+        await self.jobs.resume()
+
+    async def cog_unload(self) -> None:
+        self.jobs.close()
+
+    @commands.group(name="modjobs", invoke_without_command=True)
+    @commands.check_any(is_mod(), commands.has_permissions(manage_guild=True))
+    @Context.with_type
+    async def modjobs(self, ctx: Context):
+        """To list the running mass moderation jobs of the server.
+
+        Mass actions (like `massban`, `masskick` and `role humans`) are run in the background.
+
+        **Examples:**
+        - `[p]modjobs`
+        """
+        if ctx.invoked_subcommand is not None:
+            return
+
+        jobs = self.jobs.jobs_in(ctx.guild.id)
+        if not jobs:
+            return await ctx.send(f"{ctx.author.mention} no running jobs in this server")
+
+        await ctx.send("\n\n".join(job.status_message() for job in jobs))
+
+    @modjobs.command(name="cancel")
+    @commands.check_any(is_mod(), commands.has_permissions(manage_guild=True))
+    @Context.with_type
+    async def modjobs_cancel(self, ctx: Context, job_id: str):
+        """To cancel a running mass moderation job.
+
+        Actions that were already done are not reverted.
+
+        **Examples:**
+        - `[p]modjobs cancel 1a2b3c`
+        """
+        if self.jobs.cancel(ctx.guild.id, job_id) is None:
+            return await ctx.send(f"{ctx.author.mention} no running job with ID `{job_id}`")
+        await ctx.send(f"{ctx.author.mention} job `{job_id}` cancelled")
+
     @commands.group()
     @commands.check_any(is_mod(), commands.has_permissions(manage_roles=True))
     @commands.bot_has_permissions(manage_roles=True)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+import wavelink
+
+if TYPE_CHECKING:
+    from core import Parrot
+
+# Resolved tracks are shared by every guild, for this long.
+TRACK_TTL = 6 * 60 * 60
+MAX_CACHED_TRACKS = 4096
+# Concurrent searches while resolving a playlist.
+RESOLVE_CONCURRENCY = 8
+
+
+class TrackCache:
+    """Query (or URL) -> resolved track, with a TTL and a bounded size."""
+
+    def __init__(self, *, ttl: float = TRACK_TTL, max_size: int = MAX_CACHED_TRACKS) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self.__tracks: OrderedDict[str, tuple[float, wavelink.GenericTrack]] = OrderedDict()
+        # queries being searched right now, so concurrent misses share one search
+        self.__pending: dict[str, asyncio.Future[wavelink.GenericTrack | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__tracks)
+
+    @staticmethod
+    def key(query: str) -> str:
+        return " ".join(query.split()).lower()
+
+    def get(self, query: str) -> wavelink.GenericTrack | None:
+        key = self.key(query)
+        try:
+            expires_at, track = self.__tracks[key]
+        except KeyError:
+            return None
+
+        if expires_at < time.monotonic():
+            del self.__tracks[key]
+            return None
+
+        self.__tracks.move_to_end(key)
+        return track
+
+    def put(self, query: str, track: wavelink.GenericTrack) -> None:
+        key = self.key(query)
+        self.__tracks[key] = (time.monotonic() + self.ttl, track)
+        self.__tracks.move_to_end(key)
+        while len(self.__tracks) > self.max_size:
+            self.__tracks.popitem(last=False)
+
+    async def resolve(self, query: str) -> wavelink.GenericTrack | None:
+        if (track := self.get(query)) is not None:
+            return track
+
+        key = self.key(query)
+        if (pending := self.__pending.get(key)) is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[wavelink.GenericTrack | None] = asyncio.get_running_loop().create_future()
+        self.__pending[key] = future
+        try:
+            track = await self.__search(query)
+        except Exception as e:
+            future.set_exception(e)
+            # mark the exception as retrieved, in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            if track is not None:
+                self.put(query, track)
+            future.set_result(track)
+            return track
+        finally:
+            del self.__pending[key]
+
+    async def resolve_many(
+        self,
+        queries: Iterable[str],
+        *,
+        concurrency: int = RESOLVE_CONCURRENCY,
+    ) -> list[wavelink.GenericTrack | None]:
+        """Resolve the queries concurrently, keeping their order. Failed searches are ``None``."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def resolve(query: str) -> wavelink.GenericTrack | None:
+            async with semaphore:
+                try:
+                    return await self.resolve(query)
+                except wavelink.WavelinkException:
+                    return None
+
+        return await asyncio.gather(*(resolve(query) for query in queries))
+
+    @staticmethod
+    async def __search(query: str) -> wavelink.GenericTrack | None:
+        tracks = await wavelink.GenericTrack.search(query)
+        return tracks[0] if tracks else None
+
+
+def playlist_query(song: dict[str, Any]) -> str | None:
+    """The query to resolve a saved playlist entry; its URL, else its name."""
+    return song.get("url") or song.get("song_name")
+
+
+class LikeCounter:
+    """Number of users having a track in their playlist, kept in ``trackLikes``.
+
+    Counts are cached in memory. Tracks which have no counter document yet are
+    counted once from the playlists, and the result is stored. `add` is called
+    after the playlists changed, a counter it creates already includes the change.
+    """
+
+    def __init__(self, bot: Parrot) -> None:
+        self.bot = bot
+        self.__counts: dict[str, int] = {}
+
+    async def get(self, identifier: str) -> int:
+        if (count := self.__counts.get(identifier)) is not None:
+            return count
+        count, _ = await self.__load(identifier)
+        return count
+
+    async def __load(self, identifier: str) -> tuple[int, bool]:
+        """(count, whether it was just counted from the playlists and stored)."""
+        if data := await self.bot.track_likes.find_one({"_id": identifier}):
+            count, counted = data["likes"], False
+        else:
+            count = await self.bot.user_collections_ind.count_documents({"playlist.id": identifier})
+            result = await self.bot.track_likes.update_one(
+                {"_id": identifier},
+                {"$setOnInsert": {"likes": count}},
+                upsert=True,
+            )
+            counted = result.upserted_id is not None
+            if not counted and (data := await self.bot.track_likes.find_one({"_id": identifier})):
+                # another process stored its count first, that one is kept
+                count = data["likes"]
+
+        self.__counts[identifier] = count
+        return count, counted
+
+    async def add(self, identifier: str, amount: int = 1) -> None:
+        """Count a change the caller already made to the playlists."""
+        if amount == 0:
+            return
+
+        if identifier not in self.__counts:
+            _, counted = await self.__load(identifier)
+            if counted:
+                # counted from the playlists, the change is already in
+                return
+
+        await self.bot.track_likes.update_one({"_id": identifier}, {"$inc": {"likes": amount}})
+        self.__counts[identifier] = max(self.__counts.get(identifier, 0) + amount, 0)
+
+    async def remove_many(self, identifiers: Iterable[str]) -> None:
+        for identifier in identifiers:
+            await self.add(identifier, -1)
@@ -63,7 +63,7 @@ class MusicView(discord.ui.View):
         return True
 
     async def __add_to_playlist(self, user: discord.User | discord.Member):
-        await self.bot.user_collections_ind.update_one(
+        result = await self.bot.user_collections_ind.update_one(
             {"_id": user.id},
             {
                 "$addToSet": {
@@ -76,9 +76,11 @@ class MusicView(discord.ui.View):
             },
             upsert=True,
         )
+        if (result.modified_count or result.upserted_id is not None) and (music := self.bot.get_cog("Music")):
+            await music.likes.add(self.player.current.identifier)
 
     async def __remove_from_playlist(self, user: discord.User | discord.Member):
-        await self.bot.user_collections_ind.update_one(
+        result = await self.bot.user_collections_ind.update_one(
             {"_id": user.id},
             {
                 "$pull": {
@@ -91,6 +93,8 @@ class MusicView(discord.ui.View):
             },
             upsert=True,
         )
+        if result.modified_count and (music := self.bot.get_cog("Music")):
+            await music.likes.add(self.player.current.identifier, -1)
 
     async def __send_interal_error_response(self, interaction: discord.Interaction) -> None:
         self.disable_all()
@@ -33,6 +33,7 @@ from .__flags import (
     TremoloFlag,
     VibratoFlag,
 )
+from .__tracks import LikeCounter, TrackCache, playlist_query
 from .__view import MusicView
 
 
@@ -64,6 +65,9 @@ class Music(Cog):
         self._cache: dict[int, MusicView] = {}  # guild_id -> MusicView
         self.ON_TESTING = False
 
+        self.tracks = TrackCache()
+        self.likes = LikeCounter(bot)
+
     @property
     def display_emoji(self) -> discord.PartialEmoji:
         return discord.PartialEmoji(name="\N{MULTIPLE MUSICAL NOTES}")
@@ -95,14 +99,19 @@ class Music(Cog):
 
     async def make_final_embed(self, *, track: wavelink.GenericTrack, ctx: Context) -> discord.Embed:
         embed: discord.Embed = self.make_embed(ctx, track)
-        col = self.bot.user_collections_ind
-        i = 0
-        async for _data in col.find({"playlist.id": track.identifier}):
-            i += 1
-
-        embed.add_field(name="Likes", value=i, inline=True)
+        embed.add_field(name="Likes", value=await self.likes.get(track.identifier), inline=True)
         return embed
 
+    async def _play_now(self, ctx: Context, vc: wavelink.Player, track: wavelink.GenericTrack) -> None:
+        await vc.play(track)
+        view = MusicView(ctx.author.voice.channel, timeout=vc.current.duration, ctx=ctx)
+        view.message = await ctx.send(
+            f"{ctx.author.mention} Now playing",
+            embed=await self.make_final_embed(ctx=ctx, track=vc.current),
+            view=view,
+        )
+        self._cache[ctx.guild.id] = view
+
     @commands.command()
     @commands.bot_has_guild_permissions(connect=True)
     @in_voice()
@@ -511,21 +520,17 @@ class Music(Cog):
         if isinstance(search, str):
             if search.startswith("https://open.spotify.com/"):
                 return await self.play_spotify(ctx, link=search)
-            search = wavelink.GenericTrack.search(search, return_first=True)
+            track = await self.tracks.resolve(search)
+            if track is None:
+                return await ctx.error(f"{ctx.author.mention} No song found for **{search}**")
+            search = track
 
         if vc.is_playing():
             vc.queue.put(search)
             await ctx.send(f"{ctx.author.mention} added **{search.title}** to the queue")
             return
 
-        await vc.play(search)
-        view = MusicView(ctx.author.voice.channel, timeout=vc.current.duration, ctx=ctx)
-        view.message = await ctx.send(
-            f"{ctx.author.mention} Now playing",
-            embed=await self.make_final_embed(ctx=ctx, track=vc.current),
-            view=view,
-        )
-        self._cache[ctx.guild.id] = view
+        await self._play_now(ctx, vc, search)
 
     @play.command(name="spotify")
     async def play_spotify(self, ctx: Context, *, link: str):
@@ -583,18 +588,22 @@ class Music(Cog):
         if data is None or len(data["playlist"]) == 0:
             return await ctx.error(f"{ctx.author.mention} You don't have a playlist. You haven't like any songs yet.")
 
-        countr = 0
+        queries = [query for song in data["playlist"] if (query := playlist_query(song))]
 
-        for i, song in enumerate(data["playlist"], start=1):
-            if i == 1 and vc.is_playing() is False:
-                await self.play(ctx, search=song["song_name"])
-            else:
-                track = wavelink.GenericTrack(song["song_name"])
-                vc.queue.put(track)
-                countr += 1
+        # start the first song right away, the rest is resolved concurrently afterwards
+        started = False
+        while queries and not started and not vc.is_playing():
+            with suppress(wavelink.WavelinkException):
+                if (track := await self.tracks.resolve(queries.pop(0))) is not None:
+                    await self._play_now(ctx, vc, track)
+                    started = True
+
+        tracks = [track for track in await self.tracks.resolve_many(queries) if track is not None]
+        vc.queue.extend(tracks)
 
-        await ctx.send(f"{ctx.author.mention} added **{countr} songs** to the queue")
-        await self.nowplaying(ctx)
+        await ctx.send(f"{ctx.author.mention} added **{len(tracks)} songs** to the queue")
+        if not started:
+            await self.nowplaying(ctx)
 
     @commands.command(aliases=["np"])
     async def nowplaying(self, ctx: Context):
@@ -673,29 +682,38 @@ class Music(Cog):
                 if index == index_or_name:
                     data["playlist"].pop(index - 1)
                     await col.update_one({"_id": ctx.author.id}, {"$set": {"playlist": data["playlist"]}})
+                    if song.get("id"):
+                        await self.likes.add(song["id"], -1)
                     return await ctx.send(f"{ctx.author.mention} Removed **{song['song_name']}** from your playlist")
 
         if isinstance(index_or_name, str):
-            result: UpdateResult = await col.update_one(  # type: ignore
-                {"_id": ctx.author.id},
+            before = await col.find_one_and_update(  # type: ignore
+                {"_id": ctx.author.id, "playlist.song_name": index_or_name},
                 {"$pull": {"playlist": {"song_name": index_or_name}}},
+                {"playlist": 1, "_id": 0},
             )
-            if result.modified_count == 0:
+            if before is None:
                 return await ctx.error(f"{ctx.author.mention} Song not found")
+            await self.likes.remove_many(
+                song["id"] for song in before["playlist"] if song.get("song_name") == index_or_name and song.get("id")
+            )
             await ctx.send(f"{ctx.author.mention} Removed song from playlist")
 
     @myplaylist.command(name="add", aliases=["addsong", "add_song"])
     async def myplaylist_add(self, ctx: Context, *, track: wavelink.SoundCloudTrack | str):
         """Add song in the playlist."""
         if isinstance(track, str):
-            track = wavelink.GenericTrack.search(track)
+            resolved = await self.tracks.resolve(track)
+            if resolved is None:
+                return await ctx.error(f"{ctx.author.mention} No song found for **{track}**")
+            track = resolved
 
         data: UpdateResult = await self.bot.user_collections_ind.update_one(
             {"_id": ctx.author.id},
             {
                 "$addToSet": {
                     "playlist": {
-                        "id": track.id,
+                        "id": track.identifier,
                         "song_name": getattr(track, "title", None),
                         "url": getattr(track, "uri", None),
                     },
@@ -703,22 +721,24 @@ class Music(Cog):
             },
             upsert=True,
         )
-        if data.modified_count == 0:
+        if data.modified_count == 0 and data.upserted_id is None:
             return await ctx.error(f"{ctx.author.mention} Failed to add song to playlist")
 
+        await self.likes.add(track.identifier)
         await ctx.send(f"{ctx.author.mention} Added song to playlist")
 
     @myplaylist.command(name="clear", aliases=["deleteall", "delall"])
     async def myplaylist_clear(self, ctx: Context):
         """Clears the playlist."""
-        data: UpdateResult = await self.bot.user_collections_ind.update_one(
-            {"_id": ctx.author.id},
+        before = await self.bot.user_collections_ind.find_one_and_update(
+            {"_id": ctx.author.id, "playlist.0": {"$exists": True}},
             {"$set": {"playlist": []}},
-            upsert=True,
+            {"playlist": 1, "_id": 0},
         )
-        if data.modified_count == 0:
+        if before is None:
             return await ctx.error(f"{ctx.author.mention} Failed to clear playlist")
 
+        await self.likes.remove_many(song["id"] for song in before["playlist"] if song.get("id"))
         await ctx.send(f"{ctx.author.mention} Cleared playlist")
 
     @commands.command(name="next", aliases=["skip"])
@@ -27,6 +27,7 @@ import discord
 from core import Cog, Context, Parrot
 from discord.ext import commands
 from utilities.converters import convert_bool
+from utilities.indexes import HOT_QUERIES, explain
 from utilities.paginator import PaginationView
 from utilities.time import ShortTime
 from utilities.wikihow import Parser as WikihowParser
@@ -441,8 +442,35 @@ class Owner(Cog, command_attrs={"hidden": True}):
         ctx.bot.UNDER_MAINTENANCE = not ctx.bot.UNDER_MAINTENANCE
         ctx.bot.UNDER_MAINTENANCE_OVER = till.dt if till is not None else till
         ctx.bot.UNDER_MAINTENANCE_REASON = reason
+        await self.bot.cluster.send(
+            "maintenance",
+            {
+                "enabled": ctx.bot.UNDER_MAINTENANCE,
+                "reason": reason,
+                "over": till.dt.timestamp() if till is not None else None,
+            },
+        )
         await ctx.tick()
 
+    @commands.command(aliases=["cluster"])
+    async def clusters(self, ctx: Context):
+        """Shards, guilds and latency of every cluster."""
+        stats = await self.bot.cluster.gather("stats")
+        rows = [
+            [
+                cluster_id,
+                f"{data['shards'][0]}-{data['shards'][-1]}" if data["shards"] else "-",
+                data["guilds"],
+                data["users"],
+                f"{data['latency'] * 1000:.0f}ms",
+            ]
+            for cluster_id, data in stats.items()
+            if data is not None
+        ]
+        missing = self.bot.cluster.info.cluster_count - len(rows)
+        table = tabulate(rows, headers=["Cluster", "Shards", "Guilds", "Users", "Latency"], tablefmt="psql")
+        await ctx.send(f"```\n{table}```" + (f"\n{missing} cluster(s) did not reply" if missing else ""))
+
     @commands.command()
     async def member_count(self, ctx: Context, guild: discord.Object | None = None):
         """Returns member count of the guild.
@@ -537,6 +565,102 @@ class Owner(Cog, command_attrs={"hidden": True}):
         view = MongoView(ctx)
         await view.init()
 
+    @commands.command(name="explain", aliases=["queryplans", "query-plans"])
+    async def explain_queries(self, ctx: Context):
+        """Run `explain()` on the registered hot queries, and report the collection scans.
+
+        The level leaderboard query is explained on the level collection of the current guild.
+        """
+        rows: list[list[typing.Any]] = []
+        scans: list[str] = []
+        for query in HOT_QUERIES:
+            try:
+                plan = await explain(self.bot, query, guild_id=ctx.guild.id)
+            except Exception as e:  # noqa: BLE001
+                rows.append([query.name, f"error: {e}"[:40], "", ""])
+                continue
+
+            rows.append([query.name, " > ".join(plan.stages), plan.docs_examined, plan.returned])
+            if plan.collection_scan:
+                scans.append(query.name)
+
+        table = tabulate(rows, headers=["Query", "Plan", "Examined", "Returned"], tablefmt="psql")
+        summary = f"Collection scans: {', '.join(scans)}" if scans else "No collection scan"
+        if len(table) + len(summary) < 1900:
+            await ctx.send(f"```\n{table}```\n{summary}")
+            return
+
+        file = discord.File(io.BytesIO(table.encode()), filename="plans.txt")
+        await ctx.send(summary, file=file)
+
+    @commands.group(name="profiler", aliases=["profile"], invoke_without_command=True)
+    async def profiler(
+        self,
+        ctx: Context,
+        limit: int = 15,
+        key: Literal["total", "count", "max", "mongo", "sql", "http"] = "total",
+    ):
+        """Show the slowest listeners and commands, as measured by the profiler.
+
+        Entries are sorted by `key`; the total time by default.
+        """
+        profiler = self.bot.profiler
+        entries = profiler.top(limit, key=key)
+        if not entries:
+            status = "enabled" if profiler.enabled else f"disabled, enable it with `{ctx.clean_prefix}profiler on`"
+            await ctx.send(f"Nothing measured yet, the profiler is {status}")
+            return
+
+        rows = [
+            [
+                f"{kind}: {name}"[:48],
+                stats.count,
+                stats.errors,
+                round(stats.mean * 1000, 2),
+                round(stats.max * 1000, 2),
+                round(stats.mongo / stats.count, 2),
+                round(stats.sql / stats.count, 2),
+                round(stats.http / stats.count, 2),
+            ]
+            for kind, name, stats in entries
+        ]
+        table = tabulate(
+            rows,
+            headers=["Handler", "Calls", "Errors", "Mean ms", "Max ms", "Mongo", "SQL", "HTTP"],
+            tablefmt="psql",
+        )
+        since = discord.utils.format_dt(datetime.datetime.fromtimestamp(profiler.since, datetime.timezone.utc), "R")
+        summary = f"Profiler {'enabled' if profiler.enabled else 'disabled'}, measuring since {since}"
+        if len(table) + len(summary) < 1900:
+            await ctx.send(f"{summary}\n```\n{table}```")
+            return
+
+        file = discord.File(io.BytesIO(table.encode()), filename="profile.txt")
+        await ctx.send(summary, file=file)
+
+    @profiler.command(name="on", aliases=["enable"])
+    async def profiler_on(self, ctx: Context):
+        """Start measuring every listener and command."""
+        self.bot.profiler.enabled = True
+        await ctx.tick()
+
+    @profiler.command(name="off", aliases=["disable"])
+    async def profiler_off(self, ctx: Context):
+        """Stop measuring, the stats are kept."""
+        self.bot.profiler.enabled = False
+        await ctx.tick()
+
+    @profiler.command(name="reset", aliases=["clear"])
+    async def profiler_reset(self, ctx: Context):
+        self.bot.profiler.reset()
+        await ctx.tick()
+
+    @profiler.command(name="prometheus", aliases=["metrics"])
+    async def profiler_prometheus(self, ctx: Context):
+        """The stats in the Prometheus text format, as served to the IPC clients."""
+        file = discord.File(io.BytesIO(self.bot.profiler.prometheus().encode()), filename="metrics.txt")
+        await ctx.send(file=file)
+
     @commands.command(alises=["sql3", "sqlite3", "sqlite"])
     async def sql(self, ctx: Context, *, queries: str):  # type: ignore
         """SQL query.
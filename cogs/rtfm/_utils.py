@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import importlib.metadata
 import io
 import os
 import pathlib
@@ -12,9 +13,6 @@ from datetime import datetime, timezone
 from typing import Any
 
 import aiofiles
-import bandit
-import pkg_resources
-import pylint
 from jishaku.paginators import PaginatorInterface
 
 import discord
@@ -26,13 +24,7 @@ try:
 except ImportError:
     import json
 
-import autopep8
-import flake8
-import isort
-import pyright
-from black import FileMode, format_str
 from colorama import Fore
-from yapf.yapflib.yapf_api import FormatCode as yapf_format
 
 from ._bandit import BanditConverter, validate_flag as bandit_validate_flag
 from ._flake8 import Flake8Converter, validate_flag as flake8_validate_flag
@@ -222,6 +214,14 @@ class InformationDropdown(discord.ui.Select):
         await self.original_message.edit(embed=result_embed)
 
 
+def _version(distribution: str, default: str = "unknown") -> str:
+    # read from the installed metadata, the linters and formatters are only imported when run
+    try:
+        return importlib.metadata.version(distribution)
+    except importlib.metadata.PackageNotFoundError:
+        return default
+
+
 async def code_to_file(code: str) -> str:
     filename = f"temp/runner_{int(datetime.now(timezone.utc).timestamp()*1000)}.py"
     async with aiofiles.open(filename, "w") as f:
@@ -369,7 +369,7 @@ class LintCode:
         if data.get("stdout"):
             json_data = json.loads(data["stdout"])
             pages = commands.Paginator(prefix="```ansi", suffix="```", max_size=1980)
-            pages.add_line(f"{Fore.WHITE}Pyright Version - {Fore.WHITE}{pyright.__version__}\n")
+            pages.add_line(f"{Fore.WHITE}Pyright Version - {Fore.WHITE}{_version('pyright')}\n")
 
             pages.add_line(
                 f"{Fore.RED}{json_data['summary']['errorCount']} errors - {Fore.YELLOW}{json_data['summary']['warningCount']} warnings - {Fore.BLUE}{json_data['summary']['informationCount']} information",
@@ -413,7 +413,7 @@ class LintCode:
         if data.get("stdout"):
             json_data: dict = json.loads(data["stdout"])
             pages = commands.Paginator(prefix="```ansi", suffix="```", max_size=1980)
-            pages.add_line(f"{Fore.WHITE}Flake8 Version - {Fore.WHITE}{flake8.__version__}\n")
+            pages.add_line(f"{Fore.WHITE}Flake8 Version - {Fore.WHITE}{_version('flake8')}\n")
             interface = PaginatorInterface(ctx.bot, pages, owner=ctx.author)
             await interface.send_to(ctx)
 
@@ -448,12 +448,7 @@ class LintCode:
             pages = commands.Paginator(prefix="```ansi", suffix="```", max_size=1980)
 
             # Thanks `AAA3A#1157` (829612600059887649)
-            try:
-                ruff_version = pkg_resources.get_distribution("ruff").version
-            except pkg_resources.DistributionNotFound:
-                ruff_version = "0.0.272"
-
-            pages.add_line(f"{Fore.WHITE}Ruff Version - {Fore.WHITE}{ruff_version}\n")  # TODO: Get version from ruff
+            pages.add_line(f"{Fore.WHITE}Ruff Version - {Fore.WHITE}{_version('ruff', '0.0.272')}\n")
 
             interface = PaginatorInterface(ctx.bot, pages, owner=ctx.author)
             await interface.send_to(ctx)
@@ -497,7 +492,7 @@ class LintCode:
 
             pages = commands.Paginator(prefix="```ansi", suffix="```", max_size=1980)
 
-            pages.add_line(f"{Fore.WHITE}Pylint Version - {Fore.WHITE}{pylint.__version__}\n")
+            pages.add_line(f"{Fore.WHITE}Pylint Version - {Fore.WHITE}{_version('pylint')}\n")
 
             interface = PaginatorInterface(ctx.bot, pages, owner=ctx.author)
             await interface.send_to(ctx)
@@ -521,7 +516,7 @@ class LintCode:
         if data.get("stdout"):
             json_data = json.loads(data["stdout"])
             pages = commands.Paginator(prefix="```ansi", suffix="```", max_size=1980)
-            pages.add_line(f"{Fore.MAGENTA}Bandit Version - {Fore.MAGENTA}{bandit.__version__}\n")
+            pages.add_line(f"{Fore.MAGENTA}Bandit Version - {Fore.MAGENTA}{_version('bandit')}\n")
 
             interface = PaginatorInterface(ctx.bot, pages, owner=ctx.author)
             await interface.send_to(ctx)
@@ -586,6 +581,8 @@ class LintCode:
                 )
 
     async def run_black(self, ctx: Context) -> None:
+        from black import FileMode, format_str
+
         ini = time.perf_counter()
         res = await asyncio.to_thread(format_str, self.source, mode=FileMode())
         end = time.perf_counter()
@@ -601,6 +598,8 @@ class LintCode:
         await ctx.reply(f"```ansi\n{Fore.GREEN}[Formated Code in {int(end-ini)} seconds]``````py\n{res}```")
 
     async def run_isort(self, ctx: Context) -> None:
+        import isort
+
         ini = time.perf_counter()
         res: str = await asyncio.to_thread(isort.code, self.source)
         end = time.perf_counter()
@@ -617,6 +616,8 @@ class LintCode:
         await ctx.reply(f"```ansi\n{Fore.GREEN}[Formated Code in {int(end-ini)} seconds]``````py\n{res}```")
 
     async def run_autopep8(self, ctx: Context) -> None:
+        import autopep8
+
         ini = time.perf_counter()
         res = await asyncio.to_thread(autopep8.fix_code, self.source)
         end = time.perf_counter()
@@ -632,6 +633,8 @@ class LintCode:
         await ctx.reply(f"```ansi\n{Fore.GREEN}[Formated Code in {int(end-ini)} seconds]``````py\n{res}```")
 
     async def run_yapf(self, ctx: Context) -> None:
+        from yapf.yapflib.yapf_api import FormatCode as yapf_format
+
         ini = time.perf_counter()
         res = await asyncio.to_thread(yapf_format, self.source)
         if isinstance(res, tuple):
@@ -2,17 +2,25 @@ from __future__ import annotations
 
 import inspect
 import io
+import logging
 from itertools import zip_longest
 from random import random
-from typing import Annotated, Any
+from typing import Annotated
+
+from pymongo.errors import PyMongoError
 
 import discord
 from core import Cog, Context, Parrot
-from discord.ext import commands
+from discord.ext import commands, tasks
 from utilities.checks import is_mod
+from utilities.converters import Cache
 from utilities.formats import TabularData
 
-REACTION_EMOJI = ["\N{UPWARDS BLACK ARROW}", "\N{DOWNWARDS BLACK ARROW}"]
+from .votes import DOWNVOTE, UPVOTE, SuggestionVotes, VoteStore
+
+log = logging.getLogger("cogs.suggestion")
+
+REACTION_EMOJI = [UPVOTE, DOWNVOTE]
 
 # fmt: off
 OTHER_REACTION = {
@@ -52,12 +60,27 @@ class Suggestions(Cog):
 
     def __init__(self, bot: Parrot) -> None:
         self.bot = bot
-        self.message: dict[int, dict[str, Any]] = {}
+        self.message: Cache[int, discord.Message] = Cache(bot, cache_size=256)
+        self.votes = VoteStore(bot)
 
     @property
     def display_emoji(self) -> discord.PartialEmoji:
         return discord.PartialEmoji(name="\N{SPEECH BALLOON}")
 
+    async def cog_load(self) -> None:
+        self.flush_votes.start()
+
+    async def cog_unload(self) -> None:
+        self.flush_votes.cancel()
+        await self.votes.flush()
+
+    @tasks.loop(seconds=30)
+    async def flush_votes(self) -> None:
+        try:
+            await self.votes.flush()
+        except PyMongoError as e:
+            log.warning("Failed to write the suggestion votes", exc_info=e)
+
     async def __fetch_suggestion_channel(self, guild: discord.Guild) -> discord.TextChannel | None:
         try:
             ch_id: int | None = self.bot.guild_configurations_cache[guild.id]["suggestion_channel"]
@@ -83,7 +106,7 @@ class Suggestions(Cog):
         channel: discord.TextChannel = None,
     ) -> discord.Message | None:
         try:
-            self.message[msg_id]
+            msg = self.message[msg_id]
         except KeyError:
             if channel is None:
                 try:
@@ -91,9 +114,8 @@ class Suggestions(Cog):
                 except KeyError as e:
                     msg = "No suggestion channel is setup"
                     raise commands.BadArgument(msg) from e
-            msg = await self.__fetch_message_from_channel(message=msg_id, channel=self.bot.get_channel(channel_id))  # type: ignore
-        else:
-            msg = self.message[msg_id]["message"]
+                channel = self.bot.get_channel(channel_id)  # type: ignore
+            msg = await self.__fetch_message_from_channel(message=msg_id, channel=channel)
 
         return msg if msg and msg.author.id == self.bot.user.id else None
 
@@ -103,25 +125,12 @@ class Suggestions(Cog):
             before=discord.Object(message + 1),
             after=discord.Object(message - 1),
         ):
-            payload = {
-                "message_author": msg.author,
-                "message": msg,
-                "message_downvote": self.__get_emoji_count_from__msg(msg, emoji="\N{DOWNWARDS BLACK ARROW}"),
-                "message_upvote": self.__get_emoji_count_from__msg(msg, emoji="\N{UPWARDS BLACK ARROW}"),
-            }
-            self.message[message] = payload
+            self.message[message] = msg
+            if msg.author.id == self.bot.user.id and await self.votes.get(message) is None:
+                # posted before the votes were stored, count them from the reactions
+                self.votes.track(SuggestionVotes.from_message(msg))
             return msg
 
-    def __get_emoji_count_from__msg(
-        self,
-        msg: discord.Message,
-        *,
-        emoji: discord.Emoji | discord.PartialEmoji | str,
-    ):
-        for reaction in msg.reactions:
-            if str(reaction.emoji) == str(emoji):
-                return reaction.count
-
     async def __suggest(
         self,
         content: str | None = None,
@@ -140,14 +149,8 @@ class Suggestions(Cog):
         await ctx.bulk_add_reactions(msg, *REACTION_EMOJI)
         thread = await msg.create_thread(name=f"Suggestion {ctx.author}")
 
-        payload = {
-            "message_author": msg.author,
-            "message_downvote": 0,
-            "message_upvote": 0,
-            "message": msg,
-            "thread": thread.id,
-        }
-        self.message[msg.id] = payload
+        self.message[msg.id] = msg
+        self.votes.track(SuggestionVotes(msg.id, guild_id=ctx.guild.id, channel_id=channel.id, thread_id=thread.id))
         return msg
 
     async def __notify_on_suggestion(self, ctx: Context, *, message: discord.Message | None) -> None:
@@ -268,12 +271,12 @@ class Suggestions(Cog):
             return await ctx.send(
                 f"{ctx.author.mention} Can not find message of ID `{message_id}`. Probably already deleted, or `{message_id}` is invalid",
             )
-        PAYLOAD: dict[str, Any] = self.message[msg.id]
+        votes = await self.votes.get(msg.id) or SuggestionVotes.from_message(msg)
 
         table = TabularData()
 
-        upvoter = [PAYLOAD["message_upvote"]]
-        downvoter = [PAYLOAD["message_downvote"]]
+        upvoter = [votes.upvotes]
+        downvoter = [votes.downvotes]
 
         table.set_columns(["Upvote", "Downvote"])
         ls = list(zip_longest(upvoter, downvoter, fillvalue=""))
@@ -336,7 +339,7 @@ class Suggestions(Cog):
         embed.clear_fields()
         embed.add_field(name="Remark", value=remark[:250])
         new_msg = await msg.edit(content=msg.content, embed=embed)
-        self.message[new_msg.id]["message"] = new_msg
+        self.message[new_msg.id] = new_msg
 
         user_id = int(embed.footer.text.split(":")[1])  # type: ignore
         user = ctx.guild.get_member(user_id)
@@ -366,7 +369,7 @@ class Suggestions(Cog):
         embed.clear_fields()
         embed.color = 0xADD8E6
         new_msg = await msg.edit(embed=embed, content=None)
-        self.message[new_msg.id]["message"] = new_msg
+        self.message[new_msg.id] = new_msg
 
         for reaction in msg.reactions:
             if str(reaction.emoji) not in REACTION_EMOJI:
@@ -436,7 +439,7 @@ class Suggestions(Cog):
 
         content = f"Flagged: {flag} | {payload['emoji']}"
         new_msg = await msg.edit(content=content, embed=embed)
-        self.message[new_msg.id]["message"] = new_msg
+        self.message[new_msg.id] = new_msg
 
         await ctx.send(f"{ctx.author.mention} Done", delete_after=5)
 
@@ -448,8 +451,11 @@ class Suggestions(Cog):
 
     @Cog.listener(name="on_raw_message_delete")
     async def suggest_msg_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
-        if payload.message_id in self.message:
-            del self.message[payload.message_id]
+        if not self.bot.guild_configurations_cache.is_suggestion_channel(payload.channel_id):
+            return
+
+        self.message.pop(payload.message_id, None)
+        self.votes.forget(payload.message_id)
 
     @Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
@@ -457,13 +463,7 @@ class Suggestions(Cog):
         if message.author.bot or message.guild is None:
             return
 
-        ls = await self.bot.guild_configurations.find_one(
-            {"_id": message.guild.id, "suggestion_channel": message.channel.id},
-        )
-        if not ls:
-            return
-
-        if message.channel.id != ls["suggestion_channel"]:
+        if not self.bot.guild_configurations_cache.is_suggestion_channel(message.channel.id):
             return
 
         if _ := await self.__parse_mod_action(message):
@@ -475,33 +475,24 @@ class Suggestions(Cog):
     @Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message) -> None:
         if after.id in self.message:
-            self.message[after.id]["message"] = after
+            self.message[after.id] = after
 
     @Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
-        if payload.message_id not in self.message:
-            return
-
-        if str(payload.emoji) not in REACTION_EMOJI:
-            return
-
-        if str(payload.emoji) == "\N{UPWARDS BLACK ARROW}":
-            self.message[payload.message_id]["message_upvote"] += 1
-        if str(payload.emoji) == "\N{DOWNWARDS BLACK ARROW}":
-            self.message[payload.message_id]["message_downvote"] += 1
+        await self.__on_vote(payload, 1)
 
     @Cog.listener()
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
-        if payload.message_id not in self.message:
+        await self.__on_vote(payload, -1)
+
+    async def __on_vote(self, payload: discord.RawReactionActionEvent, amount: int) -> None:
+        if str(payload.emoji) not in REACTION_EMOJI or payload.user_id == self.bot.user.id:
             return
 
-        if str(payload.emoji) not in REACTION_EMOJI:
+        if not self.bot.guild_configurations_cache.is_suggestion_channel(payload.channel_id):
             return
 
-        if str(payload.emoji) == "\N{UPWARDS BLACK ARROW}":
-            self.message[payload.message_id]["message_upvote"] -= 1
-        if str(payload.emoji) == "\N{DOWNWARDS BLACK ARROW}":
-            self.message[payload.message_id]["message_downvote"] -= 1
+        await self.votes.vote(payload.message_id, str(payload.emoji), amount)
 
     async def __parse_mod_action(self, message: discord.Message) -> bool | None:
         assert isinstance(message.author, discord.Member)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from pymongo import DeleteOne, UpdateOne
+
+import discord
+from utilities.converters import Cache
+
+if TYPE_CHECKING:
+    from core import Parrot
+
+UPVOTE = "\N{UPWARDS BLACK ARROW}"
+DOWNVOTE = "\N{DOWNWARDS BLACK ARROW}"
+
+# Suggestions whose tally is held in memory.
+MAX_CACHED_SUGGESTIONS = 2048
+
+
+class SuggestionVotes:
+    __slots__ = ("message_id", "guild_id", "channel_id", "thread_id", "upvotes", "downvotes")
+
+    def __init__(
+        self,
+        message_id: int,
+        *,
+        guild_id: int,
+        channel_id: int,
+        thread_id: int | None = None,
+        upvotes: int = 0,
+        downvotes: int = 0,
+    ) -> None:
+        self.message_id = message_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.thread_id = thread_id
+        self.upvotes = upvotes
+        self.downvotes = downvotes
+
+    @classmethod
+    def from_document(cls, data: dict[str, Any]) -> SuggestionVotes:
+        return cls(
+            data["_id"],
+            guild_id=data["guild_id"],
+            channel_id=data["channel_id"],
+            thread_id=data.get("thread_id"),
+            upvotes=data.get("upvotes", 0),
+            downvotes=data.get("downvotes", 0),
+        )
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> SuggestionVotes:
+        """Count the votes from the reactions of the suggestion, leaving out the bot's own."""
+        votes = cls(message.id, guild_id=message.guild.id, channel_id=message.channel.id)  # type: ignore
+        for reaction in message.reactions:
+            if str(reaction.emoji) == UPVOTE:
+                votes.upvotes = reaction.count - reaction.me
+            elif str(reaction.emoji) == DOWNVOTE:
+                votes.downvotes = reaction.count - reaction.me
+        return votes
+
+    def to_document(self) -> dict[str, Any]:
+        return {
+            "guild_id": self.guild_id,
+            "channel_id": self.channel_id,
+            "thread_id": self.thread_id,
+            "upvotes": self.upvotes,
+            "downvotes": self.downvotes,
+        }
+
+
+class VoteStore:
+    """Vote tallies of the suggestions, kept in the ``suggestions`` collection.
+
+    The most recently used tallies are held in memory, the others are read back from
+    the database when voted on again. Votes only change the memory, and
+    :meth:`flush` writes every changed tally in one bulk write.
+    """
+
+    def __init__(self, bot: Parrot, *, cache_size: int = MAX_CACHED_SUGGESTIONS) -> None:
+        self.bot = bot
+        self.__cache: Cache[int, SuggestionVotes | None] = Cache(bot, cache_size=cache_size)
+        # changed tallies are kept here until written, even if evicted from the cache
+        self.__dirty: dict[int, SuggestionVotes] = {}
+        self.__deleted: set[int] = set()
+
+    def track(self, votes: SuggestionVotes) -> None:
+        self.__cache[votes.message_id] = votes
+        self.__dirty[votes.message_id] = votes
+        self.__deleted.discard(votes.message_id)
+
+    async def get(self, message_id: int) -> SuggestionVotes | None:
+        if (votes := self.__dirty.get(message_id)) is not None:
+            return votes
+        if message_id in self.__cache:
+            # None is cached too, for the messages which are not suggestions
+            return self.__cache[message_id]
+        if message_id in self.__deleted:
+            return None
+
+        data = await self.bot.suggestions.find_one({"_id": message_id})
+        # another vote may have loaded it meanwhile, that one has to be kept
+        if (votes := self.__dirty.get(message_id)) is not None or message_id in self.__cache:
+            return votes or self.__cache[message_id]
+
+        votes = SuggestionVotes.from_document(data) if data else None
+        self.__cache[message_id] = votes
+        return votes
+
+    async def vote(self, message_id: int, emoji: str, amount: int) -> bool:
+        if emoji not in (UPVOTE, DOWNVOTE) or (votes := await self.get(message_id)) is None:
+            return False
+
+        if emoji == UPVOTE:
+            votes.upvotes = max(votes.upvotes + amount, 0)
+        else:
+            votes.downvotes = max(votes.downvotes + amount, 0)
+        self.__dirty[message_id] = votes
+        return True
+
+    def forget(self, message_id: int) -> None:
+        self.__cache.pop(message_id, None)
+        self.__dirty.pop(message_id, None)
+        self.__deleted.add(message_id)
+
+    async def flush(self) -> None:
+        if not self.__dirty and not self.__deleted:
+            return
+
+        dirty, self.__dirty = self.__dirty, {}
+        deleted, self.__deleted = self.__deleted, set()
+        operations: list[UpdateOne | DeleteOne] = [
+            UpdateOne({"_id": message_id}, {"$set": votes.to_document()}, upsert=True)
+            for message_id, votes in dirty.items()
+        ]
+        operations.extend(DeleteOne({"_id": message_id}) for message_id in deleted)
+        try:
+            await self.bot.suggestions.bulk_write(operations, ordered=False)
+        except Exception:
+            self.__dirty = dirty | self.__dirty
+            self.__deleted |= deleted
+            raise
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import logging
+
+from pymongo.errors import PyMongoError
+
 import cogs.tags.method as mt
 import discord
 from core import Cog, Context, Parrot
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
+
+log = logging.getLogger("cogs.tags")
 
 
 class Tags(Cog):
@@ -11,11 +18,26 @@ class Tags(Cog):
 
     def __init__(self, bot: Parrot) -> None:
         self.bot = bot
+        self.cache = mt.TagCache(bot)
 
     @property
     def display_emoji(self) -> discord.PartialEmoji:
         return discord.PartialEmoji(name="\N{TICKET}")
 
+    async def cog_load(self) -> None:
+        self.flush_uses.start()
+
+    async def cog_unload(self) -> None:
+        self.flush_uses.cancel()
+        await self.cache.flush()
+
+    @tasks.loop(seconds=60)
+    async def flush_uses(self) -> None:
+        try:
+            await self.cache.flush()
+        except PyMongoError as e:
+            log.warning("Failed to write the tag use counts", exc_info=e)
+
     @commands.group(invoke_without_command=True)
     @commands.bot_has_permissions(embed_links=True)
     async def tag(self, ctx: Context, *, tag: str = None):
@@ -166,6 +188,28 @@ class Tags(Cog):
         """
         await mt._show_raw_tag(self.bot, ctx, tag)
 
+    @tag.command(name="search", aliases=["find"])
+    @commands.bot_has_permissions(embed_links=True)
+    async def tag_search(self, ctx: Context, *, query: str):
+        """To search the tags by the start of their name, or by a similar name.
+
+        **Examples:**
+        - `[p]tag search tag_na`
+        """
+        await mt._search_tags(self.bot, ctx, query)
+
+    @app_commands.command(name="tag")
+    @app_commands.guild_only()
+    @app_commands.describe(name="Name of the tag")
+    async def tag_slash(self, interaction: discord.Interaction, name: str):
+        """Show the tag."""
+        await mt._show_tag_interaction(self.bot, interaction, name)
+
+    @tag_slash.autocomplete("name")
+    async def tag_slash_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        index = await self.cache.index(interaction.guild_id)  # type: ignore
+        return [app_commands.Choice(name=name, value=name) for name in index.complete(current) if len(name) <= 100]
+
 
 async def setup(bot: Parrot) -> None:
     await bot.add_cog(Tags(bot))
@@ -1,7 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, NamedTuple
+
+from pymongo import UpdateOne
+
 import discord
 from core import Context, Parrot
+from utilities.name_index import NameIndex
+
+if TYPE_CHECKING:
+    from . import Tags
+
+log = logging.getLogger("cogs.tags.method")
+
+# Guilds whose tags are held in memory, least recently used ones are dropped first.
+MAX_CACHED_GUILDS = 1000
 
 # fmt: off
 IGNORE = {
@@ -16,36 +32,187 @@ IGNORE = {
     "all", "list", "show", "ls",
     "mine", "my", "owned", "own",
     "raw", "source", "code",
+    "search", "find",
 }
 # fmt: on
 
 
+class TagEntry(NamedTuple):
+    tag_id: str
+    text: str
+    owner: int
+    nsfw: bool
+
+    @classmethod
+    def from_document(cls, data: dict) -> TagEntry:
+        return cls(data["tag_id"], data["text"], data["owner"], bool(data.get("nsfw")))
+
+
+class TagCache:
+    """Read-through cache of the tags of each guild, and buffered usage counts.
+
+    All the tags of a guild are loaded on its first access, along with an index of their
+    names for searches. Writes done by the commands are applied to the cache right after
+    the database, so it never has to be reloaded. Tag uses are counted in memory, and
+    written in bulk by :meth:`flush`.
+    """
+
+    def __init__(self, bot: Parrot, *, max_guilds: int = MAX_CACHED_GUILDS) -> None:
+        self.bot = bot
+        self.max_guilds = max_guilds
+        self.__guilds: OrderedDict[int, dict[str, TagEntry]] = OrderedDict()
+        self.__indexes: dict[int, NameIndex] = {}
+        self.__loading: dict[int, asyncio.Future[dict[str, TagEntry]]] = {}
+        self.__uses: Counter[tuple[int, str]] = Counter()
+
+    def __len__(self) -> int:
+        return len(self.__guilds)
+
+    async def guild(self, guild_id: int) -> dict[str, TagEntry]:
+        """Every tag of the guild, by name."""
+        if (tags := self.__guilds.get(guild_id)) is not None:
+            self.__guilds.move_to_end(guild_id)
+            return tags
+
+        if (pending := self.__loading.get(guild_id)) is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[dict[str, TagEntry]] = asyncio.get_running_loop().create_future()
+        self.__loading[guild_id] = future
+        try:
+            tags = {}
+            async for data in self.bot.tags_collection.find(
+                {"guild_id": guild_id, "tag_id": {"$exists": True}},
+                {"tag_id": 1, "text": 1, "owner": 1, "nsfw": 1, "_id": 0},
+            ):
+                tags[data["tag_id"]] = TagEntry.from_document(data)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            self.__guilds[guild_id] = tags
+            self.__indexes[guild_id] = NameIndex(tags)
+            while len(self.__guilds) > self.max_guilds:
+                evicted, _ = self.__guilds.popitem(last=False)
+                del self.__indexes[evicted]
+            future.set_result(tags)
+            return tags
+        finally:
+            del self.__loading[guild_id]
+
+    async def get(self, guild_id: int, tag_id: str) -> TagEntry | None:
+        return (await self.guild(guild_id)).get(tag_id)
+
+    async def index(self, guild_id: int) -> NameIndex:
+        """Index of the names of every tag of the guild."""
+        await self.guild(guild_id)
+        return self.__indexes[guild_id]
+
+    def set(self, guild_id: int, entry: TagEntry) -> None:
+        if (tags := self.__guilds.get(guild_id)) is not None:
+            tags[entry.tag_id] = entry
+            self.__indexes[guild_id].add(entry.tag_id)
+
+    def remove(self, guild_id: int, tag_id: str) -> None:
+        if (tags := self.__guilds.get(guild_id)) is not None:
+            tags.pop(tag_id, None)
+            self.__indexes[guild_id].remove(tag_id)
+        self.__uses.pop((guild_id, tag_id), None)
+
+    def rename(self, guild_id: int, tag_id: str, name: str) -> None:
+        if (tags := self.__guilds.get(guild_id)) is not None and (entry := tags.pop(tag_id, None)):
+            tags[name] = entry._replace(tag_id=name)
+            self.__indexes[guild_id].remove(tag_id)
+            self.__indexes[guild_id].add(name)
+        if uses := self.__uses.pop((guild_id, tag_id), 0):
+            self.__uses[(guild_id, name)] += uses
+
+    def use(self, guild_id: int, tag_id: str) -> None:
+        self.__uses[(guild_id, tag_id)] += 1
+
+    def pending_uses(self, guild_id: int, tag_id: str) -> int:
+        return self.__uses.get((guild_id, tag_id), 0)
+
+    async def flush(self) -> None:
+        if not self.__uses:
+            return
+
+        uses, self.__uses = self.__uses, Counter()
+        operations = [
+            UpdateOne({"guild_id": guild_id, "tag_id": tag_id}, {"$inc": {"count": count}})
+            for (guild_id, tag_id), count in uses.items()
+        ]
+        try:
+            await self.bot.tags_collection.bulk_write(operations, ordered=False)
+        except Exception:
+            self.__uses.update(uses)
+            raise
+
+
+def _cache(bot: Parrot) -> TagCache:
+    cog: Tags = bot.get_cog("Tags")  # type: ignore
+    return cog.cache
+
+
 async def _show_tag(bot: Parrot, ctx: Context, tag: str, msg_ref: discord.Message | None = None):
-    collection = ctx.bot.tags_collection
+    cache = _cache(bot)
     allowed_mentions = discord.AllowedMentions.none()
-    if data := await collection.find_one({"tag_id": tag}):
-        if not data["nsfw"] and msg_ref is not None or data["nsfw"] and ctx.channel.nsfw and msg_ref is not None:  # type: ignore
-            await msg_ref.reply(data["text"], allowed_mentions=allowed_mentions)
-        elif not data["nsfw"] or ctx.channel.nsfw:  # type: ignore
-            await ctx.send(data["text"], allowed_mentions=allowed_mentions)
+    if data := await cache.get(ctx.guild.id, tag):
+        if not data.nsfw and msg_ref is not None or data.nsfw and ctx.channel.nsfw and msg_ref is not None:  # type: ignore
+            await msg_ref.reply(data.text, allowed_mentions=allowed_mentions)
+        elif not data.nsfw or ctx.channel.nsfw:  # type: ignore
+            await ctx.send(data.text, allowed_mentions=allowed_mentions)
         else:
-            await ctx.reply(f"{ctx.author.mention} this tag can only be called in NSFW marked channel")
+            return await ctx.reply(f"{ctx.author.mention} this tag can only be called in NSFW marked channel")
+        cache.use(ctx.guild.id, tag)
     else:
-        await ctx.reply(f"{ctx.author.mention} No tag with named `{tag}`")
-    await collection.update_one({"tag_id": tag, "guild_id": ctx.guild.id}, {"$inc": {"count": 1}})
+        await ctx.reply(await _not_found(bot, ctx.guild.id, tag, mention=ctx.author.mention))
+
+
+async def _not_found(bot: Parrot, guild_id: int, tag: str, *, mention: str) -> str:
+    index = await _cache(bot).index(guild_id)
+    if suggestions := index.similar(tag, limit=3):
+        return f"{mention} No tag with named `{tag}`. Did you mean: {', '.join(f'`{name}`' for name in suggestions)}?"
+    return f"{mention} No tag with named `{tag}`"
+
+
+async def _show_tag_interaction(bot: Parrot, interaction: discord.Interaction, tag: str):
+    cache = _cache(bot)
+    if data := await cache.get(interaction.guild_id, tag):  # type: ignore
+        if data.nsfw and not getattr(interaction.channel, "nsfw", False):
+            return await interaction.response.send_message(
+                "This tag can only be called in NSFW marked channel",
+                ephemeral=True,
+            )
+        await interaction.response.send_message(data.text, allowed_mentions=discord.AllowedMentions.none())
+        cache.use(interaction.guild_id, tag)  # type: ignore
+    else:
+        await interaction.response.send_message(
+            await _not_found(bot, interaction.guild_id, tag, mention=interaction.user.mention),  # type: ignore
+            ephemeral=True,
+        )
+
+
+async def _search_tags(bot: Parrot, ctx: Context, query: str):
+    index = await _cache(bot).index(ctx.guild.id)
+    if entries := index.prefix(query):
+        return await ctx.paginate(entries, module="SimplePages")
+    if suggestions := index.similar(query, limit=10):
+        return await ctx.paginate(suggestions, module="SimplePages")
+    await ctx.reply(f"{ctx.author.mention} No tag matches `{query}`")
 
 
 async def _show_raw_tag(bot: Parrot, ctx: Context, tag: str):
-    collection = ctx.bot.tags_collection
-    if data := await collection.find_one({"tag_id": tag, "guild_id": ctx.guild.id}):
-        first = discord.utils.escape_markdown(data["text"])
+    if data := await _cache(bot).get(ctx.guild.id, tag):
+        first = discord.utils.escape_markdown(data.text)
         main = discord.utils.escape_mentions(first)
-        if data["nsfw"] and ctx.channel.nsfw or not data["nsfw"]:  # type: ignore
+        if data.nsfw and ctx.channel.nsfw or not data.nsfw:  # type: ignore
             await ctx.safe_send(main, allowed_mentions=discord.AllowedMentions.none())
         else:
             await ctx.reply(f"{ctx.author.mention} this tag can only be called in NSFW marked channel")
     else:
-        await ctx.reply(f"{ctx.author.mention} No tag with named `{tag}`")
+        await ctx.reply(await _not_found(bot, ctx.guild.id, tag, mention=ctx.author.mention))
 
 
 async def _create_tag(bot: Parrot, ctx: Context, tag: str, text: str):
@@ -59,9 +226,10 @@ async def _create_tag(bot: Parrot, ctx: Context, tag: str, text: str):
         return await ctx.error(f"{ctx.author.mention} you did not provided any text to be saved")
 
     collection = ctx.bot.tags_collection
+    cache = _cache(bot)
     if tag in IGNORE:
         return await ctx.error(f"{ctx.author.mention} the name `{tag}` is reserved word.")
-    if _ := await collection.find_one({"tag_id": tag, "guild_id": ctx.guild.id}):
+    if _ := await cache.get(ctx.guild.id, tag):
         return await ctx.error(f"{ctx.author.mention} the name `{tag}` already exists")
 
     val = await ctx.prompt(f"{ctx.author.mention} do you want to make the tag as NSFW marked channels")
@@ -79,14 +247,17 @@ async def _create_tag(bot: Parrot, ctx: Context, tag: str, text: str):
             "created_at": int(discord.utils.utcnow().timestamp()),
         },
     )
+    cache.set(ctx.guild.id, TagEntry(tag, text, ctx.author.id, nsfw))
     await ctx.reply(f"{ctx.author.mention} tag created successfully")
 
 
 async def _delete_tag(bot: Parrot, ctx: Context, tag: str):
     collection = ctx.bot.tags_collection
-    if data := await collection.find_one({"tag_id": tag, "guild_id": ctx.guild.id}):
-        if data["owner"] == ctx.author.id:
-            await collection.delete_one({"tag_id": tag})
+    cache = _cache(bot)
+    if data := await cache.get(ctx.guild.id, tag):
+        if data.owner == ctx.author.id:
+            await collection.delete_one({"tag_id": tag, "guild_id": ctx.guild.id})
+            cache.remove(ctx.guild.id, tag)
             await ctx.reply(f"{ctx.author.mention} tag deleted successfully")
         else:
             await ctx.error(f"{ctx.author.mention} you don't own this tag")
@@ -96,11 +267,13 @@ async def _delete_tag(bot: Parrot, ctx: Context, tag: str):
 
 async def _name_edit(bot: Parrot, ctx: Context, tag: str, name: str):
     collection = ctx.bot.tags_collection
-    if _ := await collection.find_one({"tag_id": name, "guild_id": ctx.guild.id}):
+    cache = _cache(bot)
+    if _ := await cache.get(ctx.guild.id, name):
         await ctx.error(f"{ctx.author.mention} that name already exists in the database")
-    elif data := await collection.find_one({"tag_id": tag}):
-        if data["owner"] == ctx.author.id:
+    elif data := await cache.get(ctx.guild.id, tag):
+        if data.owner == ctx.author.id:
             await collection.update_one({"tag_id": tag, "guild_id": ctx.guild.id}, {"$set": {"tag_id": name}})
+            cache.rename(ctx.guild.id, tag, name)
             await ctx.reply(f"{ctx.author.mention} tag name successfully changed")
         else:
             await ctx.error(f"{ctx.author.mention} you don't own this tag")
@@ -110,9 +283,11 @@ async def _name_edit(bot: Parrot, ctx: Context, tag: str, name: str):
 
 async def _text_edit(bot: Parrot, ctx: Context, tag: str, text: str):
     collection = ctx.bot.tags_collection
-    if data := await collection.find_one({"tag_id": tag, "guild_id": ctx.guild.id}):
-        if data["owner"] == ctx.author.id:
+    cache = _cache(bot)
+    if data := await cache.get(ctx.guild.id, tag):
+        if data.owner == ctx.author.id:
             await collection.update_one({"tag_id": tag, "guild_id": ctx.guild.id}, {"$set": {"text": text}})
+            cache.set(ctx.guild.id, data._replace(text=text))
             await ctx.reply(f"{ctx.author.mention} tag content successfully changed")
         else:
             await ctx.error(f"{ctx.author.mention} you don't own this tag")
@@ -122,13 +297,15 @@ async def _text_edit(bot: Parrot, ctx: Context, tag: str, text: str):
 
 async def _claim_owner(bot: Parrot, ctx: Context, tag: str):
     collection = ctx.bot.tags_collection
-    if data := await collection.find_one({"tag_id": tag, "guild_id": ctx.guild.id}):
-        member = await bot.get_or_fetch_member(ctx.guild, data["owner"])
+    cache = _cache(bot)
+    if data := await cache.get(ctx.guild.id, tag):
+        member = await bot.get_or_fetch_member(ctx.guild, data.owner)
         if member:
             return await ctx.error(
                 f"{ctx.author.mention} you can not claim the tag ownership as the member is still in the server",
             )
         await collection.update_one({"tag_id": tag, "guild_id": ctx.guild.id}, {"$set": {"owner": ctx.author.id}})
+        cache.set(ctx.guild.id, data._replace(owner=ctx.author.id))
         await ctx.reply(f"{ctx.author.mention} ownership of tag `{tag}` claimed!")
     else:
         await ctx.error(f"{ctx.author.mention} No tag with named `{tag}`")
@@ -136,8 +313,9 @@ async def _claim_owner(bot: Parrot, ctx: Context, tag: str):
 
 async def _transfer_owner(bot: Parrot, ctx: Context, tag: str, member: discord.Member):
     collection = ctx.bot.tags_collection
-    if data := await collection.find_one({"tag_id": tag, "guild_id": ctx.guild.id}):
-        if data["owner"] != ctx.author.id:
+    cache = _cache(bot)
+    if data := await cache.get(ctx.guild.id, tag):
+        if data.owner != ctx.author.id:
             return await ctx.error(f"{ctx.author.mention} you don't own this tag")
         val = await ctx.prompt(
             f"{ctx.author.mention} are you sure to transfer the tag ownership to **{member}**? This process is irreversible!",
@@ -146,6 +324,7 @@ async def _transfer_owner(bot: Parrot, ctx: Context, tag: str, member: discord.M
             await ctx.error(f"{ctx.author.mention} you did not responds on time")
         elif val:
             await collection.update_one({"tag_id": tag, "guild_id": ctx.guild.id}, {"$set": {"owner": member.id}})
+            cache.set(ctx.guild.id, data._replace(owner=member.id))
             await ctx.reply(f"{ctx.author.mention} tag ownership successfully transfered to **{member}**")
         else:
             await ctx.error(f"{ctx.author.mention} ok! reverting the process!")
@@ -155,22 +334,21 @@ async def _transfer_owner(bot: Parrot, ctx: Context, tag: str, member: discord.M
 
 async def _toggle_nsfw(bot: Parrot, ctx: Context, tag: str):
     collection = ctx.bot.tags_collection
-    if data := await collection.find_one({"tag_id": tag, "guild_id": ctx.guild.id}):
-        if data["owner"] != ctx.author.id:
+    cache = _cache(bot)
+    if data := await cache.get(ctx.guild.id, tag):
+        if data.owner != ctx.author.id:
             return await ctx.reply(f"{ctx.author.mention} you don't own this tag")
-        nsfw = not data["nsfw"]
+        nsfw = not data.nsfw
         await collection.update_one({"tag_id": tag, "guild_id": ctx.guild.id}, {"$set": {"nsfw": nsfw}})
+        cache.set(ctx.guild.id, data._replace(nsfw=nsfw))
         await ctx.reply(f"{ctx.author.mention} NSFW status of tag named `{tag}` is set to **{nsfw}**")
     else:
         await ctx.reply(f"{ctx.author.mention} No tag with named `{tag}`")
 
 
 async def _show_tag_mine(bot: Parrot, ctx: Context):
-    collection = ctx.bot.tags_collection
-    entries: list[str] = []
-
-    async for data in collection.find({"owner": ctx.author.id, "guild_id": ctx.guild.id, "tag_id": {"$exists": True}}):
-        entries.append(f"{data['tag_id']}")
+    tags = await _cache(bot).guild(ctx.guild.id)
+    entries: list[str] = [tag_id for tag_id, data in tags.items() if data.owner == ctx.author.id]
     try:
         return await ctx.paginate(entries, module="SimplePages")
     except IndexError:
@@ -178,10 +356,7 @@ async def _show_tag_mine(bot: Parrot, ctx: Context):
 
 
 async def _show_all_tags(bot: Parrot, ctx: Context):
-    collection = ctx.bot.tags_collection
-    entries: list[str] = []
-    async for data in collection.find({"guild_id": ctx.guild.id, "tag_id": {"$exists": True}}):
-        entries.append(f"{data['tag_id']}")
+    entries: list[str] = list(await _cache(bot).guild(ctx.guild.id))
     try:
         return await ctx.paginate(entries, module="SimplePages")
     except IndexError:
@@ -194,7 +369,7 @@ async def _view_tag(bot: Parrot, ctx: Context, tag: str):
         text_len = len(data["text"])
         owner = await bot.get_or_fetch_member(ctx.guild, data["owner"])
         nsfw = data["nsfw"]
-        count = data["count"]
+        count = data["count"] + _cache(bot).pending_uses(ctx.guild.id, tag)
         created_at = f"<t:{data['created_at']}>"
         claimable = owner is None
         em = (
@@ -87,6 +87,7 @@ async def dial(bot: Parrot, ctx: Context, server: discord.Guild, reverse: bool =
             "message",
             check=outer_check_pickup_hangup(channel, target_channel),
             timeout=60,
+            channel_id=(channel.id, target_channel.id),
         )
     except asyncio.TimeoutError:
         await asyncio.sleep(0.5)
@@ -118,7 +119,12 @@ async def dial(bot: Parrot, ctx: Context, server: discord.Guild, reverse: bool =
                 return False if m.author.bot else m.channel in (target_channel, channel)
 
             try:
-                talk_message = await bot.wait_for("message", check=check_in_channel, timeout=60.0)
+                talk_message = await bot.wait_for(
+                    "message",
+                    check=check_in_channel,
+                    timeout=60.0,
+                    channel_id=(channel.id, target_channel.id),
+                )
             except asyncio.TimeoutError:
                 await asyncio.sleep(0.5)
                 await target_channel.send(
@@ -277,7 +277,7 @@ class Utils(Cog):
         except KeyError:
             return await ctx.send(f"{ctx.author.mention} leveling system is disabled in this server")
         else:
-            collection: Collection = self.bot.guild_level_db[f"{member.guild.id}"]
+            collection: Collection = self.bot.guild_level_collection(member.guild.id)
             if data := await collection.find_one_and_update(
                 {"_id": member.id},
                 {"$inc": {"xp": 0}},
@@ -308,7 +308,7 @@ class Utils(Cog):
     async def lb(self, ctx: Context, *, limit: int | None = None):
         """To display the Leaderboard."""
         limit = limit or 10
-        collection = self.bot.guild_level_db[f"{ctx.guild.id}"]
+        collection = self.bot.guild_level_collection(ctx.guild.id)
         entries = await self.__get_entries(collection=collection, limit=limit, guild=ctx.guild)
         if not entries:
             return await ctx.send(f"{ctx.author.mention} there is no one in the leaderboard")
@@ -10,6 +10,7 @@ from collections.abc import Awaitable, Callable, Iterable
 from contextlib import suppress
 from io import BytesIO
 from operator import attrgetter
+from time import perf_counter
 from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
 
 import aiohttp
@@ -23,6 +24,7 @@ from discord.ext import commands
 from utilities.converters import ToImage, emoji_to_url
 from utilities.emotes import emojis
 from utilities.regex import LINKS_RE
+from utilities.waiters import RoutingKey
 
 CONFIRM_REACTIONS: tuple = (
     "\N{THUMBS UP SIGN}",
@@ -30,7 +32,6 @@ CONFIRM_REACTIONS: tuple = (
 )
 
 if TYPE_CHECKING:
-    from pymongo.results import UpdateResult
     from typing_extensions import ParamSpec
 
     from .Parrot import Parrot
@@ -71,9 +72,10 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
+        self.started_at: float = perf_counter()
 
         if self.guild is not None:
-            self.guild_collection = self.bot.guild_level_db[f"{self.guild.id}"]
+            self.guild_collection = self.bot.guild_level_collection(self.guild.id)
         self.user_collection = self.bot.user_db[f"{self.author.id}"]
 
     def __repr__(self) -> str:
@@ -131,53 +133,33 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
         perms = self.author.guild_permissions
         if perms.manage_guild or perms.manage_channels:
             return self.guild.default_role
-        try:
-            dj_role = self.guild.get_role(self.bot.guild_configurations_cache[self.guild.id]["dj_role"] or 0)
-            author_dj_role = discord.utils.find(
-                lambda r: r.name.lower() == "dj",
-                self.author.roles,
-            )
-            server_dj_role = discord.utils.find(
-                lambda r: r.name.lower() == "dj",
-                self.guild.roles,
-            )
-            return dj_role or author_dj_role or server_dj_role
-        except KeyError:
-            if data := await self.bot.guild_configurations.find_one({"_id": self.guild.id}):
-                return self.guild.get_role(data.get("dj_role") or 0)
-        return None
+        dj_role = self.guild.get_role(self.bot.guild_configurations_cache.dj_role(self.guild.id) or 0)
+        author_dj_role = discord.utils.find(
+            lambda r: r.name.lower() == "dj",
+            self.author.roles,
+        )
+        server_dj_role = discord.utils.find(
+            lambda r: r.name.lower() == "dj",
+            self.guild.roles,
+        )
+        return dj_role or author_dj_role or server_dj_role
 
     @staticmethod
     async def get_mute_role(bot: Parrot, guild: discord.Guild) -> discord.Role | None:
-        try:
-            global_muted = discord.utils.find(lambda m: m.name.lower() == "muted", guild.roles)
-            return guild.get_role(bot.guild_configurations_cache[guild.id]["mute_role"] or 0) or global_muted
-        except KeyError:
-            if data := await bot.guild_configurations.find_one({"_id": guild.id}):
-                return guild.get_role(data["mute_role"] or 0)
-        return None
+        global_muted = discord.utils.find(lambda m: m.name.lower() == "muted", guild.roles)
+        return guild.get_role(bot.guild_configurations_cache.mute_role(guild.id) or 0) or global_muted
 
     async def muterole(self) -> discord.Role | None:
-        try:
-            author_muted = discord.utils.find(lambda m: m.name.lower() == "muted", self.author.roles)
-            global_muted = discord.utils.find(lambda m: m.name.lower() == "muted", self.guild.roles)
-            return (
-                self.guild.get_role(self.bot.guild_configurations_cache[self.guild.id]["mute_role"] or 0)
-                or global_muted
-                or author_muted
-            )
-        except KeyError:
-            if data := await self.bot.guild_configurations.find_one({"_id": self.guild.id}):
-                return self.guild.get_role(data["mute_role"] or 0)
-        return None
+        author_muted = discord.utils.find(lambda m: m.name.lower() == "muted", self.author.roles)
+        global_muted = discord.utils.find(lambda m: m.name.lower() == "muted", self.guild.roles)
+        return (
+            self.guild.get_role(self.bot.guild_configurations_cache.mute_role(self.guild.id) or 0)
+            or global_muted
+            or author_muted
+        )
 
     async def modrole(self) -> discord.Role | None:
-        try:
-            return self.guild.get_role(self.bot.guild_configurations_cache[self.guild.id]["mod_role"] or 0)
-        except KeyError:
-            if data := await self.bot.guild_configurations.find_one({"_id": self.guild.id}):
-                return self.guild.get_role(data["mod_role"] or 0)
-        return None
+        return self.guild.get_role(self.bot.guild_configurations_cache.mod_role(self.guild.id) or 0)
 
     @discord.utils.cached_property
     def replied_reference(self) -> discord.MessageReference | None:
@@ -248,7 +230,7 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
             try:
                 await self.wait_for(
                     "message_delete",
-                    check=lambda m: m.id == self.message.id,
+                    message_id=self.message.id,
                     timeout=30,
                 )
             except asyncio.TimeoutError:
@@ -357,6 +339,7 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
                 "raw_reaction_add",
                 check=check,
                 timeout=timeout,
+                message_id=message.id,
             )
             return str(payload.emoji) == "\N{THUMBS UP SIGN}"
         except asyncio.TimeoutError:
@@ -402,6 +385,9 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
         check: Callable[..., bool] | None = None,
         suppress_error: bool = False,
         operator: Callable[[Iterable[object]], bool] = all,
+        channel_id: RoutingKey = None,
+        user_id: RoutingKey = None,
+        message_id: RoutingKey = None,
         **kwargs: Any,
     ) -> Any:
         if _event_name.lower().startswith("on_"):
@@ -412,6 +398,9 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
                 _event_name,
                 timeout=timeout,
                 check=self.outer_check(check, operator, **kwargs),
+                channel_id=channel_id,
+                user_id=user_id,
+                message_id=message_id,
             )
         except asyncio.TimeoutError:
             if suppress_error:
@@ -500,7 +489,8 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
             return await self.bot.wait_for(
                 "message",
                 timeout=timeout,
-                check=lambda m: m.author == self.author and m.channel == self.channel,
+                channel_id=self.channel.id,
+                user_id=self.author.id,
             )
         except asyncio.TimeoutError as e:
             msg = "You took too long to respond."
@@ -537,7 +527,7 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
 
     async def wait_for_delete(self, message: discord.Message | None = None, *, timeout: float | None = None) -> Any:
         message = message or self.message
-        await self.wait_for("on_message_delete", message__id=message.id, timeout=timeout)
+        await self.wait_for("on_message_delete", message_id=message.id, timeout=timeout)
 
     async def retry(
         self,
@@ -566,55 +556,11 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
         win: bool = False,
         loss: bool = False,
         set: dict = None,
+        inc: dict = None,
         **kw: Any,
     ) -> bool:
-        if set is None:
-            set = {}
-        set_kwargs: dict[str, Any] = {f"game_{game_name}_{k}": v for k, v in set.items()}
-        kwargs = {"$set": set_kwargs}
-        if not win and not loss:
-            update_result: UpdateResult = await self.bot.game_collections.update_one(
-                {
-                    "_id": self.author.id,
-                },
-                {
-                    "$inc": {
-                        f"game_{game_name}_played": 1,
-                    },
-                    **kwargs,
-                },
-                upsert=True,
-            )
-        elif win:
-            update_result: UpdateResult = await self.bot.game_collections.update_one(
-                {
-                    "_id": self.author.id,
-                },
-                {
-                    "$inc": {
-                        f"game_{game_name}_played": 1,
-                        f"game_{game_name}_won": 1,
-                    },
-                    **kwargs,
-                },
-                upsert=True,
-            )
-        else:
-            update_result: UpdateResult = await self.bot.game_collections.update_one(
-                {
-                    "_id": self.author.id,
-                },
-                {
-                    "$inc": {
-                        f"game_{game_name}_played": 1,
-                        f"game_{game_name}_loss": 1,
-                    },
-                    **kwargs,
-                },
-                upsert=True,
-            )
-
-        return bool(update_result.modified_count)
+        """Record a game played by the author, with the fields of `set` and the counters of `inc`."""
+        return await self.bot.database_game_update(self.author.id, game_name, win=win, loss=loss, set=set, inc=inc)
 
     async def database_command_update(
         self,
@@ -622,53 +568,20 @@ class Context(commands.Context[commands.Bot], Generic[BotT]):
         success: bool = False,
         error: str | None = None,
         **kwargs: Any,
-    ) -> dict[str, Any]:
+    ) -> None:
+        """Record the invocation in the command telemetry, written in batches by the bot."""
         if self.command is None:
-            return {}
-
-        cmd = self.command.qualified_name
-        cmd = cmd.replace(" ", "_")
-        now = discord.utils.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-
-        if error:
-            kwargs["$addToSet"] = {
-                f"command_{cmd}_errors": {
-                    "error": error,
-                    "time": now,
-                },
-            }
-
-        update_result_cmd_user: UpdateResult = await self.bot.command_collections.update_one(
-            {"_id": self.author.id},
-            {
-                "$inc": {
-                    f"command_{cmd}_used": 1,
-                    f"command_{cmd}_success": 1 if success else 0,
-                },
-                "$set": {"type": "user"},
-                **kwargs,
-            },
-            upsert=True,
-        )
+            return
 
-        update_result_cmd_guild: UpdateResult = await self.bot.command_collections.update_one(
-            {"_id": self.guild.id},
-            {
-                "$inc": {
-                    f"command_{cmd}_used": 1,
-                    f"command_{cmd}_success": 1 if success else 0,
-                },
-                "$set": {"type": "guild"},
-                **kwargs,
-            },
-            upsert=True,
+        self.bot.command_telemetry.record(
+            self.command.qualified_name,
+            guild_id=self.guild.id if self.guild is not None else None,
+            user_id=self.author.id,
+            success=success,
+            latency=perf_counter() - self.started_at,
+            error=error,
         )
 
-        return {
-            "user": bool(update_result_cmd_user.modified_count),
-            "guild": bool(update_result_cmd_guild.modified_count),
-        }
-
     def send_view(self, **kw: Any) -> SentFromView:
         return SentFromView(self, **kw)
 
@@ -10,7 +10,7 @@ import re
 import traceback
 import types
 from collections import Counter, defaultdict, deque
-from collections.abc import AsyncGenerator, Awaitable, Callable, Collection, Iterable, Mapping, Sequence
+from collections.abc import AsyncGenerator, Awaitable, Callable, Collection, Coroutine, Iterable, Mapping, Sequence
 from contextlib import suppress
 from typing import TYPE_CHECKING, Any, Literal, overload
 
@@ -21,7 +21,7 @@ import pymongo
 import wavelink
 from aiohttp import ClientSession
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import ConnectionFailure, DuplicateKeyError
+from pymongo.errors import ConnectionFailure, DuplicateKeyError, PyMongoError
 from pymongo.results import DeleteResult, InsertOneResult
 
 import discord
@@ -38,14 +38,19 @@ except ImportError:
 from time import perf_counter
 
 from utilities.checks import can_run
+from utilities.cluster import ClusterClient, ClusterInfo
 from utilities.config import (
     CASE_INSENSITIVE,
     CHANGE_LOG_CHANNEL_ID,
+    CLUSTER_COUNT,
+    CLUSTER_ID,
+    CLUSTER_PORT,
     EXTENSIONS,
     GITHUB,
     HEROKU,
     MASTER_OWNER,
     OWNER_IDS,
+    SHARD_COUNT,
     STRAW_POLL,
     STRIP_AFTER_PREFIX,
     SUPPORT_SERVER,
@@ -59,10 +64,16 @@ from utilities.config import (
     WEBHOOK_STARTUP_LOGS,
     WEBHOOK_VOTE_LOGS,
 )
+from utilities.config_store import GuildConfigStore
 from utilities.converters import Cache
+from utilities.indexes import ensure_indexes, ensure_level_indexes
 from utilities.paste import Client
+from utilities.profiler import ProfiledTree, Profiler
 from utilities.regex import LINKS_RE
 from utilities.strawpoll import HTTPClient as StrawpollHTTPClient
+from utilities.telemetry import CommandTelemetry
+from utilities.view_store import RestoredItem, ViewStore
+from utilities.waiters import RoutingKey, WaiterIndex
 
 from .__template import post as POST
 from .Context import Context
@@ -74,6 +85,8 @@ if TYPE_CHECKING:
 
     from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 
+    from pymongo.results import UpdateResult
+
     from discord.ext.commands.cooldowns import CooldownMapping
 
     from .Cog import Cog
@@ -120,6 +133,8 @@ IPC_PORT = 1730
 LAVALINK_PORT = 1018
 LAVALINK_PASSWORD = "password"
 TOPGG_PORT = 1019
+# Seconds before a timer the cluster of its guild did not take is forwarded again.
+TIMER_RETRY_DELAY = 30
 
 __all__ = ("Parrot", "CustomFormatter")
 
@@ -155,6 +170,13 @@ class Parrot(commands.AutoShardedBot):
     ON_DOCKER: bool = False
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # created first, discord.py's HTTP client is traced from the start
+        self.profiler: Profiler = Profiler()
+        # this process connects the shards of its cluster only, see launcher.py
+        self.cluster: ClusterClient = ClusterClient(
+            ClusterInfo(CLUSTER_ID, CLUSTER_COUNT, SHARD_COUNT),
+            port=CLUSTER_PORT,
+        )
         super().__init__(
             command_prefix=self.get_prefix,  # type: ignore
             case_insensitive=CASE_INSENSITIVE,
@@ -165,11 +187,14 @@ class Parrot(commands.AutoShardedBot):
             owner_ids=set(OWNER_IDS),
             allowed_mentions=discord.AllowedMentions(everyone=False, replied_user=False),
             member_cache_flags=discord.MemberCacheFlags.from_intents(intents),
-            shard_count=1,
+            shard_count=self.cluster.info.shard_count,
+            shard_ids=self.cluster.info.shard_ids if self.cluster.info.clustered else None,
             max_messages=2**10,
             chunk_guilds_at_startup=False,
             enable_debug_events=False,
             help_command=PaginatedHelpCommand(),
+            tree_cls=ProfiledTree,
+            http_trace=self.profiler.trace_config(),
             **kwargs,
         )
         self._BotBase__cogs = commands.core._CaseInsensitiveDict()
@@ -186,6 +211,7 @@ class Parrot(commands.AutoShardedBot):
 
         self.error_channel: discord.TextChannel | None = None
         self.persistent_views_added: bool = False
+        self.view_store: ViewStore = ViewStore(self)
         self.spam_control: CooldownMapping = commands.CooldownMapping.from_cooldown(3, 5, commands.BucketType.user)
 
         self._was_ready: bool = False
@@ -210,16 +236,19 @@ class Parrot(commands.AutoShardedBot):
         self.mystbin: Client = Client()
 
         # caching variables
-        self.guild_configurations_cache: Cache[int, dict[str, Any]] = Cache(self)
+        self.guild_configurations_cache: GuildConfigStore = GuildConfigStore(self, defaults=POST)
         self.message_cache: dict[int, discord.Message] = {}
         self.banned_users: dict[int, dict[str, int | str | bool]] = {}
         self.afk_users: set[int] = set()
         self.channel_message_cache: Cache[int, deque[discord.Message]] = Cache(self, cache_size=2**10)
 
+        self.command_telemetry: CommandTelemetry = CommandTelemetry()
+        self.waiters: WaiterIndex = WaiterIndex()
+
         self.before_invoke(self.__before_invoke)
 
-        # IPC
-        self.HAS_IPC = TO_LOAD_IPC
+        # IPC, served by the primary cluster; its routes gather what the other clusters have
+        self.HAS_IPC = TO_LOAD_IPC and self.cluster.info.is_primary
         self.ipc_server: ipc.server.Server = ipc.server.Server(
             self,  # type: ignore
             host=LOCALHOST,
@@ -235,6 +264,9 @@ class Parrot(commands.AutoShardedBot):
         # Extensions
         self._successfully_loaded: list[str] = []
         self._failed_to_load: dict[str, str] = {}
+        # extension -> seconds taken to import and set it up
+        self._extension_load_times: dict[str, float] = {}
+        self._extensions_load_time: float = 0
 
         # Wavelink
         self.wavelink: wavelink.NodePool = wavelink.NodePool()
@@ -254,6 +286,9 @@ class Parrot(commands.AutoShardedBot):
         self.__global_write_data: dict[str, list[pymongo.UpdateOne | pymongo.UpdateMany]] = {}
         # {"database.collection": [pymongo.UpdateOne(), ...]}
 
+        # guilds whose level collection had its indexes ensured
+        self.__level_indexed: set[int] = set()
+
         self.strawpoll: StrawpollHTTPClient = StrawpollHTTPClient(token=STRAW_POLL)
 
     async def init_db(self) -> None:
@@ -263,6 +298,7 @@ class Parrot(commands.AutoShardedBot):
         self.guild_configurations: MongoCollection = self.main_db["guildConfigurations"]
         self.game_collections: MongoCollection = self.main_db["gameCollections"]
         self.command_collections: MongoCollection = self.main_db["commandCollections"]
+        self.command_rollups: MongoCollection = self.main_db["commandRollups"]
         self.timers: MongoCollection = self.main_db["timers"]
         self.starboards: MongoCollection = self.main_db["starboards"]
         self.giveaways: MongoCollection = self.main_db["giveawaysCollection"]
@@ -273,6 +309,10 @@ class Parrot(commands.AutoShardedBot):
         self.afk_collection: MongoCollection = self.main_db["afkCollection"]
         self.tags_collection: MongoCollection = self.main_db["tagsCollection"]
         self.auto_responders: MongoCollection = self.main_db["autoResponders"]
+        self.mod_jobs: MongoCollection = self.main_db["modJobs"]
+        self.track_likes: MongoCollection = self.main_db["trackLikes"]
+        self.suggestions: MongoCollection = self.main_db["suggestions"]
+        self.view_states: MongoCollection = self.main_db["viewStates"]
 
         # User Message DB
         self.user_message_db: MongoDatabase = self.mongo["userMessageDB"]
@@ -292,11 +332,48 @@ class Parrot(commands.AutoShardedBot):
         self.automod_logs: MongoCollection = self.automod_db["automodLogs"]
         self.automod_voilations: MongoCollection = self.automod_db["automodVoilations"]
 
+        # see utilities.indexes.INDEXES
+        await ensure_indexes(self)
+
+    def guild_level_collection(self, guild_id: int) -> MongoCollection:
+        """The level collection of the guild, its indexes are ensured on first use."""
+        collection: MongoCollection = self.guild_level_db[f"{guild_id}"]
+        if guild_id not in self.__level_indexed:
+            self.__level_indexed.add(guild_id)
+            self.loop.create_task(ensure_level_indexes(collection))
+        return collection
+
+    async def database_game_update(
+        self,
+        user_id: int,
+        game_name: str,
+        *,
+        win: bool = False,
+        loss: bool = False,
+        set: dict | None = None,
+        inc: dict | None = None,
+    ) -> bool:
+        """Record a game played by the user, with the fields of `set` and the counters of `inc`."""
+        set_kwargs: dict[str, Any] = {f"game_{game_name}_{k}": v for k, v in (set or {}).items()}
+        inc_kwargs: dict[str, Any] = {f"game_{game_name}_played": 1}
+        if win:
+            inc_kwargs[f"game_{game_name}_won"] = 1
+        elif loss:
+            inc_kwargs[f"game_{game_name}_loss"] = 1
+        inc_kwargs |= {f"game_{game_name}_{k}": v for k, v in (inc or {}).items()}
+
+        update_result: UpdateResult = await self.game_collections.update_one(
+            {"_id": user_id},
+            {"$inc": inc_kwargs, "$set": set_kwargs},
+            upsert=True,
+        )
+        return bool(update_result.modified_count)
+
     def __repr__(self) -> str:
         return f"<core.{self.user.name}>"
 
     @property
-    def config(self) -> Cache:
+    def config(self) -> GuildConfigStore:
         return self.guild_configurations_cache
 
     @property
@@ -353,25 +430,18 @@ class Parrot(commands.AutoShardedBot):
         return str(self.author_obj)
 
     async def setup_hook(self) -> None:
-        for ext in EXTENSIONS:
-            try:
-                await self.load_extension(ext)
-                self._successfully_loaded.append(ext)
-                log.info("Loaded extension %s", ext)
-            except (commands.ExtensionFailed, commands.ExtensionNotFound) as e:
-                self._failed_to_load[ext] = str(e)
-                traceback.print_exc()
-                log.error("Failed to load extension %s", ext)
-            else:
-                if ext in UNLOAD_EXTENSIONS:
-                    await self.unload_extension(ext)
-                    log.warning("Unloaded extension %s", ext)
+        await self.guild_configurations_cache.load()
+        self.guild_configurations_cache.start()
+
+        await self.__load_extensions()
+        # views of messages sent before a restart, see utilities.view_store
+        self.add_dynamic_items(RestoredItem)
 
         if self.HAS_TOP_GG:
             self.topgg = topgg.DBLClient(  # type: ignore
                 self,
                 os.environ["TOPGG"],
-                autopost=True,
+                autopost=self.cluster.info.is_primary,
                 post_shard_count=True,
                 autopost_interval=60 * 60 * 12,  # 12 hours
                 session=self.http_session,
@@ -413,14 +483,74 @@ class Parrot(commands.AutoShardedBot):
                     self.ON_DOCKER = True
                     traceback.print_exc()
 
-        self.timer_task = self.loop.create_task(self.dispatch_timers())
+        await self.cluster.connect()
+        self.cluster.add_handler("timer", self.__on_cluster_timer)
+        self.cluster.add_handler("timer_created", self.__on_cluster_timer_created)
+        self.cluster.add_handler("maintenance", self.__on_cluster_maintenance)
+        self.cluster.add_handler("stats", self.__on_cluster_stats)
+
+        # timers are dispatched by the primary cluster, and forwarded to the cluster of their guild
+        if self.cluster.info.is_primary:
+            self.timer_task = self.loop.create_task(self.dispatch_timers())
 
         self.global_write_data.start()
+        self.flush_command_telemetry.start()
         self.update_banned_members.start()
         self.update_scam_link_db.start()
 
         self.strawpoll.session = self.http_session
 
+    async def __load_extensions(self) -> None:
+        """Load the extensions concurrently, skipping the disabled ones without importing them.
+
+        An extension is loaded after the extension of its parent package (`cogs.holidays`
+        before `cogs.holidays.easter`), when both are listed.
+        """
+        ini = perf_counter()
+        tasks: dict[str, asyncio.Task[None]] = {}
+
+        async def load(ext: str) -> None:
+            if (parent := self.__parent_extension(ext, tasks)) is not None:
+                await asyncio.wait([parent])
+
+            start = perf_counter()
+            try:
+                await self.load_extension(ext)
+            except (commands.ExtensionFailed, commands.ExtensionNotFound) as e:
+                self._failed_to_load[ext] = str(e)
+                traceback.print_exc()
+                log.error("Failed to load extension %s", ext)
+            else:
+                self._extension_load_times[ext] = perf_counter() - start
+                self._successfully_loaded.append(ext)
+                log.info("Loaded extension %s in %.3fs", ext, self._extension_load_times[ext])
+
+        for ext in EXTENSIONS:
+            if ext in UNLOAD_EXTENSIONS:
+                log.warning("Skipped disabled extension %s", ext)
+                continue
+            tasks[ext] = asyncio.create_task(load(ext), name=f"load-extension:{ext}")
+
+        await asyncio.gather(*tasks.values())
+        self._extensions_load_time = perf_counter() - ini
+
+    @staticmethod
+    def __parent_extension(ext: str, tasks: Mapping[str, asyncio.Task[None]]) -> asyncio.Task[None] | None:
+        parts = ext.split(".")
+        for index in range(len(parts) - 1, 0, -1):
+            if (task := tasks.get(".".join(parts[:index]))) is not None:
+                return task
+        return None
+
+    def __extension_load_report(self, *, limit: int = 10) -> str:
+        slowest = sorted(self._extension_load_times.items(), key=lambda item: item[1], reverse=True)[:limit]
+        lines = [
+            f"- Loaded {len(self._successfully_loaded)} extensions in {self._extensions_load_time:.2f}s, "
+            f"skipped {len(set(EXTENSIONS) & set(UNLOAD_EXTENSIONS))} disabled",
+            *(f"  {ext}: {elapsed:.3f}s" for ext, elapsed in slowest),
+        ]
+        return "```css\n" + "\n".join(lines) + "```"
+
     async def db_latency(self) -> float:
         ini = perf_counter()
         await self.guild_configurations.find_one({})
@@ -610,10 +740,18 @@ class Parrot(commands.AutoShardedBot):
         if self.global_write_data.is_running():
             self.global_write_data.stop()
 
+        self.guild_configurations_cache.stop()
+
+        if self.flush_command_telemetry.is_running():
+            self.flush_command_telemetry.cancel()
+        await self.write_command_telemetry(force=True)
+        await self.view_store.flush()
+
         if self.update_scam_link_db.is_running():
             self.update_scam_link_db.stop()
 
         await self.sql.close()
+        await self.cluster.close()
 
         return await super().close()
 
@@ -663,6 +801,7 @@ class Parrot(commands.AutoShardedBot):
         content += "```"
 
         await self._execute_webhook(self._startup_log_token, content=f"{content}")
+        await self._execute_webhook(self._startup_log_token, content=self.__extension_load_report())
 
         for name, error in self._failed_to_load.items():
             st = f"```css\n[{self.user.name.title()}] Failed to load {name} cog due to``````py\n{error}```"
@@ -773,6 +912,61 @@ class Parrot(commands.AutoShardedBot):
 
         await self.invoke(ctx)
 
+    async def invoke(self, ctx: Context) -> None:  # type: ignore
+        if not self.profiler.enabled or ctx.command is None:
+            return await super().invoke(ctx)
+
+        with self.profiler.measure("command", ctx.command.qualified_name) as probe:
+            await super().invoke(ctx)
+            probe.failed = ctx.command_failed  # type: ignore
+
+    async def _run_event(
+        self,
+        coro: Callable[..., Coroutine[Any, Any, Any]],
+        event_name: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        if not self.profiler.enabled:
+            return await super()._run_event(coro, event_name, *args, **kwargs)
+
+        name: str = getattr(coro, "__qualname__", event_name)
+
+        async def measured(*args: Any, **kwargs: Any) -> None:
+            with self.profiler.measure("event", name):
+                await coro(*args, **kwargs)
+
+        await super()._run_event(measured, event_name, *args, **kwargs)
+
+    def dispatch(self, event_name: str, /, *args: Any, **kwargs: Any) -> None:
+        self.waiters.dispatch(event_name, args)
+        super().dispatch(event_name, *args, **kwargs)
+
+    def wait_for(
+        self,
+        event: str,
+        /,
+        *,
+        check: Callable[..., bool] | None = None,
+        timeout: float | None = None,
+        channel_id: RoutingKey = None,
+        user_id: RoutingKey = None,
+        message_id: RoutingKey = None,
+    ) -> Coroutine[Any, Any, Any]:
+        """Same as :meth:`discord.Client.wait_for`, with optional routing keys.
+
+        When a channel, user or message ID (or a collection of IDs) is given, the
+        waiter is only checked against the events of that channel, author or
+        message. Events without a known route fall back to the default behaviour.
+        """
+        event = event.lower()
+        if (channel_id is None and user_id is None and message_id is None) or not self.waiters.supports(event):
+            return super().wait_for(event, check=check, timeout=timeout)
+
+        future = self.loop.create_future()
+        self.waiters.add(event, future, check=check, channel_id=channel_id, user_id=user_id, message_id=message_id)
+        return asyncio.wait_for(future, timeout)
+
     async def on_message(self, message: discord.Message) -> None:
         self._seen_messages += 1
 
@@ -1000,9 +1194,7 @@ class Parrot(commands.AutoShardedBot):
 
     async def __update_server_config_cache(self, guild_id: int):
         log.debug("Updating server config cache for guild %s", guild_id)
-        if data := await self.guild_configurations.find_one({"_id": guild_id}):
-            self.guild_configurations_cache[guild_id] = data
-        else:
+        if not await self.guild_configurations_cache.refresh(guild_id):
             log.debug("Guild %s not found in database, creating new one", guild_id)
             FAKE_POST = POST.copy()
             FAKE_POST["_id"] = guild_id
@@ -1085,17 +1277,69 @@ class Parrot(commands.AutoShardedBot):
 
     async def call_timer(self, collection: MongoCollection, **data: Any):
         log.debug("Calling timer: %s", data)
+        guild_id = data.get("guild")
+        if isinstance(guild_id, int) and not self.cluster.info.owns(guild_id):
+            await self.__forward_timer(collection, data, self.cluster.info.cluster_of(guild_id))
+            return
+
         deleted: DeleteResult = await collection.delete_one({"_id": data["_id"]})
 
         log.debug("Deleted timer: %s", deleted)
         if deleted.deleted_count == 0:
             return
 
+        self.__dispatch_timer(data)
+
+    async def __forward_timer(self, collection: MongoCollection, data: dict[str, Any], cluster_id: int) -> None:
+        # deleted once the cluster of the guild has it, a cluster restarting gets it on a later try
+        if await self.cluster.deliver("timer", data, to=cluster_id):
+            await collection.delete_one({"_id": data["_id"]})
+            return
+
+        log.warning("Cluster %s did not take timer %s, retrying in %ss", cluster_id, data["_id"], TIMER_RETRY_DELAY)
+        retry_at = discord.utils.utcnow().timestamp() + TIMER_RETRY_DELAY
+        await collection.update_one({"_id": data["_id"]}, {"$set": {"expires_at": retry_at}})
+
+    def __dispatch_timer(self, data: dict[str, Any]) -> None:
         if data.get("_event_name"):
             self.dispatch(f"{data['_event_name']}_timer_complete", **data)
         else:
             self.dispatch("timer_complete", **data)
 
+    def __wake_timers(self, expires_at: float) -> None:
+        self._have_data.set()
+
+        if self._current_timer and self._current_timer["expires_at"] > expires_at and self.timer_task:
+            log.debug("Cancelling current timer %s", self._current_timer)
+            self.timer_task.cancel()
+            self.timer_task = self.loop.create_task(self.dispatch_timers())
+
+    async def __on_cluster_timer(self, data: dict[str, Any]) -> bool:
+        # a cluster still connecting leaves the timer to the primary, which sends it again
+        if not self.is_ready():
+            return False
+        self.__dispatch_timer(data)
+        return True
+
+    async def __on_cluster_timer_created(self, data: dict[str, Any]) -> None:
+        self.__wake_timers(data["expires_at"])
+
+    async def __on_cluster_maintenance(self, data: dict[str, Any]) -> None:
+        self.UNDER_MAINTENANCE = data["enabled"]
+        self.UNDER_MAINTENANCE_REASON = data["reason"]
+        self.UNDER_MAINTENANCE_OVER = (
+            datetime.datetime.fromtimestamp(data["over"], datetime.timezone.utc) if data["over"] is not None else None
+        )
+
+    async def __on_cluster_stats(self, _: Any) -> dict[str, Any]:
+        return {
+            "shards": self.cluster.info.shard_ids,
+            "guilds": len(self.guilds),
+            "users": len(self.users),
+            "latency": self.latency,
+            "uptime": self.uptime.timestamp() if hasattr(self, "uptime") else None,
+        }
+
     async def short_time_dispatcher(self, collection: MongoCollection, **data: Any):
         log.debug(
             "Sleeping for %s seconds",
@@ -1171,16 +1415,11 @@ class Parrot(commands.AutoShardedBot):
         # fmt: on
         insert_data = await collection.insert_one(post)
         log.debug("Inserted data: %s", insert_data)
-        self._have_data.set()
-
-        if self._current_timer and self._current_timer["expires_at"] > expires_at:
-            self._current_timer = post
-
-            if self.timer_task:
-                log.debug("Cancelling current timer %s", self._current_timer)
-                self.timer_task.cancel()
 
-                self.timer_task = self.loop.create_task(self.dispatch_timers())
+        if self.cluster.info.is_primary:
+            self.__wake_timers(expires_at)
+        else:
+            await self.cluster.send("timer_created", {"expires_at": expires_at}, to=0)
 
         return insert_data
 
@@ -1451,6 +1690,23 @@ class Parrot(commands.AutoShardedBot):
                 await self.mongo[db][col].bulk_write(self.__global_write_data[db_col])
             self.__global_write_data = {}
 
+    @tasks.loop(minutes=1)
+    async def flush_command_telemetry(self):
+        await self.write_command_telemetry()
+
+    async def write_command_telemetry(self, *, force: bool = False) -> None:
+        rollup_ops, counter_ops = self.command_telemetry.drain(force=force)
+        try:
+            if rollup_ops:
+                await self.command_rollups.bulk_write(rollup_ops, ordered=False)
+                rollup_ops = []
+            if counter_ops:
+                await self.command_collections.bulk_write(counter_ops, ordered=False)
+        except PyMongoError as e:
+            # retried by the next write, along with the minutes finished by then
+            self.command_telemetry.requeue(rollup_ops, counter_ops)
+            log.warning("Failed to write command telemetry", exc_info=e)
+
     def add_global_write_data(
         self,
         *,
@@ -14,4 +14,6 @@ __all__ = (
     "ParrotSelect",
     "ParrotLinkView",
     "ParrotModal",
+    "PersistentView",
+    "persistent_id",
 )
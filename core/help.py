@@ -281,7 +281,8 @@ class PaginatedHelpCommand(commands.HelpCommand):
         #     bot.commands, sort=True, key=key
         # )
         if not self.__all_commands:
-            entries = bot.cogs
+            # sorted, the cogs are registered in whichever order their extensions finished loading
+            entries = sorted(bot.cogs)
             all_commands: dict[Cog, list[commands.Command]] = {}
             for real_cog in entries:
                 cog: Cog = bot.get_cog(real_cog)  # type: ignore
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import traceback
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from discord.enums import ButtonStyle
 from discord.interactions import Interaction
@@ -9,9 +9,22 @@ from discord.interactions import Interaction
 import discord
 
 if TYPE_CHECKING:
-    from . import Context
+    from typing_extensions import Self
 
-__all__ = ("ParrotView", "ParrotButton", "ParrotSelect", "ParrotLinkView", "ParrotModal")
+    from . import Context, Parrot
+
+__all__ = (
+    "ParrotView",
+    "ParrotButton",
+    "ParrotSelect",
+    "ParrotLinkView",
+    "ParrotModal",
+    "PersistentView",
+    "persistent_id",
+)
+
+# Custom IDs of the items of persistent views, restored by ``utilities.view_store.RestoredItem``.
+PERSISTENT_ID_PREFIX = "pv"
 
 
 class ParrotItem(discord.ui.Item):
@@ -88,6 +101,53 @@ class ParrotView(discord.ui.View):
         await interaction.response.send_message(f"An error occurred: {err}", ephemeral=True)
 
 
+def persistent_id(kind: str, name: str) -> str:
+    """Custom ID of the item `name` of the persistent views of `kind`."""
+    return f"{PERSISTENT_ID_PREFIX}:{kind}:{name}"
+
+
+class PersistentView(ParrotView):
+    """A view which outlives the process, restored from its state after a restart.
+
+    Subclasses name their `kind`, give every item a custom ID made by
+    :func:`persistent_id`, and convert themselves to and from a compact state: a
+    list of plain values, stored as is. `persist` stores the state, `forget` drops
+    it; a state is also dropped `ttl` seconds after it was last stored, or when
+    the `version` of the view changes.
+
+    After a restart, the first click on the message loads the state back through
+    ``Parrot.view_store``, and the view takes over the message.
+    """
+
+    kinds: ClassVar[dict[str, type[PersistentView]]] = {}
+
+    kind: ClassVar[str]
+    version: ClassVar[int] = 1
+    ttl: ClassVar[float] = 24 * 60 * 60
+
+    bot: Parrot
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if kind := cls.__dict__.get("kind"):
+            PersistentView.kinds[kind] = cls
+
+    def to_state(self) -> list[Any]:
+        raise NotImplementedError
+
+    @classmethod
+    def from_state(cls, bot: Parrot, state: list[Any]) -> Self:
+        raise NotImplementedError
+
+    def persist(self) -> None:
+        """Store the state of the view, written shortly after with the changes around it."""
+        self.bot.view_store.save(self)
+
+    def forget(self) -> None:
+        """Drop the stored state, the view is over."""
+        self.bot.view_store.delete(self)
+
+
 class ParrotButton(discord.ui.Button["ParrotView"]):
     def __init__(
         self,
@@ -0,0 +1,58 @@
+"""Compare the trie scanner with the alternation regexes it replaced.
+
+    python -m emojis.benchmark
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import timeit
+
+from . import db, emojis
+from .db.db import EMOJI_DB
+
+
+def regex_scanner() -> tuple[re.Pattern[str], re.Pattern[str]]:
+    """The regexes ``emojis`` used to compile on import: (alias pattern, emoji pattern)."""
+    alias_to_emoji = db.get_emoji_aliases()
+    by_length = sorted(alias_to_emoji.values(), key=len, reverse=True)
+    return (
+        re.compile("({})".format("|".join(re.escape(alias) for alias in alias_to_emoji))),
+        re.compile("({})".format("|".join(re.escape(emoji) for emoji in by_length))),
+    )
+
+
+def messages(amount: int = 200, *, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    codes = [emoji.emoji for emoji in EMOJI_DB]
+    words = "the quick brown fox jumps over the lazy dog 12 # * :) lol".split()
+
+    result: list[str] = []
+    for _ in range(amount):
+        parts = [rng.choice(codes) if rng.random() < 0.15 else rng.choice(words) for _ in range(rng.randint(5, 80))]
+        result.append(" ".join(parts))
+    return result
+
+
+def main() -> None:
+    build_regex = timeit.timeit(regex_scanner, number=1)
+    emojis._aliases.cache_clear()
+    emojis._trie.cache_clear()
+    build_trie = timeit.timeit(emojis._trie, number=1)
+    print(f"build: regex {build_regex * 1000:.1f}ms, trie {build_trie * 1000:.1f}ms")
+
+    _, emoji_re = regex_scanner()
+    sample = messages()
+    for name, old, new in (
+        ("count", lambda: [len(emoji_re.findall(m)) for m in sample], lambda: [emojis.count(m) for m in sample]),
+        ("get", lambda: [set(emoji_re.findall(m)) for m in sample], lambda: [emojis.get(m) for m in sample]),
+    ):
+        assert old() == new()
+        old_time = min(timeit.repeat(old, number=10, repeat=3))
+        new_time = min(timeit.repeat(new, number=10, repeat=3))
+        print(f"{name}: regex {old_time * 100:.2f}ms, trie {new_time * 100:.2f}ms per {len(sample)} messages ({old_time / new_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,45 @@
 from __future__ import annotations
 
+from functools import cache
+
 from . import db
 
 
+@cache
+def _by_code():
+    index = {}
+    for emoji in db.EMOJI_DB:
+        # the first Emoji wins, as when the database was scanned
+        index.setdefault(emoji.emoji, emoji)
+    return index
+
+
+@cache
+def _by_alias():
+    index = {}
+    for emoji in db.EMOJI_DB:
+        for alias in emoji.aliases:
+            index.setdefault(alias, emoji)
+    return index
+
+
+@cache
+def _by_tag():
+    index = {}
+    for emoji in db.EMOJI_DB:
+        for tag in dict.fromkeys(emoji.tags):
+            index.setdefault(tag, []).append(emoji)
+    return index
+
+
+@cache
+def _by_category():
+    index = {}
+    for emoji in db.EMOJI_DB:
+        index.setdefault(emoji.category.lower(), []).append(emoji)
+    return index
+
+
 def get_emoji_aliases():
     """Returns all Emojis as a dict (key = alias, value = unicode).
     :rtype: dict.
@@ -22,10 +59,7 @@ def get_emoji_by_code(code):
     :param code: Emoji Unicode code.
     :rtype: emojis.db.Emoji.
     """
-    try:
-        return next(filter(lambda emoji: code == emoji.emoji, db.EMOJI_DB))
-    except StopIteration:
-        return None
+    return _by_code().get(code)
 
 
 def get_emoji_by_alias(alias):
@@ -33,10 +67,7 @@ def get_emoji_by_alias(alias):
     :param alias: Emoji alias.
     :rtype: emojis.db.Emoji.
     """
-    try:
-        return next(filter(lambda emoji: alias in emoji.aliases, db.EMOJI_DB))
-    except StopIteration:
-        return None
+    return _by_alias().get(alias)
 
 
 def get_emojis_by_tag(tag):
@@ -44,7 +75,7 @@ def get_emojis_by_tag(tag):
     :param tag: Tag name to filter (case-insensitive).
     :rtype: iter.
     """
-    return filter(lambda emoji: tag.lower() in emoji.tags, db.EMOJI_DB)
+    return iter(_by_tag().get(tag.lower(), ()))
 
 
 def get_emojis_by_category(category):
@@ -52,14 +83,14 @@ def get_emojis_by_category(category):
     :param tag: Category name to filter (case-insensitive).
     :rtype: iter.
     """
-    return filter(lambda emoji: category.lower() == emoji.category.lower(), db.EMOJI_DB)
+    return iter(_by_category().get(category.lower(), ()))
 
 
 def get_tags():
     """Returns all tags available.
     :rtype: set.
     """
-    return {tag for emoji in db.EMOJI_DB for tag in emoji.tags}
+    return set(_by_tag())
 
 
 def get_categories():
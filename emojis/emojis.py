@@ -1,16 +1,70 @@
+from __future__ import annotations
+
 import re
+from collections.abc import Iterator
+from functools import cache
+from typing import Any
 
 from . import db
 
-ALIAS_TO_EMOJI = db.get_emoji_aliases()
-EMOJI_TO_ALIAS = {v: k for k, v in ALIAS_TO_EMOJI.items()}
-EMOJI_TO_ALIAS_SORTED = sorted(ALIAS_TO_EMOJI.values(), key=len, reverse=True)
+# key of the emoji ending at a node of the trie, no emoji character is empty
+_END = ""
+
+
+@cache
+def _aliases() -> tuple[dict[str, str], dict[str, str]]:
+    """(alias -> emoji, emoji -> alias), built on first use."""
+    alias_to_emoji = db.get_emoji_aliases()
+    return alias_to_emoji, {v: k for k, v in alias_to_emoji.items()}
+
+
+@cache
+def _trie() -> tuple[dict[str, Any], re.Pattern[str]]:
+    """Codepoint trie of the emojis, and a pattern finding the characters an emoji can start with."""
+    root: dict[str, Any] = {}
+    for emoji in _aliases()[1]:
+        node = root
+        for char in emoji:
+            node = node.setdefault(char, {})
+        node[_END] = emoji
+
+    starts = re.compile("[{}]".format("".join(re.escape(char) for char in root)))
+    return root, starts
+
+
+def _scan(msg: str) -> Iterator[tuple[int, int, str]]:
+    """(start, end, emoji) of the emojis in the message, the longest one wherever several match."""
+    root, starts = _trie()
+    pos = 0
+    # the pattern skips the text which can not start an emoji, in C
+    while (match := starts.search(msg, pos)) is not None:
+        start = end = match.start()
+        found: str | None = None
 
-RE_TEXT_TO_EMOJI_GROUP = "({})".format("|".join([re.escape(emoji) for emoji in ALIAS_TO_EMOJI]))
-RE_TEXT_TO_EMOJI = re.compile(RE_TEXT_TO_EMOJI_GROUP)
+        node = root
+        for index in range(start, len(msg)):
+            node = node.get(msg[index])
+            if node is None:
+                break
+            if _END in node:
+                found, end = node[_END], index + 1
 
-RE_EMOJI_TO_TEXT_GROUP = "({})".format("|".join([re.escape(emoji) for emoji in EMOJI_TO_ALIAS_SORTED]))
-RE_EMOJI_TO_TEXT = re.compile(RE_EMOJI_TO_TEXT_GROUP)
+        if found is None:
+            pos = start + 1
+            continue
+
+        yield start, end, found
+        pos = end
+
+
+def __getattr__(name: str) -> Any:
+    # the mappings used to be built on import
+    if name == "ALIAS_TO_EMOJI":
+        return _aliases()[0]
+    if name == "EMOJI_TO_ALIAS":
+        return _aliases()[1]
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
 
 
 def encode(msg) -> str:
@@ -22,8 +76,24 @@ def encode(msg) -> str:
         >>> emojis.encode('This is a message with emojis :smile: :snake:')
         'This is a message with emojis 😄 🐍'.
     """
-    msg = RE_TEXT_TO_EMOJI.sub(lambda match: ALIAS_TO_EMOJI[match.group(0)], msg)
-    return msg
+    alias_to_emoji = _aliases()[0]
+    parts: list[str] = []
+    last = 0
+
+    # aliases have no colon in them, so an alias can only be the text between two consecutive colons
+    start = msg.find(":")
+    while start != -1 and (end := msg.find(":", start + 1)) != -1:
+        if (emoji := alias_to_emoji.get(msg[start : end + 1])) is None:
+            start = end
+            continue
+
+        parts.append(msg[last:start])
+        parts.append(emoji)
+        last = end + 1
+        start = msg.find(":", last)
+
+    parts.append(msg[last:])
+    return "".join(parts)
 
 
 def decode(msg) -> str:
@@ -35,8 +105,16 @@ def decode(msg) -> str:
         >>> emojis.decode('This is a message with emojis 😄 🐍')
         'This is a message with emojis :smile: :snake:'.
     """
-    msg = RE_EMOJI_TO_TEXT.sub(lambda match: EMOJI_TO_ALIAS[match.group(0)], msg)
-    return msg
+    emoji_to_alias = _aliases()[1]
+    parts: list[str] = []
+    last = 0
+    for start, end, emoji in _scan(msg):
+        parts.append(msg[last:start])
+        parts.append(emoji_to_alias[emoji])
+        last = end
+
+    parts.append(msg[last:])
+    return "".join(parts)
 
 
 def get(msg) -> set:
@@ -44,7 +122,7 @@ def get(msg) -> set:
     :param msg: String to search for Emojis.
     :rtype: set.
     """
-    return {match.group() for match in RE_EMOJI_TO_TEXT.finditer(msg)}
+    return {emoji for _, _, emoji in _scan(msg)}
 
 
 def iter(msg):
@@ -52,7 +130,7 @@ def iter(msg):
     :param msg: String to search for Emojis.
     :rtype: iterator.
     """
-    return (match.group() for match in RE_EMOJI_TO_TEXT.finditer(msg))
+    return (emoji for _, _, emoji in _scan(msg))
 
 
 def count(msg, unique=False):
@@ -62,5 +140,5 @@ def count(msg, unique=False):
     :rtype: int.
     """
     if unique:
-        return len({match.group() for match in RE_EMOJI_TO_TEXT.finditer(msg)})
-    return len([match.group() for match in RE_EMOJI_TO_TEXT.finditer(msg)])
+        return len(get(msg))
+    return sum(1 for _ in _scan(msg))
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+import discord
+
+if TYPE_CHECKING:
+    from core import Parrot
+
+log = logging.getLogger("events._starboard")
+
+STAR = "\N{WHITE MEDIUM STAR}"
+TWO_WEEK = 1209600
+# Reactions coming in during this many seconds are written and rendered once.
+DEBOUNCE = 5.0
+# Starred messages whose state is held in memory.
+MAX_STATES = 1024
+
+
+def star_gradient_colour(stars: int) -> int:
+    p = stars / 13
+    p = min(p, 1.0)
+    red = 255
+    green = int((194 * p) + (253 * (1 - p)))
+    blue = int((12 * p) + (247 * (1 - p)))
+    return (red << 16) + (green << 8) + blue
+
+
+def star_emoji(stars: int) -> str:
+    if 5 > stars >= 0:
+        return "\N{WHITE MEDIUM STAR}"
+    if 10 > stars >= 5:
+        return "\N{GLOWING STAR}"
+    return "\N{DIZZY SYMBOL}" if 25 > stars >= 10 else "\N{SPARKLES}"
+
+
+class StarState:
+    __slots__ = (
+        "message_id",
+        "channel_id",
+        "guild_id",
+        "author_id",
+        "starrers",
+        "baseline",
+        "bot_message_id",
+        "embed",
+        "rendered",
+        "dirty",
+        "task",
+    )
+
+    def __init__(self, message_id: int, *, channel_id: int, guild_id: int, author_id: int | None) -> None:
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.author_id = author_id
+        self.starrers: set[int] = set()
+        # number of star reactions, which counts the ones given while nobody was watching
+        self.baseline = 0
+        self.bot_message_id: int | None = None
+        self.embed: discord.Embed | None = None
+        # star count of the starboard post as last sent or edited
+        self.rendered: int | None = None
+        self.dirty = False
+        self.task: asyncio.Task[None] | None = None
+
+    @property
+    def count(self) -> int:
+        return max(len(self.starrers), self.baseline)
+
+    @property
+    def busy(self) -> bool:
+        return self.dirty or self.task is not None
+
+
+class StarboardEngine:
+    """Starboard state of the recently starred messages, with debounced updates.
+
+    Reactions only change the in-memory state of the message. The first reaction
+    schedules a sync :data:`DEBOUNCE` seconds later, which writes the state to the
+    database and creates, edits or deletes the starboard post once for every
+    reaction received in between.
+    """
+
+    def __init__(self, bot: Parrot, *, delay: float = DEBOUNCE, max_states: int = MAX_STATES) -> None:
+        self.bot = bot
+        self.delay = delay
+        self.max_states = max_states
+
+        self.__states: OrderedDict[int, StarState] = OrderedDict()
+        # starboard post ID -> starred message ID, stars on the post count too
+        self.__posts: dict[int, int] = {}
+        self.__loading: dict[int, asyncio.Future[StarState | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__states)
+
+    def resolve(self, message_id: int) -> int:
+        """ID of the starred message, given it or its starboard post."""
+        return self.__posts.get(message_id, message_id)
+
+    async def react(self, payload: discord.RawReactionActionEvent, *, added: bool) -> None:
+        state = await self.state(payload, added=added)
+        if state is None:
+            return
+
+        if payload.user_id == state.author_id and not self.config(state.guild_id).get("can_self_star", False):
+            return
+
+        if added:
+            state.starrers.add(payload.user_id)
+            state.baseline += 1
+        else:
+            state.starrers.discard(payload.user_id)
+            state.baseline = max(state.baseline - 1, 0)
+
+        self.schedule(state)
+
+    def schedule(self, state: StarState) -> None:
+        state.dirty = True
+        if state.task is None:
+            state.task = asyncio.create_task(self.__settle(state))
+
+    def config(self, guild_id: int) -> dict[str, Any]:
+        return self.bot.guild_configurations_cache.starboard(guild_id)  # type: ignore
+
+    async def state(self, payload: discord.RawReactionActionEvent, *, added: bool) -> StarState | None:
+        message_id = self.resolve(payload.message_id)
+        if (state := self.__states.get(message_id)) is not None:
+            self.__states.move_to_end(message_id)
+            return state
+
+        if (pending := self.__loading.get(message_id)) is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[StarState | None] = asyncio.get_running_loop().create_future()
+        self.__loading[message_id] = future
+        try:
+            state = await self.__load(payload, added=added)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            if state is not None:
+                self.__remember(state)
+            future.set_result(state)
+            return state
+        finally:
+            del self.__loading[message_id]
+
+    async def __load(self, payload: discord.RawReactionActionEvent, *, added: bool) -> StarState | None:
+        if data := await self.bot.starboards.find_one(
+            {"$or": [{"message_id.bot": payload.message_id}, {"message_id.author": payload.message_id}]},
+        ):
+            state = StarState(
+                data["message_id"]["author"],
+                channel_id=data["channel_id"],
+                guild_id=data["guild_id"],
+                author_id=data.get("author_id"),
+            )
+            state.starrers.update(data.get("starrer", []))
+            state.baseline = data.get("number_of_stars", 0)
+            state.bot_message_id = data["message_id"]["bot"]
+            state.rendered = state.count
+            return state
+
+        # first star seen on the message, once per message instead of once per reaction
+        message: discord.Message | None = await self.bot.get_or_fetch_message(payload.channel_id, payload.message_id)
+        if message is None:
+            return None
+
+        state = StarState(
+            payload.message_id,
+            channel_id=payload.channel_id,
+            guild_id=payload.guild_id,  # type: ignore
+            author_id=message.author.id,
+        )
+        # the reaction being handled may already be counted, it is applied afterwards
+        state.baseline = max(self.__reaction_count(message) - 1 if added else self.__reaction_count(message) + 1, 0)
+        return state
+
+    def __remember(self, state: StarState) -> None:
+        self.__states[state.message_id] = state
+        if state.bot_message_id is not None:
+            self.__posts[state.bot_message_id] = state.message_id
+
+        if len(self.__states) <= self.max_states:
+            return
+        for message_id, old in list(self.__states.items()):
+            if len(self.__states) <= self.max_states:
+                break
+            if not old.busy:
+                self.__forget(message_id)
+
+    def __forget(self, message_id: int) -> StarState | None:
+        state = self.__states.pop(message_id, None)
+        if state is not None and state.bot_message_id is not None:
+            self.__posts.pop(state.bot_message_id, None)
+        return state
+
+    async def clear(self, message_id: int) -> None:
+        """Every reaction of the message was removed."""
+        message_id = self.resolve(message_id)
+        if (state := self.__forget(message_id)) is not None and state.task is not None:
+            state.task.cancel()
+        await self.bot.starboards.delete_one(
+            {"$or": [{"message_id.bot": message_id}, {"message_id.author": message_id}]},
+        )
+
+    async def close(self) -> None:
+        """Sync every pending state now."""
+        for state in list(self.__states.values()):
+            if state.task is not None:
+                state.task.cancel()
+                state.task = None
+            if state.dirty:
+                state.dirty = False
+                try:
+                    await self.__sync(state)
+                except Exception:  # noqa: BLE001
+                    log.exception("Failed to sync the starboard state of %s", state.message_id)
+
+    async def __settle(self, state: StarState) -> None:
+        try:
+            while state.dirty:
+                await asyncio.sleep(self.delay)
+                state.dirty = False
+                await self.__sync(state)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001
+            log.exception("Failed to sync the starboard state of %s", state.message_id)
+        finally:
+            state.task = None
+
+    async def __sync(self, state: StarState) -> None:
+        config = self.config(state.guild_id)
+        limit: int = config.get("limit") or 0
+        count = state.count
+
+        if state.bot_message_id is None:
+            if limit and count >= limit and not config.get("is_locked"):
+                await self.__post(state, config)
+            return
+
+        if count < limit or count == 0:
+            await self.__delete_post(state, config)
+            return
+
+        await self.bot.starboards.update_one(
+            {"message_id.author": state.message_id},
+            {"$set": {"starrer": list(state.starrers), "number_of_stars": count}},
+        )
+        if count != state.rendered:
+            await self.__edit_post(state, config)
+
+    def __channel(self, channel_id: int | None) -> discord.TextChannel | None:
+        return self.bot.get_channel(channel_id) if channel_id else None  # type: ignore
+
+    def __content(self, state: StarState, count: int) -> str:
+        jump_url = f"https://discord.com/channels/{state.guild_id}/{state.channel_id}/{state.message_id}"
+        return f"{star_emoji(count)} {count} | In: <#{state.channel_id}> | Message ID: {state.message_id}\n> {jump_url}"
+
+    async def __post(self, state: StarState, config: dict[str, Any]) -> None:
+        starboard_channel = self.__channel(config.get("channel"))
+        message: discord.Message | None = await self.bot.get_or_fetch_message(state.channel_id, state.message_id)
+        if starboard_channel is None or message is None:
+            return
+
+        count = state.count
+        embed = self.make_embed(message, count)
+        bot_message = await starboard_channel.send(self.__content(state, count), embed=embed)
+
+        state.bot_message_id = bot_message.id
+        state.embed = embed
+        state.rendered = count
+        self.__posts[bot_message.id] = state.message_id
+
+        post: dict[str, Any] = {
+            "message_id": {"bot": bot_message.id, "author": message.id},
+            "channel_id": message.channel.id,
+            "author_id": message.author.id,
+            "guild_id": message.guild.id,  # type: ignore
+            "created_at": message.created_at.timestamp(),
+            "content": message.content,
+            "number_of_stars": count,
+            "starrer": list(state.starrers),
+        }
+        if message.attachments:
+            if message.attachments[0].url.lower().endswith(("png", "jpeg", "jpg", "gif", "webp")):
+                post["picture"] = message.attachments[0].url
+            else:
+                post["attachment"] = message.attachments[0].url
+        await self.bot.starboards.insert_one(post)
+
+    async def __edit_post(self, state: StarState, config: dict[str, Any]) -> None:
+        starboard_channel = self.__channel(config.get("channel"))
+        if starboard_channel is None or state.bot_message_id is None:
+            return
+
+        if state.embed is None:
+            # loaded from the database, the post is fetched once for its embed
+            bot_message = await self.bot.get_or_fetch_message(starboard_channel, state.bot_message_id)
+            if bot_message is None or not bot_message.embeds:
+                return
+            state.embed = bot_message.embeds[0]
+
+        count = state.count
+        state.embed.color = star_gradient_colour(count)
+        try:
+            await starboard_channel.get_partial_message(state.bot_message_id).edit(
+                content=self.__content(state, count),
+                embed=state.embed,
+            )
+        except discord.NotFound:
+            await self.__delete_post(state, config)
+            return
+        state.rendered = count
+
+    async def __delete_post(self, state: StarState, config: dict[str, Any]) -> None:
+        await self.bot.starboards.delete_one({"message_id.author": state.message_id})
+        if state.bot_message_id is None:
+            return
+
+        if (starboard_channel := self.__channel(config.get("channel"))) is not None:
+            try:
+                await starboard_channel.get_partial_message(state.bot_message_id).delete()
+            except discord.HTTPException:
+                pass
+
+        self.__posts.pop(state.bot_message_id, None)
+        state.bot_message_id = None
+        state.embed = None
+        state.rendered = None
+
+    @staticmethod
+    def make_embed(message: discord.Message, count: int) -> discord.Embed:
+        embed = discord.Embed(timestamp=message.created_at, color=star_gradient_colour(count))
+        embed.set_footer(text=f"ID: {message.author.id}")
+        embed.set_author(
+            name=str(message.author),
+            icon_url=message.author.display_avatar.url,
+            url=message.jump_url,
+        )
+        if message.content:
+            embed.description = message.content
+        if message.attachments:
+            if message.attachments[0].url.lower().endswith(("png", "jpeg", "jpg", "gif", "webp")):
+                embed.set_image(url=message.attachments[0].url)
+            else:
+                embed.add_field(
+                    name="Attachment",
+                    value=f"[{message.attachments[0].filename}]({message.attachments[0].url})",
+                )
+        return embed
+
+    @staticmethod
+    def __reaction_count(message: discord.Message) -> int:
+        for reaction in message.reactions:
+            if str(reaction.emoji) == STAR:
+                return reaction.count
+        return 0
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import contextlib
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import discord
 from cogs.giveaway.method import end_giveaway
 from core import Cog, Parrot
 from utilities.time import ShortTime
 
+if TYPE_CHECKING:
+    from cogs.giveaway.giveaway import Giveaways
+
 
 class EventCustom(Cog):
     def __init__(self, bot: Parrot) -> None:
@@ -150,6 +153,10 @@ class EventCustom(Cog):
         await self.bot.create_timer(**post)
 
     async def _parse_giveaway(self, **kw: Any) -> None:
+        cog: Giveaways | None = self.bot.get_cog("Giveaways")  # type: ignore
+        if cog is not None:
+            await cog.close_entries(kw["message_id"])
+
         data: dict[str, Any] = await self.bot.giveaways.find_one(
             {
                 "message_id": kw.get("message_id"),
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from pymongo import UpdateOne
+
+if TYPE_CHECKING:
+    from core import Parrot
+
+
+class HubChannel(NamedTuple):
+    channel_id: int
+    author: int
+    index: int
+
+    def to_dict(self) -> dict[str, int]:
+        return self._asdict()
+
+
+class HubRegistry:
+    """Temporary hub voice channels of every guild, held in memory.
+
+    Lookups on voice state updates never touch the database. Creations and deletions
+    mark the guild as dirty, and :meth:`flush` writes the whole list of every dirty
+    guild in a single bulk write.
+    """
+
+    def __init__(self) -> None:
+        # guild ID -> channel ID -> hub channel
+        self.__guilds: dict[int, dict[int, HubChannel]] = {}
+        self.__dirty: set[int] = set()
+
+    def __len__(self) -> int:
+        return sum(len(channels) for channels in self.__guilds.values())
+
+    def load(self, guild_id: int, channels: list[dict[str, Any]]) -> None:
+        hubs: dict[int, HubChannel] = {}
+        used: set[int] = set()
+        for data in channels:
+            # old documents have no index, they get the lowest free one
+            index = data.get("index") or self.__lowest_free(used)
+            used.add(index)
+            hubs[data["channel_id"]] = HubChannel(data["channel_id"], data["author"], index)
+
+        if hubs:
+            self.__guilds[guild_id] = hubs
+
+    def get(self, guild_id: int, channel_id: int) -> HubChannel | None:
+        if hubs := self.__guilds.get(guild_id):
+            return hubs.get(channel_id)
+        return None
+
+    def owner(self, guild_id: int, channel_id: int) -> int | None:
+        hub = self.get(guild_id, channel_id)
+        return hub.author if hub else None
+
+    def next_index(self, guild_id: int) -> int:
+        hubs = self.__guilds.get(guild_id, {})
+        return self.__lowest_free({hub.index for hub in hubs.values()})
+
+    def add(self, guild_id: int, *, channel_id: int, author: int, index: int) -> HubChannel:
+        hub = HubChannel(channel_id, author, index)
+        self.__guilds.setdefault(guild_id, {})[channel_id] = hub
+        self.__dirty.add(guild_id)
+        return hub
+
+    def remove(self, guild_id: int, channel_id: int) -> HubChannel | None:
+        hubs = self.__guilds.get(guild_id)
+        if not hubs or (hub := hubs.pop(channel_id, None)) is None:
+            return None
+
+        if not hubs:
+            del self.__guilds[guild_id]
+        self.__dirty.add(guild_id)
+        return hub
+
+    async def flush(self, bot: Parrot) -> None:
+        if not self.__dirty:
+            return
+
+        dirty, self.__dirty = self.__dirty, set()
+        operations = [
+            UpdateOne(
+                {"_id": guild_id},
+                {"$set": {"hub_temp_channels": [hub.to_dict() for hub in self.__guilds.get(guild_id, {}).values()]}},
+            )
+            for guild_id in dirty
+        ]
+        try:
+            await bot.guild_configurations.bulk_write(operations, ordered=False)
+        except Exception:
+            self.__dirty |= dirty
+            raise
+
+    @staticmethod
+    def __lowest_free(used: set[int]) -> int:
+        index = 1
+        while index in used:
+            index += 1
+        return index
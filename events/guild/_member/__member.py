@@ -17,12 +17,7 @@ class _MemberJoin(Cog):
 
     @Cog.listener("on_member_remove")
     async def on_member_kick(self, member: discord.Member) -> None:
-        try:
-            premium: bool = self.bot.guild_configurations_cache[member.guild.id]["premium"]
-        except KeyError:
-            premium: bool = False  # type: ignore
-
-        if not premium:
+        if not self.bot.guild_configurations_cache.premium(member.guild.id):
             return
 
         RETRY = 3
@@ -47,12 +42,7 @@ class _MemberJoin(Cog):
 
     @Cog.listener("on_member_join")
     async def on_invite(self, member: discord.Member) -> None:
-        try:
-            premium: bool = self.bot.guild_configurations_cache[member.guild.id]["premium"]
-        except KeyError:
-            premium: bool = False  # type: ignore
-
-        if not premium:
+        if not self.bot.guild_configurations_cache.premium(member.guild.id):
             return
 
         RETRY: int = 3
@@ -114,12 +104,7 @@ class _MemberJoin(Cog):
         guild: discord.Guild | discord.PartialInviteGuild | discord.Object | None = invite.guild
         if guild is None:
             return
-        try:
-            premium: bool = self.bot.guild_configurations_cache[guild.id]["premium"]
-        except KeyError:
-            premium: bool = False  # type: ignore
-
-        if not premium:
+        if not self.bot.guild_configurations_cache.premium(guild.id):
             return
 
         self._cache.get(guild.id, []).append(invite)
@@ -129,12 +114,7 @@ class _MemberJoin(Cog):
         guild: discord.Guild | discord.PartialInviteGuild | discord.Object | None = invite.guild
         if guild is None:
             return
-        try:
-            premium: bool = self.bot.guild_configurations_cache[guild.id]["premium"]
-        except KeyError:
-            premium: bool = False  # type: ignore
-
-        if not premium:
+        if not self.bot.guild_configurations_cache.premium(guild.id):
             return
 
         for invite in self._cache.get(guild.id, []):
@@ -1,28 +1,30 @@
 from __future__ import annotations
 
+import logging
 from contextlib import suppress
 
 from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
 
 import discord
 from core import Cog, Parrot
+from discord.ext import tasks
 
+from ._hub import HubRegistry
 from ._member import _MemberJoin as MemberJoin
 
+log = logging.getLogger("events.guild.member")
+
 
 class Member(Cog, command_attrs={"hidden": True}):
     def __init__(self, bot: Parrot) -> None:
         self.bot = bot
         self.muted: dict[int, set[int]] = {}  # {GUILD_ID: {*MEMBER_IDS}}
+        self.hubs = HubRegistry()
 
     @Cog.listener()
     async def on_member_join(self, member: discord.Member):
-        try:
-            role = int(self.bot.guild_configurations_cache[member.guild.id]["mute_role"] or 0)
-            role: discord.Role | None = member.guild.get_role(role)
-        except KeyError:
-            role = discord.utils.get(member.guild.roles, name="Muted")
-
+        role = member.guild.get_role(self.bot.guild_configurations_cache.mute_role(member.guild.id) or 0)
         if role is None:
             role = discord.utils.get(member.guild.roles, name="Muted")
 
@@ -43,11 +45,7 @@ class Member(Cog, command_attrs={"hidden": True}):
         member = payload.user
         if isinstance(member, discord.User) or member.bot:
             return
-        try:
-            role = int(self.bot.guild_configurations_cache[payload.guild_id]["mute_role"] or 0)
-            role = member.guild.get_role(role)
-        except KeyError:
-            role = discord.utils.find(lambda m: "muted" in m.name.lower(), member.roles)
+        role = member.guild.get_role(self.bot.guild_configurations_cache.mute_role(payload.guild_id) or 0)
         if role is None:
             role = discord.utils.find(lambda m: "muted" in m.name.lower(), member.roles)
 
@@ -74,76 +72,58 @@ class Member(Cog, command_attrs={"hidden": True}):
         with suppress(discord.Forbidden):
             await member.send(error)
 
-    async def _get_index(self, guild: discord.Guild) -> int:
-        if data := await self.bot.guild_configurations.find_one({"_id": guild.id, "hub_temp_channels": {"$exists": True}}):
-            return len(data["hub_temp_channels"]) + 1
-
-        return 1
-
     async def __on_voice_channel_join(
         self,
         channel: discord.VoiceChannel | discord.StageChannel,
         member: discord.Member,
     ):
-        try:
-            self.bot.guild_configurations_cache[member.guild.id]["hub"]
-        except KeyError:
+        hub = self.bot.guild_configurations_cache.hub(member.guild.id)
+        if hub is None or channel.id != hub:
+            return
+
+        perms = member.guild.me.guild_permissions
+        if not all([perms.manage_permissions, perms.manage_channels, perms.move_members]):
             return
+
+        if channel.category:
+            index = self.hubs.next_index(member.guild.id)
+            hub_channel = await member.guild.create_voice_channel(
+                f"[#{index}] {member.name}",
+                category=channel.category,
+            )
+            self.hubs.add(member.guild.id, channel_id=hub_channel.id, author=member.id, index=index)
+            await member.edit(
+                voice_channel=hub_channel,
+                reason=f"{member} ({member.id}) created their Hub",
+            )
         else:
-            perms = member.guild.me.guild_permissions
-            if not all([perms.manage_permissions, perms.manage_channels, perms.move_members]):
-                return
-            if channel.id == self.bot.guild_configurations_cache[member.guild.id]["hub"]:
-                if channel.category:
-                    hub_channel = await member.guild.create_voice_channel(
-                        f"[#{await self._get_index(member.guild)}] {member.name}",
-                        category=channel.category,
-                    )
-                    await self.bot.guild_configurations.update_one(
-                        {"_id": member.guild.id},
-                        {
-                            "$addToSet": {
-                                "hub_temp_channels": {
-                                    "channel_id": hub_channel.id,
-                                    "author": member.id,
-                                },
-                            },
-                        },
-                    )
-                    await member.edit(
-                        voice_channel=hub_channel,
-                        reason=f"{member} ({member.id}) created their Hub",
-                    )
-                else:
-                    await self.__notify_member(
-                        f"{member.mention} falied to create Hub for you. As the base Category is unreachable by the bot",
-                        member=member,
-                    )
+            await self.__notify_member(
+                f"{member.mention} falied to create Hub for you. As the base Category is unreachable by the bot",
+                member=member,
+            )
 
     async def __on_voice_channel_remove(
         self,
         channel: discord.VoiceChannel | discord.StageChannel,
         member: discord.Member,
     ):
-        if data := await self.bot.guild_configurations.find_one(
-            {
-                "_id": member.guild.id,
-                "hub_temp_channels.channel_id": channel.id,
-                "hub_temp_channels.author": member.id,
-            },
-        ):
-            perms = member.guild.me.guild_permissions
-            if not all([perms.manage_permissions, perms.manage_channels, perms.move_members]):
-                return
-            for ch in data["hub_temp_channels"]:
-                if ch["channel_id"] == channel.id and ch["author"] == member.id:
-                    hub_channel = await self.bot.getch(self.bot.get_channel, self.bot.fetch_channel, channel.id)
-                    await self.bot.guild_configurations.update_one(
-                        {"_id": member.guild.id},
-                        {"$pull": {"hub_temp_channels": {"channel_id": hub_channel.id}}},
-                    )
-                    await hub_channel.delete(reason=f"{member} ({member.id}) left their Hub")
-                    return
+        if self.hubs.owner(member.guild.id, channel.id) != member.id:
+            return
+
+        perms = member.guild.me.guild_permissions
+        if not all([perms.manage_permissions, perms.manage_channels, perms.move_members]):
+            return
+
+        self.hubs.remove(member.guild.id, channel.id)
+        with suppress(discord.NotFound):
+            await channel.delete(reason=f"{member} ({member.id}) left their Hub")
+
+    @tasks.loop(seconds=30)
+    async def flush_hubs(self):
+        try:
+            await self.hubs.flush(self.bot)
+        except PyMongoError as e:
+            log.warning("Failed to write the hub channels", exc_info=e)
 
     @Cog.listener(name="on_voice_state_update")
     async def hub_on_voice_state_update(
@@ -182,7 +162,18 @@ class Member(Cog, command_attrs={"hidden": True}):
         async for data in self.bot.guild_configurations.find({"muted": {"$exists": True}}):
             self.muted[data["_id"]] = set(data["muted"])
 
+        async for data in self.bot.guild_configurations.find(
+            {"hub_temp_channels": {"$exists": True, "$ne": []}},
+            {"hub_temp_channels": 1},
+        ):
+            self.hubs.load(data["_id"], data["hub_temp_channels"])
+
+        self.flush_hubs.start()
+
     async def cog_unload(self):
+        self.flush_hubs.cancel()
+        await self.hubs.flush(self.bot)
+
         operations = [
             UpdateOne(
                 {"_id": guild_id},
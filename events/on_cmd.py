@@ -50,7 +50,7 @@ class Cmd(Cog, command_attrs={"hidden": True}):
         self.bot = bot
 
     @Cog.listener()
-    async def on_command(self, ctx: Context):
+    async def on_command_completion(self, ctx: Context):
         """This event will be triggered when the command is being completed; triggered by [discord.User]!."""
         if ctx.author.bot:
             return
@@ -60,6 +60,12 @@ class Cmd(Cog, command_attrs={"hidden": True}):
 
     @Cog.listener()
     async def on_command_error(self, ctx: Context, error: commands.CommandError):
+        if not ctx.author.bot:
+            await ctx.database_command_update(
+                success=False,
+                error=f"{error.__class__.__name__}: {error}",
+            )
+
         await self.bot.wait_until_ready()
         # elif command has local error handler, return
         if hasattr(ctx.command, "on_error"):
@@ -229,7 +235,7 @@ class Cmd(Cog, command_attrs={"hidden": True}):
 
         try:
             if msg:
-                await ctx.wait_for("message_delete", timeout=10, check=lambda m: m.id == ctx.message.id)
+                await ctx.wait_for("message_delete", timeout=10, message_id=ctx.message.id)
                 await msg.delete(delay=0)
         except asyncio.TimeoutError:
             pass
@@ -474,18 +474,11 @@ class OnMsg(Cog, command_attrs={"hidden": True}):
         if self.is_banned(message.author):
             return
 
-        data: DocumentType | None = await self.bot.guild_configurations.find_one(
-            {
-                "_id": message.guild.id,
-                "global_chat.channel_id": message.channel.id,
-                "global_chat.enable": True,
-            },
-        )
-        if data is None:
+        # the subdocument is partial when only some of its keys were ever set
+        data = self.bot.guild_configurations_cache.global_chat(message.guild.id)
+        if not data.get("enable") or data.get("channel_id") != message.channel.id:
             return
 
-        data = data["global_chat"]
-
         bucket = self.cd_mapping.get_bucket(message)
         if bucket:
             if retry_after := bucket.update_rate_limit():
@@ -551,10 +544,10 @@ class OnMsg(Cog, command_attrs={"hidden": True}):
                 pass
 
         await message.delete(delay=2)
-        __functions: list = []
-        async for webhook in self.bot.guild_configurations.find({"global_chat.enable": True}):
-            if hook := webhook["global_chat"]["webhook"]:
-                __functions.append(__internal_funtion(hook=hook, message=message))
+        __functions: list = [
+            __internal_funtion(hook=hook, message=message)
+            for hook in self.bot.guild_configurations_cache.global_chat_webhooks()
+        ]
 
         if __functions:
             await asyncio.gather(*__functions, return_exceptions=False)
@@ -612,7 +605,7 @@ class OnMsg(Cog, command_attrs={"hidden": True}):
         except KeyError:
             return
         else:
-            collection: Collection = self.bot.guild_level_db[f"{message.guild.id}"]
+            collection: Collection = self.bot.guild_level_collection(message.guild.id)
             ch: discord.TextChannel = await self.bot.getch(
                 self.bot.get_channel,
                 self.bot.fetch_channel,
@@ -719,7 +712,7 @@ class OnMsg(Cog, command_attrs={"hidden": True}):
     ):
         assert isinstance(msg.author, discord.Member) and msg.guild is not None
 
-        collection: Collection = self.bot.guild_level_db[f"{member.guild.id}"]
+        collection: Collection = self.bot.guild_level_collection(member.guild.id)
         data = await collection.find_one_and_update(
             {"_id": member.id},
             {"$inc": {"xp": xp}},
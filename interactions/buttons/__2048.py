@@ -5,7 +5,10 @@ import random
 from typing import Any
 
 import discord
-from core import Parrot
+from core import Parrot, PersistentView, persistent_id
+
+from .__constants import _2048_GAME
+from .utils import BaseView
 
 URL_THUMBNAIL = "https://cdn.discordapp.com/attachments/894938379697913916/922771882904793120/41NgOgTVblL.png"
 
@@ -125,7 +128,11 @@ class Twenty48:
         self.number_to_emoji()
 
 
-class Twenty48_Button(discord.ui.View):
+class Twenty48_Button(BaseView, PersistentView):
+    kind = "2048"
+    # a game stopped by a restart is resumed within this many seconds
+    ttl = 15 * 60
+
     def __init__(
         self,
         game: Twenty48,
@@ -149,6 +156,38 @@ class Twenty48_Button(discord.ui.View):
         self.user = user
 
         self._moves = 0
+        # boards restarted, and the moves made on them
+        self._restarts = 0
+        self._restarted_moves = 0
+
+    def to_state(self) -> list[Any]:
+        # the player, the board size and the counters, then the current and the starting board row by row
+        return [
+            self.user.id,
+            self.__size,
+            self._moves,
+            self._restarts,
+            self._restarted_moves,
+            *itertools.chain.from_iterable(self.game.board),
+            *itertools.chain.from_iterable(self.__board),
+        ]
+
+    @classmethod
+    def from_state(cls, bot: Parrot, state: list[Any]) -> Twenty48_Button:
+        user_id, size, moves, restarts, restarted_moves, *cells = state
+        if len(cells) != 2 * size * size:
+            msg = f"expected {2 * size * size} cells, got {len(cells)}"
+            raise ValueError(msg)
+        rows = [cells[start : start + size] for start in range(0, len(cells), size)]
+
+        game = Twenty48(_2048_GAME, size=size)
+        game.board = rows[size:]
+        view = cls(game, discord.Object(user_id), bot=bot)  # type: ignore
+        game.board = rows[:size]
+        game.has_empty = 0 in cells[: size * size]
+
+        view._moves, view._restarts, view._restarted_moves = moves, restarts, restarted_moves
+        return view
 
     def make_original_instance(self) -> Twenty48:
         original_game = Twenty48(self.__conversion)
@@ -160,76 +199,88 @@ class Twenty48_Button(discord.ui.View):
         return original_game
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        if interaction.user == self.user:
+        if interaction.user.id == self.user.id:
             return True
         await interaction.response.send_message(content="This isn't your game!", ephemeral=True)
         return False
 
-    async def update_to_db(self) -> None:
-        col = self.bot.game_collections
-        await col.update_one(
-            {"_id": self.user.id},
-            {
-                "$inc": {"game_twenty48_played": 1, "game_twenty48_moves": self._moves},
-            },
-            upsert=True,
+    def board_embed(self) -> discord.Embed:
+        board_string = self.render_board(self.game.board, lambda number: self.game._conversion[str(number)])
+        return discord.Embed(
+            title="2048 Game",
+            description=f"{board_string}",
+        ).set_footer(text=f"Total Moves: {self._moves}")
+
+    async def save(self) -> None:
+        self.forget()
+        # a restarted board was a game played too
+        await self.bot.database_game_update(
+            self.user.id,
+            "twenty48",
+            inc={"played": self._restarts + 1, "moves": self._restarted_moves + self._moves},
         )
 
     async def on_timeout(self):
-        await self.update_to_db()
+        await self.finish()
+
+    def _game_lost(self, embed: discord.Embed) -> bool:
+        if not self.game.lost():
+            return False
 
-    async def _game_lost(self, embed: discord.Embed) -> None:
-        if self.game.lost():
-            for child in self.children:
-                if isinstance(child, discord.ui.Button):
-                    child.disabled = True
+        for child in self.children:
+            if isinstance(child, discord.ui.Button):
+                child.disabled = True
 
-            embed.add_field(name="Result", value="`You are out of moves`")
-            await self.update_to_db()
+        embed.add_field(name="Result", value="`You are out of moves`")
+        return True
+
+    async def _move(self, interaction: discord.Interaction, move: str) -> None:
+        getattr(self.game, move)()
+        self._moves += 1
+        self.game.spawn_new()
+        embed = self.board_embed()
+        lost = self._game_lost(embed)
+        await self.refresh(interaction, content=f"{interaction.user.mention}", embed=embed, view=self)
+        if lost:
+            await self.finish()
+        else:
+            self.persist()
 
     @discord.ui.button(
         emoji="\N{REGIONAL INDICATOR SYMBOL LETTER R}",
+        custom_id=persistent_id("2048", "restart"),
         label="\u200b",
         style=discord.ButtonStyle.primary,
         disabled=False,
     )
     async def null_button(self, interaction: discord.Interaction, _: discord.ui.Button):
         self.game = self.make_original_instance()
+        self._restarts += 1
+        self._restarted_moves += self._moves
         self._moves = 0
-        board_string = self.game.number_to_emoji()
-        embed = discord.Embed(
-            title="2048 Game",
-            description=f"{board_string}",
-        ).set_footer(text=f"Total Moves: {self._moves}")
-        await self.update_to_db()
-        await interaction.response.edit_message(content=f"{interaction.user.mention}", embed=embed, view=self)
+        await self.refresh(interaction, content=f"{interaction.user.mention}", embed=self.board_embed(), view=self)
+        self.persist()
 
     @discord.ui.button(
         emoji="\N{UPWARDS BLACK ARROW}",
+        custom_id=persistent_id("2048", "up"),
         label="\u200b",
         style=discord.ButtonStyle.red,
         disabled=False,
     )
     async def upward(self, interaction: discord.Interaction, _: discord.ui.Button):
-        self.game.move_up()
-        self._moves += 1
-        self.game.spawn_new()
-        board_string = self.game.number_to_emoji()
-        embed: discord.Embed = discord.Embed(
-            title="2048 Game",
-            description=f"{board_string}",
-        ).set_footer(text=f"Total Moves: {self._moves}")
-        await self._game_lost(embed)
-        await interaction.response.edit_message(content=f"{interaction.user.mention}", embed=embed, view=self)
+        await self._move(interaction, "move_up")
 
     @discord.ui.button(
         emoji="\N{REGIONAL INDICATOR SYMBOL LETTER Q}",
+        custom_id=persistent_id("2048", "quit"),
         label="\u200b",
         style=discord.ButtonStyle.primary,
         disabled=False,
     )
     async def null_button2(self, interaction: discord.Interaction, _: discord.ui.Button):
-        await self.update_to_db()
+        await interaction.response.defer()
+        await self.finish()
         self.stop()
 
         if interaction.message:
@@ -237,58 +288,33 @@ class Twenty48_Button(discord.ui.View):
 
     @discord.ui.button(
         emoji="\N{LEFTWARDS BLACK ARROW}",
+        custom_id=persistent_id("2048", "left"),
         label="\u200b",
         style=discord.ButtonStyle.red,
         disabled=False,
         row=1,
     )
     async def left(self, interaction: discord.Interaction, _: discord.ui.Button):
-        self.game.move_left()
-        self._moves += 1
-        self.game.spawn_new()
-        board_string = self.game.number_to_emoji()
-        embed: discord.Embed = discord.Embed(
-            title="2048 Game",
-            description=f"{board_string}",
-        ).set_footer(text=f"Total Moves: {self._moves}")
-        await self._game_lost(embed)
-
-        await interaction.response.edit_message(content=f"{interaction.user.mention}", embed=embed, view=self)
+        await self._move(interaction, "move_left")
 
     @discord.ui.button(
         emoji="\N{DOWNWARDS BLACK ARROW}",
+        custom_id=persistent_id("2048", "down"),
         label="\u200b",
         style=discord.ButtonStyle.red,
         disabled=False,
         row=1,
     )
     async def down(self, interaction: discord.Interaction, _: discord.ui.Button):
-        self.game.move_down()
-        self._moves += 1
-        self.game.spawn_new()
-        board_string = self.game.number_to_emoji()
-        embed: discord.Embed = discord.Embed(
-            title="2048 Game",
-            description=f"{board_string}",
-        ).set_footer(text=f"Total Moves: {self._moves}")
-        await self._game_lost(embed)
-        await interaction.response.edit_message(content=f"{interaction.user.mention}", embed=embed, view=self)
+        await self._move(interaction, "move_down")
 
     @discord.ui.button(
         emoji="\N{BLACK RIGHTWARDS ARROW}",
+        custom_id=persistent_id("2048", "right"),
         label="\u200b",
         style=discord.ButtonStyle.red,
         disabled=False,
         row=1,
     )
     async def right(self, interaction: discord.Interaction, _: discord.ui.Button):
-        self.game.move_right()
-        self._moves += 1
-        self.game.spawn_new()
-        board_string = self.game.number_to_emoji()
-        embed: discord.Embed = discord.Embed(
-            title="2048 Game",
-            description=f"{board_string}",
-        ).set_footer(text=f"Total Moves: {self._moves}")
-        await self._game_lost(embed)
-        await interaction.response.edit_message(content=f"{interaction.user.mention}", embed=embed, view=self)
+        await self._move(interaction, "move_right")
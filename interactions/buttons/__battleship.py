@@ -282,7 +282,12 @@ class BattleShip:
                     return bool(self.inputpat.match(content))
 
             try:
-                message: discord.Message = await ctx.wait_for("message", check=check, timeout=self.timeout)
+                message: discord.Message = await ctx.wait_for(
+                    "message",
+                    check=check,
+                    timeout=self.timeout,
+                    user_id=user.id,
+                )
             except asyncio.TimeoutError:
                 await user.send(f"The timeout of {self.timeout} seconds, has been reached. Aborting...")
                 return False
@@ -297,7 +302,12 @@ class BattleShip:
                     return content in ("yes", "no")
 
             try:
-                message: discord.Message = await ctx.wait_for("message", check=check, timeout=self.timeout)
+                message: discord.Message = await ctx.wait_for(
+                    "message",
+                    check=check,
+                    timeout=self.timeout,
+                    user_id=user.id,
+                )
             except asyncio.TimeoutError:
                 await user.send(f"The timeout of {self.timeout} seconds, has been reached. Aborting...")
                 return False
@@ -367,7 +377,12 @@ class BattleShip:
                     return bool(self.inputpat.match(content))
 
             try:
-                message: discord.Message = await ctx.wait_for("message", check=check, timeout=self.timeout)
+                message: discord.Message = await ctx.wait_for(
+                    "message",
+                    check=check,
+                    timeout=self.timeout,
+                    user_id=self.turn.id,
+                )
             except asyncio.TimeoutError:
                 await ctx.send(f"The timeout of {timeout} seconds, has been reached. Aborting...")
                 break
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any
 
 import chess
@@ -8,8 +9,13 @@ from pymongo import UpdateOne
 
 import discord
 from core import Context, Parrot
+from utilities import chess_engine
+from utilities.imaging.chessboard import BoardRenderer
 from utilities.paginator import ParrotPaginator
 
+# shared by the games, a position is drawn once whoever plays it
+renderer = BoardRenderer()
+
 
 class ChessView(discord.ui.View):
     def __init__(self, *, game: Chess, ctx: Context = None, timeout: float = 300.0, **kwargs: Any) -> None:
@@ -65,6 +71,8 @@ class Chess:
         timeout: float = 300,
         react_on_success: bool = True,
         custom: str = None,
+        engine_depth: int = 3,
+        engine_time: float = 5.0,
     ) -> None:
         self.white = white
         self.black = black
@@ -73,6 +81,9 @@ class Chess:
         self.ctx = ctx
         self.timeout = timeout
         self.react_on_success = react_on_success
+        # the bot plays its moves with the engine, within `engine_time` seconds each
+        self.engine_depth = engine_depth
+        self.engine_time = engine_time
 
         self.board = chess.Board(custom) if custom else chess.Board()
         self.turn = white
@@ -81,6 +92,31 @@ class Chess:
         self.game_stop = False
         self.game_message: discord.Message | None = None
 
+    def is_engine(self, user: discord.abc.User) -> bool:
+        return self.bot.user is not None and user.id == self.bot.user.id
+
+    async def engine_move(self) -> str | None:
+        move = await chess_engine.best_move(self.board, depth=self.engine_depth, time_limit=self.engine_time)
+        return self.board.san(move) if move is not None else None
+
+    async def board_message(self, *, footer: str) -> tuple[discord.Embed, discord.File]:
+        orientation = self.board.turn
+        if self.is_engine(self.white if orientation == chess.WHITE else self.black):
+            orientation = not orientation
+        buf = await asyncio.to_thread(renderer.render, self.board.copy(), orientation=orientation)
+
+        embed = discord.Embed(
+            timestamp=discord.utils.utcnow(),
+        )
+        embed.set_image(url="attachment://chess.png")
+        embed.description = f"""```
+On Check?      : {self.board.is_check()}
+Can Claim Draw?: {self.board.can_claim_threefold_repetition()}
+```
+"""
+        embed.set_footer(text=footer)
+        return embed, discord.File(buf, "chess.png")
+
     def legal_moves(self) -> list[str]:
         return [self.board.san(move) for move in self.board.legal_moves]
 
@@ -93,7 +129,7 @@ class Chess:
             return (self.ctx.channel.id == m.channel.id) and (m.author == self.turn) and (m.content in LEGAL_MOVES)
 
         try:
-            msg = await self.bot.wait_for("message", check=check, timeout=self.timeout)
+            msg = await self.bot.wait_for("message", check=check, timeout=self.timeout, channel_id=self.ctx.channel.id)
             return msg
         except asyncio.TimeoutError:
             if not self.game_stop:
@@ -113,23 +149,16 @@ class Chess:
             return
 
     async def place_move(self, user_move: str) -> None:
-        st = "white" if self.alternate_turn == self.white else "black"
-        move = self.board.push_san(user_move)
+        self.board.push_san(user_move)
         content = f"{self.white.mention} VS {self.black.mention}"
-        embed = discord.Embed(
-            timestamp=discord.utils.utcnow(),
-        )
-        embed.set_image(
-            url=f"https://backscattering.de/web-boardimage/board.png?fen={self.board.board_fen()}&lastMove={move.uci()}&coordinates=true&orientation={st}",
-        )
-        embed.description = f"""```
-On Check?      : {self.board.is_check()}
-Can Claim Draw?: {self.board.can_claim_threefold_repetition()}
-```
-"""
-        embed.set_footer(text=f"Turn: {self.alternate_turn} | Having 5m to make move")
+        embed, file = await self.board_message(footer=f"Turn: {self.alternate_turn} | Having 5m to make move")
         await self.game_message.delete()
-        self.game_message = await self.ctx.send(content=content, embed=embed, view=ChessView(game=self, ctx=self.ctx))
+        self.game_message = await self.ctx.send(
+            content=content,
+            embed=embed,
+            file=file,
+            view=ChessView(game=self, ctx=self.ctx),
+        )
         await self.game_over()
 
     async def game_over(
@@ -162,20 +191,27 @@ Can Claim Draw?: {self.board.can_claim_threefold_repetition()}
 
     async def start(self):
         content = f"{self.white.mention} VS {self.black.mention}"
-        embed = discord.Embed(
-            timestamp=discord.utils.utcnow(),
+        embed, file = await self.board_message(footer=f"Turn: {self.turn} | Having 5m to make move")
+        self.game_message = await self.ctx.send(
+            content=content,
+            embed=embed,
+            file=file,
+            view=ChessView(game=self, ctx=self.ctx),
         )
-        embed.set_image(
-            url=f"https://backscattering.de/web-boardimage/board.png?fen={self.board.board_fen()}&coordinates=true",
-        )
-        embed.description = f"""```
-On Check?      : {self.board.is_check()}
-Can Claim Draw?: {self.board.can_claim_threefold_repetition()}
-```
-"""
-        embed.set_footer(text=f"Turn: {self.turn} | Having 5m to make move")
-        self.game_message = await self.ctx.send(content=content, embed=embed, view=ChessView(game=self, ctx=self.ctx))
         while not self.game_stop:
+            if self.is_engine(self.turn):
+                try:
+                    san = await self.engine_move()
+                except BrokenProcessPool:
+                    await self.ctx.send(f"**{self.ctx.me}** could not think of a move, the game is aborted.")
+                    self.game_stop = True
+                    return
+                if san is None:
+                    return
+                await self.place_move(san)
+                self.switch()
+                continue
+
             msg = await self.wait_for_move()
             if msg is None:
                 return
@@ -209,7 +245,9 @@ Can Claim Draw?: {self.board.can_claim_threefold_repetition()}
                 )
                 return
 
-            if msg.content.lower() == "draw":
+            if msg.content.lower() == "draw" and (self.is_engine(self.white) or self.is_engine(self.black)):
+                await self.ctx.send(f"**{self.ctx.me}** declined the draw, play on!")
+            elif msg.content.lower() == "draw":
                 value = await self.ctx.prompt(
                     f"**{msg.author}** offered draw! **{self.turn if self.turn.id != msg.author.id else self.alternate_turn}** to accept the draw click `Confirm`",
                     author_id=self.turn.id if self.turn.id != msg.author.id else self.alternate_turn.id,
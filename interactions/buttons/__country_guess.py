@@ -128,7 +128,13 @@ class CountryGuesser:
                 return m.channel == ctx.channel and m.author == ctx.author and len(m.content) == length
             return m.channel == ctx.channel and m.author == ctx.author
 
-        message: discord.Message = await ctx.wait_for("message", timeout=self.timeout, check=check)
+        message: discord.Message = await ctx.wait_for(
+            "message",
+            timeout=self.timeout,
+            check=check,
+            channel_id=ctx.channel.id,
+            user_id=ctx.author.id,
+        )
         content = message.content.strip().lower()
 
         if options and content not in options:
@@ -4,22 +4,21 @@ import asyncio
 import itertools
 import random
 import re
+from bisect import bisect_left
 from collections import defaultdict
-from functools import cached_property, wraps
+from functools import cache, cached_property, wraps
 from typing import (
     TYPE_CHECKING,
     Dict,
     Iterable,
     Iterator,
     List,
-    Literal,
     NamedTuple,
     Optional,
     Sequence,
     Tuple,
     TypedDict,
     Union,
-    overload,
 )
 
 from discord.utils import MISSING
@@ -28,6 +27,7 @@ import discord
 import emojis
 from core import Context, Parrot
 from discord.ext import boardgames, commands, old_menus as menus  # type: ignore
+from utilities import game_ai, workers
 
 from .__constants import (
     BIG,
@@ -49,6 +49,20 @@ with open("extra/boggle.txt", encoding="utf-8", errors="ignore") as f:
     DICTIONARY = set(f.read().splitlines())
 
 
+# sorts after every letter, the end of the words starting with a prefix
+_PREFIX_END = "\uffff"
+
+
+@cache
+def _sorted_dictionary() -> list[str]:
+    """The dictionary as a trie: the words starting with a prefix are a slice of the sorted words.
+
+    Nodes are ranges of the list, narrowed with a bisection per letter, instead of
+    a dict per letter of the dictionary, which takes a hundred MB.
+    """
+    return sorted(DICTIONARY)
+
+
 class Position(NamedTuple):
     col: int
     row: int
@@ -79,6 +93,44 @@ class BoardBoogle:
 
         self.columns = board
 
+    @cached_property
+    def legal_words(self) -> frozenset[str]:
+        """Every word of the dictionary on the board. Computed once, off the event loop when the game starts."""
+        words = _sorted_dictionary()
+        cells = [(col, row) for col in range(self.size) for row in range(self.size)]
+        letters = [self.columns[col][row] for col, row in cells]
+        letters = [DIAGRAPHS.get(letter, letter) for letter in letters]
+        neighbours = [
+            [
+                index
+                for index, (other_col, other_row) in enumerate(cells)
+                if max(abs(other_col - col), abs(other_row - row)) == 1
+            ]
+            for col, row in cells
+        ]
+        found: set[str] = set()
+
+        def walk(index: int, prefix: str, lo: int, hi: int, passed: int) -> None:
+            prefix += letters[index]
+            lo = bisect_left(words, prefix, lo, hi)
+            hi = bisect_left(words, prefix + _PREFIX_END, lo, hi)
+            if lo == hi:
+                return
+            if words[lo] == prefix and len(prefix) >= 3:
+                found.add(prefix)
+
+            passed |= 1 << index
+            for neighbour in neighbours[index]:
+                if not passed & (1 << neighbour):
+                    walk(neighbour, prefix, lo, hi, passed)
+
+        for index in range(len(cells)):
+            walk(index, "", 0, len(words), 0)
+        return frozenset(found)
+
+    def max_points(self) -> int:
+        return sum(POINTS[len(word)] for word in self.legal_words)
+
     def board_contains(self, word: str, pos: Position = None, passed: List[Position] = None) -> bool:
         if passed is None:
             passed = []
@@ -122,8 +174,7 @@ class BoardBoogle:
     def is_legal(self, word: str) -> bool:
         if len(word) < 3:
             return False
-        word = word.upper()
-        return False if word not in DICTIONARY else self.board_contains(word)
+        return word.upper() in self.legal_words
 
     def points(self, word: str) -> int:
         return POINTS[len(word)] if self.is_legal(word) else 0
@@ -159,8 +210,8 @@ class GameBoogle(menus.Menu):
         return await channel.send(content="Boggle game started, you have 3 minutes!", embed=self.state)
 
     async def start(self, *args, **kwargs):
+        await asyncio.to_thread(lambda: self.board.legal_words)
         await super().start(*args, **kwargs)
-        # await self.bot.loop.run_in_executor(None, lambda: self.board.legal_words)
 
     async def finalize(self, timed_out):
         self.bot.dispatch("boggle_game_complete", self.message.channel)
@@ -171,6 +222,17 @@ class GameBoogle(menus.Menu):
     def check_word(self, word: str) -> bool:
         return self.board.is_legal(word)
 
+    def legal_words(self) -> frozenset[str]:
+        return self.board.legal_words
+
+    def add_missed_words(self, embed: discord.Embed, found: Iterable[str], *, limit: int = 20) -> discord.Embed:
+        legal = self.legal_words()
+        missed = sorted(legal.difference(found), key=lambda word: (-len(word), word))
+        if missed:
+            shown = ", ".join(missed[:limit]) + (f" and {len(missed) - limit} more" if len(missed) > limit else "")
+            embed.add_field(name=f"Missed words ({len(missed)})", value=f"`{shown}`", inline=False)
+        return embed.set_footer(text=f"{len(legal)} words on the board, {sum(POINTS[len(word)] for word in legal)} points")
+
     async def check_message(self, message: discord.Message):
         raise NotImplementedError
 
@@ -196,6 +258,7 @@ class ShuffflingGame(GameBoogle):
 
             # Shuffle board
             self.shuffle()
+            await asyncio.to_thread(lambda: self.board.legal_words)
             self.boards.append(self.board)
 
             # Note Board Updated
@@ -225,6 +288,9 @@ class ShuffflingGame(GameBoogle):
 
         return points
 
+    def legal_words(self) -> frozenset[str]:
+        return frozenset().union(*(board.legal_words for board in self.boards))
+
 
 class DiscordGame(GameBoogle):
     name = "Discord Boggle"
@@ -281,7 +347,7 @@ class DiscordGame(GameBoogle):
         await super().finalize(timed_out)
         if timed_out:
             await self.message.edit(content="Game Over!")
-            await self.message.reply(embed=self.scores)
+            await self.message.reply(embed=self.add_missed_words(self.scores, self.all_words))
 
 
 class ClassicGame(GameBoogle):
@@ -370,7 +436,7 @@ class ClassicGame(GameBoogle):
             self.over = True
             await asyncio.sleep(10)
             self.filter_lists()
-            await self.message.reply(embed=self.scores)
+            await self.message.reply(embed=self.add_missed_words(self.scores, self.used_words))
 
 
 class FlipGame(ShuffflingGame, DiscordGame):
@@ -561,7 +627,7 @@ class GameC4:
             await self.print_grid()
 
             if isinstance(self.player_active, AI_C4):
-                coords = self.player_active.play()
+                coords = await self.player_active.play()
                 if not coords:
                     await self.game_over(
                         "draw",
@@ -657,6 +723,9 @@ class AI_C4:
     if TYPE_CHECKING:
         from .__constants import Coordinate
 
+    # seconds the AI thinks for each move
+    time_limit: float = 1.0
+
     def __init__(self, bot: Parrot, game: GameC4):
         self.game = game
         self.mention = bot.user.mention
@@ -672,57 +741,17 @@ class AI_C4:
                     break
         return possible_coords
 
-    def check_ai_win(self, coord_list: List[Coordinate]) -> Optional[Coordinate]:
-        """
-        Check AI_C4 win.
-        Check if placing a counter in any possible coordinate would cause the AI_C4 to win
-        with 10% chance of not winning and returning None
-        """
-        if random.randint(1, 10) == 1:
-            return None
-        return next(
-            (coords for coords in coord_list if self.game.check_win(coords, 2)),
-            None,
-        )
-
-    def check_player_win(self, coord_list: List[Coordinate]) -> Optional[Coordinate]:
-        """
-        Check Player win.
-        Check if placing a counter in possible coordinates would stop the player
-        from winning with 25% of not blocking them  and returning None.
-        """
-        if random.randint(1, 4) == 1:
-            return None
-        return next(
-            (coords for coords in coord_list if self.game.check_win(coords, 1)),
-            None,
-        )
-
-    @staticmethod
-    def random_coords(coord_list: List[Coordinate]) -> Coordinate:
-        """Picks a random coordinate from the possible ones."""
-        return random.choice(coord_list)
-
-    def play(self) -> Union[Coordinate, bool]:
+    async def play(self) -> Union[Coordinate, bool]:
         """
         Plays for the AI_C4.
-        Gets all possible coords, and determins the move:
-        1. coords where it can win.
-        2. coords where the player can win.
-        3. Random coord
-        The first possible value is choosen.
+        Searches the board for the best column, in a worker process for `time_limit` seconds.
         """
-        possible_coords = self.get_possible_places()
-
-        if not possible_coords:
+        grid = [row.copy() for row in self.game.grid]
+        column = await workers.run(game_ai.best_column, grid, 2, time_limit=self.time_limit)
+        if column is None:
             return False
 
-        coords = (
-            self.check_ai_win(possible_coords)
-            or self.check_player_win(possible_coords)
-            or self.random_coords(possible_coords)
-        )
-
+        coords = next(coords for coords in self.get_possible_places() if coords[1] == column)
         row, column = coords
         self.game.grid[row][column] = 2
         return coords
@@ -812,68 +841,14 @@ class AI:
 
 
 class NegamaxAI(AI):
+    """Perfect player, the positions are solved once for all the games."""
+
     def __init__(self, player: bool) -> None:
         super().__init__(player)
 
-    def heuristic(self, game: Board, sign: int) -> float:
-        player = not self.player if sign == -1 else self.player
-        if game.over:
-            if game.winner is None:
-                return 0
-            return 1_000_000 if game.winner == player else -1_000_000
-        return random.randint(-10, 10)
-
-    @overload
-    def negamax(
-        self,
-        game: Board,
-        depth: Literal[0] = ...,
-        alpha: float = ...,
-        beta: float = ...,
-        sign: int = ...,
-    ) -> Tuple[int, int]:
-        ...
-
-    @overload
-    def negamax(
-        self,
-        game: Board,
-        depth: int = ...,
-        alpha: float = ...,
-        beta: float = ...,
-        sign: int = ...,
-    ) -> float:
-        ...
-
-    def negamax(
-        self,
-        game: Board,
-        depth: int = 0,
-        alpha: float = float("-inf"),
-        beta: float = float("inf"),
-        sign: int = 1,
-    ) -> Union[float, Tuple[int, int]]:
-        if game.over:
-            return sign * self.heuristic(game, sign)
-
-        move = MISSING
-
-        score = float("-inf")
-        for c in game.legal_moves:
-            move_score = -self.negamax(game.move(*c), depth + 1, -beta, -alpha, -sign)
-
-            if move_score > score:
-                score = move_score
-                move = c
-
-            alpha = max(alpha, score)
-            if alpha >= beta:
-                break
-
-        return move if depth == 0 else score
-
     def move(self, game: Board) -> Board:
-        return game.move(*self.negamax(game))
+        coords = game_ai.best_cell(game.state, self.player)
+        return super().move(game) if coords is None else game.move(*coords)
 
 
 class ButtonTicTacToe(discord.ui.Button["GameTicTacToe"]):
@@ -2,67 +2,23 @@ from __future__ import annotations
 
 import asyncio
 import re
-from io import BytesIO
 
 import numpy as np
-from PIL import Image
 
 import discord
 from core import Context
+from utilities.imaging.isometric import IsometricRenderer
 
 from .__constants import code_dict, codes, selector_back, selector_front
 
 
-def isometric_func(shape, selector_pos=None):
-    """Creates static isometric drawing."""
-    t = 4
-    resx = resy = 1024 * 5
-    canvas = Image.new("RGBA", (resx, resy), (25, 25, 25, 0))
-
-    shape = list(shape)
-    mid = round(resx / 2)
-
-    i = j = lvl = count = 0
-    for row in shape:
-        for val in row:
-            fx = mid + j * t * 7 - i * t * 7
-            fy = mid + j * t * 4 + i * t * 4 - lvl * t * 7
-            # fx = mid + j*t*7 - i*t*7
-            # fy = mid + j*t*6 + i*t*6 - lvl*t*7
+def make_renderer() -> IsometricRenderer:
+    return IsometricRenderer(code_dict, counted=codes, selector=(selector_back, selector_front))
 
-            selected = False
-            if [lvl, i, j] == selector_pos:
-                canvas.paste(selector_back, (fx, fy), selector_back)
-                selected = True
 
-            if img := code_dict.get(val):
-                canvas.paste(img, (fx, fy), img)
-
-            if selected:
-                canvas.paste(selector_front, (fx, fy), selector_front)
-
-            j += 1
-            if val == "-":
-                i = -1
-                j = 0
-                lvl += 1
-
-            if val in codes or selected:
-                count += 1
-        j = 0
-        i += 1
-
-    if count == 0:
-        msg = "Did not detect any blocks. Do `j;iso blocks` or `j;help iso` to see available blocks"
-        raise Exception(msg)
-
-    canvasBox = canvas.getbbox()
-    crop = canvas.crop(canvasBox)
-    buf = BytesIO()
-    crop.save(buf, "PNG")
-    buf.seek(0)
-
-    return buf, count
+def isometric_func(shape, selector_pos=None):
+    """Creates static isometric drawing."""
+    return make_renderer().render(shape, selector_pos)
 
 
 def liquid(blocks: str) -> str:
@@ -211,6 +167,8 @@ class Minecraft(discord.ui.View):
         self.message = None
         self.block_selector = BlockSelector(self.selector_pos)
         self.n_blocks = 0
+        # keeps the last drawing, so each move only repaints what changed
+        self.renderer = make_renderer()
         self.add_item(self.block_selector)
 
         self.selatan_btn = discord.ui.Button(
@@ -297,7 +255,7 @@ class Minecraft(discord.ui.View):
         if "2" in code or "v" in code:
             code = liquid(code)
 
-        buf, c = await asyncio.to_thread(isometric_func, code.split(), self.selector_pos)
+        buf, c = await asyncio.to_thread(self.renderer.render, code.split(), self.selector_pos)
         c -= 1
         buf_file = discord.File(buf, "interactive_iso.png")
 
@@ -350,7 +308,7 @@ class Minecraft(discord.ui.View):
         if "2" in code or "v" in code:
             code = liquid(code)
 
-        buf, _ = await asyncio.to_thread(isometric_func, code.split())
+        buf, _ = await asyncio.to_thread(self.renderer.render, code.split())
         await self.ctx.reply(file=discord.File(buf, "interactive_iso.png"), mention_author=False)
 
         for child in self.children[:]:
@@ -5,6 +5,10 @@ import time
 import discord
 from core import Context
 
+from .utils import BaseView
+
+THUMBNAIL = "https://cdn.discordapp.com/attachments/894938379697913916/922772599627472906/icon.png"
+
 
 class SokobanGame:
     """The real sokoban game."""
@@ -136,7 +140,7 @@ class SokobanGame:
         return self.target == self.blocks
 
 
-class SokobanGameView(discord.ui.View):
+class SokobanGameView(BaseView):
     def __init__(
         self,
         game: SokobanGame,
@@ -169,52 +173,54 @@ class SokobanGameView(discord.ui.View):
         embed = (
             discord.Embed(title="You win! :tada:", timestamp=discord.utils.utcnow())
             .set_footer(text=f"User: {self.user}")
-            .set_thumbnail(url="https://cdn.discordapp.com/attachments/894938379697913916/922772599627472906/icon.png")
+            .set_thumbnail(url=THUMBNAIL)
         )
-        embed.description = f"{self.game.display_board()}"
+        embed.description = self.display_board()
         embed.add_field(
             name="Thanks for playing",
             value=f"For next level type `{self.ctx.prefix}sokoban {self.level+1}`",
         )
         return embed
 
-    @discord.ui.button(
-        emoji="\N{REGIONAL INDICATOR SYMBOL LETTER R}",
-        label="\u200b",
-        style=discord.ButtonStyle.primary,
-        disabled=False,
-    )
-    async def null_button(self, interaction: discord.Interaction, _: discord.ui.Button):
-        self.game = self._original_game
-        embed = (
+    def display_board(self) -> str:
+        return self.render_board(self.game.level, self.game.legend.__getitem__)
+
+    def make_embed(self) -> discord.Embed:
+        return (
             discord.Embed(
                 title="Sokoban Game",
-                description=f"{self.game.display_board()}",
+                description=self.display_board(),
                 timestamp=discord.utils.utcnow(),
             )
             .set_footer(text=f"User: {self.user}")
-            .set_thumbnail(url="https://cdn.discordapp.com/attachments/894938379697913916/922772599627472906/icon.png")
+            .set_thumbnail(url=THUMBNAIL)
         )
-        await interaction.response.edit_message(embed=embed, view=self)
 
-    @discord.ui.button(emoji="\N{UPWARDS BLACK ARROW}", style=discord.ButtonStyle.red, disabled=False)
-    async def upward(self, interaction: discord.Interaction, _: discord.ui.Button):
+    async def _move(self, interaction: discord.Interaction, move: str) -> None:
         self.moves += 1
-        self.game.move_up()
-        embed = (
-            discord.Embed(
-                title="Sokoban Game",
-                description=f"{self.game.display_board()}",
-                timestamp=discord.utils.utcnow(),
-            )
-            .set_footer(text=f"User: {self.user}")
-            .set_thumbnail(url="https://cdn.discordapp.com/attachments/894938379697913916/922772599627472906/icon.png")
-        )
+        getattr(self.game, move)()
 
         if self.game.is_game_over():
-            await interaction.response.edit_message(embed=self.make_win_embed(), view=None)
+            self.stop()
+            await self.refresh(interaction, embed=self.make_win_embed(), view=None)
+            await self.finish()
+            return
+
+        await self.refresh(interaction, embed=self.make_embed(), view=self)
+
+    @discord.ui.button(
+        emoji="\N{REGIONAL INDICATOR SYMBOL LETTER R}",
+        label="\u200b",
+        style=discord.ButtonStyle.primary,
+        disabled=False,
+    )
+    async def null_button(self, interaction: discord.Interaction, _: discord.ui.Button):
+        self.game = self._original_game
+        await self.refresh(interaction, embed=self.make_embed(), view=self)
 
-        await interaction.response.edit_message(embed=embed, view=self)
+    @discord.ui.button(emoji="\N{UPWARDS BLACK ARROW}", style=discord.ButtonStyle.red, disabled=False)
+    async def upward(self, interaction: discord.Interaction, _: discord.ui.Button):
+        await self._move(interaction, "move_up")
 
     @discord.ui.button(
         emoji="\N{REGIONAL INDICATOR SYMBOL LETTER Q}",
@@ -235,22 +241,7 @@ class SokobanGameView(discord.ui.View):
         row=1,
     )
     async def left(self, interaction: discord.Interaction, _: discord.ui.Button):
-        self.moves += 1
-        self.game.move_left()
-        embed = (
-            discord.Embed(
-                title="Sokoban Game",
-                description=f"{self.game.display_board()}",
-                timestamp=discord.utils.utcnow(),
-            )
-            .set_footer(text=f"User: {self.user}")
-            .set_thumbnail(url="https://cdn.discordapp.com/attachments/894938379697913916/922772599627472906/icon.png")
-        )
-
-        if self.game.is_game_over():
-            await interaction.response.edit_message(embed=self.make_win_embed(), view=None)
-
-        await interaction.response.edit_message(embed=embed, view=self)
+        await self._move(interaction, "move_left")
 
     @discord.ui.button(
         emoji="\N{DOWNWARDS BLACK ARROW}",
@@ -260,22 +251,7 @@ class SokobanGameView(discord.ui.View):
         row=1,
     )
     async def downward(self, interaction: discord.Interaction, _: discord.ui.Button):
-        self.moves += 1
-        self.game.move_down()
-        embed = (
-            discord.Embed(
-                title="Sokoban Game",
-                description=f"{self.game.display_board()}",
-                timestamp=discord.utils.utcnow(),
-            )
-            .set_footer(text=f"User: {self.user}")
-            .set_thumbnail(url="https://cdn.discordapp.com/attachments/894938379697913916/922772599627472906/icon.png")
-        )
-
-        if self.game.is_game_over():
-            await interaction.response.edit_message(embed=self.make_win_embed(), view=None)
-
-        await interaction.response.edit_message(embed=embed, view=self)
+        await self._move(interaction, "move_down")
 
     @discord.ui.button(
         emoji="\N{BLACK RIGHTWARDS ARROW}",
@@ -285,31 +261,7 @@ class SokobanGameView(discord.ui.View):
         row=1,
     )
     async def right(self, interaction: discord.Interaction, _: discord.ui.Button):
-        self.moves += 1
-        self.game.move_right()
-        embed = (
-            discord.Embed(
-                title="Sokoban Game",
-                description=f"{self.game.display_board()}",
-                timestamp=discord.utils.utcnow(),
-            )
-            .set_footer(text=f"User: {self.user}")
-            .set_thumbnail(url="https://cdn.discordapp.com/attachments/894938379697913916/922772599627472906/icon.png")
-        )
-
-        if self.game.is_game_over():
-            await interaction.response.edit_message(embed=self.make_win_embed(), view=None)
-
-        await interaction.response.edit_message(embed=embed, view=self)
+        await self._move(interaction, "move_right")
 
     async def start(self, ctx: Context):
-        await ctx.send(
-            embed=discord.Embed(
-                title="Sokoban Game",
-                description=f"{self.game.display_board()}",
-                timestamp=discord.utils.utcnow(),
-            )
-            .set_footer(text=f"User: {self.user}")
-            .set_thumbnail(url="https://cdn.discordapp.com/attachments/894938379697913916/922772599627472906/icon.png"),
-            view=self,
-        )
+        await ctx.send(embed=self.make_embed(), view=self)
@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING, TypeVar
 
 import discord
 
+from .utils import BaseView
+
 if TYPE_CHECKING:
     from core import Context
 
@@ -204,12 +206,12 @@ class SudokuButton(discord.ui.Button["SudokuView"]):
 
         if self.view.game.is_current_number_empty and self.label:
             self.view.game.place_number(int(self.label))
-            await interaction.response.edit_message(content=self.view.game.display_board("discord"), view=self.view)
+            await self.view.refresh(interaction, content=self.view.game.display_board("discord"), view=self.view)
         else:
             await interaction.response.defer()
 
 
-class SudokuView(discord.ui.View):
+class SudokuView(BaseView):
     message: discord.Message
     ctx: Context
 
@@ -239,6 +241,7 @@ class SudokuView(discord.ui.View):
             )
 
     async def on_timeout(self):
+        await self.flush()
         for item in self.children:
             if isinstance(item, discord.ui.Button):
                 item.disabled = True
@@ -264,7 +267,7 @@ class SudokuView(discord.ui.View):
     )
     async def up_button(self, interaction: discord.Interaction, _: discord.ui.Button):
         self.game.move_cursor_up()
-        await interaction.response.edit_message(content=self.game.display_board("discord"), view=self)
+        await self.refresh(interaction, content=self.game.display_board("discord"), view=self)
 
     @discord.ui.button(
         label="\u200b",
@@ -280,7 +283,7 @@ class SudokuView(discord.ui.View):
     )
     async def reset(self, interaction: discord.Interaction, _: discord.ui.Button):
         self.game.reset()
-        await interaction.response.edit_message(content=self.game.display_board("discord"), view=self)
+        await self.refresh(interaction, content=self.game.display_board("discord"), view=self)
 
     @discord.ui.button(
         emoji="\N{LEFTWARDS BLACK ARROW}",
@@ -289,7 +292,7 @@ class SudokuView(discord.ui.View):
     )
     async def left_button(self, interaction: discord.Interaction, _: discord.ui.Button):
         self.game.move_cursor_left()
-        await interaction.response.edit_message(content=self.game.display_board("discord"), view=self)
+        await self.refresh(interaction, content=self.game.display_board("discord"), view=self)
 
     @discord.ui.button(
         emoji="\N{MEMO}",
@@ -298,7 +301,7 @@ class SudokuView(discord.ui.View):
     )
     async def erase(self, interaction: discord.Interaction, _: discord.ui.Button):
         self.game.erase_current_position()
-        await interaction.response.edit_message(content=self.game.display_board("discord"), view=self)
+        await self.refresh(interaction, content=self.game.display_board("discord"), view=self)
 
     @discord.ui.button(
         emoji="\N{BLACK RIGHTWARDS ARROW}",
@@ -307,7 +310,7 @@ class SudokuView(discord.ui.View):
     )
     async def right_button(self, interaction: discord.Interaction, _: discord.ui.Button):
         self.game.move_cursor_right()
-        await interaction.response.edit_message(content=self.game.display_board("discord"), view=self)
+        await self.refresh(interaction, content=self.game.display_board("discord"), view=self)
 
     @discord.ui.button(
         label="Exit",
@@ -318,8 +321,9 @@ class SudokuView(discord.ui.View):
         for item in self.children:
             if isinstance(item, discord.ui.Button):
                 item.disabled = True
-        await interaction.response.edit_message(content=self.game.display_board("discord"), view=self)
+        await self.refresh(interaction, content=self.game.display_board("discord"), view=self)
         self.stop()
+        await self.finish()
 
     @discord.ui.button(
         label="\u200b",
@@ -337,7 +341,7 @@ class SudokuView(discord.ui.View):
     )
     async def down_button(self, interaction: discord.Interaction, _: discord.ui.Button):
         self.game.move_cursor_down()
-        await interaction.response.edit_message(content=self.game.display_board("discord"), view=self)
+        await self.refresh(interaction, content=self.game.display_board("discord"), view=self)
 
     @discord.ui.button(
         label="\u200b",
@@ -356,12 +360,13 @@ class SudokuView(discord.ui.View):
     async def submit(self, interaction: discord.Interaction, _: discord.ui.Button):
         if self.game.is_board_full:
             if self.game.is_board_valid:
-                await interaction.response.edit_message(content="You win!", view=self)
+                await self.refresh(interaction, content="You win!", view=self)
             else:
-                await interaction.response.edit_message(content="You lose!", view=self)
+                await self.refresh(interaction, content="You lose!", view=self)
             self.stop()
+            await self.finish()
         else:
-            await interaction.response.edit_message(content="You have not filled out the whole board!", view=self)
+            await self.refresh(interaction, content="You have not filled out the whole board!", view=self)
 
     async def start(
         self,
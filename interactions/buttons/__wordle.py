@@ -15,6 +15,7 @@ from PIL import Image, ImageDraw, ImageFont
 
 import discord
 from core import Context, Parrot
+from utilities.wordle import WordIndex
 
 from .utils import DEFAULT_COLOR, BaseView
 
@@ -32,30 +33,33 @@ GRAY = (119, 123, 125)
 ORANGE = (200, 179, 87)
 GREEN = (105, 169, 99)
 LGRAY = (198, 201, 205)
+# by the feedback of the letter: absent, present, correct
+COLORS = (GRAY, ORANGE, GREEN)
 
-with open(r"extra/5_words.txt", encoding="utf-8", errors="ignore") as f:
-    VALID_WORDS = tuple(f.read().splitlines())
+WORDS = WordIndex.from_file(r"extra/5_words.txt")
 
 
 class Wordle:
     def __init__(self, *, text_size: int = 55) -> None:
         self.embed_color: DiscordColor | None = None
 
-        self._valid_words = VALID_WORDS
+        self._valid_words = WORDS
         self._text_size = text_size
         self._font = ImageFont.truetype(r"extra/HelveticaNeuBold.ttf", self._text_size)
 
         self.guesses: list[list[dict[str, str]]] = []
-        self.word: str = random.choice(self._valid_words)
+        self.word: str = random.choice(WORDS.words)
+        # rows of the words the guesses so far leave possible
+        self.answers = WORDS.everything
 
     def parse_guess(self, guess: str) -> bool:
+        pattern = WORDS.feedback(guess, self.word)
+        self.answers = WORDS.narrow(self.answers, guess, pattern)
+
         self.guesses.append([])
-        for ind, letter in enumerate(guess):
-            if letter in self.word:
-                color = GREEN if self.word[ind] == letter else ORANGE
-            else:
-                color = GRAY
-            self.guesses[-1].append({"letter": letter, "color": color})
+        for letter in guess:
+            pattern, feedback = divmod(pattern, 3)
+            self.guesses[-1].append({"letter": letter, "color": COLORS[feedback]})
 
         return guess == self.word
 
@@ -116,7 +120,7 @@ class Wordle:
                 )
 
             try:
-                guess: discord.Message = await ctx.wait_for("message", check=check, timeout=900)
+                guess: discord.Message = await ctx.wait_for("message", check=check, timeout=900, channel_id=ctx.channel.id)
             except asyncio.TimeoutError:
                 return await ctx.send("You took too long to guess the word!")
             content = guess.content.lower()
@@ -175,7 +179,7 @@ class WordInput(discord.ui.Modal, title="Word Input"):
         if content not in game._valid_words:
             return await interaction.response.send_message("That is not a valid word!", ephemeral=True)
         won = game.parse_guess(content)
-        buf = await game.render_image()
+        buf = await asyncio.to_thread(game.render_image)
 
         embed = discord.Embed(title="Wordle!", color=self.view.game.embed_color)
         embed.set_image(url="attachment://wordle.png")
@@ -218,12 +222,32 @@ class WordInputButton(discord.ui.Button["WordleView"]):
         return
 
 
+class HintButton(discord.ui.Button["WordleView"]):
+    def __init__(self) -> None:
+        super().__init__(label="Hint", style=discord.ButtonStyle.gray)
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        assert isinstance(self.view, WordleView)
+
+        game = self.view.game
+        if interaction.user != game.player:
+            return await interaction.response.send_message("This isn't your game!", ephemeral=True)
+
+        hint = await asyncio.to_thread(WORDS.hint, game.answers)
+        left = len(game.answers)
+        await interaction.response.send_message(
+            f"Try **{hint}**, {left} word{'s' if left != 1 else ''} left.",
+            ephemeral=True,
+        )
+
+
 class WordleView(BaseView):
     def __init__(self, game: BetaWordle, *, timeout: float | None) -> None:
         super().__init__(timeout=timeout)
 
         self.game = game
         self.add_item(WordInputButton())
+        self.add_item(HintButton())
         self.add_item(WordInputButton(cancel_button=True))
 
 
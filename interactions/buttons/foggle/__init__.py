@@ -7,7 +7,7 @@ import random
 import re
 from collections import defaultdict
 from collections.abc import Iterable
-from functools import wraps
+from functools import cached_property, wraps
 from typing import Literal, NamedTuple
 
 import discord
@@ -190,44 +190,49 @@ class Board:
 
         self.columns = board
         self.number = magic_number
+        self._contains: dict[str, bool] = {}
+
+    @cached_property
+    def cells(self) -> dict[str, list[int]]:
+        """Number -> indexes of the squares showing it, squares being numbered column by column."""
+        cells: dict[str, list[int]] = defaultdict(list)
+        for col in range(self.size):
+            for row in range(self.size):
+                cells[self.columns[col][row]].append(col * self.size + row)
+        return cells
+
+    @cached_property
+    def neighbours(self) -> list[int]:
+        """Bitmask of the squares adjacent to each square."""
+        masks = []
+        for col in range(self.size):
+            for row in range(self.size):
+                mask = 0
+                for other_col in range(max(col - 1, 0), min(col + 2, self.size)):
+                    for other_row in range(max(row - 1, 0), min(row + 2, self.size)):
+                        if (other_col, other_row) != (col, row):
+                            mask |= 1 << (other_col * self.size + other_row)
+                masks.append(mask)
+        return masks
+
+    def board_contains(self, numbers: str) -> bool:
+        """Whether the numbers can be traced on the board, each adjacent to the previous one."""
+        # the same chains are guessed over and over, with different operators
+        if (contained := self._contains.get(numbers)) is not None:
+            return contained
+
+        def trace(index: int, square: int, passed: int) -> bool:
+            if index == len(numbers):
+                return True
+            passed |= 1 << square
+            candidates = self.neighbours[square] & ~passed
+            return any(
+                candidates & (1 << other) and trace(index + 1, other, passed) for other in self.cells.get(numbers[index], ())
+            )
 
-    def board_contains(self, numbers: str, pos: Position = None, passed: list[Position] = None) -> bool:
-        if passed is None:
-            passed = []
-        # Empty numberss
-        if not numbers:
-            return True
-
-        # When starting out
-        if pos is None:
-            # Check all positions
-            for col in range(self.size):
-                for row in range(self.size):
-                    if self.board_contains(numbers, Position(col, row)):
-                        return True
-
-        # Checking new squares
-        elif pos not in passed:
-            # Check if letter matches current start of numbers
-            if numbers[0] == self.columns[pos.col][pos.row]:
-                # Check adjacent for next letter
-                for x in range(-1, 2):
-                    for y in range(-1, 2):
-                        # don't check yourself
-                        if x == 0 and y == 0:
-                            continue
-
-                        new_pos = Position(pos.col + x, pos.row + y)
-
-                        # don't check out of bounds
-                        if new_pos.col < 0 or new_pos.col >= self.size or new_pos.row < 0 or new_pos.row >= self.size:
-                            continue
-
-                        if self.board_contains(numbers[1:], new_pos, [*passed, pos]):
-                            return True
-
-        # Otherwise cannot find numbers
-        return False
+        contained = not numbers or any(trace(1, square, 0) for square in self.cells.get(numbers[0], ()))
+        self._contains[numbers] = contained
+        return contained
 
     def get_chain(self, equation: str) -> str:
         view = View(equation, self.base)
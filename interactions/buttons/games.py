@@ -22,6 +22,7 @@ import discord
 import emojis
 from core import Cog, Context, Parrot
 from discord.ext import boardgames, commands, old_menus as menus  # type: ignore
+from utilities import workers
 from utilities.constants import Colours
 from utilities.converters import convert_bool
 from utilities.robopages import SimplePages
@@ -67,7 +68,7 @@ from .__games_utils import (
 )
 from .__light_out import LightsOut
 from .__memory_game import MemoryGame
-from .__minecraft import Minecraft, isometric_func
+from .__minecraft import Minecraft
 from .__number_memory import NumberMemory
 from .__number_slider import NumberSlider
 from .__sokoban import SokobanGame, SokobanGameView
@@ -102,6 +103,10 @@ class Games(Cog):
         self.current_games: Dict[int, DuckGame] = {}
         self.uno_games: Dict[int, UNO] = {}
 
+    async def cog_unload(self) -> None:
+        """Stop the worker processes of the computer players."""
+        workers.shutdown()
+
     @staticmethod
     def _load_templates() -> List[MadlibsTemplate]:
         madlibs_stories = Path("extra/madlibs_templates.json")
@@ -562,15 +567,13 @@ class Games(Cog):
             title="2048 Game",
             description=f"{BoardString}",
         ).set_footer(text=f"User: {ctx.author}")
-        await ctx.send(
-            ctx.author.mention,
-            embed=embed,
-            view=Twenty48_Button(game, ctx.author, bot=self.bot),
-        )
+        view = Twenty48_Button(game, ctx.author, bot=self.bot, ctx=ctx)
+        view.message = await ctx.send(ctx.author.mention, embed=embed, view=view)
+        view.persist()
 
     @commands.group(name="chess", invoke_without_command=True)
     @commands.max_concurrency(1, commands.BucketType.user)
-    @commands.bot_has_permissions(embed_links=True, add_reactions=True)
+    @commands.bot_has_permissions(embed_links=True, attach_files=True, add_reactions=True)
     async def chess(self, ctx: Context):
         """Chess game. In testing"""
         if ctx.invoked_subcommand:
@@ -612,6 +615,7 @@ class Games(Cog):
         await game.start()
 
     @chess.command()
+    @commands.bot_has_permissions(embed_links=True, attach_files=True, add_reactions=True)
     async def custom_chess(self, ctx: Context, board: fenPass):  # type: ignore
         """To play chess, from a custom FEN notation"""
         announcement: discord.Message = await ctx.send(  # type: ignore
@@ -646,6 +650,15 @@ class Games(Cog):
         game = Chess(white=ctx.author, black=user, bot=self.bot, ctx=ctx, custom=board)
         await game.start()
 
+    @chess.command(name="engine", aliases=["bot", "computer"])
+    @commands.max_concurrency(1, commands.BucketType.user)
+    @commands.bot_has_permissions(embed_links=True, attach_files=True, add_reactions=True)
+    async def chess_bot(self, ctx: Context, depth: Literal[1, 2, 3, 4] = 3, color: Literal["white", "black"] = "white"):
+        """To play chess against the bot. The deeper it searches, the stronger it plays"""
+        white, black = (ctx.author, ctx.me) if color == "white" else (ctx.me, ctx.author)
+        game = Chess(white=white, black=black, bot=self.bot, ctx=ctx, engine_depth=depth)  # type: ignore
+        await game.start()
+
     @commands.command()
     @commands.max_concurrency(1, commands.BucketType.user)
     @commands.bot_has_permissions(embed_links=True)
@@ -1338,7 +1351,7 @@ class Games(Cog):
         interactive_view = Minecraft(ctx, [50, 50, 50])
         code = "- ".join([" ".join(["".join(row) for row in lay]) for lay in interactive_view.box])
 
-        buf, c = await asyncio.to_thread(isometric_func, code.split(), interactive_view.selector_pos)
+        buf, c = await asyncio.to_thread(interactive_view.renderer.render, code.split(), interactive_view.selector_pos)
         c -= 1
         buf_file = discord.File(buf, "interactive_iso.png")
         # link = await ctx.upload_bytes(buf.getvalue(), 'image/png', 'interactive_iso')
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import functools
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable
 from typing import TYPE_CHECKING, Any, Final, TypeVar
 
 import discord
@@ -102,4 +102,110 @@ async def double_wait(
 
 
 class BaseView(ParrotView):
-    pass
+    """Base of the button games.
+
+    `refresh` answers a click with an edit of the game's message. An edit which
+    would not change the message is skipped, and the edits of clicks coming less
+    than `frame` seconds apart are gathered into one, sent at the end of the frame.
+    Only views whose buttons stay the same between edits can gather them, a click
+    on a button of the message must reach the view.
+
+    `render_board` draws a board from the drawings of its rows, kept between renders.
+    `finish` stores the result of the game through `save`, once however the game ends.
+    """
+
+    # seconds the edits of a burst of clicks are gathered over
+    frame: float = 0.5
+    # rows drawn kept by `render_board`
+    max_rows: int = 1024
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.__rows: dict[tuple[Any, ...], str] = {}
+        self.__shown: str | None = None
+        self.__last_edit = 0.0
+        self.__pending: tuple[discord.Interaction, dict[str, Any], str | None] | None = None
+        self.__flush: asyncio.Task[None] | None = None
+        self.__finished = False
+
+    def render_board(self, board: Iterable[Iterable[Any]], cell: Callable[[Any], str], *, separator: str = "") -> str:
+        """The board drawn a row per line, the cells drawn by `cell`. A view draws its boards with one `cell`."""
+        lines: list[str] = []
+        for row in board:
+            key = tuple(row)
+            if (line := self.__rows.get(key)) is None:
+                if len(self.__rows) >= self.max_rows:
+                    self.__rows.clear()
+                line = self.__rows[key] = separator.join(cell(value) for value in key)
+            lines.append(f"{line}\n")
+        return "".join(lines)
+
+    def __fingerprint(self, payload: dict[str, Any]) -> str | None:
+        if "attachments" in payload:
+            # files can not be compared, they are always sent
+            return None
+
+        parts = []
+        for key, value in sorted(payload.items()):
+            if isinstance(value, discord.Embed):
+                value = {k: v for k, v in value.to_dict().items() if k != "timestamp"}
+            elif isinstance(value, discord.ui.View):
+                value = value.to_components()
+            parts.append((key, value))
+        return repr(parts)
+
+    async def refresh(self, interaction: discord.Interaction, **payload: Any) -> None:
+        """Answer the click with an edit of the message, taking the keywords of `edit_message`."""
+        loop = asyncio.get_running_loop()
+        fingerprint = self.__fingerprint(payload)
+
+        if self.__pending is None:
+            if fingerprint is not None and fingerprint == self.__shown:
+                await interaction.response.defer()
+                return
+            if loop.time() - self.__last_edit >= self.frame:
+                self.__shown, self.__last_edit = fingerprint, loop.time()
+                await interaction.response.edit_message(**payload)
+                return
+
+        # the click is acknowledged now, the message is edited with the state of the last one
+        await interaction.response.defer()
+        self.__pending = (interaction, payload, fingerprint)
+        if self.__flush is None:
+            delay = self.frame - (loop.time() - self.__last_edit)
+            self.__flush = asyncio.create_task(self.__flush_after(delay))
+
+    async def __flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self.__flush = None
+        if self.is_finished():
+            # the game ended without `finish`, its message may be gone
+            self.__pending = None
+            return
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send the edit waiting for the end of its frame, if any."""
+        if self.__flush is not None:
+            self.__flush.cancel()
+            self.__flush = None
+        if self.__pending is None:
+            return
+
+        interaction, payload, fingerprint = self.__pending
+        self.__pending = None
+        if fingerprint is not None and fingerprint == self.__shown:
+            return
+        self.__shown, self.__last_edit = fingerprint, asyncio.get_running_loop().time()
+        await interaction.edit_original_response(**payload)
+
+    async def finish(self) -> None:
+        """Send the waiting edit and store the result of the game, the first time only."""
+        await self.flush()
+        if self.__finished:
+            return
+        self.__finished = True
+        await self.save()
+
+    async def save(self) -> None:
+        """Store the result of the game, called once by `finish`."""
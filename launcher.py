@@ -0,0 +1,95 @@
+"""Run the bot as several processes ("clusters"), each connecting a contiguous range of the shards.
+
+    python launcher.py --clusters 4 --shards 16
+
+The launcher runs the coordinator the clusters talk to each other through, and
+restarts any cluster which exits. Cluster 0 is the primary one, running the
+timers, the IPC server and the top.gg autopost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import sys
+
+from utilities.cluster import DEFAULT_PORT, Coordinator, shard_ranges
+
+log = logging.getLogger("launcher")
+
+# Seconds between two identifies, clusters are started this long apart for each shard of the previous one.
+IDENTIFY_DELAY = 5
+# A cluster running for this long is restarted right away when it exits, else with a growing delay.
+HEALTHY_UPTIME = 60
+MAX_RESTART_DELAY = 60
+
+
+async def run_cluster(cluster_id: int, args: argparse.Namespace, stop: asyncio.Event) -> None:
+    env = {
+        **os.environ,
+        "CLUSTER_ID": str(cluster_id),
+        "CLUSTER_COUNT": str(args.clusters),
+        "SHARD_COUNT": str(args.shards),
+        "CLUSTER_PORT": str(args.port),
+    }
+    loop = asyncio.get_running_loop()
+    delay = 1
+
+    while not stop.is_set():
+        started_at = loop.time()
+        process = await asyncio.create_subprocess_exec(sys.executable, "main.py", env=env)
+        log.info("Started cluster %s (pid %s)", cluster_id, process.pid)
+
+        waiter = asyncio.create_task(process.wait())
+        stopping = asyncio.create_task(stop.wait())
+        await asyncio.wait([waiter, stopping], return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+
+        if stop.is_set():
+            if process.returncode is None:
+                process.terminate()
+                await waiter
+            return
+
+        log.warning("Cluster %s exited with code %s", cluster_id, process.returncode)
+        delay = 1 if loop.time() - started_at > HEALTHY_UPTIME else min(delay * 2, MAX_RESTART_DELAY)
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), delay)
+
+
+async def main(args: argparse.Namespace) -> None:
+    ranges = shard_ranges(args.shards, args.clusters)
+
+    coordinator = Coordinator(port=args.port)
+    await coordinator.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    tasks: list[asyncio.Task[None]] = []
+    for cluster_id, shard_ids in enumerate(ranges):
+        log.info("Cluster %s: shards %s-%s", cluster_id, shard_ids[0], shard_ids[-1])
+        tasks.append(asyncio.create_task(run_cluster(cluster_id, args, stop)))
+        if cluster_id < len(ranges) - 1:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), IDENTIFY_DELAY * len(shard_ids))
+
+    await asyncio.gather(*tasks)
+    await coordinator.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the bot as several clusters of shards.")
+    parser.add_argument("--clusters", type=int, default=os.cpu_count() or 1, help="number of processes")
+    parser.add_argument("--shards", type=int, required=True, help="total number of shards")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port of the coordinator")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+    asyncio.run(main(parser.parse_args()))
@@ -11,8 +11,6 @@ from core import Parrot
 from updater import init
 from utilities.config import DATABASE_KEY, DATABASE_URI, TOKEN, VERSION
 
-bot: Parrot = Parrot()
-
 if os.name == "nt":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 else:
@@ -25,10 +23,15 @@ else:
 
 
 async def main() -> None:
-    async with ClientSession(connector=TCPConnector(resolver=AsyncResolver(), family=socket.AF_INET)) as http_session:
+    # built here, processes importing this module (the workers of a process pool) do not start a bot
+    bot: Parrot = Parrot()
+    async with ClientSession(
+        connector=TCPConnector(resolver=AsyncResolver(), family=socket.AF_INET),
+        trace_configs=[bot.profiler.trace_config()],
+    ) as http_session:
         async with bot:
             bot.http_session = http_session
-            bot.sql = await init()
+            bot.sql = bot.profiler.trace_sqlite(await init())  # type: ignore
             bot.database = bot.sql
 
             if not hasattr(bot, "__version__"):
@@ -36,6 +39,7 @@ async def main() -> None:
 
             bot.mongo = AsyncIOMotorClient(
                 DATABASE_URI.format(DATABASE_KEY),
+                event_listeners=[bot.profiler.command_listener()],
             )
             await bot.init_db()
             await bot.start(TOKEN)
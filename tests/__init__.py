@@ -1,4 +1,20 @@
 # sourcery skip: dont-import-test-modules
+from .test_chess import *
+from .test_cluster import *
+from .test_config_store import *
+from .test_emojis import *
+from .test_game_ai import *
+from .test_giveaway import *
+from .test_indexes import *
+from .test_isometric import *
+from .test_name_index import *
+from .test_overwrites import *
+from .test_profiler import *
+from .test_telemetry import *
 from .test_time import *
+from .test_view_store import *
+from .test_waiters import *
 from .test_wikihow import *
+from .test_word_games import *
+from .test_wordle import *
 from .test_youtube_search import *
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import signal
+from io import BytesIO
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import chess
+from PIL import Image
+
+from utilities import workers
+from utilities.chess_engine import best_move, evaluate, search
+from utilities.imaging.chessboard import DARK_LAST_MOVE, LIGHT, LIGHT_LAST_MOVE, BoardRenderer
+
+SQUARE = 20
+
+
+def flat_piece(piece: chess.Piece, size: int) -> Image.Image:
+    colour = (255, 255, 255, 255) if piece.color == chess.WHITE else (0, 0, 0, 255)
+    image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    image.paste(colour, (size // 4, size // 4, 3 * size // 4, 3 * size // 4))
+    return image
+
+
+class TestBoardRenderer(TestCase):
+    def setUp(self) -> None:
+        self.renderer = BoardRenderer(square=SQUARE, margin=10, pieces=flat_piece, cache_size=2)
+
+    def pixel(self, png: BytesIO, square: chess.Square, orientation: chess.Color, *, corner: bool = False):
+        x0, y0, x1, y1 = self.renderer.square_box(square, orientation)
+        point = (x0 + 1, y0 + 1) if corner else ((x0 + x1) // 2, (y0 + y1) // 2)
+        with Image.open(png) as image:
+            return image.convert("RGBA").getpixel(point)
+
+    def test_pieces_and_orientation(self) -> None:
+        board = chess.Board()
+        for orientation in (chess.WHITE, chess.BLACK):
+            png = self.renderer.render(board, orientation=orientation)
+            self.assertEqual(self.pixel(png, chess.E1, orientation), (255, 255, 255, 255))
+            self.assertEqual(self.pixel(png, chess.E8, orientation), (0, 0, 0, 255))
+            self.assertEqual(self.pixel(png, chess.E4, orientation), LIGHT)
+
+        self.assertEqual(self.renderer.square_box(chess.A8, chess.WHITE), (10, 10, 30, 30))
+        self.assertEqual(self.renderer.square_box(chess.H1, chess.BLACK), (10, 10, 30, 30))
+
+    def test_last_move(self) -> None:
+        board = chess.Board()
+        board.push_san("e4")
+        png = self.renderer.render(board)
+        self.assertEqual(self.pixel(png, chess.E2, chess.WHITE), LIGHT_LAST_MOVE)
+        self.assertEqual(self.pixel(png, chess.E4, chess.WHITE, corner=True), LIGHT_LAST_MOVE)
+
+        board.push_san("e5")
+        png = self.renderer.render(board, orientation=chess.BLACK)
+        self.assertEqual(self.pixel(png, chess.E7, chess.BLACK), DARK_LAST_MOVE)
+        self.assertEqual(self.pixel(png, chess.E5, chess.BLACK, corner=True), DARK_LAST_MOVE)
+        self.assertEqual(self.pixel(png, chess.E2, chess.BLACK), LIGHT)
+
+    def test_cache(self) -> None:
+        board = chess.Board()
+        first = self.renderer.render(board).getvalue()
+        self.assertEqual(self.renderer.cache_info(), (1, 2))
+        self.assertEqual(self.renderer.render(chess.Board()).getvalue(), first)
+        self.assertEqual(self.renderer.cache_info(), (1, 2))
+
+        for san in ("e4", "e5", "Nf3"):
+            board.push_san(san)
+            self.renderer.render(board)
+        self.assertEqual(self.renderer.cache_info(), (2, 2))
+
+
+class TestChessEngine(TestCase):
+    def test_evaluate(self) -> None:
+        self.assertEqual(evaluate(chess.Board()), 0)
+        board = chess.Board("4k3/8/8/8/8/8/8/3QK3 w - - 0 1")
+        self.assertGreater(evaluate(board), 800)
+        board.turn = chess.BLACK
+        self.assertLess(evaluate(board), -800)
+
+    def test_mate_in_one(self) -> None:
+        move, score, _ = search("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1", depth=3, time_limit=5)
+        self.assertEqual(move, "a1a8")
+        self.assertGreater(score, 0)
+
+    def test_wins_material(self) -> None:
+        # the black queen is left hanging
+        move, _, _ = search("rnb1kbnr/pppp1ppp/8/4p3/4P2q/5N2/PPPP1PPP/RNBQKB1R w KQkq - 0 3", depth=2, time_limit=5)
+        self.assertEqual(move, "f3h4")
+
+    def test_time_limit(self) -> None:
+        move, _, depth = search(chess.STARTING_FEN, depth=20, time_limit=0.2)
+        self.assertIsNotNone(move)
+        self.assertIn(chess.Move.from_uci(move), chess.Board().legal_moves)  # type: ignore
+        self.assertLess(depth, 20)
+
+    def test_no_moves(self) -> None:
+        self.assertEqual(search("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", depth=2, time_limit=1)[0], None)
+
+
+class TestEnginePool(IsolatedAsyncioTestCase):
+    async def asyncTearDown(self) -> None:
+        workers.shutdown()
+
+    async def test_recovers_from_a_dead_worker(self) -> None:
+        board = chess.Board("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+        self.assertEqual(await best_move(board, depth=3), chess.Move.from_uci("a1a8"))
+
+        for process in list(workers._executor()._processes.values()):  # type: ignore
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+        self.assertEqual(await best_move(board, depth=3), chess.Move.from_uci("a1a8"))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from utilities.cluster import MAX_MESSAGE, ClusterClient, ClusterInfo, Coordinator, shard_ranges
+
+
+class TestShardRanges(TestCase):
+    def test_ranges(self) -> None:
+        self.assertEqual(shard_ranges(10, 3), [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.assertEqual(shard_ranges(1, 1), [[0]])
+
+        with self.assertRaises(ValueError):
+            shard_ranges(2, 3)
+
+    def test_cluster_of(self) -> None:
+        for shard_count, cluster_count in ((10, 3), (16, 4), (7, 7), (5, 1)):
+            ranges = shard_ranges(shard_count, cluster_count)
+            info = ClusterInfo(0, cluster_count, shard_count)
+            for shard_id in range(shard_count):
+                guild_id = shard_id << 22
+                expected = next(index for index, shards in enumerate(ranges) if shard_id in shards)
+                self.assertEqual(info.cluster_of(guild_id), expected)
+
+
+class TestClusterClient(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.coordinator = Coordinator(port=0)
+        await self.coordinator.start()
+        port = self.coordinator._Coordinator__server.sockets[0].getsockname()[1]  # type: ignore
+
+        self.clients = [ClusterClient(ClusterInfo(cluster_id, 3, 6), port=port) for cluster_id in range(3)]
+        for client in self.clients:
+            await client.connect()
+        while len(self.coordinator.clusters) < 3:
+            await asyncio.sleep(0.01)
+
+    async def asyncTearDown(self) -> None:
+        for client in self.clients:
+            await client.close()
+        await self.coordinator.close()
+
+    async def test_gather(self) -> None:
+        for client in self.clients:
+
+            async def stats(data: int, *, client: ClusterClient = client) -> int:
+                return client.info.cluster_id * data
+
+            client.add_handler("stats", stats)
+
+        self.assertEqual(await self.clients[1].gather("stats", 10, timeout=1), {0: 0, 1: 10, 2: 20})
+
+    async def test_send(self) -> None:
+        received: asyncio.Queue[tuple[int, dict]] = asyncio.Queue()
+        for client in self.clients:
+
+            async def timer(data: dict, *, client: ClusterClient = client) -> None:
+                await received.put((client.info.cluster_id, data))
+
+            client.add_handler("timer", timer)
+
+        await self.clients[0].send("timer", {"_id": 1}, to=2)
+        self.assertEqual(await asyncio.wait_for(received.get(), 1), (2, {"_id": 1}))
+
+        await self.clients[0].send("timer", {"_id": 2})
+        broadcast = {(await asyncio.wait_for(received.get(), 1))[0] for _ in range(2)}
+        self.assertEqual(broadcast, {1, 2})
+
+    async def test_deliver(self) -> None:
+        received: list[dict] = []
+
+        async def timer(data: dict) -> bool:
+            received.append(data)
+            return True
+
+        self.clients[2].add_handler("timer", timer)
+        self.assertTrue(await self.clients[0].deliver("timer", {"_id": 1}, to=2, timeout=1))
+        self.assertEqual(received, [{"_id": 1}])
+
+        # the cluster is gone, the timer is not delivered
+        await self.clients[2].close()
+        while len(self.coordinator.clusters) > 2:
+            await asyncio.sleep(0.01)
+        self.assertFalse(await self.clients[0].deliver("timer", {"_id": 2}, to=2, timeout=0.2))
+        self.assertEqual(len(received), 1)
+
+    async def test_reply_over_the_limit(self) -> None:
+        for client in self.clients:
+
+            async def guilds(_: None, *, client: ClusterClient = client) -> str:
+                return "x" * (MAX_MESSAGE if client.info.cluster_id == 2 else 1)
+
+            client.add_handler("guilds", guilds)
+
+        # the reply too long is left out, the connection is kept
+        self.assertEqual(await self.clients[0].gather("guilds", timeout=0.5), {0: "x", 1: "x"})
+        self.assertEqual(self.coordinator.clusters, [0, 1, 2])
+        self.assertEqual(await self.clients[2].deliver("guilds", to=1, timeout=1), "x")
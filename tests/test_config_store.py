@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+from unittest import TestCase
+
+from core.__template import post
+from utilities.config_store import GuildConfigStore
+
+
+class FakeCursor:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = {document["_id"]: document for document in documents}
+
+    def find(self, *_, **__) -> FakeCursor:
+        return FakeCursor(list(self.documents.values()))
+
+    async def find_one(self, query: dict) -> dict | None:
+        return self.documents.get(query["_id"])
+
+
+class FakeBot:
+    def __init__(self, documents: list[dict]) -> None:
+        self.guild_configurations = FakeCollection(documents)
+
+
+class TestGuildConfigStore(TestCase):
+    def setUp(self) -> None:
+        self.bot = FakeBot(
+            [
+                {"_id": 1, "prefix": "!", "mute_role": 10, "global_chat": {"enable": True, "webhook": "a"}},
+                {"_id": 2, "prefix": "?", "global_chat": {"enable": False, "webhook": "b"}, "suggestion_channel": 20},
+            ],
+        )
+        self.store = GuildConfigStore(self.bot, defaults=post)  # type: ignore
+        asyncio.run(self.store.load())
+
+    def test_load(self):
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store[1]["prefix"], "!")
+        with self.assertRaises(KeyError):
+            self.store[3]
+
+    def test_accessors_fall_back_to_defaults(self):
+        self.assertEqual(self.store.mute_role(1), 10)
+        self.assertIsNone(self.store.mute_role(2))
+        self.assertEqual(self.store.prefix(3), "$")
+        self.assertFalse(self.store.leveling(3)["enable"])
+
+    def test_global_chat_index(self):
+        self.assertEqual(self.store.global_chat_webhooks(), ["a"])
+
+        self.store[2] = {"_id": 2, "global_chat": {"enable": True, "webhook": "b"}}
+        self.assertEqual(sorted(self.store.global_chat_webhooks()), ["a", "b"])
+
+        self.store.pop(1)
+        self.assertEqual(self.store.global_chat_webhooks(), ["b"])
+
+    def test_suggestion_channel_index(self):
+        self.assertTrue(self.store.is_suggestion_channel(20))
+        self.assertFalse(self.store.is_suggestion_channel(21))
+
+        self.store[2] = {"_id": 2, "suggestion_channel": 21}
+        self.assertFalse(self.store.is_suggestion_channel(20))
+        self.assertTrue(self.store.is_suggestion_channel(21))
+
+        del self.store[2]
+        self.assertFalse(self.store.is_suggestion_channel(21))
+
+    def test_refresh(self):
+        self.bot.guild_configurations.documents[1]["prefix"] = "-"
+        asyncio.run(self.store.refresh(1))
+        self.assertEqual(self.store.prefix(1), "-")
+
+        del self.bot.guild_configurations.documents[2]
+        asyncio.run(self.store.refresh(2))
+        self.assertNotIn(2, self.store)
+
+
+if __name__ == "__main__":
+    from unittest import main
+
+    main()
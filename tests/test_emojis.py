@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+import emojis
+from emojis import db
+from emojis.benchmark import messages, regex_scanner
+from emojis.db.db import EMOJI_DB
+
+
+class TestEmojis(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.alias_re, cls.emoji_re = regex_scanner()
+        cls.alias_to_emoji = db.get_emoji_aliases()
+        cls.emoji_to_alias = {v: k for k, v in cls.alias_to_emoji.items()}
+
+    def test_same_as_regex(self) -> None:
+        samples = [
+            *messages(50, seed=1),
+            "family 👨‍👩‍👧‍👦 and keycap #️⃣ 1️⃣ then ❤️ and ❤",
+            "".join(emoji.emoji for emoji in EMOJI_DB),
+            "",
+        ]
+        for msg in samples:
+            self.assertEqual(emojis.count(msg), len(self.emoji_re.findall(msg)))
+            self.assertEqual(emojis.get(msg), set(self.emoji_re.findall(msg)))
+            self.assertEqual(
+                emojis.decode(msg),
+                self.emoji_re.sub(lambda match: self.emoji_to_alias[match.group(0)], msg),
+            )
+
+    def test_encode(self) -> None:
+        for msg in ("hi :smile: :snake:", ":foo:smile::+1:", "::smile:", ":smile", "no colons", ":grinning::"):
+            self.assertEqual(
+                emojis.encode(msg),
+                self.alias_re.sub(lambda match: self.alias_to_emoji[match.group(0)], msg),
+            )
+
+        self.assertEqual(emojis.encode(emojis.decode("a 🐍 b")), "a 🐍 b")
+
+    def test_lookups(self) -> None:
+        snake = db.get_emoji_by_code("🐍")
+        self.assertEqual(snake, db.get_emoji_by_alias("snake"))
+        self.assertIsNone(db.get_emoji_by_code("x"))
+
+        self.assertEqual(
+            list(db.get_emojis_by_tag("HAPPY")),
+            [emoji for emoji in EMOJI_DB if "happy" in emoji.tags],
+        )
+        self.assertEqual(
+            list(db.get_emojis_by_category("animals & nature")),
+            [emoji for emoji in EMOJI_DB if emoji.category.lower() == "animals & nature"],
+        )
+        self.assertEqual(db.get_tags(), {tag for emoji in EMOJI_DB for tag in emoji.tags})
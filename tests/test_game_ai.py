@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import itertools
+import random
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from utilities import workers
+from utilities.game_ai import ConnectFour, best_cell, best_column
+
+
+def grid(rows: str) -> list[list[int]]:
+    return [[int(square) for square in row] for row in rows.split()]
+
+
+class TestConnectFour(TestCase):
+    def test_aligned(self) -> None:
+        game = ConnectFour(7, 6)
+        for rows in (
+            "0000000 0000000 0000000 0000000 0000000 1111000",
+            "0000000 0000000 1000000 1000000 1000000 1000000",
+            "0000000 0000000 0001000 0010000 0100000 1000000",
+            "0000000 0000000 1000000 0100000 0010000 0001000",
+        ):
+            _, mask, _ = game.from_grid(grid(rows), 1)
+            self.assertTrue(game.aligned(mask), rows)
+
+        # counters of consecutive columns do not wrap around the board
+        _, mask, _ = game.from_grid(grid("1000000 0000000 0000000 0000000 0000001 0000001"), 1)
+        self.assertFalse(game.aligned(mask))
+
+    def test_play_matches_grid(self) -> None:
+        rng = random.Random(0)
+        game = ConnectFour(7, 6)
+        board = [[0] * 7 for _ in range(6)]
+        position = game.from_grid(board, 1)
+        for player in itertools.islice(itertools.cycle((1, 2)), 20):
+            column = rng.choice([column for column in range(7) if game.can_play(position, column)])
+            row = max(row for row in range(6) if not board[row][column])
+            board[row][column] = player
+            position = game.play(position, column)
+            current, mask, moves = position
+            self.assertEqual((current ^ mask, mask, moves), game.from_grid(board, player))
+
+    def test_wins_and_blocks(self) -> None:
+        board = grid("0000000 0000000 0000000 0200000 0200000 0211000")
+        self.assertEqual(best_column(board, 2, time_limit=0.5), 1)
+        board = grid("0000000 0000000 0000000 0000000 0000002 1110002")
+        self.assertEqual(best_column(board, 2, time_limit=0.5), 3)
+
+    def test_time_limit(self) -> None:
+        game = ConnectFour(9, 9)
+        column, depth = game.search(game.from_grid([[0] * 9] * 9, 1), time_limit=0.2)
+        self.assertIn(column, range(9))
+        self.assertGreaterEqual(depth, 1)
+        self.assertIsNone(best_column(grid("12 21"), 1))
+
+
+class TestConnectFourWorker(IsolatedAsyncioTestCase):
+    async def asyncTearDown(self) -> None:
+        workers.shutdown()
+
+    async def test_searches_in_a_worker(self) -> None:
+        board = grid("0000000 0000000 0000000 0200000 0200000 0211000")
+        self.assertEqual(await workers.run(best_column, board, 2, time_limit=0.5), 1)
+
+
+class TestTicTacToe(TestCase):
+    def test_never_loses(self) -> None:
+        rng = random.Random(0)
+        for game in range(100):
+            state: list[list[bool | None]] = [[None] * 3 for _ in range(3)]
+            player, ai = False, game % 2 == 0
+            for _ in range(9):
+                if player == ai:
+                    coords = best_cell(state, player)
+                    assert coords is not None
+                    row, column = coords
+                else:
+                    row, column = rng.choice([(r, c) for r in range(3) for c in range(3) if state[r][c] is None])
+                state[row][column] = player
+                lines = [*state, *zip(*state), [state[i][i] for i in range(3)], [state[i][2 - i] for i in range(3)]]
+                if any(all(cell == player for cell in line) for line in lines):
+                    self.assertEqual(player, ai)
+                    break
+                player = not player
+
+    def test_takes_the_win(self) -> None:
+        self.assertEqual(best_cell([[False, False, None], [True, True, None], [None, None, None]], False), (0, 2))
+        self.assertEqual(best_cell([[False, False, None], [True, None, None], [None, None, None]], True), (0, 2))
+        self.assertIsNone(best_cell([[False, False, False], [True, True, None], [None, None, None]], True))
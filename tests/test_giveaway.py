@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+
+from pymongo.errors import AutoReconnect
+
+from cogs.giveaway.method import GiveawayRegistry, flush_entrants
+
+
+class FailingCollection:
+    def __init__(self) -> None:
+        self.fail = True
+        self.writes: list[list] = []
+
+    async def bulk_write(self, requests: list, ordered: bool = True) -> None:
+        if self.fail:
+            raise AutoReconnect("down")
+        self.writes.append(requests)
+
+
+class TestGiveawayRegistry(IsolatedAsyncioTestCase):
+    async def test_failed_flush_is_requeued(self):
+        registry = GiveawayRegistry()
+        registry.register(1, [10])
+        registry.register(2)
+        registry.add(1, 11)
+        registry.add(1, 12)
+        registry.remove(1, 10)
+        registry.add(2, 20)
+
+        collection = FailingCollection()
+        bot = SimpleNamespace(giveaways=collection)
+        with self.assertRaises(AutoReconnect):
+            await flush_entrants(bot, registry)  # type: ignore
+
+        # changes made after the failed write win over it
+        registry.remove(1, 12)
+        registry.add(1, 10)
+        registry.unregister(2)
+        changes = registry.drain()
+        self.assertEqual(changes, {1: ({11, 10}, {12})})
+
+        registry.requeue(changes)
+        collection.fail = False
+        await flush_entrants(bot, registry)  # type: ignore
+        self.assertEqual(len(collection.writes), 1)
+        self.assertEqual(len(collection.writes[0]), 2)
+        self.assertEqual(registry.drain(), {})
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from unittest import TestCase
+
+from utilities.indexes import HOT_QUERIES, INDEXES, QueryPlan, _stages
+
+
+class TestIndexes(TestCase):
+    def test_stages(self):
+        plan = {
+            "stage": "SUBPLAN",
+            "inputStage": {
+                "stage": "FETCH",
+                "inputStage": {
+                    "stage": "OR",
+                    "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}],
+                },
+            },
+        }
+        self.assertEqual(_stages(plan), ["SUBPLAN", "FETCH", "OR", "IXSCAN", "COLLSCAN"])
+        self.assertTrue(QueryPlan("q", _stages(plan), None, None).collection_scan)
+        self.assertFalse(QueryPlan("q", ["FETCH", "IXSCAN"], 1, 1).collection_scan)
+
+    def test_registered_collections_exist(self):
+        source = (Path(__file__).parent.parent / "core" / "Parrot.py").read_text()
+        attributes = set(re.findall(r"self\.(\w+): MongoCollection = ", source))
+        for spec in INDEXES:
+            self.assertIn(spec.collection, attributes)
+        for query in HOT_QUERIES:
+            if query.collection is not None:
+                self.assertIn(query.collection, attributes)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import random
+from unittest import TestCase
+
+from PIL import Image
+
+from utilities.imaging.isometric import IsometricRenderer, parse_shape
+
+SIZE = 4
+
+
+def sprite(color: tuple[int, int, int]) -> Image.Image:
+    image = Image.new("RGBA", (56, 60), (0, 0, 0, 0))
+    image.paste((*color, 255), (0, 14, 56, 46))
+    image.paste((*color, 128), (10, 0, 46, 60))
+    return image
+
+
+SPRITES = {"1": sprite((200, 50, 50)), "2": sprite((50, 200, 50)), "3": sprite((50, 50, 200))}
+SELECTOR = (Image.new("RGBA", (56, 60), (255, 255, 0, 80)), Image.new("RGBA", (56, 60), (255, 255, 255, 60)))
+
+
+def make() -> IsometricRenderer:
+    return IsometricRenderer(SPRITES, counted="123", selector=SELECTOR)
+
+
+def code(box: list[list[list[str]]]) -> list[str]:
+    return "- ".join(" ".join("".join(row) for row in level) for level in box).split()
+
+
+class TestIsometric(TestCase):
+    def test_parse_shape(self) -> None:
+        self.assertEqual(
+            parse_shape(["10", "02-", "00", "03-"], "123"),
+            {(0, 0, 0): "1", (0, 1, 1): "2", (1, 1, 1): "3"},
+        )
+
+    def test_incremental_matches_full(self) -> None:
+        rng = random.Random(0)
+        box = [[["0"] * SIZE for _ in range(SIZE)] for _ in range(SIZE)]
+        box[0][0][0] = "1"
+        renderer = make()
+
+        for _ in range(30):
+            lvl, i, j = (rng.randrange(SIZE) for _ in range(3))
+            box[lvl][i][j] = rng.choice("0123")
+            if all(val == "0" for level in box for row in level for val in row):
+                box[0][0][0] = "1"
+            selector = [rng.randrange(SIZE) for _ in range(3)]
+
+            buf, count = renderer.render(code(box), selector)
+            fresh_buf, fresh_count = make().render(code(box), selector)
+            self.assertEqual(count, fresh_count)
+            with Image.open(buf) as image, Image.open(fresh_buf) as fresh:
+                self.assertEqual(image.size, fresh.size)
+                self.assertEqual(image.tobytes(), fresh.tobytes())
+
+    def test_count(self) -> None:
+        _, count = make().render(["12", "00-"], [0, 0, 0])
+        self.assertEqual(count, 2)
+        _, count = make().render(["12", "00-"], [0, 1, 1])
+        self.assertEqual(count, 3)
+        with self.assertRaises(Exception):
+            make().render(["00", "00-"])
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from utilities.name_index import NameIndex
+
+
+class TestNameIndex(TestCase):
+    def setUp(self) -> None:
+        self.index = NameIndex(["rules", "Roles", "rule34", "faq", "install", "installation", "python"])
+
+    def test_prefix_is_sorted_and_case_insensitive(self):
+        self.assertEqual(self.index.prefix("R"), ["Roles", "rule34", "rules"])
+        self.assertEqual(self.index.prefix("inst"), ["install", "installation"])
+        self.assertEqual(self.index.prefix("zzz"), [])
+
+    def test_prefix_pagination(self):
+        self.assertEqual(self.index.prefix("r", limit=2), ["Roles", "rule34"])
+        self.assertEqual(self.index.prefix("r", limit=2, offset=2), ["rules"])
+        self.assertEqual(self.index.count_prefix("r"), 3)
+        self.assertEqual(self.index.count_prefix(""), len(self.index))
+
+    def test_similar(self):
+        self.assertEqual(self.index.similar("instal")[0], "install")
+        self.assertEqual(self.index.similar("pyhton", cutoff=0.2), ["python"])
+        self.assertEqual(self.index.similar("qwerty"), [])
+
+    def test_remove(self):
+        self.index.remove("rules")
+        self.index.remove("missing")
+        self.assertNotIn("rules", self.index)
+        self.assertEqual(self.index.prefix("rul"), ["rule34"])
+        self.assertNotIn("rules", self.index.similar("rules"))
+
+    def test_complete(self):
+        self.assertEqual(self.index.complete("inst", limit=2), ["install", "installation"])
+        self.assertEqual(self.index.complete("stall")[:2], ["install", "installation"])
+        self.assertEqual(len(self.index.complete("")), len(self.index))
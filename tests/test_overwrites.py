@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+import discord
+from utilities.overwrites import BulkChannelEditor, ChannelChange
+
+
+class FakeRole(discord.Role):
+    def __init__(self, role_id: int) -> None:  # pylint: disable=super-init-not-called
+        self.id = role_id
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int) -> None:
+        self.id = channel_id
+        self.overwrite = discord.PermissionOverwrite()
+        self.slowmode_delay = 0
+
+    def overwrites_for(self, _target: discord.Role) -> discord.PermissionOverwrite:
+        return self.overwrite
+
+    async def set_permissions(self, _target: discord.Role, *, overwrite: discord.PermissionOverwrite | None, reason: str | None):
+        await asyncio.sleep(0)
+        self.overwrite = overwrite or discord.PermissionOverwrite()
+
+    async def edit(self, *, slowmode_delay: int, reason: str | None):
+        self.slowmode_delay = slowmode_delay
+
+
+class FakeGuild:
+    id = 1
+
+    def __init__(self, channels: dict[int, FakeChannel], role: FakeRole) -> None:
+        self.channels = channels
+        self.role = role
+
+    def get_channel(self, channel_id: int) -> FakeChannel | None:
+        return self.channels.get(channel_id)
+
+    def get_role(self, _role_id: int) -> FakeRole:
+        return self.role
+
+
+class TestBulkChannelEditor(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.role = FakeRole(1)
+        self.channels = {channel_id: FakeChannel(channel_id) for channel_id in range(20)}
+        self.channels[0].overwrite = discord.PermissionOverwrite(read_messages=True)
+        self.guild = FakeGuild(self.channels, self.role)
+
+    def test_plan_merges_and_skips_noop(self):
+        editor = BulkChannelEditor(self.guild)  # type: ignore
+        channel = self.channels[0]
+
+        editor.plan_overwrite(channel, self.role, read_messages=False)  # type: ignore
+        editor.plan_overwrite(channel, self.role, send_messages=False)  # type: ignore
+        self.assertEqual(len(editor.pending), 1)
+
+        change = next(iter(editor.pending.values()))
+        self.assertEqual(change.before, BulkChannelEditor._to_pair(discord.PermissionOverwrite(read_messages=True)))
+
+        self.assertIsNone(editor.plan_slowmode(channel, 0))  # type: ignore
+
+    async def test_execute_and_rollback(self):
+        editor = BulkChannelEditor(self.guild, concurrency=4)  # type: ignore
+        for channel in self.channels.values():
+            editor.plan_overwrite(channel, self.role, send_messages=False)  # type: ignore
+            editor.plan_slowmode(channel, 10)  # type: ignore
+
+        await editor.execute()
+        self.assertEqual(editor.done, 40)
+        self.assertFalse(editor.pending)
+        self.assertTrue(all(channel.overwrite.send_messages is False for channel in self.channels.values()))
+
+        stored = [ChannelChange.from_dict(change.to_dict()) for change in editor.applied]
+        rollback = BulkChannelEditor(self.guild)  # type: ignore
+        rollback.extend(change.reverse() for change in reversed(stored))
+        await rollback.execute()
+
+        self.assertEqual(self.channels[0].overwrite, discord.PermissionOverwrite(read_messages=True))
+        self.assertTrue(self.channels[1].overwrite.is_empty())
+        self.assertTrue(all(channel.slowmode_delay == 0 for channel in self.channels.values()))
+
+    async def test_cancel_and_resume(self):
+        editor = BulkChannelEditor(self.guild, concurrency=1)  # type: ignore
+        for channel in self.channels.values():
+            editor.plan_overwrite(channel, self.role, connect=False)  # type: ignore
+
+        task = asyncio.create_task(editor.execute())
+        await asyncio.sleep(0)
+        editor.cancel()
+        await task
+        self.assertTrue(editor.pending)
+
+        await editor.execute()
+        self.assertFalse(editor.pending)
+        self.assertEqual(len(editor.applied), len(self.channels))
+
+    async def test_uncached_target(self):
+        # a role created just before, which the guild does not know yet
+        role = FakeRole(2)
+        self.guild.get_role = lambda _role_id: None  # type: ignore
+        editor = BulkChannelEditor(self.guild)  # type: ignore
+        editor.plan_overwrite(self.channels[1], role, send_messages=False)  # type: ignore
+
+        await editor.execute()
+        self.assertFalse(editor.failed)
+        self.assertIs(self.channels[1].overwrite.send_messages, False)
+
+
+if __name__ == "__main__":
+    from unittest import main
+
+    main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from utilities.profiler import BUCKETS, Profiler
+
+
+class TestProfiler(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.profiler = Profiler(enabled=True)
+
+    async def test_calls_are_counted_per_handler(self) -> None:
+        async def handler(calls: int) -> None:
+            with self.profiler.measure("event", f"handler {calls}"):
+                for _ in range(calls):
+                    self.profiler.record("mongo")
+                    await asyncio.sleep(0)
+                self.profiler.record("http")
+
+        await asyncio.gather(handler(1), handler(3))
+
+        stats = self.profiler.stats["event", "handler 3"]
+        self.assertEqual((stats.count, stats.mongo, stats.http), (1, 3, 1))
+        self.assertEqual(self.profiler.stats["event", "handler 1"].mongo, 1)
+
+    async def test_disabled(self) -> None:
+        self.profiler.enabled = False
+        with self.profiler.measure("event", "on_message") as probe:
+            self.profiler.record("sql")
+
+        self.assertIsNone(probe)
+        self.assertEqual(len(self.profiler), 0)
+
+    async def test_errors(self) -> None:
+        with self.assertRaises(ValueError), self.profiler.measure("command", "ping"):
+            raise ValueError
+
+        with self.profiler.measure("command", "ping") as probe:
+            probe.failed = True  # type: ignore
+
+        with self.profiler.measure("command", "ping"):
+            pass
+
+        stats = self.profiler.stats["command", "ping"]
+        self.assertEqual((stats.count, stats.errors), (3, 2))
+
+    async def test_prometheus(self) -> None:
+        with self.profiler.measure("event", 'Cog."quoted"'):
+            self.profiler.record("sql")
+
+        text = self.profiler.prometheus()
+        labels = 'kind="event",name="Cog.\\"quoted\\""'
+        self.assertIn(f'parrot_handler_seconds_bucket{{{labels},le="+Inf"}} 1', text)
+        self.assertIn(f"parrot_handler_seconds_count{{{labels}}} 1", text)
+        self.assertIn(f'parrot_handler_calls_total{{{labels},backend="sql"}} 1', text)
+        self.assertEqual(text.count("_bucket{"), len(BUCKETS) + 1)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from utilities.telemetry import ERROR_SAMPLE_SIZE, LATENCY_SAMPLE_SIZE, CommandTelemetry
+
+
+class TestCommandTelemetry(TestCase):
+    def setUp(self) -> None:
+        self.telemetry = CommandTelemetry()
+
+    def test_drain_keeps_current_minute(self):
+        self.telemetry.record("ping", guild_id=1, user_id=2, success=True, latency=0.1, now=60)
+        self.telemetry.record("ping", guild_id=1, user_id=2, success=True, latency=0.1, now=125)
+
+        rollup_ops, counter_ops = self.telemetry.drain(now=130)
+
+        self.assertEqual(len(rollup_ops), 1)
+        self.assertEqual(rollup_ops[0]._filter, {"_id": "60:ping"})
+        self.assertEqual(len(counter_ops), 2)
+        self.assertEqual(len(self.telemetry), 1)
+
+        rollup_ops, _ = self.telemetry.drain(force=True, now=130)
+        self.assertEqual(len(rollup_ops), 1)
+        self.assertEqual(len(self.telemetry), 0)
+
+    def test_samples_are_bounded(self):
+        # sourcery skip: no-loop-in-tests
+        for i in range(LATENCY_SAMPLE_SIZE * 4):
+            self.telemetry.record("tag get", guild_id=1, user_id=i, success=False, latency=i, error="boom", now=0)
+
+        rollup = self.telemetry.buckets[0]["tag get"]
+        self.assertEqual(rollup.used, LATENCY_SAMPLE_SIZE * 4)
+        self.assertEqual(len(rollup.latencies), LATENCY_SAMPLE_SIZE)
+        self.assertEqual(len(rollup.error_samples), ERROR_SAMPLE_SIZE)
+
+    def test_lifetime_counters(self):
+        self.telemetry.record("tag get", guild_id=1, user_id=2, success=True, latency=0.1, now=0)
+        self.telemetry.record("tag get", guild_id=1, user_id=2, success=False, latency=0.1, now=0)
+
+        _, counter_ops = self.telemetry.drain(force=True)
+
+        self.assertEqual(
+            [op._doc["$inc"] for op in counter_ops],
+            [{"command_tag_get_used": 2, "command_tag_get_success": 1}] * 2,
+        )
+
+    def test_requeue(self):
+        self.telemetry.record("ping", guild_id=1, user_id=2, success=True, latency=0.1, now=0)
+        rollup_ops, counter_ops = self.telemetry.drain(now=60)
+        self.telemetry.requeue(rollup_ops, counter_ops)
+        self.assertEqual(len(self.telemetry), 1)
+
+        self.telemetry.record("ping", guild_id=1, user_id=2, success=True, latency=0.1, now=60)
+        retried_rollups, retried_counters = self.telemetry.drain(now=120)
+        self.assertEqual(retried_rollups[:1], rollup_ops)
+        self.assertEqual(len(retried_rollups), 2)
+        self.assertEqual(retried_counters[:2], counter_ops)
+        self.assertEqual(len(retried_counters), 4)
+        self.assertEqual(self.telemetry.drain(force=True), ([], []))
+
+
+if __name__ == "__main__":
+    from unittest import main
+
+    main()
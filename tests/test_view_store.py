@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from types import SimpleNamespace
+from typing import Any
+from unittest import IsolatedAsyncioTestCase
+
+from pymongo import DeleteOne, ReplaceOne
+
+import discord
+from core import PersistentView, persistent_id
+from utilities.view_store import RestoredItem, ViewStore
+
+
+class CounterView(PersistentView):
+    kind = "test-counter"
+
+    def __init__(self, count: int = 0) -> None:
+        super().__init__(timeout=None)
+        self.count = count
+
+    def to_state(self) -> list[Any]:
+        return [self.count]
+
+    @classmethod
+    def from_state(cls, bot: Any, state: list[Any]) -> CounterView:
+        (count,) = state
+        view = cls(count)
+        view.bot = bot
+        return view
+
+    @discord.ui.button(label="+1", custom_id=persistent_id("test-counter", "increment"))
+    async def increment(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        self.count += 1
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.documents: dict[int, dict] = {}
+        self.writes: list[list] = []
+        self.reads = 0
+
+    async def bulk_write(self, requests: list, ordered: bool = True) -> None:
+        self.writes.append(requests)
+        for request in requests:
+            document = request._doc if isinstance(request, ReplaceOne) else None
+            message_id = request._filter["_id"]
+            if document is None:
+                self.documents.pop(message_id, None)
+            else:
+                self.documents[message_id] = {"_id": message_id, **document}
+
+    async def find_one(self, query: dict) -> dict | None:
+        self.reads += 1
+        await asyncio.sleep(0)
+        return self.documents.get(query["_id"])
+
+
+class FakeMessage:
+    def __init__(self, message_id: int) -> None:
+        self.id = message_id
+        self.edits: list[dict] = []
+
+    async def edit(self, **kwargs: Any) -> None:
+        self.edits.append(kwargs)
+
+
+def make_store() -> tuple[ViewStore, FakeCollection]:
+    collection = FakeCollection()
+    bot = SimpleNamespace(view_states=collection)
+    store = ViewStore(bot)  # type: ignore
+    bot.view_store = store
+    return store, collection
+
+
+class TestViewStore(IsolatedAsyncioTestCase):
+    async def test_writes_latest_state_in_bulk(self):
+        store, collection = make_store()
+        view = CounterView.from_state(store.bot, [1])
+        view.message = FakeMessage(10)  # type: ignore
+
+        view.persist()
+        view.count = 5
+        view.persist()
+        await store.flush()
+
+        self.assertEqual(len(collection.writes), 1)
+        (request,) = collection.writes[0]
+        self.assertIsInstance(request, ReplaceOne)
+        self.assertEqual(collection.documents[10]["state"], [5])
+        self.assertEqual(collection.documents[10]["kind"], "test-counter")
+        self.assertIs(store.live(10), view)
+
+        view.forget()
+        await store.flush()
+        self.assertIsInstance(collection.writes[-1][0], DeleteOne)
+        self.assertNotIn(10, collection.documents)
+        self.assertIsNone(store.live(10))
+
+    async def test_restore_once(self):
+        store, collection = make_store()
+        view = CounterView.from_state(store.bot, [3])
+        view.message = FakeMessage(20)  # type: ignore
+        view.persist()
+        await store.flush()
+
+        # a new process
+        store, _ = make_store()
+        store.bot.view_states = collection
+        message = FakeMessage(20)
+        first, second = await asyncio.gather(store.restore(message), store.restore(message))  # type: ignore
+
+        self.assertIsInstance(first, CounterView)
+        self.assertIs(first, second)
+        self.assertEqual(first.count, 3)
+        self.assertIs(first.message, message)
+        self.assertEqual(collection.reads, 1)
+        self.assertEqual(len(message.edits), 1)
+        self.assertIs(store.live(20), first)
+
+    async def test_drops_stale_states(self):
+        store, collection = make_store()
+        expires_at = discord.utils.utcnow() + datetime.timedelta(hours=1)
+        collection.documents = {
+            1: {"_id": 1, "kind": "test-counter", "version": 1, "state": [0], "expires_at": expires_at},
+            2: {"_id": 2, "kind": "test-counter", "version": 1, "state": [0], "expires_at": datetime.datetime(2000, 1, 1)},
+            3: {"_id": 3, "kind": "test-counter", "version": 2, "state": [0], "expires_at": expires_at},
+            4: {"_id": 4, "kind": "unknown", "version": 1, "state": [0], "expires_at": expires_at},
+            5: {"_id": 5, "kind": "test-counter", "version": 1, "state": [0, 1], "expires_at": expires_at},
+        }
+
+        self.assertIsNotNone(await store.restore(FakeMessage(1)))  # type: ignore
+        for message_id in (2, 3, 4, 5, 6):
+            self.assertIsNone(await store.restore(FakeMessage(message_id)), message_id)  # type: ignore
+
+    async def test_restored_item_forwards_the_click(self):
+        store, _ = make_store()
+        view = CounterView.from_state(store.bot, [0])
+        button = discord.ui.Button(custom_id=persistent_id("test-counter", "increment"))
+        sent: list[str] = []
+
+        async def send_message(content: str, **_: Any) -> None:
+            sent.append(content)
+
+        interaction = SimpleNamespace(data={}, response=SimpleNamespace(send_message=send_message))
+        await RestoredItem(button, view).callback(interaction)  # type: ignore
+        self.assertEqual(view.count, 1)
+
+        await RestoredItem(button, None).callback(interaction)  # type: ignore
+        self.assertEqual(len(sent), 1)
+
+        live = RestoredItem(button, None, live=True)
+        self.assertFalse(await live.interaction_check(interaction))  # type: ignore
+
+    def test_template(self):
+        template = RestoredItem.__discord_ui_compiled_template__
+        self.assertIsNotNone(template.fullmatch(persistent_id("2048", "up")))
+        self.assertIsNone(template.fullmatch("up"))
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+
+from utilities.waiters import WaiterIndex
+
+
+def make_message(*, channel_id: int, author_id: int, message_id: int = 1) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=message_id,
+        channel=SimpleNamespace(id=channel_id),
+        author=SimpleNamespace(id=author_id),
+    )
+
+
+class TestWaiterIndex(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.index = WaiterIndex()
+        self.loop = asyncio.get_running_loop()
+
+    async def test_routes_by_all_keys(self):
+        future = self.loop.create_future()
+        self.index.add("message", future, channel_id=1, user_id=2)
+
+        self.index.dispatch("message", (make_message(channel_id=1, author_id=3),))
+        self.index.dispatch("message", (make_message(channel_id=4, author_id=2),))
+        self.assertFalse(future.done())
+
+        message = make_message(channel_id=1, author_id=2)
+        self.index.dispatch("message", (message,))
+        self.assertIs(await future, message)
+
+        await asyncio.sleep(0)
+        self.assertEqual(len(self.index), 0)
+
+    async def test_check_and_multiple_channels(self):
+        future = self.loop.create_future()
+        self.index.add("message", future, channel_id=(1, 2), check=lambda m: m.id == 10)
+
+        self.index.dispatch("message", (make_message(channel_id=2, author_id=5, message_id=9),))
+        self.assertFalse(future.done())
+
+        self.index.dispatch("message", (make_message(channel_id=2, author_id=5, message_id=10),))
+        self.assertTrue(future.done())
+
+    async def test_cancelled_waiters_are_removed(self):
+        future = self.loop.create_future()
+        self.index.add("reaction_add", future, message_id=1)
+        self.assertEqual(len(self.index), 1)
+
+        future.cancel()
+        await asyncio.sleep(0)
+        self.assertEqual(len(self.index), 0)
+
+    async def test_check_error_is_raised_to_waiter(self):
+        future = self.loop.create_future()
+        self.index.add("message", future, user_id=1, check=lambda _: 1 / 0)
+
+        self.index.dispatch("message", (make_message(channel_id=1, author_id=1),))
+        with self.assertRaises(ZeroDivisionError):
+            await future
+
+
+if __name__ == "__main__":
+    from unittest import main
+
+    main()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import random
+from unittest import TestCase
+
+from interactions.buttons.__constants import BIG, ORIGINAL, SMALL
+from interactions.buttons.__games_utils import DIAGRAPHS, DICTIONARY, BoardBoogle
+from interactions.buttons.foggle import Board
+
+
+def old_board_contains(
+    board: Board, numbers: str, pos: tuple[int, int] = None, passed: list[tuple[int, int]] = None
+) -> bool:
+    """The recursive search Foggle boards used before the bitmask one."""
+    if passed is None:
+        passed = []
+    if not numbers:
+        return True
+
+    if pos is None:
+        return any(
+            old_board_contains(board, numbers, (col, row)) for col in range(board.size) for row in range(board.size)
+        )
+
+    col, row = pos
+    if pos in passed or numbers[0] != board.columns[col][row]:
+        return False
+    return any(
+        old_board_contains(board, numbers[1:], (col + x, row + y), [*passed, pos])
+        for x in range(-1, 2)
+        for y in range(-1, 2)
+        if (x, y) != (0, 0) and 0 <= col + x < board.size and 0 <= row + y < board.size
+    )
+
+
+class TestBoggleSolver(TestCase):
+    def test_legal_words(self) -> None:
+        for size in (SMALL, ORIGINAL):
+            for seed in range(3):
+                random.seed(seed)
+                board = BoardBoogle(size=size)
+                # a word on the board only has letters of its squares, the rest cannot pass board_contains
+                letters = set("".join(DIAGRAPHS.get(letter, letter) for column in board.columns for letter in column))
+                expected = {
+                    word for word in DICTIONARY if len(word) >= 3 and set(word) <= letters and board.board_contains(word)
+                }
+                self.assertEqual(board.legal_words, expected, (size, seed))
+
+
+class TestFoggleSearch(TestCase):
+    def test_matches_old_search(self) -> None:
+        rng = random.Random(0)
+        for base in (2, 10, 16):
+            for size in (SMALL, ORIGINAL, BIG):
+                random.seed(base * size)
+                board = Board(size=size, base=base)
+                numbers = sorted({number for column in board.columns for number in column})
+
+                chains = {"".join(rng.choices(numbers, k=rng.randint(0, 8))) for _ in range(200)}
+                # random chains are rarely on the board, so also trace walks over it, revisiting squares at times
+                for _ in range(200):
+                    col, row = rng.randrange(size), rng.randrange(size)
+                    chain = board.columns[col][row]
+                    for _ in range(rng.randint(1, 8)):
+                        col = min(max(col + rng.randint(-1, 1), 0), size - 1)
+                        row = min(max(row + rng.randint(-1, 1), 0), size - 1)
+                        chain += board.columns[col][row]
+                    chains.add(chain)
+
+                for chain in chains:
+                    self.assertEqual(board.board_contains(chain), old_board_contains(board, chain), (base, size, chain))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from utilities.wordle import ABSENT, CORRECT, PRESENT, SOLVED, WordIndex
+
+
+def pattern(*feedback: int) -> int:
+    return sum(value * 3**position for position, value in enumerate(feedback))
+
+
+class TestWordIndex(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.words = WordIndex.from_file("extra/5_words.txt")
+
+    def test_lookup(self):
+        self.assertIn("women", self.words)
+        self.assertNotIn("wome", self.words)
+        self.assertNotIn("zzzzz", self.words)
+        self.assertEqual(self.words.words[self.words.index["women"]], "women")
+
+    def test_repeated_letters(self):
+        A, P, C = ABSENT, PRESENT, CORRECT
+        words = WordIndex(["speed", "abide", "eerie", "there", "crane"])
+        self.assertEqual(words.feedback("speed", "abide"), pattern(A, A, P, A, P))
+        self.assertEqual(words.feedback("eerie", "there"), pattern(P, A, P, A, C))
+        self.assertEqual(words.feedback("crane", "crane"), SOLVED)
+        self.assertEqual(words.feedback("speed", "crane"), pattern(A, A, P, A, A))
+
+    def test_patterns_match_feedback(self):
+        rng = random.Random(0)
+        answers = np.array(rng.sample(range(len(self.words)), 500))
+        for guess in rng.sample(self.words.words, 20):
+            expected = [self.words.feedback(guess, self.words.words[row]) for row in answers]
+            self.assertEqual(self.words.patterns(guess, answers).tolist(), expected)
+
+    def test_hints_solve(self):
+        rng = random.Random(1)
+        for answer in rng.sample(self.words.words, 10):
+            answers = self.words.everything
+            for _ in range(10):
+                guess = self.words.hint(answers)
+                assert guess is not None
+                feedback = self.words.feedback(guess, answer)
+                if feedback == SOLVED:
+                    break
+                answers = self.words.narrow(answers, guess, feedback)
+                self.assertIn(self.words.index[answer], answers)
+            else:
+                self.fail(f"{answer} was not found")
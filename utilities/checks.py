@@ -16,6 +16,8 @@ from utilities.config import SUPER_USER
 if TYPE_CHECKING:
     from discord.ext.commands._types import Check
 
+    from events.guild.member import Member
+
 
 MongoCollection: TypeAlias = Collection
 __all__ = (
@@ -135,13 +137,8 @@ def in_temp_channel() -> Check[Context]:
         if not ctx.author.voice:
             raise ex.InHubVoice()
 
-        if _ := await ctx.bot.guild_configurations.find_one(
-            {
-                "_id": ctx.guild.id,
-                "hub_temp_channels.channel_id": getattr(ctx.author.voice.channel, "id", 0),
-                "hub_temp_channels.author": ctx.author.id,
-            },
-        ):
+        cog: Member | None = ctx.bot.get_cog("Member")  # type: ignore
+        if cog is not None and cog.hubs.owner(ctx.guild.id, getattr(ctx.author.voice.channel, "id", 0)) == ctx.author.id:
             return True
 
         raise ex.InHubVoice()
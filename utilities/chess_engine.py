@@ -0,0 +1,242 @@
+"""A small chess engine for games against the bot.
+
+Iterative deepening negamax with alpha-beta pruning, a quiescence search over
+captures and a transposition table, evaluating material and piece-square tables.
+Searches are CPU bound, they run in the worker processes of
+:mod:`utilities.workers`, each move within its own time budget.
+"""
+
+from __future__ import annotations
+
+import time
+
+import chess
+import chess.polyglot
+
+from utilities import workers
+
+__all__ = ("best_move", "search")
+
+MATE = 100_000
+INFINITY = MATE + 1
+# Nodes searched between two looks at the clock.
+CLOCK_INTERVAL = 1024
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0,
+}
+
+# Bonuses of the white pieces by square, from a1 to h8; black ones use the mirrored square.
+# fmt: off
+PIECE_SQUARES = {
+    chess.PAWN: (
+        0,   0,   0,   0,   0,   0,   0,   0,
+        5,  10,  10, -20, -20,  10,  10,   5,
+        5,  -5, -10,   0,   0, -10,  -5,   5,
+        0,   0,   0,  20,  20,   0,   0,   0,
+        5,   5,  10,  25,  25,  10,   5,   5,
+        10, 10,  20,  30,  30,  20,  10,  10,
+        50, 50,  50,  50,  50,  50,  50,  50,
+        0,   0,   0,   0,   0,   0,   0,   0,
+    ),
+    chess.KNIGHT: (
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ),
+    chess.BISHOP: (
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   5,   0,   0,   0,   0,   5, -10,
+        -10,  10,  10,  10,  10,  10,  10, -10,
+        -10,   0,  10,  10,  10,  10,   0, -10,
+        -10,   5,   5,  10,  10,   5,   5, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ),
+    chess.ROOK: (
+        0,   0,   0,   5,   5,   0,   0,   0,
+        -5,  0,   0,   0,   0,   0,   0,  -5,
+        -5,  0,   0,   0,   0,   0,   0,  -5,
+        -5,  0,   0,   0,   0,   0,   0,  -5,
+        -5,  0,   0,   0,   0,   0,   0,  -5,
+        -5,  0,   0,   0,   0,   0,   0,  -5,
+        5,  10,  10,  10,  10,  10,  10,   5,
+        0,   0,   0,   0,   0,   0,   0,   0,
+    ),
+    chess.QUEEN: (
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10,   0,   5,  0,  0,   0,   0, -10,
+        -10,   5,   5,  5,  5,   5,   0, -10,
+          0,   0,   5,  5,  5,   5,   0,  -5,
+         -5,   0,   5,  5,  5,   5,   0,  -5,
+        -10,   0,   5,  5,  5,   5,   0, -10,
+        -10,   0,   0,  0,  0,   0,   0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ),
+    chess.KING: (
+         20,  30,  10,   0,   0,  10,  30,  20,
+         20,  20,   0,   0,   0,   0,  20,  20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+    ),
+}
+# fmt: on
+
+# transposition table entry kinds: exact score, lower bound, upper bound
+EXACT, LOWER, UPPER = range(3)
+
+
+class _Timeout(Exception):
+    pass
+
+
+def evaluate(board: chess.Board) -> int:
+    """Score of the position for the side to move, in centipawns."""
+    score = 0
+    for piece_type, value in PIECE_VALUES.items():
+        table = PIECE_SQUARES[piece_type]
+        for square in chess.scan_forward(board.pieces_mask(piece_type, chess.WHITE)):
+            score += value + table[square]
+        for square in chess.scan_forward(board.pieces_mask(piece_type, chess.BLACK)):
+            score -= value + table[chess.square_mirror(square)]
+    return score if board.turn == chess.WHITE else -score
+
+
+def _capture_value(board: chess.Board, move: chess.Move) -> int:
+    # most valuable victim, least valuable attacker
+    if board.is_en_passant(move):
+        return PIECE_VALUES[chess.PAWN]
+    victim = board.piece_type_at(move.to_square)
+    attacker = board.piece_type_at(move.from_square)
+    return 10 * PIECE_VALUES.get(victim, 0) - PIECE_VALUES.get(attacker, 0) // 10  # type: ignore
+
+
+class _Search:
+    def __init__(self, deadline: float) -> None:
+        self.deadline = deadline
+        self.nodes = 0
+        self.table: dict[int, tuple[int, int, int, chess.Move | None]] = {}
+
+    def tick(self) -> None:
+        self.nodes += 1
+        if self.nodes % CLOCK_INTERVAL == 0 and time.monotonic() > self.deadline:
+            raise _Timeout
+
+    def ordered(self, board: chess.Board, first: chess.Move | None) -> list[chess.Move]:
+        def priority(move: chess.Move) -> int:
+            if move == first:
+                return INFINITY
+            if board.is_capture(move):
+                return _capture_value(board, move)
+            return PIECE_VALUES[move.promotion] if move.promotion else -INFINITY
+
+        return sorted(board.legal_moves, key=priority, reverse=True)
+
+    def quiescence(self, board: chess.Board, alpha: int, beta: int) -> int:
+        self.tick()
+        stand_pat = evaluate(board)
+        if stand_pat >= beta:
+            return beta
+        alpha = max(alpha, stand_pat)
+
+        captures = sorted(board.generate_legal_captures(), key=lambda move: _capture_value(board, move), reverse=True)
+        for move in captures:
+            board.push(move)
+            score = -self.quiescence(board, -beta, -alpha)
+            board.pop()
+            if score >= beta:
+                return beta
+            alpha = max(alpha, score)
+        return alpha
+
+    def negamax(self, board: chess.Board, depth: int, alpha: int, beta: int, ply: int) -> tuple[int, chess.Move | None]:
+        self.tick()
+        if board.is_checkmate():
+            # sooner mates score higher
+            return -MATE + ply, None
+        if ply and (board.is_stalemate() or board.is_insufficient_material() or board.is_repetition(2)):
+            return 0, None
+        if depth <= 0:
+            return self.quiescence(board, alpha, beta), None
+
+        key = chess.polyglot.zobrist_hash(board)
+        original_alpha = alpha
+        first: chess.Move | None = None
+        if (entry := self.table.get(key)) is not None:
+            entry_depth, kind, entry_score, first = entry
+            if ply and entry_depth >= depth:
+                if kind == EXACT:
+                    return entry_score, first
+                if kind == LOWER:
+                    alpha = max(alpha, entry_score)
+                elif kind == UPPER:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return entry_score, first
+
+        best_score, best_move = -INFINITY, None
+        for move in self.ordered(board, first):
+            board.push(move)
+            score = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)[0]
+            board.pop()
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            kind = UPPER
+        elif best_score >= beta:
+            kind = LOWER
+        else:
+            kind = EXACT
+        self.table[key] = (depth, kind, best_score, best_move)
+        return best_score, best_move
+
+
+def search(fen: str, *, depth: int, time_limit: float) -> tuple[str | None, int, int]:
+    """(best move in UCI, its score, depth completed) of the position.
+
+    Searches one ply deeper at a time, until `depth` or `time_limit` seconds. A
+    search the time runs out in is discarded, except the first ply, so there is
+    always a move.
+    """
+    board = chess.Board(fen)
+    deadline = time.monotonic() + time_limit
+    searcher = _Search(float("inf"))
+    best: chess.Move | None = None
+    score = completed = 0
+
+    for current in range(1, depth + 1):
+        try:
+            score, move = searcher.negamax(board, current, -INFINITY, INFINITY, 0)
+        except _Timeout:
+            break
+        best, completed = move, current
+        searcher.deadline = deadline
+        if abs(score) >= MATE - depth or time.monotonic() > deadline:
+            break
+
+    return (best.uci() if best else None), score, completed
+
+
+async def best_move(board: chess.Board, *, depth: int = 3, time_limit: float = 5.0) -> chess.Move | None:
+    """The engine's move in the position, searched in a worker process within `time_limit` seconds."""
+    uci, _, _ = await workers.run(search, board.fen(), depth=depth, time_limit=time_limit)
+    return chess.Move.from_uci(uci) if uci else None
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
+
+from bson import json_util
+
+__all__ = (
+    "DEFAULT_PORT",
+    "ClusterClient",
+    "ClusterInfo",
+    "Coordinator",
+    "shard_ranges",
+)
+
+log = logging.getLogger("utilities.cluster")
+
+DEFAULT_PORT = 1731
+# Longest message sent between the clusters, in bytes.
+MAX_MESSAGE = 2**22
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+
+def shard_ranges(shard_count: int, cluster_count: int) -> list[list[int]]:
+    """Split the shards into `cluster_count` contiguous ranges, as even as possible."""
+    if not 0 < cluster_count <= shard_count:
+        msg = f"cannot split {shard_count} shards into {cluster_count} clusters"
+        raise ValueError(msg)
+
+    size, extra = divmod(shard_count, cluster_count)
+    ranges: list[list[int]] = []
+    start = 0
+    for cluster_id in range(cluster_count):
+        end = start + size + (cluster_id < extra)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+class ClusterInfo(NamedTuple):
+    cluster_id: int = 0
+    cluster_count: int = 1
+    shard_count: int = 1
+
+    @property
+    def clustered(self) -> bool:
+        return self.cluster_count > 1
+
+    @property
+    def is_primary(self) -> bool:
+        """The primary cluster runs the tasks which must only run once: timers, IPC server, top.gg."""
+        return self.cluster_id == 0
+
+    @property
+    def shard_ids(self) -> list[int]:
+        return shard_ranges(self.shard_count, self.cluster_count)[self.cluster_id]
+
+    def shard_of(self, guild_id: int) -> int:
+        return (guild_id >> 22) % self.shard_count
+
+    def cluster_of(self, guild_id: int) -> int:
+        shard = self.shard_of(guild_id)
+        size, extra = divmod(self.shard_count, self.cluster_count)
+        # the first `extra` clusters have one more shard than the others
+        boundary = extra * (size + 1)
+        if shard < boundary:
+            return shard // (size + 1)
+        return extra + (shard - boundary) // size
+
+    def owns(self, guild_id: int) -> bool:
+        return self.cluster_of(guild_id) == self.cluster_id
+
+
+async def _write(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    # json_util keeps the BSON types (ObjectId, datetimes) of the documents sent around
+    line = json_util.dumps(message).encode() + b"\n"
+    if len(line) > MAX_MESSAGE:
+        # the reader would drop the connection
+        raise ValueError(f"message of {len(line)} bytes is over the limit of {MAX_MESSAGE}")
+    writer.write(line)
+    await writer.drain()
+
+
+async def _read(reader: asyncio.StreamReader) -> dict[str, Any] | None:
+    line = await reader.readline()
+    return json_util.loads(line) if line else None
+
+
+class Coordinator:
+    """Routes the messages of the clusters to each other, run by the launcher.
+
+    Every cluster connects once and says which one it is. A message with a ``to``
+    key goes to that cluster, any other goes to every cluster but its sender.
+    """
+
+    def __init__(self, *, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+        self.host = host
+        self.port = port
+        self.__clusters: dict[int, asyncio.StreamWriter] = {}
+        self.__server: asyncio.Server | None = None
+
+    @property
+    def clusters(self) -> list[int]:
+        return sorted(self.__clusters)
+
+    async def start(self) -> None:
+        self.__server = await asyncio.start_server(self.__serve, self.host, self.port, limit=MAX_MESSAGE)
+        log.info("Coordinator listening on %s:%s", self.host, self.port)
+
+    async def close(self) -> None:
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+        for writer in self.__clusters.values():
+            writer.close()
+        self.__clusters.clear()
+
+    async def __serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        cluster_id: int | None = None
+        try:
+            hello = await _read(reader)
+            if hello is None or hello.get("op") != "hello":
+                return
+
+            cluster_id = hello["cluster"]
+            self.__clusters[cluster_id] = writer
+            log.info("Cluster %s connected", cluster_id)
+
+            while (message := await _read(reader)) is not None:
+                await self.__route(cluster_id, message)
+        except (ConnectionError, ValueError) as e:
+            log.warning("Connection of cluster %s lost", cluster_id, exc_info=e)
+        finally:
+            if cluster_id is not None and self.__clusters.get(cluster_id) is writer:
+                del self.__clusters[cluster_id]
+                log.info("Cluster %s disconnected", cluster_id)
+            writer.close()
+
+    async def __route(self, origin: int, message: dict[str, Any]) -> None:
+        message["from"] = origin
+        if (target := message.get("to")) is not None:
+            targets = [target]
+        else:
+            targets = [cluster_id for cluster_id in self.__clusters if cluster_id != origin]
+
+        for cluster_id in targets:
+            if (writer := self.__clusters.get(cluster_id)) is None:
+                continue
+            try:
+                await _write(writer, message)
+            except (ConnectionError, ValueError):
+                log.warning("Failed to forward %s to cluster %s", message.get("event"), cluster_id)
+
+
+class ClusterClient:
+    """Connection of a cluster to the coordinator.
+
+    Clusters talk with named events. :meth:`send` fires one, to a given cluster or
+    to every other one, :meth:`deliver` waits for the result of one on a cluster,
+    and :meth:`gather` collects the result of its handler on every cluster.
+    Running as a single process, nothing is connected and events are only
+    handled locally.
+    """
+
+    def __init__(self, info: ClusterInfo, *, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+        self.info = info
+        self.host = host
+        self.port = port
+
+        self.__handlers: dict[str, Handler] = {}
+        # nonce -> replies received so far, the number of replies expected, and the event set once they came
+        self.__waiting: dict[int, tuple[dict[int, Any], int, asyncio.Event]] = {}
+        self.__nonces = itertools.count()
+        self.__writer: asyncio.StreamWriter | None = None
+        self.__task: asyncio.Task[None] | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self.__writer is not None and not self.__writer.is_closing()
+
+    def add_handler(self, event: str, handler: Handler) -> None:
+        self.__handlers[event] = handler
+
+    def remove_handler(self, event: str) -> None:
+        self.__handlers.pop(event, None)
+
+    async def connect(self) -> None:
+        if not self.info.clustered:
+            return
+
+        reader, self.__writer = await asyncio.open_connection(self.host, self.port, limit=MAX_MESSAGE)
+        await _write(self.__writer, {"op": "hello", "cluster": self.info.cluster_id})
+        self.__task = asyncio.create_task(self.__listen(reader), name=f"cluster-{self.info.cluster_id}")
+
+    async def close(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+
+    async def send(self, event: str, data: Any = None, *, to: int | None = None) -> None:
+        """Handle `event` on cluster `to`, or on every other cluster; without waiting for it."""
+        if to == self.info.cluster_id:
+            await self.__call(event, data)
+        elif self.connected:
+            await self.__send({"op": "event", "event": event, "data": data, "to": to})
+
+    async def gather(self, event: str, data: Any = None, *, timeout: float = 5) -> dict[int, Any]:
+        """Cluster ID -> result of `event` on it. Clusters not replying within `timeout` are left out."""
+        results: dict[int, Any] = {self.info.cluster_id: await self.__call(event, data)}
+        if not self.connected:
+            return results
+
+        await self.__wait({"op": "event", "event": event, "data": data}, results, self.info.cluster_count, timeout)
+        return dict(sorted(results.items()))
+
+    async def deliver(self, event: str, data: Any = None, *, to: int, timeout: float = 5) -> Any:
+        """Result of `event` on cluster `to`, waiting for it. ``None`` when it did not reply in time.
+
+        A cluster restarting or disconnected does not reply; handlers return a true
+        value once they took what was sent, for the caller to keep it otherwise.
+        """
+        if to == self.info.cluster_id:
+            return await self.__call(event, data)
+        if not self.connected:
+            return None
+
+        results: dict[int, Any] = {}
+        await self.__wait({"op": "event", "event": event, "data": data, "to": to}, results, 1, timeout)
+        return results.get(to)
+
+    async def __wait(self, message: dict[str, Any], results: dict[int, Any], expected: int, timeout: float) -> None:
+        nonce = next(self.__nonces)
+        done = asyncio.Event()
+        self.__waiting[nonce] = (results, expected, done)
+        try:
+            await self.__send({**message, "nonce": nonce})
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(done.wait(), timeout)
+        finally:
+            del self.__waiting[nonce]
+
+    async def __send(self, message: dict[str, Any]) -> None:
+        assert self.__writer is not None
+        try:
+            await _write(self.__writer, message)
+        except (ConnectionError, ValueError):
+            log.warning("Failed to send %s to the coordinator", message.get("event"), exc_info=True)
+
+    async def __call(self, event: str, data: Any) -> Any:
+        if (handler := self.__handlers.get(event)) is None:
+            return None
+        try:
+            return await handler(data)
+        except Exception:  # noqa: BLE001
+            log.exception("Cluster event %s failed", event)
+            return None
+
+    async def __listen(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while (message := await _read(reader)) is not None:
+                if message["op"] == "reply":
+                    self.__reply(message)
+                else:
+                    asyncio.create_task(self.__handle(message))
+        except (ConnectionError, ValueError) as e:
+            log.error("Lost the connection to the coordinator", exc_info=e)
+        else:
+            log.error("The coordinator closed the connection")
+
+    def __reply(self, message: dict[str, Any]) -> None:
+        if (waiting := self.__waiting.get(message["nonce"])) is None:
+            # too late, the gather timed out
+            return
+
+        results, expected, done = waiting
+        results[message["from"]] = message["data"]
+        if len(results) >= expected:
+            done.set()
+
+    async def __handle(self, message: dict[str, Any]) -> None:
+        result = await self.__call(message["event"], message.get("data"))
+        if message.get("nonce") is not None and self.connected:
+            await self.__send({"op": "reply", "to": message["from"], "nonce": message["nonce"], "data": result})
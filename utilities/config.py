@@ -71,6 +71,12 @@ SUPPORT_SERVER_ID = parse_env_var("SUPPORT_SERVER_ID", 741614680652644382)
 MEME_PASS = parse_env_var("MEME_PASS")
 PRIVACY_POLICY: str = parse_env_var("PRIVACY_POLICY")
 
+# Set by the cluster launcher, a single process connects every shard.
+CLUSTER_ID: int = parse_env_var("CLUSTER_ID", "0")
+CLUSTER_COUNT: int = parse_env_var("CLUSTER_COUNT", "1")
+SHARD_COUNT: int = parse_env_var("SHARD_COUNT", "1")
+CLUSTER_PORT: int = parse_env_var("CLUSTER_PORT", "1731")
+
 LRU_CACHE = 128 if HEROKU else 256
 TO_LOAD_IPC: bool = "cogs.ipc" not in UNLOAD_EXTENSIONS
 # TO_LOAD_IPC: bool = True
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+if TYPE_CHECKING:
+    from core import Parrot
+
+__all__ = (
+    "GuildConfigStore",
+    "GlobalChatConfig",
+    "LevelingConfig",
+    "StarboardConfig",
+)
+
+log = logging.getLogger("utilities.config_store")
+
+# When the database is not a replica set (no change streams), every document is
+# reloaded this often, in case something was written without invalidating.
+RELOAD_INTERVAL = 5 * 60
+# How long to wait before reopening a change stream that errored.
+RETRY_INTERVAL = 10
+
+
+class GlobalChatConfig(TypedDict):
+    enable: bool
+    channel_id: int | None
+    ignore_role: int | list[int] | None
+    webhook: str | None
+
+
+class StarboardConfig(TypedDict):
+    is_locked: bool
+    limit: int | None
+    ignore_channel: list[int]
+    max_duration: int | None
+    channel: int | None
+    can_self_star: bool
+
+
+class LevelingConfig(TypedDict):
+    enable: bool
+    channel: int | None
+    reward: list[dict[str, int]]
+    ignore_role: list[int]
+    ignore_channel: list[int]
+
+
+class GuildConfigStore:
+    """Every guild configuration document, held in memory.
+
+    All the documents are loaded in bulk with :meth:`load`, and kept coherent with a
+    change stream on the collection. Databases which do not support change streams
+    fall back to the explicit invalidation done with :meth:`refresh` (which is what
+    ``Parrot.update_server_config_cache`` does), plus a periodic full reload.
+
+    Supports the mapping interface of the LRU cache it replaces, so
+    ``store[guild_id]["prefix"]`` still raises :exc:`KeyError` for unknown guilds.
+    The typed accessors never raise, and fall back to `defaults`.
+    """
+
+    def __init__(self, bot: Parrot, *, defaults: dict[str, Any]) -> None:
+        self.bot = bot
+        self.defaults = defaults
+        self.__data: dict[int, dict[str, Any]] = {}
+        # guild ID -> webhook URL, of the guilds with the global chat enabled
+        self.__global_chat_webhooks: dict[int, str] = {}
+        # guild ID -> suggestion channel ID
+        self.__suggestion_channels: dict[int, int] = {}
+        self.__suggestion_channel_ids: set[int] = set()
+
+        self._task: asyncio.Task[None] | None = None
+        self.using_change_stream = False
+
+    def __repr__(self) -> str:
+        return f"<GuildConfigStore size={len(self)} change_stream={self.using_change_stream}>"
+
+    # mapping interface
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.__data)
+
+    def __contains__(self, guild_id: object) -> bool:
+        return guild_id in self.__data
+
+    def __getitem__(self, guild_id: int) -> dict[str, Any]:
+        return self.__data[guild_id]
+
+    def __setitem__(self, guild_id: int, data: dict[str, Any]) -> None:
+        self.__data[guild_id] = data
+        self.__index(guild_id, data)
+
+    def __delitem__(self, guild_id: int) -> None:
+        del self.__data[guild_id]
+        self.__unindex(guild_id)
+
+    def get(self, guild_id: int, default: Any = None) -> dict[str, Any] | Any:
+        return self.__data.get(guild_id, default)
+
+    def pop(self, guild_id: int, default: Any = None) -> dict[str, Any] | Any:
+        self.__unindex(guild_id)
+        return self.__data.pop(guild_id, default)
+
+    def keys(self):
+        return self.__data.keys()
+
+    def values(self):
+        return self.__data.values()
+
+    def items(self):
+        return self.__data.items()
+
+    def clear(self) -> None:
+        self.__data.clear()
+        self.__global_chat_webhooks.clear()
+        self.__suggestion_channels.clear()
+        self.__suggestion_channel_ids.clear()
+
+    def __index(self, guild_id: int, data: dict[str, Any]) -> None:
+        global_chat = data.get("global_chat") or {}
+        if global_chat.get("enable") and global_chat.get("webhook"):
+            self.__global_chat_webhooks[guild_id] = global_chat["webhook"]
+        else:
+            self.__global_chat_webhooks.pop(guild_id, None)
+
+        if (previous := self.__suggestion_channels.pop(guild_id, None)) is not None:
+            self.__suggestion_channel_ids.discard(previous)
+        if channel_id := data.get("suggestion_channel"):
+            self.__suggestion_channels[guild_id] = channel_id
+            self.__suggestion_channel_ids.add(channel_id)
+
+    def __unindex(self, guild_id: int) -> None:
+        self.__global_chat_webhooks.pop(guild_id, None)
+        if (channel_id := self.__suggestion_channels.pop(guild_id, None)) is not None:
+            self.__suggestion_channel_ids.discard(channel_id)
+
+    # typed accessors
+
+    def section(self, guild_id: int, name: str) -> Any:
+        """Return a top level key of the configuration, or its default value."""
+        data = self.__data.get(guild_id)
+        if data is not None and (value := data.get(name)) is not None:
+            return value
+        return copy.deepcopy(self.defaults.get(name))
+
+    def prefix(self, guild_id: int) -> str:
+        return self.section(guild_id, "prefix")
+
+    def premium(self, guild_id: int) -> bool:
+        return bool(self.section(guild_id, "premium"))
+
+    def mute_role(self, guild_id: int) -> int | None:
+        return self.section(guild_id, "mute_role")
+
+    def mod_role(self, guild_id: int) -> int | None:
+        return self.section(guild_id, "mod_role")
+
+    def dj_role(self, guild_id: int) -> int | None:
+        return self.section(guild_id, "dj_role")
+
+    def suggestion_channel(self, guild_id: int) -> int | None:
+        return self.section(guild_id, "suggestion_channel")
+
+    def hub(self, guild_id: int) -> int | None:
+        return self.section(guild_id, "hub")
+
+    def global_chat(self, guild_id: int) -> GlobalChatConfig:
+        return self.section(guild_id, "global_chat")
+
+    def starboard(self, guild_id: int) -> StarboardConfig:
+        return self.section(guild_id, "starboard_config")
+
+    def leveling(self, guild_id: int) -> LevelingConfig:
+        return self.section(guild_id, "leveling")
+
+    def global_chat_webhooks(self) -> list[str]:
+        """Webhook URLs of every guild with the global chat enabled."""
+        return list(self.__global_chat_webhooks.values())
+
+    def is_suggestion_channel(self, channel_id: int) -> bool:
+        return channel_id in self.__suggestion_channel_ids
+
+    # loading and coherency
+
+    async def load(self) -> None:
+        """Replace the store with every document of the collection."""
+        data: dict[int, dict[str, Any]] = {}
+        async for document in self.bot.guild_configurations.find({}, batch_size=1000):
+            data[document["_id"]] = document
+
+        self.clear()
+        for guild_id, document in data.items():
+            self[guild_id] = document
+
+        log.info("Loaded %s guild configurations", len(self))
+
+    async def refresh(self, guild_id: int) -> dict[str, Any] | None:
+        """Reload the configuration of a single guild from the database."""
+        if data := await self.bot.guild_configurations.find_one({"_id": guild_id}):
+            self[guild_id] = data
+        else:
+            self.pop(guild_id)
+        return data
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.__watch())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def __watch(self) -> None:
+        resume_token: Any = None
+        while True:
+            try:
+                async with self.bot.guild_configurations.watch(
+                    full_document="updateLookup",
+                    resume_after=resume_token,
+                ) as stream:
+                    self.using_change_stream = True
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        self.__apply_change(change)
+            except OperationFailure as e:
+                if e.code in (40573, 40324):  # change streams need a replica set
+                    log.warning("Change streams are unavailable, reloading guild configurations periodically")
+                    self.using_change_stream = False
+                    await self.__reload_forever()
+                    return
+                log.warning("Guild configuration change stream failed, reloading", exc_info=e)
+            except PyMongoError as e:
+                log.warning("Guild configuration change stream failed, reloading", exc_info=e)
+
+            self.using_change_stream = False
+            resume_token = None
+            await asyncio.sleep(RETRY_INTERVAL)
+            # changes were possibly missed while the stream was down
+            try:
+                await self.load()
+            except PyMongoError as e:
+                log.warning("Failed to reload guild configurations", exc_info=e)
+
+    async def __reload_forever(self) -> None:
+        while True:
+            await asyncio.sleep(RELOAD_INTERVAL)
+            try:
+                await self.load()
+            except PyMongoError as e:
+                log.warning("Failed to reload guild configurations", exc_info=e)
+
+    def __apply_change(self, change: dict[str, Any]) -> None:
+        operation = change["operationType"]
+        if operation in ("drop", "dropDatabase", "invalidate"):
+            self.clear()
+            return
+
+        guild_id = change.get("documentKey", {}).get("_id")
+        if guild_id is None:
+            return
+
+        if operation == "delete":
+            self.pop(guild_id)
+        elif document := change.get("fullDocument"):
+            self[guild_id] = document
@@ -0,0 +1,234 @@
+"""Computer players of the board games.
+
+Connect Four is searched on bitboards with alpha-beta pruning, iterative
+deepening within a time budget and a transposition table. Tic-tac-toe is small
+enough to be solved outright, each position once for the life of the process.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from functools import cache
+
+__all__ = ("ConnectFour", "best_column", "best_cell")
+
+WIN = 1_000_000
+# Nodes searched between two looks at the clock.
+CLOCK_INTERVAL = 1024
+# Score of a window of four squares holding only the counters of one player, by their number.
+WINDOW_SCORES = (0, 1, 4, 32, 0)
+
+# transposition table entry kinds: exact score, lower bound, upper bound
+EXACT, LOWER, UPPER = range(3)
+
+Position = tuple[int, int, int]
+"""(counters of the player to move, counters of both players, moves played)"""
+
+
+class _Timeout(Exception):
+    pass
+
+
+class ConnectFour:
+    """Connect Four search on a board of `width` columns and `height` rows.
+
+    A position is two bitboards, of the counters of the player to move and of
+    every counter; a column takes ``height + 1`` bits, the extra one keeping
+    alignments from wrapping from a column to the next.
+    """
+
+    def __init__(self, width: int = 7, height: int = 6) -> None:
+        self.width = width
+        self.height = height
+        self.size = width * height
+
+        stride = height + 1
+        self.bottom = [1 << (column * stride) for column in range(width)]
+        self.top = [1 << (height - 1 + column * stride) for column in range(width)]
+        self.column_masks = [((1 << height) - 1) << (column * stride) for column in range(width)]
+        # vertical, horizontal and both diagonals
+        self.directions = (1, stride, stride - 1, stride + 1)
+        # center columns first, they take part in the most alignments
+        self.order = sorted(range(width), key=lambda column: abs(2 * column - width + 1))
+        self.windows = self.__windows()
+
+        self.deadline = float("inf")
+        self.nodes = 0
+        self.table: dict[int, tuple[int, int, int, int | None]] = {}
+
+    def __windows(self) -> list[int]:
+        windows = []
+        for column in range(self.width):
+            for row in range(self.height):
+                for d_column, d_row in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_column, end_row = column + 3 * d_column, row + 3 * d_row
+                    if not (0 <= end_column < self.width and 0 <= end_row < self.height):
+                        continue
+                    window = 0
+                    for step in range(4):
+                        window |= 1 << ((column + step * d_column) * (self.height + 1) + row + step * d_row)
+                    windows.append(window)
+        return windows
+
+    def from_grid(self, grid: Sequence[Sequence[int]], player: int) -> Position:
+        """The position of a grid of rows, top first, 0 for empty squares, to be played by `player`."""
+        current = mask = moves = 0
+        for index, row in enumerate(reversed(grid[-self.height :])):
+            for column, square in enumerate(row[: self.width]):
+                if not square:
+                    continue
+                bit = 1 << (column * (self.height + 1) + index)
+                mask |= bit
+                moves += 1
+                if square == player:
+                    current |= bit
+        return current, mask, moves
+
+    def can_play(self, position: Position, column: int) -> bool:
+        return not position[1] & self.top[column]
+
+    def play(self, position: Position, column: int) -> Position:
+        current, mask, moves = position
+        # the opponent plays next, with the counters of the player who did not move
+        return current ^ mask, mask | (mask + self.bottom[column]), moves + 1
+
+    def aligned(self, counters: int) -> bool:
+        for shift in self.directions:
+            pairs = counters & (counters >> shift)
+            if pairs & (pairs >> 2 * shift):
+                return True
+        return False
+
+    def is_winning_move(self, position: Position, column: int) -> bool:
+        current, mask, _ = position
+        return self.aligned(current | ((mask + self.bottom[column]) & self.column_masks[column]))
+
+    def evaluate(self, position: Position) -> int:
+        """Score of the position for the player to move, from the windows only one player can fill."""
+        current, mask, _ = position
+        opponent = current ^ mask
+        score = 0
+        for window in self.windows:
+            if not window & opponent:
+                score += WINDOW_SCORES[(window & current).bit_count()]
+            elif not window & current:
+                score -= WINDOW_SCORES[(window & opponent).bit_count()]
+        return score
+
+    def __tick(self) -> None:
+        self.nodes += 1
+        if self.nodes % CLOCK_INTERVAL == 0 and time.monotonic() > self.deadline:
+            raise _Timeout
+
+    def negamax(self, position: Position, depth: int, alpha: int, beta: int) -> tuple[int, int | None]:
+        self.__tick()
+        playable = [column for column in self.order if self.can_play(position, column)]
+        if not playable:
+            return 0, None
+        for column in playable:
+            if self.is_winning_move(position, column):
+                # sooner wins score higher
+                return WIN - position[2], column
+        if depth == 0:
+            return self.evaluate(position), None
+
+        current, mask, _ = position
+        key = current + mask
+        original_alpha = alpha
+        first: int | None = None
+        if (entry := self.table.get(key)) is not None:
+            entry_depth, kind, entry_score, first = entry
+            if entry_depth >= depth:
+                if kind == EXACT:
+                    return entry_score, first
+                if kind == LOWER:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return entry_score, first
+        if first is not None:
+            playable.remove(first)
+            playable.insert(0, first)
+
+        best_score, best_column = -WIN - 1, playable[0]
+        for column in playable:
+            score = -self.negamax(self.play(position, column), depth - 1, -beta, -alpha)[0]
+            if score > best_score:
+                best_score, best_column = score, column
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            kind = UPPER
+        elif best_score >= beta:
+            kind = LOWER
+        else:
+            kind = EXACT
+        self.table[key] = (depth, kind, best_score, best_column)
+        return best_score, best_column
+
+    def search(self, position: Position, *, time_limit: float = 1.0, max_depth: int | None = None) -> tuple[int | None, int]:
+        """(best column, depth completed), searching one move deeper at a time for `time_limit` seconds.
+
+        A search the time runs out in is discarded, except the first one, so there
+        is always a column while one is playable.
+        """
+        remaining = self.size - position[2]
+        max_depth = remaining if max_depth is None else min(max_depth, remaining)
+        deadline = time.monotonic() + time_limit
+        self.deadline = float("inf")
+        best: int | None = None
+        completed = 0
+
+        for depth in range(1, max_depth + 1):
+            try:
+                score, column = self.negamax(position, depth, -WIN - 1, WIN + 1)
+            except _Timeout:
+                break
+            best, completed = column, depth
+            self.deadline = deadline
+            if abs(score) >= WIN - self.size or time.monotonic() > deadline:
+                break
+
+        return best, completed
+
+
+def best_column(grid: Sequence[Sequence[int]], player: int, *, time_limit: float = 1.0) -> int | None:
+    """Column `player` should play on a Connect Four grid of rows, top first. ``None`` when it is full."""
+    game = ConnectFour(len(grid[0]), len(grid))
+    return game.search(game.from_grid(grid, player), time_limit=time_limit)[0]
+
+
+_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+)  # fmt: skip
+
+
+@cache
+def _solve(cells: tuple[bool | None, ...], player: bool) -> tuple[int, int | None]:
+    """(score for `player` to move, best cell) of a tic-tac-toe position, with perfect play."""
+    for a, b, c in _LINES:
+        if cells[a] is not None and cells[a] == cells[b] == cells[c]:
+            # the previous player won, the sooner the better for them
+            return -(1 + cells.count(None)), None
+
+    best_score, best = -10, None
+    for index, cell in enumerate(cells):
+        if cell is not None:
+            continue
+        child = cells[:index] + (player,) + cells[index + 1 :]
+        score = -_solve(child, not player)[0]
+        if score > best_score:
+            best_score, best = score, index
+    return (0, None) if best is None else (best_score, best)
+
+
+def best_cell(state: Sequence[Sequence[bool | None]], player: bool) -> tuple[int, int] | None:
+    """(row, column) `player` should play on a tic-tac-toe board. ``None`` when the game is over."""
+    _, index = _solve(tuple(cell for row in state for cell in row), player)
+    return None if index is None else divmod(index, 3)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import cache
+from io import BytesIO
+
+import chess
+import chess.svg
+from PIL import Image, ImageDraw, ImageFont
+
+__all__ = ("BoardRenderer", "svg_piece")
+
+LIGHT = (240, 217, 181, 255)
+DARK = (181, 136, 99, 255)
+LIGHT_LAST_MOVE = (205, 210, 106, 255)
+DARK_LAST_MOVE = (170, 162, 58, 255)
+CHECK = (230, 60, 60, 255)
+BORDER = (33, 33, 33, 255)
+COORDINATES = (230, 230, 230, 255)
+
+FONT = "extra/roboto-bold.ttf"
+# Positions rendered last, a game only ever shows its latest one.
+CACHE_SIZE = 256
+
+PieceSprite = Callable[[chess.Piece, int], Image.Image]
+
+
+@cache
+def svg_piece(piece: chess.Piece, size: int) -> Image.Image:
+    """The python-chess drawing of a piece, rasterised to a `size` pixels square."""
+    # wand loads ImageMagick, only done for the first board
+    from .image import svg_to_png
+
+    png = svg_to_png(chess.svg.piece(piece).encode(), width=size, height=size)
+    return Image.open(BytesIO(png)).convert("RGBA")
+
+
+class BoardRenderer:
+    """PNG drawings of chess positions, without any network round trip.
+
+    The squares and coordinates of each orientation are drawn once, the pieces
+    are sprites pasted on a copy of it. Drawings are kept by position, the same
+    position is not drawn twice.
+    """
+
+    def __init__(
+        self,
+        *,
+        square: int = 60,
+        margin: int = 20,
+        pieces: PieceSprite = svg_piece,
+        cache_size: int = CACHE_SIZE,
+    ) -> None:
+        self.square = square
+        self.margin = margin
+        self.pieces = pieces
+        self.cache_size = cache_size
+
+        self.__lock = threading.Lock()
+        self.__cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self.__backgrounds: dict[chess.Color, Image.Image] = {}
+
+    def render(
+        self,
+        board: chess.Board,
+        *,
+        orientation: chess.Color = chess.WHITE,
+        last_move: chess.Move | None = None,
+    ) -> BytesIO:
+        """PNG of the board, seen from `orientation`. The last move defaults to the last one played."""
+        if last_move is None and board.move_stack:
+            last_move = board.peek()
+        check = board.king(board.turn) if board.is_check() else None
+
+        key = (board.board_fen(), orientation, last_move, check)
+        with self.__lock:
+            if (png := self.__cache.get(key)) is not None:
+                self.__cache.move_to_end(key)
+                return BytesIO(png)
+
+        png = self.__draw(board, orientation, last_move, check)
+        with self.__lock:
+            self.__cache[key] = png
+            if len(self.__cache) > self.cache_size:
+                self.__cache.popitem(last=False)
+        return BytesIO(png)
+
+    def cache_info(self) -> tuple[int, int]:
+        """(positions cached, maximum positions cached)."""
+        return len(self.__cache), self.cache_size
+
+    def square_box(self, square: chess.Square, orientation: chess.Color) -> tuple[int, int, int, int]:
+        """Box of the square on the drawing."""
+        file, rank = chess.square_file(square), chess.square_rank(square)
+        column, row = (file, 7 - rank) if orientation == chess.WHITE else (7 - file, rank)
+        x, y = self.margin + column * self.square, self.margin + row * self.square
+        return x, y, x + self.square, y + self.square
+
+    def __background(self, orientation: chess.Color) -> Image.Image:
+        if (background := self.__backgrounds.get(orientation)) is not None:
+            return background
+
+        size = 8 * self.square + 2 * self.margin
+        background = Image.new("RGBA", (size, size), BORDER)
+        draw = ImageDraw.Draw(background)
+        for square in chess.SQUARES:
+            draw.rectangle(self.__inclusive(self.square_box(square, orientation)), fill=self.__colour(square))
+
+        font = ImageFont.truetype(FONT, self.margin * 2 // 3)
+        for index in range(8):
+            x0, y0, x1, y1 = self.square_box(chess.square(index, index), orientation)
+            file, rank = chess.FILE_NAMES[index], chess.RANK_NAMES[index]
+            draw.text(((x0 + x1) // 2, size - self.margin // 2), file, fill=COORDINATES, font=font, anchor="mm")
+            draw.text((self.margin // 2, (y0 + y1) // 2), rank, fill=COORDINATES, font=font, anchor="mm")
+
+        self.__backgrounds[orientation] = background
+        return background
+
+    def __draw(
+        self,
+        board: chess.Board,
+        orientation: chess.Color,
+        last_move: chess.Move | None,
+        check: chess.Square | None,
+    ) -> bytes:
+        image = self.__background(orientation).copy()
+        draw = ImageDraw.Draw(image)
+
+        if last_move is not None:
+            for square in {last_move.from_square, last_move.to_square}:
+                colour = LIGHT_LAST_MOVE if self.__is_light(square) else DARK_LAST_MOVE
+                draw.rectangle(self.__inclusive(self.square_box(square, orientation)), fill=colour)
+        if check is not None:
+            draw.rectangle(self.__inclusive(self.square_box(check, orientation)), fill=CHECK)
+
+        for square, piece in board.piece_map().items():
+            sprite = self.pieces(piece, self.square)
+            x, y, _, _ = self.square_box(square, orientation)
+            image.paste(sprite, (x, y), sprite)
+
+        buf = BytesIO()
+        image.save(buf, "PNG", compress_level=1)
+        return buf.getvalue()
+
+    @staticmethod
+    def __is_light(square: chess.Square) -> bool:
+        return (chess.square_file(square) + chess.square_rank(square)) % 2 == 1
+
+    def __colour(self, square: chess.Square) -> tuple[int, int, int, int]:
+        return LIGHT if self.__is_light(square) else DARK
+
+    @staticmethod
+    def __inclusive(box: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+        x0, y0, x1, y1 = box
+        return x0, y0, x1 - 1, y1 - 1
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Collection, Iterable, Mapping
+from io import BytesIO
+
+from PIL import Image
+
+__all__ = ("IsometricRenderer", "parse_shape")
+
+# Offsets between neighbouring blocks on the drawing, in pixels.
+STEP_X = 28
+STEP_Y = 16
+STEP_LEVEL = 28
+BACKGROUND = (25, 25, 25, 0)
+# A canvas this many times larger than what is drawn on it is reallocated.
+MAX_CANVAS_WASTE = 4
+
+Cell = tuple[int, int, int]
+Box = tuple[int, int, int, int]
+
+
+def parse_shape(shape: Iterable[str], codes: Collection[str]) -> dict[Cell, str]:
+    """(level, row, column) -> code of every block of the shape whose code is in `codes`.
+
+    The shape is a list of rows, the last row of a level ends with ``-``.
+    """
+    cells: dict[Cell, str] = {}
+    i = lvl = 0
+    for row in shape:
+        # most rows of the interactive game are empty
+        if not row.strip("0"):
+            i += 1
+            continue
+
+        j = 0
+        for val in row:
+            if val in codes:
+                cells[lvl, i, j] = val
+            j += 1
+            if val == "-":
+                i = -1
+                j = 0
+                lvl += 1
+        i += 1
+    return cells
+
+
+def _position(cell: Cell) -> tuple[int, int]:
+    lvl, i, j = cell
+    return (j - i) * STEP_X, (j + i) * STEP_Y - lvl * STEP_LEVEL
+
+
+def _union(a: Box | None, b: Box | None) -> Box | None:
+    if a is None or b is None:
+        return a or b
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def _intersect(a: Box, b: Box) -> Box | None:
+    box = max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+    return box if box[0] < box[2] and box[1] < box[3] else None
+
+
+def _area(box: Box) -> int:
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+class IsometricRenderer:
+    """Isometric drawing of a shape of blocks, kept between renders.
+
+    Only the blocks are allocated for, not a fixed size canvas. Each render
+    compares the shape with the previous one and repaints the regions of the
+    changed blocks; the selector is painted on the output only. Painting a region
+    redraws every block overlapping it in the same order as a full drawing, so
+    the result is identical.
+    """
+
+    def __init__(
+        self,
+        sprites: Mapping[str, Image.Image],
+        *,
+        counted: Collection[str],
+        selector: tuple[Image.Image, Image.Image],
+    ) -> None:
+        self.sprites = sprites
+        self.counted = frozenset(counted)
+        self.selector_back, self.selector_front = selector
+        self.__codes = frozenset(sprites) | self.counted
+
+        self.__lock = threading.Lock()
+        self.__cells: dict[Cell, str] = {}
+        self.__canvas: Image.Image | None = None
+        # position of the canvas on the drawing
+        self.__origin = (0, 0)
+
+    def render(self, shape: Iterable[str], selector_pos: list[int] | None = None) -> tuple[BytesIO, int]:
+        """PNG of the shape, and the number of blocks drawn (the selector counting as one)."""
+        cells = parse_shape(shape, self.__codes)
+        selector: Cell | None = tuple(selector_pos) if selector_pos is not None else None  # type: ignore
+
+        count = sum(code in self.counted for code in cells.values())
+        if selector is not None and cells.get(selector) not in self.counted:
+            count += 1
+        if count == 0:
+            msg = "Did not detect any blocks. Do `j;iso blocks` or `j;help iso` to see available blocks"
+            raise Exception(msg)
+
+        with self.__lock:
+            self.__update(cells)
+            image = self.__compose(cells, selector)
+
+        buf = BytesIO()
+        image.save(buf, "PNG", compress_level=1)
+        buf.seek(0)
+        return buf, count
+
+    def __box(self, cell: Cell, code: str | None) -> Box | None:
+        if (sprite := self.sprites.get(code)) is None:  # type: ignore
+            return None
+        x, y = _position(cell)
+        return x, y, x + sprite.width, y + sprite.height
+
+    def __selector_box(self, cell: Cell) -> Box:
+        x, y = _position(cell)
+        width = max(self.selector_back.width, self.selector_front.width)
+        height = max(self.selector_back.height, self.selector_front.height)
+        return x, y, x + width, y + height
+
+    def __bounds(self, cells: Mapping[Cell, str]) -> Box | None:
+        bounds: Box | None = None
+        for cell, code in cells.items():
+            bounds = _union(bounds, self.__box(cell, code))
+        return bounds
+
+    def __canvas_box(self) -> Box | None:
+        if self.__canvas is None:
+            return None
+        x, y = self.__origin
+        return x, y, x + self.__canvas.width, y + self.__canvas.height
+
+    def __update(self, cells: dict[Cell, str]) -> None:
+        bounds = self.__bounds(cells)
+        canvas_box = self.__canvas_box()
+        previous, self.__cells = self.__cells, cells
+
+        if bounds is None:
+            self.__canvas = None
+            return
+
+        outgrown = canvas_box is None or _intersect(canvas_box, bounds) != bounds
+        if outgrown or _area(canvas_box) > MAX_CANVAS_WASTE * _area(bounds):  # type: ignore
+            self.__canvas = Image.new("RGBA", (bounds[2] - bounds[0], bounds[3] - bounds[1]), BACKGROUND)
+            self.__origin = bounds[0], bounds[1]
+            self.__paint(self.__canvas, self.__origin, bounds, cells, None)
+            return
+
+        assert self.__canvas is not None
+        for cell in cells.keys() | previous.keys():
+            if cells.get(cell) == previous.get(cell):
+                continue
+            dirty = _union(self.__box(cell, previous.get(cell)), self.__box(cell, cells.get(cell)))
+            if dirty is not None and (region := _intersect(dirty, canvas_box)) is not None:
+                self.__paint(self.__canvas, self.__origin, region, cells, None)
+
+    def __compose(self, cells: dict[Cell, str], selector: Cell | None) -> Image.Image:
+        canvas_box = self.__canvas_box()
+        if selector is None:
+            assert self.__canvas is not None
+            return self.__canvas.crop(self.__canvas.getbbox())
+
+        selector_box = self.__selector_box(selector)
+        box = _union(canvas_box, selector_box)
+        assert box is not None
+
+        image = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]), BACKGROUND)
+        if self.__canvas is not None:
+            image.paste(self.__canvas, (self.__origin[0] - box[0], self.__origin[1] - box[1]))
+        self.__paint(image, (box[0], box[1]), selector_box, cells, selector)
+        return image.crop(image.getbbox())
+
+    def __paint(
+        self,
+        image: Image.Image,
+        origin: tuple[int, int],
+        region: Box,
+        cells: Mapping[Cell, str],
+        selector: Cell | None,
+    ) -> None:
+        """Repaint `region` (a box on the drawing) of `image`, positioned at `origin` on the drawing."""
+        left, top, right, bottom = region
+        # painted apart and pasted as a whole, blocks overlapping the region are not blended twice outside of it
+        tile = Image.new("RGBA", (right - left, bottom - top), BACKGROUND)
+
+        overlapping = [
+            cell
+            for cell, code in cells.items()
+            if (box := self.__box(cell, code)) is not None and _intersect(box, region) is not None
+        ]
+        if selector is not None:
+            overlapping.append(selector)
+
+        for cell in sorted(set(overlapping)):
+            x, y = _position(cell)
+            offset = (x - left, y - top)
+            if cell == selector:
+                tile.paste(self.selector_back, offset, self.selector_back)
+            if (sprite := self.sprites.get(cells.get(cell))) is not None:  # type: ignore
+                tile.paste(sprite, offset, sprite)
+            if cell == selector:
+                tile.paste(self.selector_front, offset, self.selector_front)
+
+        image.paste(tile, (left - origin[0], top - origin[1]))
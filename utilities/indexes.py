@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCollection as MongoCollection
+
+    from core import Parrot
+
+__all__ = (
+    "INDEXES",
+    "LEVEL_INDEXES",
+    "HOT_QUERIES",
+    "HotQuery",
+    "IndexSpec",
+    "QueryPlan",
+    "ensure_indexes",
+    "ensure_level_indexes",
+    "explain",
+)
+
+log = logging.getLogger("utilities.indexes")
+
+
+class IndexSpec(NamedTuple):
+    # attribute of the bot holding the collection
+    collection: str
+    keys: list[tuple[str, int]]
+    options: dict[str, Any] = {}
+
+    def model(self) -> IndexModel:
+        return IndexModel(self.keys, **self.options)
+
+
+class HotQuery(NamedTuple):
+    name: str
+    # attribute of the bot holding the collection, ``None`` for the level collection of the guild
+    collection: str | None
+    filter: dict[str, Any]
+    sort: list[tuple[str, int]] | None = None
+
+
+class QueryPlan(NamedTuple):
+    name: str
+    stages: list[str]
+    docs_examined: int | None
+    returned: int | None
+
+    @property
+    def collection_scan(self) -> bool:
+        return "COLLSCAN" in self.stages
+
+
+# fmt: off
+INDEXES: tuple[IndexSpec, ...] = (
+    IndexSpec("timers", [("expires_at", ASCENDING)]),
+    IndexSpec("starboards", [("message_id.bot", ASCENDING)]),
+    IndexSpec("starboards", [("message_id.author", ASCENDING)]),
+    IndexSpec("afk_collection", [("messageAuthor", ASCENDING), ("guild", ASCENDING)]),
+    IndexSpec("tags_collection", [("guild_id", ASCENDING), ("tag_id", ASCENDING)]),
+    IndexSpec("tags_collection", [("guild_id", ASCENDING), ("owner", ASCENDING)]),
+    IndexSpec("giveaways", [("message_id", ASCENDING), ("status", ASCENDING)]),
+    IndexSpec("giveaways", [("status", ASCENDING)]),
+    IndexSpec("giveaways", [("guild_id", ASCENDING)]),
+    IndexSpec(
+        "guild_configurations",
+        [("global_chat.enable", ASCENDING)],
+        {"partialFilterExpression": {"global_chat.enable": True}},
+    ),
+    IndexSpec("user_collections_ind", [("playlist.id", ASCENDING)]),
+    IndexSpec("mod_jobs", [("status", ASCENDING)]),
+    IndexSpec("view_states", [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+)
+
+# every collection of guildLevelDB, one per guild
+LEVEL_INDEXES: tuple[IndexSpec, ...] = (
+    IndexSpec("guild_level_db", [("xp", DESCENDING)]),
+)
+
+HOT_QUERIES: tuple[HotQuery, ...] = (
+    HotQuery("next timer", "timers", {}, [("expires_at", ASCENDING)]),
+    HotQuery("starboard by post", "starboards", {"$or": [{"message_id.bot": 0}, {"message_id.author": 0}]}),
+    HotQuery("afk of user", "afk_collection", {"messageAuthor": 0, "guild": 0}),
+    HotQuery("tag of guild", "tags_collection", {"guild_id": 0, "tag_id": ""}),
+    HotQuery("tags of owner", "tags_collection", {"guild_id": 0, "owner": 0}),
+    HotQuery("giveaway by message", "giveaways", {"message_id": 0, "status": "ONGOING"}),
+    HotQuery("ongoing giveaways", "giveaways", {"status": "ONGOING"}),
+    HotQuery("global chat guilds", "guild_configurations", {"global_chat.enable": True}),
+    HotQuery("track likes", "user_collections_ind", {"playlist.id": ""}),
+    HotQuery("unfinished mod jobs", "mod_jobs", {"status": {"$in": ["QUEUED", "RUNNING"]}}),
+    HotQuery("level leaderboard", None, {}, [("xp", DESCENDING)]),
+)
+# fmt: on
+
+
+async def ensure_indexes(bot: Parrot) -> None:
+    """Create the missing indexes of :data:`INDEXES`, existing ones are left untouched."""
+    by_collection: dict[str, list[IndexModel]] = {}
+    for spec in INDEXES:
+        by_collection.setdefault(spec.collection, []).append(spec.model())
+
+    for attribute, models in by_collection.items():
+        collection: MongoCollection = getattr(bot, attribute)
+        try:
+            await collection.create_indexes(models)
+        except PyMongoError as e:
+            log.warning("Failed to create the indexes of %s", collection.name, exc_info=e)
+
+
+async def ensure_level_indexes(collection: MongoCollection) -> None:
+    try:
+        await collection.create_indexes([spec.model() for spec in LEVEL_INDEXES])
+    except PyMongoError as e:
+        log.warning("Failed to create the level indexes of %s", collection.name, exc_info=e)
+
+
+def _stages(plan: dict[str, Any]) -> list[str]:
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages.extend(_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_stages(child))
+    return stages
+
+
+async def explain(bot: Parrot, query: HotQuery, *, guild_id: int) -> QueryPlan:
+    if query.collection is None:
+        collection: MongoCollection = bot.guild_level_collection(guild_id)
+    else:
+        collection = getattr(bot, query.collection)
+
+    cursor = collection.find(query.filter)
+    if query.sort:
+        cursor = cursor.sort(query.sort)
+    result: dict[str, Any] = await cursor.explain()
+
+    planner = result.get("queryPlanner", {})
+    stats = result.get("executionStats", {})
+    return QueryPlan(
+        query.name,
+        _stages(planner.get("winningPlan", {})),
+        stats.get("totalDocsExamined"),
+        stats.get("nReturned"),
+    )
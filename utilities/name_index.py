@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+__all__ = ("NameIndex",)
+
+
+def _fold(name: str) -> str:
+    return name.casefold()
+
+
+def _trigrams(folded: str) -> set[str]:
+    padded = f"  {folded} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Prefix and trigram index over a set of names, for lookups by partial names.
+
+    Names are matched case insensitively. Prefix searches are a binary search in the
+    sorted names, and fuzzy searches only score the names sharing a trigram with the
+    query, so neither of them scans every name.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        # (folded name, name), sorted
+        self.__sorted: list[tuple[str, str]] = []
+        # trigram -> names containing it
+        self.__trigrams: dict[str, set[str]] = {}
+        # name -> number of trigrams of the name
+        self.__names: dict[str, int] = {}
+
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self.__names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.__names
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for _, name in self.__sorted)
+
+    def add(self, name: str) -> None:
+        if name in self.__names:
+            return
+
+        folded = _fold(name)
+        trigrams = _trigrams(folded)
+        self.__names[name] = len(trigrams)
+        bisect.insort(self.__sorted, (folded, name))
+        for trigram in trigrams:
+            self.__trigrams.setdefault(trigram, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        if name not in self.__names:
+            return
+
+        folded = _fold(name)
+        del self.__names[name]
+        del self.__sorted[bisect.bisect_left(self.__sorted, (folded, name))]
+        for trigram in _trigrams(folded):
+            names = self.__trigrams[trigram]
+            names.discard(name)
+            if not names:
+                del self.__trigrams[trigram]
+
+    def prefix(self, query: str, *, limit: int | None = None, offset: int = 0) -> list[str]:
+        """Names starting with `query`, in alphabetical order."""
+        folded = _fold(query)
+        start = bisect.bisect_left(self.__sorted, (folded, "")) + offset
+
+        matches: list[str] = []
+        for index in range(start, len(self.__sorted)):
+            key, name = self.__sorted[index]
+            if not key.startswith(folded) or (limit is not None and len(matches) >= limit):
+                break
+            matches.append(name)
+        return matches
+
+    def count_prefix(self, query: str) -> int:
+        folded = _fold(query)
+        start = bisect.bisect_left(self.__sorted, (folded, ""))
+        # every name with the prefix sorts before the prefix followed by the highest code point
+        end = bisect.bisect_left(self.__sorted, (f"{folded}\U0010ffff", ""))
+        return end - start
+
+    def similar(self, query: str, *, limit: int = 5, cutoff: float = 0.3) -> list[str]:
+        """Names most similar to `query` (Jaccard similarity of their trigrams), best first."""
+        query_trigrams = _trigrams(_fold(query))
+
+        shared: Counter[str] = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.__trigrams.get(trigram, ()))
+
+        scored: list[tuple[float, str]] = []
+        for name, common in shared.items():
+            score = common / (len(query_trigrams) + self.__names[name] - common)
+            if score >= cutoff:
+                scored.append((score, name))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [name for _, name in scored[:limit]]
+
+    def complete(self, query: str, *, limit: int = 25) -> list[str]:
+        """Prefix matches first, then similar names; what autocompletion shows."""
+        if not query:
+            return self.prefix("", limit=limit)
+
+        matches = self.prefix(query, limit=limit)
+        if len(matches) < limit:
+            seen = set(matches)
+            matches.extend(name for name in self.similar(query, limit=limit, cutoff=0.1) if name not in seen)
+        return matches[:limit]
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, Literal, NamedTuple
+
+import discord
+
+__all__ = ("ChannelChange", "BulkChannelEditor")
+
+log = logging.getLogger("utilities.overwrites")
+
+# Permission overwrite and channel edit routes are bucketed per channel, so two
+# different channels never share a bucket. The bound only keeps a single guild
+# from eating the global (50 requests/second) limit of the bot.
+DEFAULT_CONCURRENCY = 8
+# How often (in seconds) the progress callback is called while executing.
+PROGRESS_INTERVAL = 2.5
+
+OverwritePair = tuple[int, int]
+ProgressCallback = Callable[["BulkChannelEditor"], Awaitable[Any]]
+
+
+class ChannelChange(NamedTuple):
+    """A single planned change to a channel.
+
+    For ``overwrite`` changes, ``before`` and ``after`` are ``(allow, deny)`` bit pairs,
+    ``None`` meaning there is no overwrite for the target.
+    For ``slowmode`` changes, they are the slowmode delay in seconds.
+    """
+
+    channel_id: int
+    kind: Literal["overwrite", "slowmode"]
+    target_id: int | None
+    target_type: Literal["role", "member"] | None
+    before: OverwritePair | int | None
+    after: OverwritePair | int | None
+
+    @property
+    def key(self) -> tuple[int, str, int | None]:
+        return self.channel_id, self.kind, self.target_id
+
+    def reverse(self) -> ChannelChange:
+        return self._replace(before=self.after, after=self.before)
+
+    def to_dict(self) -> dict[str, Any]:
+        return self._asdict()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ChannelChange:
+        before, after = data.get("before"), data.get("after")
+        return cls(
+            channel_id=data["channel_id"],
+            kind=data["kind"],
+            target_id=data.get("target_id"),
+            target_type=data.get("target_type"),
+            before=tuple(before) if isinstance(before, list) else before,  # type: ignore
+            after=tuple(after) if isinstance(after, list) else after,  # type: ignore
+        )
+
+
+class BulkChannelEditor:
+    """Plan channel permission/slowmode changes up front and apply them concurrently.
+
+    Every planned change records the state it replaces, so :meth:`rollback` can put
+    the channels back exactly how they were. Execution can be cancelled with
+    :meth:`cancel`; changes that were not applied yet stay in :attr:`pending` and
+    calling :meth:`execute` again resumes from there.
+    """
+
+    def __init__(
+        self,
+        guild: discord.Guild,
+        *,
+        reason: str | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        on_progress: ProgressCallback | None = None,
+    ) -> None:
+        self.guild = guild
+        self.reason = reason
+        self.concurrency = max(1, concurrency)
+        self.on_progress = on_progress
+
+        self.pending: dict[tuple[int, str, int | None], ChannelChange] = {}
+        self.applied: list[ChannelChange] = []
+        self.failed: list[tuple[ChannelChange, Exception]] = []
+        # targets of the planned overwrites, a role created just before is not cached by the guild yet
+        self._targets: dict[int, discord.Role | discord.Member] = {}
+
+        self._cancelled = False
+        self._running = False
+
+    def __repr__(self) -> str:
+        return f"<BulkChannelEditor guild={self.guild.id} done={self.done}/{self.total} failed={len(self.failed)}>"
+
+    @property
+    def total(self) -> int:
+        return len(self.pending) + len(self.applied) + len(self.failed)
+
+    @property
+    def done(self) -> int:
+        return len(self.applied) + len(self.failed)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def plan_overwrite(
+        self,
+        channel: discord.abc.GuildChannel,
+        target: discord.Role | discord.Member,
+        **permissions: bool | None,
+    ) -> ChannelChange | None:
+        """Plan an update of the overwrite of `target` in `channel`.
+
+        Planning the same channel and target twice merges both updates into one change.
+        Returns ``None`` if the channel already has the requested permissions.
+        """
+        key = (channel.id, "overwrite", target.id)
+        if planned := self.pending.get(key):
+            before = planned.before
+            current = self._to_overwrite(planned.after)  # type: ignore
+        else:
+            current = channel.overwrites_for(target)
+            before = None if current.is_empty() else self._to_pair(current)
+
+        overwrite = discord.PermissionOverwrite.from_pair(*current.pair())
+        overwrite.update(**permissions)
+
+        after = None if overwrite.is_empty() else self._to_pair(overwrite)
+        if after == before:
+            self.pending.pop(key, None)
+            return None
+
+        change = ChannelChange(
+            channel_id=channel.id,
+            kind="overwrite",
+            target_id=target.id,
+            target_type="role" if isinstance(target, discord.Role) else "member",
+            before=before,
+            after=after,
+        )
+        self.pending[key] = change
+        self._targets[target.id] = target
+        return change
+
+    def plan_slowmode(self, channel: discord.TextChannel, delay: int) -> ChannelChange | None:
+        """Plan a change of the slowmode delay of `channel`."""
+        key = (channel.id, "slowmode", None)
+        before = planned.before if (planned := self.pending.get(key)) else channel.slowmode_delay
+        if before == delay:
+            self.pending.pop(key, None)
+            return None
+
+        change = ChannelChange(
+            channel_id=channel.id,
+            kind="slowmode",
+            target_id=None,
+            target_type=None,
+            before=before,
+            after=delay,
+        )
+        self.pending[key] = change
+        return change
+
+    def extend(self, changes: Iterable[ChannelChange]) -> None:
+        for change in changes:
+            self.pending[change.key] = change
+
+    def rollback(self, *, reason: str | None = None) -> BulkChannelEditor:
+        """Return a new editor which reverts every applied change."""
+        editor = self.__class__(
+            self.guild,
+            reason=reason or self.reason,
+            concurrency=self.concurrency,
+            on_progress=self.on_progress,
+        )
+        editor.extend(change.reverse() for change in reversed(self.applied))
+        editor._targets.update(self._targets)
+        return editor
+
+    def cancel(self) -> None:
+        """Stop picking up new changes. In-flight requests are allowed to finish."""
+        self._cancelled = True
+
+    async def execute(self) -> BulkChannelEditor:
+        """Apply all the pending changes, or resume after a :meth:`cancel`."""
+        if self._running:
+            msg = "editor is already running"
+            raise RuntimeError(msg)
+
+        self._cancelled = False
+        self._running = True
+
+        queue: deque[ChannelChange] = deque(self.pending.values())
+        self.pending = {}
+
+        async def worker() -> None:
+            while queue and not self._cancelled:
+                change = queue.popleft()
+                try:
+                    await self._apply(change)
+                except asyncio.CancelledError:
+                    queue.appendleft(change)
+                    raise
+                except (discord.HTTPException, LookupError) as e:
+                    log.warning("failed to apply %s in guild %s: %s", change, self.guild.id, e)
+                    self.failed.append((change, e))
+                else:
+                    self.applied.append(change)
+
+        progress = asyncio.create_task(self._report_progress()) if self.on_progress else None
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(queue)))))
+        finally:
+            self._running = False
+            self.extend(queue)
+            if progress is not None:
+                progress.cancel()
+                await self._call_progress()
+
+        return self
+
+    async def _report_progress(self) -> None:
+        while self._running:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            await self._call_progress()
+
+    async def _call_progress(self) -> None:
+        if self.on_progress is None:
+            return
+        try:
+            await self.on_progress(self)
+        except discord.HTTPException:
+            pass
+
+    async def _apply(self, change: ChannelChange) -> None:
+        channel = self.guild.get_channel(change.channel_id)
+        if channel is None:
+            msg = f"channel {change.channel_id} not found"
+            raise LookupError(msg)
+
+        if change.kind == "slowmode":
+            await channel.edit(slowmode_delay=change.after, reason=self.reason)  # type: ignore
+            return
+
+        target_id: int = change.target_id  # type: ignore
+        target = self._targets.get(target_id)
+        if target is None:
+            target = self.guild.get_role(target_id) if change.target_type == "role" else self.guild.get_member(target_id)
+        if target is None:
+            msg = f"{change.target_type} {target_id} not found"
+            raise LookupError(msg)
+
+        overwrite = None if change.after is None else self._to_overwrite(change.after)  # type: ignore
+        await channel.set_permissions(target, overwrite=overwrite, reason=self.reason)
+
+    @staticmethod
+    def _to_pair(overwrite: discord.PermissionOverwrite) -> OverwritePair:
+        allow, deny = overwrite.pair()
+        return allow.value, deny.value
+
+    @staticmethod
+    def _to_overwrite(pair: OverwritePair | None) -> discord.PermissionOverwrite:
+        if pair is None:
+            return discord.PermissionOverwrite()
+        allow, deny = pair
+        return discord.PermissionOverwrite.from_pair(discord.Permissions(allow), discord.Permissions(deny))
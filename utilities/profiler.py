@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import bisect
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Literal
+
+import aiohttp
+from pymongo import monitoring
+
+import discord
+from discord import app_commands
+
+if TYPE_CHECKING:
+    import aiosqlite
+
+    from core import Parrot
+
+__all__ = (
+    "BUCKETS",
+    "BACKENDS",
+    "Probe",
+    "ProfiledTree",
+    "Profiler",
+    "Stats",
+    "TracedConnection",
+)
+
+# Upper bounds of the latency histogram, in seconds. The last bucket is everything above.
+BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BACKENDS = ("mongo", "sql", "http")
+
+Backend = Literal["mongo", "sql", "http"]
+
+_probe: ContextVar[Probe | None] = ContextVar("profiler_probe", default=None)
+
+
+class Probe:
+    """Calls made by the listener or command running in the current context."""
+
+    __slots__ = (*BACKENDS, "failed")
+
+    def __init__(self) -> None:
+        self.mongo = 0
+        self.sql = 0
+        self.http = 0
+        # for the handlers which report their errors instead of raising them
+        self.failed = False
+
+
+class Stats:
+    __slots__ = ("count", "errors", "total", "max", "buckets", "mongo", "sql", "http")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: list[int] = [0] * (len(BUCKETS) + 1)
+        self.mongo = 0
+        self.sql = 0
+        self.http = 0
+
+    def add(self, elapsed: float, probe: Probe, *, error: bool) -> None:
+        self.count += 1
+        self.errors += error
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.buckets[bisect.bisect_left(BUCKETS, elapsed)] += 1
+        self.mongo += probe.mongo
+        self.sql += probe.sql
+        self.http += probe.http
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class _MongoListener(monitoring.CommandListener):
+    # called from the executor thread of motor, which runs in a copy of the caller's context
+    def __init__(self, profiler: Profiler) -> None:
+        self.profiler = profiler
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.profiler.record("mongo")
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+class TracedConnection:
+    """Thin proxy over an :class:`aiosqlite.Connection` counting the statements run through it."""
+
+    def __init__(self, connection: aiosqlite.Connection, profiler: Profiler) -> None:
+        self.__connection = connection
+        self.__profiler = profiler
+
+    @property
+    def connection(self) -> aiosqlite.Connection:
+        return self.__connection
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__connection, name)
+
+    def execute(self, *args: Any, **kwargs: Any) -> Any:
+        self.__profiler.record("sql")
+        return self.__connection.execute(*args, **kwargs)
+
+    def executemany(self, *args: Any, **kwargs: Any) -> Any:
+        self.__profiler.record("sql")
+        return self.__connection.executemany(*args, **kwargs)
+
+    def executescript(self, *args: Any, **kwargs: Any) -> Any:
+        self.__profiler.record("sql")
+        return self.__connection.executescript(*args, **kwargs)
+
+    def commit(self) -> Any:
+        self.__profiler.record("sql")
+        return self.__connection.commit()
+
+
+class Profiler:
+    """Opt-in latency and database call profiler of the listeners and commands.
+
+    While enabled, every listener and command runs under a :class:`Probe`. The
+    MongoDB command listener, the aiohttp trace config and the traced SQLite
+    connection count their calls on the probe of the context they are made from,
+    so each call is attributed to the listener or command which made it. Disabled,
+    the hooks only check for a probe and return.
+    """
+
+    def __init__(self, *, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.since = time.time()
+        self.stats: dict[tuple[str, str], Stats] = {}
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    @staticmethod
+    def record(backend: Backend) -> None:
+        if (probe := _probe.get()) is not None:
+            setattr(probe, backend, getattr(probe, backend) + 1)
+
+    @contextmanager
+    def measure(self, kind: str, name: str) -> Iterator[Probe | None]:
+        if not self.enabled:
+            yield None
+            return
+
+        probe = Probe()
+        token = _probe.set(probe)
+        error = False
+        start = time.perf_counter()
+        try:
+            yield probe
+        except BaseException:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _probe.reset(token)
+            error = error or probe.failed
+            if (stats := self.stats.get((kind, name))) is None:
+                stats = self.stats[kind, name] = Stats()
+            stats.add(elapsed, probe, error=error)
+
+    def reset(self) -> None:
+        self.stats.clear()
+        self.since = time.time()
+
+    def top(self, limit: int = 10, *, key: str = "total") -> list[tuple[str, str, Stats]]:
+        """The `limit` entries with the highest `key` (any attribute of :class:`Stats`)."""
+        entries = sorted(self.stats.items(), key=lambda item: getattr(item[1], key), reverse=True)
+        return [(kind, name, stats) for (kind, name), stats in entries[:limit]]
+
+    def command_listener(self) -> monitoring.CommandListener:
+        """To be given to the MongoDB client, as one of its ``event_listeners``."""
+        return _MongoListener(self)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """To be given to an aiohttp session (or discord.py's ``http_trace``)."""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(*_: Any) -> None:
+            self.record("http")
+
+        trace.on_request_start.append(on_request_start)
+        return trace
+
+    def trace_sqlite(self, connection: aiosqlite.Connection) -> TracedConnection:
+        return TracedConnection(connection, self)
+
+    def prometheus(self, *, prefix: str = "parrot") -> str:
+        """The stats in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_handler_seconds Latency of the listeners and commands.",
+            f"# TYPE {prefix}_handler_seconds histogram",
+        ]
+        for (kind, name), stats in self.stats.items():
+            labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), stats.buckets):
+                cumulative += count
+                lines.append(f'{prefix}_handler_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{prefix}_handler_seconds_sum{{{labels}}} {stats.total}")
+            lines.append(f"{prefix}_handler_seconds_count{{{labels}}} {stats.count}")
+
+        lines.append(f"# HELP {prefix}_handler_errors_total Listener and command invocations which raised.")
+        lines.append(f"# TYPE {prefix}_handler_errors_total counter")
+        for (kind, name), stats in self.stats.items():
+            lines.append(f'{prefix}_handler_errors_total{{kind="{_escape(kind)}",name="{_escape(name)}"}} {stats.errors}')
+
+        lines.append(f"# HELP {prefix}_handler_calls_total Database and HTTP calls made by the listeners and commands.")
+        lines.append(f"# TYPE {prefix}_handler_calls_total counter")
+        for (kind, name), stats in self.stats.items():
+            labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+            for backend in BACKENDS:
+                lines.append(f'{prefix}_handler_calls_total{{{labels},backend="{backend}"}} {getattr(stats, backend)}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ProfiledTree(app_commands.CommandTree["Parrot"]):
+    """Command tree measuring the application commands with the profiler of the bot."""
+
+    async def _call(self, interaction: discord.Interaction[Parrot]) -> None:
+        profiler: Profiler = self.client.profiler
+        if not profiler.enabled or interaction.command is None:
+            return await super()._call(interaction)
+
+        with profiler.measure("app_command", interaction.command.qualified_name) as probe:
+            await super()._call(interaction)
+            probe.failed = interaction.command_failed  # type: ignore
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import Counter
+from typing import Any
+
+from pymongo import UpdateOne
+
+__all__ = ("CommandRollup", "CommandTelemetry")
+
+# Latency samples kept per command per minute, the percentiles are computed over them.
+LATENCY_SAMPLE_SIZE = 256
+# Error samples kept per command per minute, and stored per rollup document.
+ERROR_SAMPLE_SIZE = 5
+
+PERCENTILES = (50, 90, 99)
+
+
+class CommandRollup:
+    """Usage of a single command during a single minute."""
+
+    __slots__ = (
+        "used",
+        "success",
+        "errors",
+        "guilds",
+        "users",
+        "guild_success",
+        "user_success",
+        "latencies",
+        "seen",
+        "error_samples",
+    )
+
+    def __init__(self) -> None:
+        self.used = 0
+        self.success = 0
+        self.errors = 0
+        self.guilds: Counter[int] = Counter()
+        self.users: Counter[int] = Counter()
+        self.guild_success: Counter[int] = Counter()
+        self.user_success: Counter[int] = Counter()
+        self.latencies: list[float] = []
+        self.seen = 0
+        self.error_samples: list[dict[str, Any]] = []
+
+    def add(self, *, guild_id: int | None, user_id: int, success: bool, latency: float, error: str | None) -> None:
+        self.used += 1
+        if success:
+            self.success += 1
+            self.user_success[user_id] += 1
+            if guild_id is not None:
+                self.guild_success[guild_id] += 1
+        if error is not None:
+            self.errors += 1
+            if len(self.error_samples) < ERROR_SAMPLE_SIZE:
+                self.error_samples.append({"error": error[:1000], "guild_id": guild_id, "user_id": user_id})
+
+        if guild_id is not None:
+            self.guilds[guild_id] += 1
+        self.users[user_id] += 1
+
+        # reservoir sampling, so the percentiles stay representative on busy minutes
+        self.seen += 1
+        if len(self.latencies) < LATENCY_SAMPLE_SIZE:
+            self.latencies.append(latency)
+        elif (index := random.randrange(self.seen)) < LATENCY_SAMPLE_SIZE:
+            self.latencies[index] = latency
+
+    def percentiles(self) -> dict[str, float]:
+        if not self.latencies:
+            return {}
+
+        latencies = sorted(self.latencies)
+        last = len(latencies) - 1
+        result = {f"p{p}": round(latencies[round(last * p / 100)], 4) for p in PERCENTILES}
+        result["max"] = round(latencies[-1], 4)
+        return result
+
+
+class CommandTelemetry:
+    """In-memory aggregator for command usage.
+
+    Recording an invocation is a couple of dictionary increments. :meth:`drain`
+    turns every finished minute into bulk writes: one rollup document per command
+    per minute in ``commandRollups`` and one lifetime counter update per user and
+    per guild in ``commandCollections``. Writes which failed are handed back with
+    :meth:`requeue` and come out of the next drain.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, dict[str, CommandRollup]] = {}
+        self.__failed_rollups: list[UpdateOne] = []
+        self.__failed_counters: list[UpdateOne] = []
+
+    def __len__(self) -> int:
+        return sum(len(commands) for commands in self.buckets.values()) + len(self.__failed_rollups)
+
+    def record(
+        self,
+        command: str,
+        *,
+        guild_id: int | None,
+        user_id: int,
+        success: bool,
+        latency: float,
+        error: str | None = None,
+        now: float | None = None,
+    ) -> None:
+        minute = int((time.time() if now is None else now) // 60) * 60
+        commands = self.buckets.setdefault(minute, {})
+        if (rollup := commands.get(command)) is None:
+            rollup = commands[command] = CommandRollup()
+
+        rollup.add(guild_id=guild_id, user_id=user_id, success=success, latency=latency, error=error)
+
+    def drain(self, *, force: bool = False, now: float | None = None) -> tuple[list[UpdateOne], list[UpdateOne]]:
+        """Remove the finished minutes and return ``(rollup_ops, counter_ops)``.
+
+        The current minute is kept unless `force` is set.
+        """
+        current = int((time.time() if now is None else now) // 60) * 60
+        minutes = [minute for minute in self.buckets if force or minute < current]
+
+        rollup_ops, self.__failed_rollups = self.__failed_rollups, []
+        user_counters: dict[int, Counter[str]] = {}
+        guild_counters: dict[int, Counter[str]] = {}
+
+        for minute in sorted(minutes):
+            for command, rollup in self.buckets.pop(minute).items():
+                rollup_ops.append(self._rollup_op(minute, command, rollup))
+
+                key = command.replace(" ", "_")
+                for counters, used, success in (
+                    (user_counters, rollup.users, rollup.user_success),
+                    (guild_counters, rollup.guilds, rollup.guild_success),
+                ):
+                    for _id, count in used.items():
+                        counter = counters.setdefault(_id, Counter())
+                        counter[f"command_{key}_used"] += count
+                        counter[f"command_{key}_success"] += success[_id]
+
+        counter_ops, self.__failed_counters = self.__failed_counters, []
+        counter_ops += [
+            UpdateOne({"_id": _id}, {"$inc": dict(counter), "$set": {"type": _type}}, upsert=True)
+            for _type, counters in (("user", user_counters), ("guild", guild_counters))
+            for _id, counter in counters.items()
+        ]
+        return rollup_ops, counter_ops
+
+    def requeue(self, rollup_ops: list[UpdateOne], counter_ops: list[UpdateOne]) -> None:
+        """Keep drained operations which failed to be written, for the next drain."""
+        self.__failed_rollups[:0] = rollup_ops
+        self.__failed_counters[:0] = counter_ops
+
+    @staticmethod
+    def _rollup_op(minute: int, command: str, rollup: CommandRollup) -> UpdateOne:
+        update: dict[str, Any] = {
+            "$inc": {
+                "used": rollup.used,
+                "success": rollup.success,
+                "errors": rollup.errors,
+                **{f"guilds.{_id}": count for _id, count in rollup.guilds.items()},
+                **{f"users.{_id}": count for _id, count in rollup.users.items()},
+            },
+            "$set": {"minute": minute, "command": command, "latency": rollup.percentiles()},
+        }
+        if rollup.error_samples:
+            update["$push"] = {"error_samples": {"$each": rollup.error_samples, "$slice": -ERROR_SAMPLE_SIZE}}
+
+        return UpdateOne({"_id": f"{minute}:{command}"}, update, upsert=True)
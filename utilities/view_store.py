@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from typing import TYPE_CHECKING, Any
+
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import PyMongoError
+
+import discord
+from core.view import PERSISTENT_ID_PREFIX, PersistentView
+
+if TYPE_CHECKING:
+    from core import Parrot
+
+__all__ = ("RestoredItem", "ViewStore")
+
+log = logging.getLogger("utilities.view_store")
+
+# Seconds the states stored by views are gathered for before being written together.
+WRITE_DELAY = 2
+EXPIRED_MESSAGE = "This has expired, start a new one."
+
+
+def _expired(expires_at: datetime.datetime) -> bool:
+    if expires_at.tzinfo is None:
+        # naive datetimes of the database are UTC
+        expires_at = expires_at.replace(tzinfo=datetime.timezone.utc)
+    return expires_at <= discord.utils.utcnow()
+
+
+class ViewStore:
+    """States of the persistent views, by the ID of their message.
+
+    States are written to ``Parrot.view_states`` in bulk, a few seconds after they
+    change; the collection has a TTL index on ``expires_at``, states of views
+    nobody uses anymore disappear on their own. Views are restored lazily, by the
+    first click on their message after a restart, see :class:`RestoredItem`.
+    """
+
+    def __init__(self, bot: Parrot) -> None:
+        self.bot = bot
+        # message ID -> view of this process
+        self.__live: dict[int, PersistentView] = {}
+        # message ID -> document to write, None to delete
+        self.__pending: dict[int, dict[str, Any] | None] = {}
+        self.__restoring: dict[int, asyncio.Task[PersistentView | None]] = {}
+        self.__writer: asyncio.Task[None] | None = None
+
+    def __repr__(self) -> str:
+        return f"<ViewStore live={len(self.__live)} pending={len(self.__pending)}>"
+
+    def live(self, message_id: int) -> PersistentView | None:
+        """The view of the message in this process, if it is still running."""
+        view = self.__live.get(message_id)
+        if view is not None and view.is_finished():
+            del self.__live[message_id]
+            return None
+        return view
+
+    def save(self, view: PersistentView) -> None:
+        message_id = view.message.id
+        self.__live[message_id] = view
+        self.__pending[message_id] = {
+            "kind": view.kind,
+            "version": view.version,
+            "state": view.to_state(),
+            "expires_at": discord.utils.utcnow() + datetime.timedelta(seconds=view.ttl),
+        }
+        self.__schedule()
+
+    def delete(self, view: PersistentView) -> None:
+        message_id = view.message.id
+        self.__live.pop(message_id, None)
+        self.__pending[message_id] = None
+        self.__schedule()
+
+    def __schedule(self) -> None:
+        if self.__writer is None or self.__writer.done():
+            self.__writer = asyncio.create_task(self.__write_after(WRITE_DELAY))
+
+    async def __write_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write the states waiting to be, done on close too."""
+        pending, self.__pending = self.__pending, {}
+        if not pending:
+            return
+
+        requests: list[DeleteOne | ReplaceOne] = [
+            DeleteOne({"_id": message_id})
+            if document is None
+            else ReplaceOne({"_id": message_id}, document, upsert=True)
+            for message_id, document in pending.items()
+        ]
+        try:
+            await self.bot.view_states.bulk_write(requests, ordered=False)
+        except PyMongoError as e:
+            log.warning("Failed to write %s view states", len(requests), exc_info=e)
+
+    async def restore(self, message: discord.Message) -> PersistentView | None:
+        """The view of the message, loaded from its state. ``None`` when it expired or there is none.
+
+        Clicks coming while the state loads wait for the same view.
+        """
+        if (view := self.live(message.id)) is not None:
+            return view
+
+        if (task := self.__restoring.get(message.id)) is None:
+            task = self.__restoring[message.id] = asyncio.create_task(self.__load(message))
+            task.add_done_callback(lambda _: self.__restoring.pop(message.id, None))
+        return await asyncio.shield(task)
+
+    async def __load(self, message: discord.Message) -> PersistentView | None:
+        try:
+            document = await self.bot.view_states.find_one({"_id": message.id})
+        except PyMongoError as e:
+            log.warning("Failed to load the view state of message %s", message.id, exc_info=e)
+            return None
+
+        # the TTL monitor only runs every minute
+        if document is None or _expired(document["expires_at"]):
+            return None
+        cls = PersistentView.kinds.get(document["kind"])
+        if cls is None or document["version"] != cls.version:
+            return None
+
+        try:
+            view = cls.from_state(self.bot, document["state"])
+        except (LookupError, TypeError, ValueError) as e:
+            log.warning("Dropping the invalid %s view state of message %s", cls.kind, message.id, exc_info=e)
+            return None
+
+        view.message = message
+        self.__live[message.id] = view
+        # editing the message registers the view, with its timeout
+        await message.edit(view=view)
+        return view
+
+
+class RestoredItem(discord.ui.DynamicItem[discord.ui.Item], template=rf"{PERSISTENT_ID_PREFIX}:(?P<kind>[\w-]+):[\w-]+"):
+    """Any item of a persistent view, restoring the view from the first click after a restart.
+
+    Every click on such an item comes here too, the views of this process are left
+    alone and handle it.
+    """
+
+    def __init__(self, item: discord.ui.Item, restored: PersistentView | None, *, live: bool = False) -> None:
+        super().__init__(item)
+        self.restored = restored
+        self.live = live
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction[Parrot],
+        item: discord.ui.Item,
+        match: Any,
+    ) -> RestoredItem:
+        store = interaction.client.view_store
+        assert interaction.message is not None
+        if store.live(interaction.message.id) is not None:
+            return cls(item, None, live=True)
+        return cls(item, await store.restore(interaction.message))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return not self.live
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        view = self.restored
+        if view is None:
+            # answered, the user does not retry a click that fails
+            await interaction.response.send_message(EXPIRED_MESSAGE, ephemeral=True)
+            return
+
+        target = discord.utils.get(view.children, custom_id=self.custom_id)
+        if target is None:
+            await interaction.response.defer()
+            return
+
+        # this click did not go through the view, done as discord.py dispatches it
+        target._refresh_state(interaction, interaction.data)  # type: ignore
+        try:
+            if await view.interaction_check(interaction):
+                await target.callback(interaction)
+        except Exception as e:
+            await view.on_error(interaction, e, target)
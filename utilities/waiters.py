@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Collection
+from typing import Any
+
+__all__ = ("WaiterIndex", "RoutingKey", "ROUTES")
+
+RoutingKey = int | Collection[int] | None
+# (channel ID, user ID, message ID) of an event, any of them can be None
+Route = tuple[int | None, int | None, int | None]
+
+KINDS = ("channel", "user", "message")
+# Waiters are bucketed by their most selective key.
+SPECIFICITY = ("message", "user", "channel")
+
+
+def _message_route(message: Any, *_: Any) -> Route:
+    return message.channel.id, message.author.id, message.id
+
+
+def _reaction_route(reaction: Any, user: Any) -> Route:
+    message = reaction.message
+    return message.channel.id, user.id, message.id
+
+
+def _raw_reaction_route(payload: Any) -> Route:
+    return payload.channel_id, payload.user_id, payload.message_id
+
+
+def _interaction_route(interaction: Any) -> Route:
+    message = interaction.message
+    return interaction.channel_id, interaction.user.id, message.id if message is not None else None
+
+
+ROUTES: dict[str, Callable[..., Route]] = {
+    "message": _message_route,
+    "message_delete": _message_route,
+    "message_edit": lambda _, after: _message_route(after),
+    "reaction_add": _reaction_route,
+    "reaction_remove": _reaction_route,
+    "raw_reaction_add": _raw_reaction_route,
+    "raw_reaction_remove": _raw_reaction_route,
+    "interaction": _interaction_route,
+    "typing": lambda channel, user, _: (channel.id, user.id, None),
+    "voice_state_update": lambda member, *_: (None, member.id, None),
+}
+
+
+class _Waiter:
+    __slots__ = ("future", "check", "keys", "bucket_keys")
+
+    def __init__(
+        self,
+        future: asyncio.Future[Any],
+        check: Callable[..., bool] | None,
+        keys: dict[str, frozenset[int]],
+    ) -> None:
+        self.future = future
+        self.check = check
+        self.keys = keys
+        self.bucket_keys: list[tuple[str, int]] = []
+
+    def matches(self, route: Route) -> bool:
+        return all(value in self.keys[kind] for kind, value in zip(KINDS, route) if kind in self.keys)
+
+
+class WaiterIndex:
+    """`wait_for` waiters bucketed by channel, user or message ID.
+
+    Each waiter is stored in the buckets of its most selective key, so an event is only
+    checked against the waiters registered for its own channel, author or message,
+    instead of against every pending waiter of the event.
+    """
+
+    def __init__(self) -> None:
+        self.__buckets: dict[str, dict[tuple[str, int], list[_Waiter]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(waiters) for buckets in self.__buckets.values() for waiters in buckets.values())
+
+    @staticmethod
+    def supports(event: str) -> bool:
+        return event in ROUTES
+
+    def add(
+        self,
+        event: str,
+        future: asyncio.Future[Any],
+        *,
+        check: Callable[..., bool] | None = None,
+        channel_id: RoutingKey = None,
+        user_id: RoutingKey = None,
+        message_id: RoutingKey = None,
+    ) -> None:
+        keys: dict[str, frozenset[int]] = {}
+        for kind, value in zip(KINDS, (channel_id, user_id, message_id)):
+            if value is not None:
+                keys[kind] = frozenset((value,) if isinstance(value, int) else value)
+
+        if not keys:
+            msg = "at least one routing key is required"
+            raise ValueError(msg)
+
+        waiter = _Waiter(future, check, keys)
+        kind = next(kind for kind in SPECIFICITY if kind in keys)
+        buckets = self.__buckets.setdefault(event, {})
+        for _id in keys[kind]:
+            buckets.setdefault((kind, _id), []).append(waiter)
+            waiter.bucket_keys.append((kind, _id))
+
+        future.add_done_callback(lambda _: self.__discard(event, waiter))
+
+    def dispatch(self, event: str, args: tuple[Any, ...]) -> None:
+        buckets = self.__buckets.get(event)
+        if not buckets:
+            return
+
+        try:
+            route = ROUTES[event](*args)
+        except AttributeError:
+            return
+
+        for kind, value in zip(KINDS, route):
+            if value is None or (bucket := buckets.get((kind, value))) is None:
+                continue
+
+            # resolving a future removes the waiter from its buckets
+            for waiter in list(bucket):
+                if waiter.future.done() or not waiter.matches(route):
+                    continue
+                try:
+                    result = waiter.check is None or waiter.check(*args)
+                except Exception as e:  # noqa: BLE001
+                    waiter.future.set_exception(e)
+                    continue
+
+                if result:
+                    waiter.future.set_result(None if not args else args[0] if len(args) == 1 else args)
+
+    def __discard(self, event: str, waiter: _Waiter) -> None:
+        buckets = self.__buckets.get(event, {})
+        for key in waiter.bucket_keys:
+            bucket = buckets.get(key)
+            if bucket is None:
+                continue
+            try:
+                bucket.remove(waiter)
+            except ValueError:
+                continue
+            if not bucket:
+                del buckets[key]
+
+        if not buckets:
+            self.__buckets.pop(event, None)
@@ -0,0 +1,149 @@
+"""Wordle feedback and solver over a fixed word list.
+
+The words are held as an array of letter codes, with a bit mask of the letters
+of each word; feedback is a number of base 3, a digit per position. Hints score
+guesses by the information their feedback gives on the remaining answers, the
+feedback of a guess against every answer being computed at once with NumPy.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Sequence
+from functools import cached_property
+
+import numpy as np
+
+__all__ = ("WordIndex", "ABSENT", "PRESENT", "CORRECT", "SOLVED")
+
+LENGTH = 5
+# feedback of a letter
+ABSENT, PRESENT, CORRECT = range(3)
+SOLVED = sum(CORRECT * 3**position for position in range(LENGTH))
+PATTERNS = 3**LENGTH
+_POWERS = 3 ** np.arange(LENGTH, dtype=np.uint8)
+
+# Guesses scored by a hint, the ones sharing the most frequent letters of the answers left.
+HINT_GUESSES = 256
+# Answers a hint scores the guesses against, a sample of them when more are left.
+HINT_ANSWERS = 2048
+
+
+class WordIndex:
+    """The words of a Wordle game, loaded once.
+
+    `letters` holds the letter codes of the words, a row per word, and `masks` a
+    bit per letter a word contains. Words are looked up by their row in `index`.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words: tuple[str, ...] = tuple(dict.fromkeys(word for word in words if len(word) == LENGTH and word.isalpha()))
+        self.index: dict[str, int] = {word: row for row, word in enumerate(self.words)}
+
+        letters = np.frombuffer("".join(self.words).encode("ascii"), dtype=np.uint8) - ord("a")
+        self.letters: np.ndarray = letters.reshape(-1, LENGTH)
+        self.masks: np.ndarray = np.bitwise_or.reduce(np.left_shift(1, self.letters.astype(np.int32)), axis=1)
+
+    @classmethod
+    def from_file(cls, path: str) -> WordIndex:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            return cls(line.strip().lower() for line in f)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.index
+
+    @cached_property
+    def everything(self) -> np.ndarray:
+        """Rows of every word, the answers before any guess."""
+        return np.arange(len(self.words))
+
+    def feedback(self, guess: str, answer: str) -> int:
+        """Feedback of `guess` when the word is `answer`, both words of the index."""
+        guess_row, answer_row = self.index[guess], self.index[answer]
+        if not self.masks[guess_row] & self.masks[answer_row]:
+            return ABSENT
+
+        pattern = 0
+        # letters of the answer not guessed at their position, each makes one guessed letter present
+        left: dict[str, int] = {}
+        for position in range(LENGTH):
+            if guess[position] == answer[position]:
+                pattern += CORRECT * 3**position
+            else:
+                left[answer[position]] = left.get(answer[position], 0) + 1
+        for position in range(LENGTH):
+            letter = guess[position]
+            if letter != answer[position] and left.get(letter):
+                left[letter] -= 1
+                pattern += PRESENT * 3**position
+        return pattern
+
+    def patterns(self, guess: str, answers: np.ndarray) -> np.ndarray:
+        """Feedback of `guess` for each row of `answers`."""
+        guessed = self.letters[self.index[guess]]
+        letters = self.letters[answers]
+
+        correct = letters == guessed
+        # answers' letters not guessed at their position, counted by letter
+        cells = np.arange(len(answers))[:, None] * 26 + letters
+        left = np.bincount(cells[~correct], minlength=len(answers) * 26).reshape(-1, 26)
+
+        feedback = correct.astype(np.uint8) * CORRECT
+        for position in range(LENGTH):
+            letter = guessed[position]
+            present = ~correct[:, position] & (left[:, letter] > 0)
+            left[:, letter] -= present
+            feedback[:, position] += present.astype(np.uint8) * PRESENT
+        return (feedback.astype(np.int16) * _POWERS).sum(axis=1)
+
+    def narrow(self, answers: np.ndarray, guess: str, pattern: int) -> np.ndarray:
+        """Rows of `answers` which give `pattern` as the feedback of `guess`."""
+        return answers[self.patterns(guess, answers) == pattern]
+
+    def information(self, guess: str, answers: np.ndarray) -> float:
+        """Expected information of the feedback of `guess` over `answers`, in bits."""
+        counts = np.bincount(self.patterns(guess, answers), minlength=PATTERNS)
+        probabilities = counts[counts > 0] / len(answers)
+        return float(-(probabilities * np.log2(probabilities)).sum())
+
+    @cached_property
+    def opening(self) -> str | None:
+        """The hint before any guess, the same for every game."""
+        return self.__best(self.everything)
+
+    def hint(self, answers: np.ndarray) -> str | None:
+        """The most informative guess on `answers`, rows of the words the answer can still be."""
+        if len(answers) == len(self.words):
+            return self.opening
+        return self.__best(answers)
+
+    def __best(self, answers: np.ndarray, *, seed: int = 0) -> str | None:
+        if len(answers) == 0:
+            return None
+        if len(answers) <= 2:
+            return self.words[answers[0]]
+
+        sample = answers
+        if len(answers) > HINT_ANSWERS:
+            sample = np.random.default_rng(seed).choice(answers, HINT_ANSWERS, replace=False)
+
+        possible = set(answers.tolist())
+        best, best_score = None, -math.inf
+        for row in self.__hint_guesses(sample):
+            # a guess which may be the answer wins the ties
+            score = self.information(self.words[row], sample) + (row in possible) / len(answers)
+            if score > best_score:
+                best, best_score = row, score
+        return None if best is None else self.words[best]
+
+    def __hint_guesses(self, answers: np.ndarray) -> Sequence[int]:
+        # letters by the number of answers containing them, guesses by the frequency of their distinct letters
+        bits = np.left_shift(1, np.arange(26, dtype=np.int32))
+        frequency = ((self.masks[answers, None] & bits) > 0).sum(axis=0)
+        scores = ((self.masks[:, None] & bits) > 0) @ frequency
+        if len(scores) <= HINT_GUESSES:
+            return range(len(scores))
+        return np.argpartition(scores, -HINT_GUESSES)[-HINT_GUESSES:].tolist()
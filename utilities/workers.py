@@ -0,0 +1,69 @@
+"""Worker processes for the CPU bound searches of the games.
+
+A search holds the GIL for its whole time budget, in a thread it would stall the
+event loop as long. The workers are forked from a server process which only
+imported the game modules, not from the running bot; games beyond their number
+wait for a free one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, TypeVar
+
+__all__ = ("BrokenProcessPool", "run", "shutdown")
+
+T = TypeVar("T")
+
+# Worker processes searching at once.
+WORKERS = 2
+# Modules the workers need, imported once by the fork server.
+PRELOAD = ["utilities.chess_engine", "utilities.game_ai"]
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # forking the running bot would copy its event loop and sockets
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(PRELOAD)
+        else:
+            context = multiprocessing.get_context("spawn")
+        _pool = ProcessPoolExecutor(WORKERS, mp_context=context)
+    return _pool
+
+
+async def run(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """The result of `func`, called in a worker process. It must be a module level function.
+
+    A worker dying breaks the whole pool; the call is tried once more in a new
+    one before :class:`BrokenProcessPool` is raised.
+    """
+    loop = asyncio.get_running_loop()
+    call = partial(func, *args, **kwargs)
+    try:
+        return await loop.run_in_executor(_executor(), call)
+    except BrokenProcessPool:
+        shutdown()
+
+    try:
+        return await loop.run_in_executor(_executor(), call)
+    except BrokenProcessPool:
+        shutdown()
+        raise
+
+
+def shutdown() -> None:
+    """Stop the worker processes, started again by the next call."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None